@@ -8,7 +8,6 @@ import os
 import sys
 from pathlib import Path
 import streamlit as st
-import shutil
 
 # Page config MUST be first Streamlit command
 st.set_page_config(
@@ -25,15 +24,18 @@ sys.path.insert(0, str(Path(__file__).parent))
 from core.utils.cache_cleaner import CacheCleaner
 from core.utils.output_manager import get_output_manager
 
-# Clean cache on startup
-CacheCleaner.clean_cache(verbose=False)
-
 # Load configuration
 from core.config.config_loader import ConfigLoader
 
 # Get config from environment or use default
 config = ConfigLoader.load_from_env('BILL_CONFIG', 'config/v01.json')
 
+# Warm the document stack in the background (once per server process);
+# bytecode caches are kept so modules load without recompiling
+if config.processing.warm_startup:
+    from core.utils.warmup import start_warmup
+    start_warmup(config.processing.pdf_engine)
+
 # Automatic cache cleaning on startup (optional)
 # This can be controlled by configuration or environment variable
 auto_clean_env = os.getenv('CLEAN_CACHE_ON_STARTUP', 'false').lower() == 'true'
@@ -43,65 +45,11 @@ if 'cache_cleaned' not in st.session_state:
     st.session_state.cache_cleaned = False
 
 if (auto_clean_env or (config and config.processing.auto_clean_cache)) and not st.session_state.cache_cleaned:
-    # Define cache directories to clean
-    cache_dirs = [
-        "__pycache__",
-        ".pytest_cache",
-        ".mypy_cache"
-    ]
-    
-    # Define additional patterns to clean
-    additional_patterns = [
-        "**/__pycache__",  # Recursive py cache directories
-        "**/*.pyc",        # Python compiled files
-        "**/*.pyo",        # Optimized Python files
-        "**/*.pyd",        # Python DLL files
-        "**/*.pyz",        # Python zip files
-        "**/*.pyx",        # Cython files
-        "**/*.so",         # Shared libraries
-        "**/*.dll",        # Windows DLL files
-        "**/*.dylib"       # macOS dynamic libraries
-    ]
-    
-    cleaned_any = False
-    
-    # Clean cache directories
-    for cache_dir in cache_dirs:
-        cache_path = Path(cache_dir)
-        if cache_path.exists():
-            try:
-                if cache_path.is_dir():
-                    shutil.rmtree(cache_path)
-                else:
-                    cache_path.unlink()
-                cleaned_any = True
-                print(f"Cleaned cache directory: {cache_dir}")
-            except Exception as e:
-                print(f"Failed to clean {cache_dir}: {e}")
-                pass  # Silent fail on startup
-    
-    # Clean additional patterns
-    for pattern in additional_patterns:
-        try:
-            for file_path in Path(".").glob(pattern):
-                if file_path.is_file():
-                    file_path.unlink()
-                    cleaned_any = True
-                    print(f"Cleaned file: {file_path}")
-                elif file_path.is_dir():
-                    shutil.rmtree(file_path)
-                    cleaned_any = True
-                    print(f"Cleaned directory: {file_path}")
-        except Exception as e:
-            print(f"Failed to clean pattern {pattern}: {e}")
-            pass  # Silent fail on startup
-    
-    # Mark cache as cleaned for this session
-    if cleaned_any:
-        st.session_state.cache_cleaned = True
-        print("Cache cleaning completed for this session")
-    else:
-        print("No cache files found to clean")
+    # Tool caches only - deleting bytecode would force a full recompile on every start
+    cleaned_dirs, cleaned_files = CacheCleaner.clean_cache(verbose=False)
+    st.session_state.cache_cleaned = True
+    if cleaned_dirs or cleaned_files:
+        print(f"Cache cleaning completed: {cleaned_dirs} directories, {cleaned_files} files")
 
 # Custom CSS with Beautiful Gradient Styling
 st.markdown("""
@@ -341,11 +289,15 @@ with st.sidebar:
     
     # Get output manager
     output_mgr = get_output_manager()
-    output_size = output_mgr.get_folder_size()
-    output_files = len(output_mgr.get_all_files())
+    usage = output_mgr.get_usage_summary()
+    output_size = usage['size_bytes']
+    output_files = usage['entries']
     
     if output_size > 0:
         st.info(f"📦 OUTPUT folder: {output_files} files ({output_mgr.format_size(output_size)})")
+        dedup_saved = usage['saved_bytes']
+        if dedup_saved > 0:
+            st.caption(f"♻️ {output_mgr.format_size(dedup_saved)} saved by storing identical files once")
     
     # Button to clean cache
     if st.button("🧹 Clean Cache & Temp Files"):
@@ -33,13 +33,8 @@ except ImportError:
     print("ERROR: Click library not installed. Install with: pip install click")
     sys.exit(1)
 
-from core.processors.excel_processor_enterprise import ExcelProcessor
-from core.generators.html_renderer_enterprise import HTMLRenderer, DocumentType
-from core.rendering.pdf_renderer_enterprise import (
-    PDFRendererFactory, PDFConfig, PageSize, PageOrientation, PDFEngine
-)
-from core.batch.job_runner_enterprise import BatchJobRunner, BatchConfig, RetryPolicy
-from core.validation.error_diagnostics_enterprise import ComprehensiveValidator
+# Processing modules (pandas, openpyxl, renderers) are imported inside each
+# command, so `--help` and argument errors return without loading them
 from core.logging.structured_logger import get_structured_logger, LogLevel
 
 
@@ -111,6 +106,12 @@ def process(
     Example:
         python cli.py process -i input.xlsx -o OUTPUT/ -f both
     """
+    from core.processors.excel_processor_enterprise import ExcelProcessor
+    from core.rendering.pdf_renderer_enterprise import (
+        PDFRendererFactory, PDFConfig, PageSize, PageOrientation, PDFEngine
+    )
+    from core.validation.error_diagnostics_enterprise import ComprehensiveValidator
+    
     start_time = time.time()
     
     click.echo(f"\n{'='*80}")
@@ -316,6 +317,9 @@ def batch(
     Example:
         python cli.py batch -i INPUT/ -o OUTPUT/batch/ -w 4
     """
+    from core.processors.excel_processor_enterprise import ExcelProcessor
+    from core.batch.job_runner_enterprise import BatchJobRunner, BatchConfig, RetryPolicy
+    
     start_time = time.time()
     
     click.echo(f"\n{'='*80}")
@@ -447,6 +451,9 @@ def validate(input: Path, rules: Optional[Path], output: Optional[Path]):
     Example:
         python cli.py validate -i input.xlsx --rules rules.json
     """
+    from core.processors.excel_processor_enterprise import ExcelProcessor
+    from core.validation.error_diagnostics_enterprise import ComprehensiveValidator
+    
     click.echo(f"\n{'='*80}")
     click.echo(f"ENTERPRISE BILL GENERATOR - Validation Only")
     click.echo(f"{'='*80}\n")
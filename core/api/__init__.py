@@ -0,0 +1,3 @@
+"""
+API module - Headless HTTP access to bill generation
+"""
@@ -0,0 +1,418 @@
+"""
+Headless HTTP API - Workbook in, document package out
+Built on asyncio streams (stdlib only). Parsing and rendering run in a
+process pool; the event loop only moves bytes, so slow uploads and
+downloads never hold a worker.
+
+Endpoints:
+    GET  /v1/health   Capacity and load as JSON
+    POST /v1/bills    Workbook upload (raw body or multipart field "file")
+                      → application/zip package
+
+Query options for /v1/bills: filename, html, pdf, docx, native_pdf (0/1)
+
+Usage:
+    FEATURE_API_ACCESS=true python -m core.api.server --port 8502
+"""
+import argparse
+import asyncio
+import json
+import os
+import shutil
+import sys
+import tempfile
+import time
+from concurrent.futures import Executor, ProcessPoolExecutor
+from email.parser import BytesParser
+from email.policy import HTTP
+from multiprocessing import get_context
+from pathlib import Path
+from typing import Any, Dict, Optional, Tuple
+from urllib.parse import parse_qs, quote, urlsplit
+
+CHUNK_SIZE = 64 * 1024
+MAX_HEADER_BYTES = 16 * 1024
+LINGER_SECONDS = 5
+
+REASONS = {
+    200: 'OK', 400: 'Bad Request', 404: 'Not Found', 405: 'Method Not Allowed',
+    411: 'Length Required', 413: 'Payload Too Large', 422: 'Unprocessable Entity',
+    429: 'Too Many Requests', 500: 'Internal Server Error', 504: 'Gateway Timeout',
+}
+
+OPTION_FLAGS = {'html': True, 'pdf': True, 'docx': True, 'native_pdf': False}
+
+
+class HTTPError(Exception):
+    """Error that maps directly to an HTTP status"""
+
+    def __init__(self, status: int, message: str, headers: Optional[Dict[str, str]] = None):
+        super().__init__(message)
+        self.status = status
+        self.message = message
+        self.headers = headers or {}
+
+
+class Request:
+    """Parsed request head"""
+
+    def __init__(self, method: str, target: str, headers: Dict[str, str]):
+        self.method = method
+        self.target = target
+        self.headers = headers
+        self.body_read = False
+
+    @property
+    def content_length(self) -> int:
+        return int(self.headers.get('content-length', 0) or 0)
+
+
+def render_upload(input_path: str, work_dir: str, label: str,
+                  options: Dict[str, Any]) -> Tuple[str, int, list]:
+    """
+    Generate the package for one uploaded workbook (runs in a worker process)
+
+    Returns:
+        Tuple of (result ZIP path, document count, failed render messages)
+    """
+    from core.batch.job_queue import build_package
+    result_path, doc_count, errors = build_package('workbook', input_path, work_dir, label, options)
+    return str(result_path), doc_count, errors
+
+
+def _flag(value: str) -> bool:
+    return value.strip().lower() in ('1', 'true', 'yes', 'on')
+
+
+def _content_disposition(stem: str) -> str:
+    """
+    attachment header for the package download
+
+    Control characters, quotes and backslashes are dropped so the client's
+    filename cannot break out of the header. Non-ASCII names go in an
+    RFC 5987 filename* parameter next to an ASCII fallback.
+    """
+    name = ''.join(c for c in stem if c.isprintable() and c not in '"\\') or 'bill'
+    fallback = ''.join(c if c.isascii() else '_' for c in name)
+    return f"attachment; filename=\"{fallback}.zip\"; filename*=UTF-8''{quote(name + '.zip', safe='')}"
+
+
+def _extract_multipart(content_type: str, body: bytes) -> Tuple[bytes, Optional[str]]:
+    """Return the bytes and filename of the 'file' field of a multipart body"""
+    message = BytesParser(policy=HTTP).parsebytes(
+        f"Content-Type: {content_type}\r\n\r\n".encode('latin-1') + body
+    )
+    for part in message.iter_parts():
+        if part.get_param('name', header='content-disposition') == 'file':
+            return part.get_payload(decode=True) or b'', part.get_filename()
+    raise HTTPError(400, "multipart body has no 'file' field")
+
+
+class BillAPIServer:
+    """
+    asyncio HTTP server for bill generation
+
+    - At most max_concurrent packages render at once (one per worker process)
+    - Up to max_queue further requests wait for a worker; beyond that the
+      server answers 429 with Retry-After instead of queueing unboundedly
+    - The finished ZIP is streamed from disk in chunks with drain(), so a
+      slow client only ever holds CHUNK_SIZE bytes of the response in memory
+    """
+
+    def __init__(self, max_concurrent: int = 2, max_queue: int = 8,
+                 request_timeout: float = 300, max_upload_mb: int = 50,
+                 executor: Optional[Executor] = None,
+                 work_dir: Optional[str] = None,
+                 pdf_engine: str = 'reportlab'):
+        """
+        Initialize API server
+
+        Args:
+            max_concurrent: Worker processes rendering in parallel
+            max_queue: Requests allowed to wait for a worker
+            request_timeout: Seconds before a render is answered with 504
+            max_upload_mb: Largest accepted workbook
+            executor: Executor for render_upload (default: spawn process pool)
+            work_dir: Parent folder for per-request temp folders
+            pdf_engine: Configured PDF engine, warmed in each worker process
+        """
+        self.max_concurrent = max_concurrent
+        self.max_queue = max_queue
+        self.request_timeout = request_timeout
+        self.max_upload_bytes = max_upload_mb * 1024 * 1024
+        self.work_dir = work_dir
+        self.pdf_engine = pdf_engine
+        self._executor = executor
+        self._owns_executor = executor is None
+        self._admitted = 0
+        self._served = 0
+        self._rejected = 0
+        self._server: Optional[asyncio.AbstractServer] = None
+
+    @property
+    def capacity(self) -> int:
+        return self.max_concurrent + self.max_queue
+
+    async def start(self, host: str = '127.0.0.1', port: int = 8502) -> asyncio.AbstractServer:
+        """Start listening (port 0 picks a free port)"""
+        if self._executor is None:
+            # spawn: workers must not inherit the event loop's threads
+            from core.utils.warmup import warm_worker
+            self._executor = ProcessPoolExecutor(
+                max_workers=self.max_concurrent, mp_context=get_context('spawn'),
+                initializer=warm_worker, initargs=(self.pdf_engine,)
+            )
+        self._server = await asyncio.start_server(self._handle, host, port, limit=MAX_HEADER_BYTES)
+        return self._server
+
+    @property
+    def port(self) -> int:
+        return self._server.sockets[0].getsockname()[1]
+
+    async def close(self) -> None:
+        if self._server is not None:
+            self._server.close()
+            await self._server.wait_closed()
+        if self._owns_executor and self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
+
+    # ---------------------------------------------------------------- HTTP
+
+    async def _send(self, writer: asyncio.StreamWriter, status: int,
+                    headers: Dict[str, str], body: bytes = b'') -> None:
+        lines = [f"HTTP/1.1 {status} {REASONS.get(status, '')}"]
+        headers = {'Content-Length': str(len(body)), 'Connection': 'close', **headers}
+        lines += [f"{name}: {value}" for name, value in headers.items()]
+        writer.write(("\r\n".join(lines) + "\r\n\r\n").encode('latin-1') + body)
+        await writer.drain()
+
+    async def _send_json(self, writer: asyncio.StreamWriter, status: int,
+                         payload: Dict[str, Any], headers: Optional[Dict[str, str]] = None) -> None:
+        body = json.dumps(payload).encode('utf-8')
+        await self._send(writer, status, {'Content-Type': 'application/json', **(headers or {})}, body)
+
+    async def _stream_file(self, writer: asyncio.StreamWriter, path: Path,
+                           headers: Dict[str, str]) -> None:
+        await self._send(writer, 200, {**headers, 'Content-Length': str(path.stat().st_size)})
+        with open(path, 'rb') as f:
+            while True:
+                chunk = f.read(CHUNK_SIZE)
+                if not chunk:
+                    break
+                writer.write(chunk)
+                await writer.drain()
+
+    async def _read_request(self, reader: asyncio.StreamReader) -> Request:
+        try:
+            head = await reader.readuntil(b'\r\n\r\n')
+        except (asyncio.LimitOverrunError, asyncio.IncompleteReadError):
+            raise HTTPError(400, "malformed request head")
+        request_line, *header_lines = head.decode('latin-1').split('\r\n')
+        try:
+            method, target, _version = request_line.split(' ', 2)
+        except ValueError:
+            raise HTTPError(400, "malformed request line")
+        headers = {}
+        for line in header_lines:
+            if ':' in line:
+                name, value = line.split(':', 1)
+                headers[name.strip().lower()] = value.strip()
+        # Checked here so every later use (including _discard_body) gets a valid size
+        length = headers.get('content-length', '0')
+        if not (length.isascii() and length.isdigit()):
+            raise HTTPError(400, "invalid Content-Length")
+        return Request(method.upper(), target, headers)
+
+    async def _read_body(self, reader: asyncio.StreamReader, request: Request) -> bytes:
+        if 'content-length' not in request.headers:
+            raise HTTPError(411, "Content-Length required")
+        if request.content_length > self.max_upload_bytes:
+            raise HTTPError(413, f"upload exceeds {self.max_upload_bytes // (1024 * 1024)} MB")
+        try:
+            body = await reader.readexactly(request.content_length)
+        except asyncio.IncompleteReadError:
+            raise HTTPError(400, "request body shorter than Content-Length")
+        request.body_read = True
+        return body
+
+    async def _discard_body(self, reader: asyncio.StreamReader, request: Request) -> None:
+        """
+        Read and drop an unread body after an early error response
+
+        Closing with unread data makes the kernel send RST, and the client
+        loses the 413/429 it was about to read. Bounded by LINGER_SECONDS.
+        """
+        remaining = request.content_length
+
+        async def drain():
+            nonlocal remaining
+            while remaining > 0:
+                chunk = await reader.read(min(CHUNK_SIZE, remaining))
+                if not chunk:
+                    break
+                remaining -= len(chunk)
+
+        try:
+            await asyncio.wait_for(drain(), LINGER_SECONDS)
+        except asyncio.TimeoutError:
+            pass
+
+    async def _handle(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        request = None
+        try:
+            request = await self._read_request(reader)
+            url = urlsplit(request.target)
+            if url.path == '/v1/health':
+                if request.method != 'GET':
+                    raise HTTPError(405, "use GET")
+                await self._send_json(writer, 200, self.health())
+            elif url.path == '/v1/bills':
+                if request.method != 'POST':
+                    raise HTTPError(405, "use POST")
+                await self._generate(reader, writer, request, parse_qs(url.query))
+            else:
+                raise HTTPError(404, f"no route for {url.path}")
+        except HTTPError as e:
+            await self._send_json(writer, e.status, {'error': e.message}, e.headers)
+            if request is not None and not request.body_read:
+                await self._discard_body(reader, request)
+        except (ConnectionError, asyncio.IncompleteReadError):
+            pass
+        except Exception as e:
+            print(f"[ERROR] API request failed: {e}")
+            await self._send_json(writer, 500, {'error': str(e)})
+        finally:
+            try:
+                writer.close()
+                await writer.wait_closed()
+            except ConnectionError:
+                pass
+
+    # ---------------------------------------------------------------- generation
+
+    async def _generate(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter,
+                        request: Request, query: Dict[str, list]) -> None:
+        # Backpressure before reading the body: a full server costs the client nothing
+        if self._admitted >= self.capacity:
+            self._rejected += 1
+            raise HTTPError(429, "generation queue is full", {'Retry-After': '5'})
+
+        self._admitted += 1
+        work_dir = Path(tempfile.mkdtemp(prefix='bill_api_', dir=self.work_dir))
+        render = None
+        try:
+            body = await self._read_body(reader, request)
+            filename = query.get('filename', [None])[0]
+            content_type = request.headers.get('content-type', '')
+            loop = asyncio.get_running_loop()
+            if content_type.startswith('multipart/form-data'):
+                # Parsing a large body would stall every other connection on the loop
+                body, part_name = await loop.run_in_executor(None, _extract_multipart, content_type, body)
+                filename = filename or part_name
+            if not body:
+                raise HTTPError(400, "empty upload")
+            filename = Path(filename or 'bill.xlsx').name
+            options = {name: _flag(query[name][0]) if name in query else default
+                       for name, default in OPTION_FLAGS.items()}
+
+            input_path = work_dir / f"input{Path(filename).suffix or '.xlsx'}"
+            input_path.write_bytes(body)
+            del body
+
+            started = time.perf_counter()
+            render = loop.run_in_executor(
+                self._executor, render_upload,
+                str(input_path), str(work_dir), Path(filename).stem, options
+            )
+            try:
+                # shield: a timeout answers the client but cannot stop the worker
+                result_path, doc_count, errors = await asyncio.wait_for(
+                    asyncio.shield(render), timeout=self.request_timeout
+                )
+            except asyncio.TimeoutError:
+                raise HTTPError(504, f"generation exceeded {self.request_timeout}s")
+            except HTTPError:
+                raise
+            except Exception as e:
+                raise HTTPError(422, f"could not generate documents: {e}")
+
+            await self._stream_file(writer, Path(result_path), {
+                'Content-Type': 'application/zip',
+                'Content-Disposition': _content_disposition(Path(filename).stem),
+                'X-Documents': str(doc_count),
+                'X-Failed-Renders': str(len(errors)),
+                'X-Render-Seconds': f"{time.perf_counter() - started:.2f}",
+            })
+            self._served += 1
+        finally:
+            if render is not None and not render.done():
+                # The worker is still writing into work_dir and still occupies a slot
+                render.add_done_callback(lambda future: self._release(work_dir, future))
+            else:
+                self._release(work_dir, render)
+
+    def _release(self, work_dir: Path, render: Optional[asyncio.Future]) -> None:
+        """Free the request's slot and temp folder once its render has finished"""
+        if render is not None and not render.cancelled():
+            # Mark a late failure as retrieved; the client already had its 504
+            render.exception()
+        self._admitted -= 1
+        shutil.rmtree(work_dir, ignore_errors=True)
+
+    def health(self) -> Dict[str, Any]:
+        """Load snapshot for monitoring and client-side throttling"""
+        return {
+            'status': 'ok',
+            'in_flight': self._admitted,
+            'capacity': self.capacity,
+            'max_concurrent': self.max_concurrent,
+            'served': self._served,
+            'rejected': self._rejected,
+        }
+
+
+async def serve(server: BillAPIServer, host: str, port: int) -> None:
+    """Run until cancelled"""
+    await server.start(host, port)
+    print(f"[INFO] Bill API listening on http://{host}:{server.port} "
+          f"({server.max_concurrent} workers, queue {server.max_queue})")
+    try:
+        await asyncio.Event().wait()
+    finally:
+        await server.close()
+
+
+def main(argv: Optional[list] = None) -> int:
+    """Command-line entry point"""
+    from core.config.config_loader import ConfigLoader
+
+    parser = argparse.ArgumentParser(description="Headless bill generation API")
+    parser.add_argument('--config', default=os.environ.get('BILL_CONFIG', 'config/v01.json'))
+    parser.add_argument('--host')
+    parser.add_argument('--port', type=int)
+    parser.add_argument('--workers', type=int, help="Concurrent renders (worker processes)")
+    parser.add_argument('--queue', type=int, help="Requests allowed to wait before 429")
+    args = parser.parse_args(argv)
+
+    config = ConfigLoader.load_from_file(args.config)
+    if not config.features.api_access:
+        print("[ERROR] API access is disabled; set features.api_access or FEATURE_API_ACCESS=true")
+        return 1
+
+    server = BillAPIServer(
+        max_concurrent=args.workers or config.api.max_concurrent,
+        max_queue=config.api.max_queue if args.queue is None else args.queue,
+        request_timeout=config.api.request_timeout_seconds,
+        max_upload_mb=config.processing.max_file_size_mb,
+        pdf_engine=config.processing.pdf_engine,
+    )
+    try:
+        asyncio.run(serve(server, args.host or config.api.host, args.port or config.api.port))
+    except KeyboardInterrupt:
+        pass
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,673 @@
+"""
+Background Job Queue
+Runs bill generation (parse → HTML → PDF/DOCX → ZIP) in worker processes
+so the Streamlit script only submits work and polls for progress.
+
+Jobs are persisted in SQLite: every session and every rerun sees the same
+queue, a rerun never restarts a job, and artefacts stay on disk until the
+job is purged.
+"""
+
+import json
+import logging
+import os
+import pickle
+import shutil
+import socket
+import sqlite3
+import threading
+import time
+import traceback
+import uuid
+from concurrent.futures import Future, ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from dataclasses import dataclass, field
+from datetime import datetime
+from multiprocessing import get_context
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Tuple, Union
+
+from core.batch.job_runner_enterprise import JobStatus
+
+
+logger = logging.getLogger(__name__)
+
+
+# ============================================================================
+# CONSTANTS
+# ============================================================================
+
+DEFAULT_QUEUE_DIR = ".job_queue"
+DEFAULT_JOB_WORKERS = 2
+DISPATCH_POLL_SECONDS = 1.0
+RESULT_ZIP_NAME = "result.zip"
+PARSED_BILL_DIR = "bill"
+# A running job belongs to the dispatcher that claimed it while its lease is
+# renewed; other server processes requeue it only once the lease has expired
+JOB_LEASE_SECONDS = 60.0
+
+FINISHED_STATUSES = (JobStatus.SUCCESS, JobStatus.FAILED, JobStatus.PARTIAL, JobStatus.CANCELLED)
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS jobs (
+    id TEXT PRIMARY KEY,
+    kind TEXT NOT NULL,
+    label TEXT NOT NULL,
+    status TEXT NOT NULL,
+    progress REAL NOT NULL DEFAULT 0,
+    message TEXT NOT NULL DEFAULT '',
+    options TEXT NOT NULL DEFAULT '{}',
+    input_path TEXT NOT NULL,
+    job_dir TEXT NOT NULL,
+    result_path TEXT,
+    error TEXT,
+    created_at REAL NOT NULL,
+    started_at REAL,
+    finished_at REAL,
+    owner TEXT,
+    lease_until REAL
+);
+CREATE INDEX IF NOT EXISTS jobs_status_created ON jobs (status, created_at);
+"""
+
+# Columns added after the first release, for databases created before them
+_MIGRATIONS = {
+    'owner': "ALTER TABLE jobs ADD COLUMN owner TEXT",
+    'lease_until': "ALTER TABLE jobs ADD COLUMN lease_until REAL",
+}
+
+
+# ============================================================================
+# DATA CLASSES
+# ============================================================================
+
+@dataclass
+class QueuedJob:
+    """Snapshot of one row of the job table."""
+    job_id: str
+    kind: str
+    label: str
+    status: JobStatus
+    progress: float = 0.0
+    message: str = ""
+    options: Dict[str, Any] = field(default_factory=dict)
+    input_path: str = ""
+    job_dir: str = ""
+    result_path: Optional[str] = None
+    error: Optional[str] = None
+    created_at: float = 0.0
+    started_at: Optional[float] = None
+    finished_at: Optional[float] = None
+
+    @property
+    def finished(self) -> bool:
+        return self.status in FINISHED_STATUSES
+
+    @property
+    def duration_seconds(self) -> Optional[float]:
+        if self.started_at is None:
+            return None
+        return (self.finished_at or time.time()) - self.started_at
+
+    def artefacts(self) -> List[Path]:
+        """Generated files (excluding the result ZIP)"""
+        out_dir = Path(self.job_dir) / "output"
+        if not out_dir.exists():
+            return []
+        return sorted(p for p in out_dir.rglob("*") if p.is_file())
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            'job_id': self.job_id,
+            'kind': self.kind,
+            'label': self.label,
+            'status': self.status.value,
+            'progress': self.progress,
+            'message': self.message,
+            'result_path': self.result_path,
+            'error': self.error,
+            'created_at': datetime.fromtimestamp(self.created_at).isoformat(),
+            'duration_seconds': self.duration_seconds,
+        }
+
+
+# ============================================================================
+# SQLITE STORE
+# ============================================================================
+
+def _connect(db_path: Union[str, Path]) -> sqlite3.Connection:
+    conn = sqlite3.connect(str(db_path), timeout=30, isolation_level=None)
+    conn.row_factory = sqlite3.Row
+    conn.execute("PRAGMA journal_mode=WAL")
+    conn.execute("PRAGMA synchronous=NORMAL")
+    return conn
+
+
+def _row_to_job(row: sqlite3.Row) -> QueuedJob:
+    return QueuedJob(
+        job_id=row['id'],
+        kind=row['kind'],
+        label=row['label'],
+        status=JobStatus(row['status']),
+        progress=row['progress'],
+        message=row['message'],
+        options=json.loads(row['options']),
+        input_path=row['input_path'],
+        job_dir=row['job_dir'],
+        result_path=row['result_path'],
+        error=row['error'],
+        created_at=row['created_at'],
+        started_at=row['started_at'],
+        finished_at=row['finished_at'],
+    )
+
+
+def _update_job(db_path: Union[str, Path], job_id: str, **fields) -> None:
+    columns = ", ".join(f"{name} = ?" for name in fields)
+    conn = _connect(db_path)
+    try:
+        conn.execute(f"UPDATE jobs SET {columns} WHERE id = ?", (*fields.values(), job_id))
+    finally:
+        conn.close()
+
+
+# ============================================================================
+# WORKER (runs in a child process)
+# ============================================================================
+
+def _load_job_input(kind: str, input_path: Path, keep_parsed: bool = False) -> Dict[str, Any]:
+    """
+    Parsed bill data for a job
+
+    Args:
+        kind: 'workbook' or 'data'
+        input_path: Job input file
+        keep_parsed: Save a parsed workbook as a bill folder next to the input
+            (queue jobs, which may be requeued; one-shot API requests skip it)
+    """
+    if kind == 'workbook':
+        from core.processors.bill_store import is_bill_store, load_bill, save_bill
+        # A requeued job renders from the bill saved on its first run, skipping Excel
+        bill_dir = input_path.parent / PARSED_BILL_DIR
+        if is_bill_store(bill_dir):
+            return load_bill(bill_dir)
+        from core.processors.excel_processor import ExcelProcessor
+        with open(input_path, 'rb') as f:
+            processed_data = ExcelProcessor(columnar=True).process_excel(f)
+        if keep_parsed:
+            try:
+                save_bill(processed_data, bill_dir)
+            except Exception as e:
+                logger.warning(f"Could not save parsed bill for {input_path.parent.name}: {e}")
+        return processed_data
+    with open(input_path, 'rb') as f:
+        return pickle.load(f)
+
+
+def build_package(kind: str, input_path: Union[str, Path], job_dir: Union[str, Path],
+                  label: str, options: Optional[Dict[str, Any]] = None,
+                  progress: Optional[Callable[[float, str], None]] = None) -> Tuple[Path, int, List[str]]:
+    """
+    Parse, render and package one bill
+
+    Args:
+        kind: 'workbook' (Excel file) or 'data' (pickled bill data)
+        input_path: Job input file
+        job_dir: Folder receiving output/ and the result ZIP
+        label: Bill label (OUTPUT subfolder name when saving)
+        options: html/pdf/docx/native_pdf/save_to_output/save_bill flags
+            (save_bill keeps the parsed workbook for a rerun)
+        progress: Optional callback(fraction, message)
+
+    Returns:
+        Tuple of (result ZIP path, document count, failed render messages)
+    """
+    options = options or {}
+    progress = progress or (lambda fraction, message: None)
+    job_dir = Path(job_dir)
+    out_dir = job_dir / "output"
+    out_dir.mkdir(parents=True, exist_ok=True)
+
+    progress(0.05, "Parsing workbook" if kind == 'workbook' else "Preparing data")
+    processed_data = _load_job_input(kind, Path(input_path), keep_parsed=options.get('save_bill', False))
+
+    progress(0.2, "Generating HTML")
+    from core.generators.document_generator import DocumentGenerator
+    doc_gen = DocumentGenerator(processed_data)
+    html_documents = doc_gen.generate_all_documents()
+    template_data = doc_gen.html_generator.template_data
+
+    output_mgr = None
+    if options.get('save_to_output'):
+        from core.utils.output_manager import get_output_manager
+        output_mgr = get_output_manager()
+        output_mgr.set_source_file(label)
+
+    def store(content: Union[str, bytes], doc_name: str, fmt: str, subdir: str) -> None:
+        target = out_dir / subdir
+        target.mkdir(exist_ok=True)
+        data = content.encode('utf-8') if isinstance(content, str) else content
+        (target / f"{doc_name}.{fmt}").write_bytes(data)
+        if output_mgr:
+            output_mgr.save_file(data, doc_name, fmt)
+
+    if options.get('html', True):
+        for doc_name, html_content in html_documents.items():
+            store(html_content, doc_name, 'html', 'html')
+
+    from core.generators.render_pool import get_render_pool
+    futures = get_render_pool().submit_bill(
+        label, html_documents, template_data,
+        pdf=options.get('pdf', True), docx=options.get('docx', True),
+        native_pdf=options.get('native_pdf', False)
+    )
+    errors = []
+    for done, result in enumerate(get_render_pool().iter_completed(futures), 1):
+        if result.success:
+            store(result.content, result.doc_name, result.fmt, 'word' if result.fmt == 'docx' else result.fmt)
+        else:
+            errors.append(f"{result.doc_name} ({result.fmt}): {result.error}")
+        progress(0.2 + 0.7 * done / len(futures), f"Rendered {done}/{len(futures)} documents")
+
+    progress(0.95, "Packaging ZIP")
+    from core.utils.streaming_zip import StreamingZipWriter
+    result_path = job_dir / RESULT_ZIP_NAME
+    with open(result_path, 'wb') as f:
+        with StreamingZipWriter(f) as writer:
+            for path in sorted(p for p in out_dir.rglob("*") if p.is_file()):
+                writer.add_file(path, path.relative_to(out_dir).as_posix())
+
+    return result_path, len(html_documents), errors
+
+
+def run_generation_job(db_path: str, job_id: str) -> str:
+    """
+    Execute one generation job and record the outcome
+
+    Module-level so it can be pickled into a worker process.
+
+    Args:
+        db_path: Path to the queue database
+        job_id: Job to run (already marked running by the dispatcher)
+
+    Returns:
+        Final status value
+    """
+    conn = _connect(db_path)
+    try:
+        row = conn.execute("SELECT * FROM jobs WHERE id = ?", (job_id,)).fetchone()
+    finally:
+        conn.close()
+    job = _row_to_job(row)
+
+    def progress(fraction: float, message: str) -> None:
+        _update_job(db_path, job_id, progress=round(fraction, 3), message=message)
+
+    try:
+        result_path, doc_count, errors = build_package(
+            job.kind, job.input_path, job.job_dir, job.label, {**job.options, 'save_bill': True}, progress
+        )
+        status = JobStatus.PARTIAL if errors else JobStatus.SUCCESS
+        _update_job(
+            db_path, job_id, status=status.value, progress=1.0,
+            message=f"{doc_count} documents ready",
+            result_path=str(result_path), error="\n".join(errors) or None,
+            finished_at=time.time()
+        )
+        return status.value
+
+    except Exception as e:
+        logger.error(f"Job {job_id} failed: {e}")
+        _update_job(
+            db_path, job_id, status=JobStatus.FAILED.value, message="Failed",
+            error=f"{e}\n{traceback.format_exc()}", finished_at=time.time()
+        )
+        return JobStatus.FAILED.value
+
+
+# ============================================================================
+# QUEUE
+# ============================================================================
+
+class JobQueue:
+    """
+    SQLite-backed generation queue with a process worker pool
+
+    - submit_* stores the input under <queue_dir>/<job_id>/ and inserts a
+      pending row; nothing is rendered on the caller's thread
+    - A dispatcher thread claims pending jobs oldest-first while a worker
+      process is free, so concurrent users share the pool fairly
+    - Workers write progress straight to the database; callers poll get()
+    """
+
+    def __init__(self, queue_dir: Union[str, Path] = DEFAULT_QUEUE_DIR,
+                 max_workers: Optional[int] = None, pdf_engine: str = 'reportlab'):
+        """
+        Initialize job queue
+
+        Args:
+            queue_dir: Directory for the database and job folders
+            max_workers: Worker processes (default: min(2, CPU count))
+            pdf_engine: Configured PDF engine, warmed in each worker process
+        """
+        self.queue_dir = Path(queue_dir)
+        self.queue_dir.mkdir(parents=True, exist_ok=True)
+        self.db_path = self.queue_dir / "jobs.db"
+        self.max_workers = max_workers or min(DEFAULT_JOB_WORKERS, os.cpu_count() or 1)
+        self.pdf_engine = pdf_engine
+        # Identifies this server process as the owner of the jobs it claims
+        self.owner = f"{socket.gethostname()}:{os.getpid()}:{uuid.uuid4().hex[:8]}"
+
+        conn = _connect(self.db_path)
+        try:
+            conn.executescript(_SCHEMA)
+            columns = {row['name'] for row in conn.execute("PRAGMA table_info(jobs)")}
+            for column, statement in _MIGRATIONS.items():
+                if column not in columns:
+                    conn.execute(statement)
+        finally:
+            conn.close()
+
+        self._executor: Optional[ProcessPoolExecutor] = None
+        self._in_flight: Dict[str, Future] = {}
+        self._lock = threading.Lock()
+        self._wake = threading.Event()
+        self._stop = threading.Event()
+        self._dispatcher: Optional[threading.Thread] = None
+
+    # ---------------------------------------------------------------- submit
+
+    def _insert(self, kind: str, label: str, payload: bytes, suffix: str,
+                options: Optional[Dict[str, Any]]) -> str:
+        job_id = uuid.uuid4().hex
+        job_dir = self.queue_dir / job_id
+        job_dir.mkdir(parents=True)
+        input_path = job_dir / f"input{suffix}"
+        input_path.write_bytes(payload)
+
+        conn = _connect(self.db_path)
+        try:
+            conn.execute(
+                "INSERT INTO jobs (id, kind, label, status, options, input_path, job_dir, created_at) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                (job_id, kind, label, JobStatus.PENDING.value, json.dumps(options or {}),
+                 str(input_path), str(job_dir), time.time())
+            )
+        finally:
+            conn.close()
+
+        self.start()
+        self._wake.set()
+        return job_id
+
+    def submit_workbook(self, content: bytes, filename: str,
+                        options: Optional[Dict[str, Any]] = None) -> str:
+        """
+        Queue generation from an uploaded workbook
+
+        Args:
+            content: Workbook bytes
+            filename: Original file name (its stem labels the job and bill folder)
+            options: html/pdf/docx/native_pdf/save_to_output flags
+
+        Returns:
+            Job ID
+        """
+        suffix = Path(filename).suffix or '.xlsx'
+        return self._insert('workbook', Path(filename).stem, content, suffix, options)
+
+    def submit_data(self, data: Dict[str, Any], label: str,
+                    options: Optional[Dict[str, Any]] = None) -> str:
+        """
+        Queue generation from already prepared bill data (e.g. hybrid edits)
+
+        Args:
+            data: Dict accepted by DocumentGenerator
+            label: Job / bill folder label
+            options: html/pdf/docx/native_pdf/save_to_output flags
+
+        Returns:
+            Job ID
+        """
+        payload = pickle.dumps(data, protocol=pickle.HIGHEST_PROTOCOL)
+        return self._insert('data', label, payload, '.pkl', options)
+
+    # ---------------------------------------------------------------- query
+
+    def get(self, job_id: str) -> Optional[QueuedJob]:
+        """Current state of a job (None if unknown)"""
+        conn = _connect(self.db_path)
+        try:
+            row = conn.execute("SELECT * FROM jobs WHERE id = ?", (job_id,)).fetchone()
+        finally:
+            conn.close()
+        return _row_to_job(row) if row else None
+
+    def list_jobs(self, status: Optional[JobStatus] = None, limit: int = 50) -> List[QueuedJob]:
+        """Most recent jobs first"""
+        query = "SELECT * FROM jobs"
+        params: tuple = ()
+        if status is not None:
+            query += " WHERE status = ?"
+            params = (status.value,)
+        query += " ORDER BY created_at DESC LIMIT ?"
+        conn = _connect(self.db_path)
+        try:
+            rows = conn.execute(query, params + (limit,)).fetchall()
+        finally:
+            conn.close()
+        return [_row_to_job(row) for row in rows]
+
+    def queue_position(self, job_id: str) -> int:
+        """Number of pending jobs ahead of this one (0 once running)"""
+        conn = _connect(self.db_path)
+        try:
+            row = conn.execute(
+                "SELECT COUNT(*) FROM jobs WHERE status = ? AND created_at < "
+                "(SELECT created_at FROM jobs WHERE id = ? AND status = ?)",
+                (JobStatus.PENDING.value, job_id, JobStatus.PENDING.value)
+            ).fetchone()
+        finally:
+            conn.close()
+        return row[0]
+
+    def counts(self) -> Dict[str, int]:
+        """Jobs per status"""
+        conn = _connect(self.db_path)
+        try:
+            rows = conn.execute("SELECT status, COUNT(*) FROM jobs GROUP BY status").fetchall()
+        finally:
+            conn.close()
+        return {status: count for status, count in rows}
+
+    # ---------------------------------------------------------------- control
+
+    def cancel(self, job_id: str) -> bool:
+        """
+        Cancel a job that has not started yet
+
+        Returns:
+            True if the job was pending and is now cancelled
+        """
+        conn = _connect(self.db_path)
+        try:
+            cursor = conn.execute(
+                "UPDATE jobs SET status = ?, message = 'Cancelled', finished_at = ? "
+                "WHERE id = ? AND status = ?",
+                (JobStatus.CANCELLED.value, time.time(), job_id, JobStatus.PENDING.value)
+            )
+        finally:
+            conn.close()
+        return cursor.rowcount == 1
+
+    def purge(self, job_id: str) -> None:
+        """Delete a finished job and its files"""
+        job = self.get(job_id)
+        if job is None or not job.finished:
+            return
+        shutil.rmtree(job.job_dir, ignore_errors=True)
+        conn = _connect(self.db_path)
+        try:
+            conn.execute("DELETE FROM jobs WHERE id = ?", (job_id,))
+        finally:
+            conn.close()
+
+    def purge_finished(self, max_age_hours: float = 24) -> int:
+        """
+        Delete finished jobs older than max_age_hours
+
+        Returns:
+            Number of jobs removed
+        """
+        cutoff = time.time() - max_age_hours * 3600
+        removed = 0
+        for job in self.list_jobs(limit=10_000):
+            if job.finished and (job.finished_at or job.created_at) < cutoff:
+                self.purge(job.job_id)
+                removed += 1
+        return removed
+
+    def _claim_next(self) -> Optional[str]:
+        """Atomically move the oldest pending job to running, leased to this queue"""
+        conn = _connect(self.db_path)
+        try:
+            # Plain SELECT + UPDATE in a write transaction (UPDATE ... RETURNING needs SQLite 3.35)
+            conn.execute("BEGIN IMMEDIATE")
+            try:
+                row = conn.execute(
+                    "SELECT id FROM jobs WHERE status = ? ORDER BY created_at LIMIT 1",
+                    (JobStatus.PENDING.value,)
+                ).fetchone()
+                if row is not None:
+                    now = time.time()
+                    conn.execute(
+                        "UPDATE jobs SET status = ?, started_at = ?, message = 'Starting', "
+                        "owner = ?, lease_until = ? WHERE id = ?",
+                        (JobStatus.RUNNING.value, now, self.owner, now + JOB_LEASE_SECONDS, row['id'])
+                    )
+                conn.execute("COMMIT")
+            except Exception:
+                conn.execute("ROLLBACK")
+                raise
+        finally:
+            conn.close()
+        return row['id'] if row else None
+
+    def _renew_leases(self) -> None:
+        """Heartbeat: extend the lease on every job this queue is running"""
+        conn = _connect(self.db_path)
+        try:
+            conn.execute(
+                "UPDATE jobs SET lease_until = ? WHERE owner = ? AND status = ?",
+                (time.time() + JOB_LEASE_SECONDS, self.owner, JobStatus.RUNNING.value)
+            )
+        finally:
+            conn.close()
+
+    def _recover_interrupted(self) -> int:
+        """Requeue running jobs whose owner stopped renewing their lease"""
+        conn = _connect(self.db_path)
+        try:
+            cursor = conn.execute(
+                "UPDATE jobs SET status = ?, progress = 0, message = 'Requeued (worker stopped)', "
+                "started_at = NULL, owner = NULL, lease_until = NULL "
+                "WHERE status = ? AND (lease_until IS NULL OR lease_until < ?)",
+                (JobStatus.PENDING.value, JobStatus.RUNNING.value, time.time())
+            )
+        finally:
+            conn.close()
+        return cursor.rowcount
+
+    def _on_done(self, job_id: str, future: Future) -> None:
+        with self._lock:
+            self._in_flight.pop(job_id, None)
+        error = future.exception()
+        if error is not None:
+            # The worker process died (e.g. out of memory); the job could not record it
+            _update_job(
+                self.db_path, job_id, status=JobStatus.FAILED.value, message="Worker crashed",
+                error=repr(error), finished_at=time.time()
+            )
+            if isinstance(error, BrokenProcessPool):
+                with self._lock:
+                    self._executor = None
+        self._wake.set()
+
+    def _dispatch_loop(self) -> None:
+        while not self._stop.is_set():
+            self._renew_leases()
+            recovered = self._recover_interrupted()
+            if recovered:
+                logger.info(f"Requeued {recovered} interrupted job(s)")
+            with self._lock:
+                free = self.max_workers - len(self._in_flight)
+            while free > 0:
+                job_id = self._claim_next()
+                if job_id is None:
+                    break
+                with self._lock:
+                    if self._executor is None:
+                        # spawn: forking a process that runs Streamlit's threads is unsafe
+                        from core.utils.warmup import warm_worker
+                        self._executor = ProcessPoolExecutor(
+                            max_workers=self.max_workers, mp_context=get_context('spawn'),
+                            initializer=warm_worker, initargs=(self.pdf_engine,)
+                        )
+                    future = self._executor.submit(run_generation_job, str(self.db_path), job_id)
+                    self._in_flight[job_id] = future
+                future.add_done_callback(lambda f, j=job_id: self._on_done(j, f))
+                free -= 1
+            # Poll as well, so jobs queued by other server processes are picked up
+            self._wake.wait(DISPATCH_POLL_SECONDS)
+            self._wake.clear()
+
+    def start(self) -> None:
+        """Start the dispatcher (idempotent)"""
+        with self._lock:
+            if self._dispatcher is not None and self._dispatcher.is_alive():
+                return
+            self._stop.clear()
+            self._dispatcher = threading.Thread(target=self._dispatch_loop, name="job-dispatcher", daemon=True)
+            self._dispatcher.start()
+
+    def wait(self, job_id: str, timeout: float = 300, poll: float = 0.2) -> Optional[QueuedJob]:
+        """Block until a job finishes (for CLI use and tests)"""
+        deadline = time.time() + timeout
+        while time.time() < deadline:
+            job = self.get(job_id)
+            if job is None or job.finished:
+                return job
+            time.sleep(poll)
+        return self.get(job_id)
+
+    def shutdown(self, wait: bool = True) -> None:
+        """Stop dispatching and shut the worker pool down"""
+        self._stop.set()
+        self._wake.set()
+        if self._dispatcher is not None:
+            self._dispatcher.join(timeout=5)
+        with self._lock:
+            executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown(wait=wait)
+
+
+# Global instance
+_job_queue = None
+_job_queue_lock = threading.Lock()
+
+def get_job_queue(pdf_engine: Optional[str] = None) -> JobQueue:
+    """
+    Get global job queue instance
+
+    Args:
+        pdf_engine: Configured PDF engine (applies to worker pools started from now on)
+    """
+    global _job_queue
+    with _job_queue_lock:
+        if _job_queue is None:
+            _job_queue = JobQueue(pdf_engine=pdf_engine or 'reportlab')
+            _job_queue.start()
+        elif pdf_engine:
+            _job_queue.pdf_engine = pdf_engine
+    return _job_queue
@@ -8,12 +8,12 @@ Standards: Fault tolerance, Progress tracking, Comprehensive reporting
 
 import logging
 import json
-from dataclasses import dataclass, field, asdict
+from dataclasses import dataclass, field
 from datetime import datetime
 from enum import Enum
 from pathlib import Path
-from typing import Any, Callable, Dict, List, Optional, Union
-from concurrent.futures import ThreadPoolExecutor, as_completed
+from typing import Any, Callable, Dict, Iterable, List, Optional, Union
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
 import time
 import traceback
 
@@ -56,6 +56,9 @@ DEFAULT_MAX_RETRIES = 3
 DEFAULT_RETRY_DELAY = 1.0  # seconds
 DEFAULT_TIMEOUT = 300  # seconds per record
 
+# Records in flight per worker when records arrive lazily
+PARALLEL_WINDOW_PER_WORKER = 2
+
 
 # ============================================================================
 # DATA CLASSES
@@ -78,9 +81,26 @@ class BatchConfig:
     continue_on_error: bool = True
     retry_policy: RetryPolicy = field(default_factory=RetryPolicy)
     save_intermediate: bool = True
+    save_bills: bool = False  # Also save each record's parsed bill ('data') as a bill folder
     output_dir: Path = field(default_factory=lambda: Path("OUTPUT/batch"))
 
 
+def _json_safe(value: Any) -> Any:
+    """Reduce a record payload to JSON types without copying large tables."""
+    if isinstance(value, (str, int, float, bool)) or value is None:
+        return value
+    if isinstance(value, dict):
+        return {str(k): _json_safe(v) for k, v in value.items()}
+    if isinstance(value, (list, tuple)):
+        return [_json_safe(v) for v in value]
+    if hasattr(value, 'shape') and hasattr(value, 'columns'):
+        # DataFrame (e.g. a parsed bill sheet)
+        return {'rows': int(value.shape[0]), 'columns': [str(c) for c in value.columns]}
+    if isinstance(value, Enum):
+        return value.value
+    return str(value)
+
+
 @dataclass
 class RecordResult:
     """Result of processing a single record."""
@@ -95,8 +115,8 @@ class RecordResult:
     timestamp: str = field(default_factory=lambda: datetime.now().isoformat())
     
     def to_dict(self) -> Dict[str, Any]:
-        """Convert to dictionary."""
-        data = asdict(self)
+        """Convert to dictionary (JSON-safe; DataFrames are summarised, not copied)."""
+        data = {name: _json_safe(getattr(self, name)) for name in self.__dataclass_fields__}
         data['status'] = self.status.value
         return data
 
@@ -119,7 +139,10 @@ class JobResult:
     
     def to_dict(self) -> Dict[str, Any]:
         """Convert to dictionary."""
-        data = asdict(self)
+        data = {
+            name: _json_safe(getattr(self, name))
+            for name in self.__dataclass_fields__ if name != 'record_results'
+        }
         data['status'] = self.status.value
         data['record_results'] = [r.to_dict() for r in self.record_results]
         return data
@@ -181,7 +204,7 @@ class BatchJobRunner:
     
     def run_batch(
         self,
-        records: List[Dict[str, Any]],
+        records: Iterable[Dict[str, Any]],
         process_func: Callable[[Dict[str, Any]], Dict[str, Any]],
         record_id_key: str = "id"
     ) -> JobResult:
@@ -189,7 +212,8 @@ class BatchJobRunner:
         Run batch processing job.
         
         Args:
-            records: List of records to process
+            records: Records to process (a list, or a lazy iterable such as
+                ExcelProcessor.iter_bills; lazy records are pulled as workers free up)
             process_func: Function to process each record
             record_id_key: Key to extract record ID
             
@@ -197,19 +221,20 @@ class BatchJobRunner:
             JobResult with comprehensive results
         """
         start_time = datetime.now()
+        total = len(records) if hasattr(records, '__len__') else None
         
         # Initialize job result
         job_result = JobResult(
             job_id=self.job_id,
             status=JobStatus.RUNNING,
-            total_records=len(records),
+            total_records=total or 0,
             successful_records=0,
             failed_records=0,
             skipped_records=0,
             start_time=start_time.isoformat()
         )
         
-        logger.info(f"Starting batch job: {self.job_id} ({len(records)} records)")
+        logger.info(f"Starting batch job: {self.job_id} ({total if total is not None else '?'} records)")
         
         # Process records
         if self.config.max_workers > 1:
@@ -224,6 +249,7 @@ class BatchJobRunner:
             )
         
         # Calculate statistics
+        job_result.total_records = len(job_result.record_results)
         for record_result in job_result.record_results:
             if record_result.status == RecordStatus.SUCCESS:
                 job_result.successful_records += 1
@@ -263,16 +289,17 @@ class BatchJobRunner:
     
     def _process_sequential(
         self,
-        records: List[Dict[str, Any]],
+        records: Iterable[Dict[str, Any]],
         process_func: Callable,
         record_id_key: str
     ) -> List[RecordResult]:
         """Process records sequentially."""
         results = []
+        total = len(records) if hasattr(records, '__len__') else '?'
         
         for idx, record in enumerate(records, 1):
             record_id = str(record.get(record_id_key, f"record_{idx}"))
-            logger.info(f"Processing {idx}/{len(records)}: {record_id}")
+            logger.info(f"Processing {idx}/{total}: {record_id}")
             
             result = self._process_single_record(
                 record_id, record, process_func
@@ -287,48 +314,68 @@ class BatchJobRunner:
     
     def _process_parallel(
         self,
-        records: List[Dict[str, Any]],
+        records: Iterable[Dict[str, Any]],
         process_func: Callable,
         record_id_key: str
     ) -> List[RecordResult]:
-        """Process records in parallel."""
+        """
+        Process records in parallel.
+        
+        At most max_workers * PARALLEL_WINDOW_PER_WORKER records are in
+        flight, so a lazy iterable is never drained ahead of the workers.
+        """
         results = []
+        total = len(records) if hasattr(records, '__len__') else '?'
+        window = self.config.max_workers * PARALLEL_WINDOW_PER_WORKER
         
         with ThreadPoolExecutor(max_workers=self.config.max_workers) as executor:
-            # Submit all tasks
             future_to_record = {}
-            for idx, record in enumerate(records, 1):
-                record_id = str(record.get(record_id_key, f"record_{idx}"))
-                future = executor.submit(
-                    self._process_single_record,
-                    record_id,
-                    record,
-                    process_func
-                )
-                future_to_record[future] = (idx, record_id)
+            pending = enumerate(records, 1)
+            exhausted = False
             
-            # Collect results as they complete
-            for future in as_completed(future_to_record):
-                idx, record_id = future_to_record[future]
-                try:
-                    result = future.result(timeout=self.config.timeout_per_record)
-                    results.append(result)
-                    logger.info(f"Completed {idx}/{len(records)}: {record_id}")
-                    
-                    # Save intermediate results
-                    if self.config.save_intermediate:
-                        self._save_record_result(result)
-                        
-                except Exception as e:
-                    logger.error(f"Future failed for {record_id}: {e}")
-                    # Create failed result
-                    result = RecordResult(
-                        record_id=record_id,
-                        status=RecordStatus.FAILED,
-                        input_data={},
-                        error_message=f"Future execution failed: {e}"
+            while future_to_record or not exhausted:
+                # Top up the window
+                while not exhausted and len(future_to_record) < window:
+                    try:
+                        idx, record = next(pending)
+                    except StopIteration:
+                        exhausted = True
+                        break
+                    record_id = str(record.get(record_id_key, f"record_{idx}"))
+                    future = executor.submit(
+                        self._process_single_record,
+                        record_id,
+                        record,
+                        process_func
                     )
-                    results.append(result)
+                    future_to_record[future] = (idx, record_id)
+                
+                if not future_to_record:
+                    break
+                
+                # Collect results as they complete
+                done, _ = wait(future_to_record, return_when=FIRST_COMPLETED)
+                for future in done:
+                    idx, record_id = future_to_record.pop(future)
+                    try:
+                        result = future.result(timeout=self.config.timeout_per_record)
+                        results.append(result)
+                        logger.info(f"Completed {idx}/{total}: {record_id}")
+                        
+                        # Save intermediate results
+                        if self.config.save_intermediate:
+                            self._save_record_result(result)
+                            
+                    except Exception as e:
+                        logger.error(f"Future failed for {record_id}: {e}")
+                        # Create failed result
+                        result = RecordResult(
+                            record_id=record_id,
+                            status=RecordStatus.FAILED,
+                            input_data={},
+                            error_message=f"Future execution failed: {e}"
+                        )
+                        results.append(result)
         
         # Sort results by original order
         return results
@@ -421,6 +468,12 @@ class BatchJobRunner:
             output_file = output_dir / f"{result.record_id}.json"
             with open(output_file, 'w', encoding='utf-8') as f:
                 json.dump(result.to_dict(), f, indent=2)
+            
+            # JSON only summarises DataFrames; the bill folder keeps them for re-rendering
+            bill_data = result.input_data.get('data') if isinstance(result.input_data, dict) else None
+            if self.config.save_bills and isinstance(bill_data, dict):
+                from core.processors.bill_store import save_bill
+                save_bill(bill_data, output_dir / f"{result.record_id}.bill")
                 
         except Exception as e:
             logger.error(f"Failed to save record result {result.record_id}: {e}")
@@ -483,7 +536,7 @@ class BatchJobRunner:
 # ============================================================================
 
 def run_batch_job(
-    records: List[Dict[str, Any]],
+    records: Iterable[Dict[str, Any]],
     process_func: Callable,
     config: Optional[BatchConfig] = None,
     **kwargs
@@ -492,7 +545,7 @@ def run_batch_job(
     Convenience function to run batch job.
     
     Args:
-        records: List of records to process
+        records: Records to process (list or lazy iterable)
         process_func: Processing function
         config: Batch configuration
         **kwargs: Additional arguments for BatchJobRunner
@@ -37,6 +37,10 @@ class Config:
         # Processing
         processing_dict = config_dict.get('processing', {})
         self.processing = Processing(processing_dict)
+        
+        # HTTP API (only served when features.api_access is enabled)
+        api_dict = config_dict.get('api', {})
+        self.api = API(api_dict)
 
 
 class Features:
@@ -121,6 +125,7 @@ class Processing:
         self.pdf_engine = processing_dict.get('pdf_engine', 'reportlab')
         self.auto_clean_cache = processing_dict.get('auto_clean_cache', False)
         self.enable_macro_sheets = processing_dict.get('enable_macro_sheets', True)  # NEW: Enable macro sheets by default
+        self.warm_startup = processing_dict.get('warm_startup', True)
         
         # Override with environment variables if available
         self.max_file_size_mb = int(os.getenv('PROCESSING_MAX_FILE_SIZE_MB', self.max_file_size_mb))
@@ -128,6 +133,7 @@ class Processing:
         self.pdf_engine = os.getenv('PROCESSING_PDF_ENGINE', self.pdf_engine)
         self.auto_clean_cache = self._get_bool_env('PROCESSING_AUTO_CLEAN_CACHE', self.auto_clean_cache)
         self.enable_macro_sheets = self._get_bool_env('PROCESSING_ENABLE_MACRO_SHEETS', self.enable_macro_sheets)  # NEW
+        self.warm_startup = self._get_bool_env('PROCESSING_WARM_STARTUP', self.warm_startup)
     
     def _get_bool_env(self, key: str, default: bool) -> bool:
         """Get boolean value from environment variable"""
@@ -139,6 +145,24 @@ class Processing:
         return default
 
 
+class API:
+    """Headless HTTP API configuration"""
+    
+    def __init__(self, api_dict: Dict[str, Any]):
+        self.host = api_dict.get('host', '127.0.0.1')
+        self.port = api_dict.get('port', 8502)
+        self.max_concurrent = api_dict.get('max_concurrent', 2)
+        self.max_queue = api_dict.get('max_queue', 8)
+        self.request_timeout_seconds = api_dict.get('request_timeout_seconds', 300)
+        
+        # Override with environment variables if available
+        self.host = os.getenv('API_HOST', self.host)
+        self.port = int(os.getenv('API_PORT', self.port))
+        self.max_concurrent = int(os.getenv('API_MAX_CONCURRENT', self.max_concurrent))
+        self.max_queue = int(os.getenv('API_MAX_QUEUE', self.max_queue))
+        self.request_timeout_seconds = int(os.getenv('API_REQUEST_TIMEOUT_SECONDS', self.request_timeout_seconds))
+
+
 class ConfigLoader:
     """Load configuration from JSON files"""
     
@@ -190,7 +214,15 @@ class ConfigLoader:
                 'enable_caching': True,
                 'pdf_engine': 'reportlab',
                 'auto_clean_cache': False,
-                'enable_macro_sheets': True  # NEW: Enable macro sheets by default
+                'enable_macro_sheets': True,  # NEW: Enable macro sheets by default
+                'warm_startup': True
+            },
+            'api': {
+                'host': '127.0.0.1',
+                'port': 8502,
+                'max_concurrent': 2,
+                'max_queue': 8,
+                'request_timeout_seconds': 300
             }
         }
         return Config(default_config)
@@ -1,20 +1,31 @@
 """
 Generators module - Contains all document generation classes
+
+Classes are imported on first access (PEP 562), so `import core.generators`
+stays cheap and HTML-only callers never load python-docx, bs4 or PDF engines.
 """
+import importlib
+
+# Public name -> defining submodule
+_EXPORTS = {
+    'BaseGenerator': '.base_generator',
+    'HTMLGenerator': '.html_generator',
+    'FixedPDFGenerator': '.pdf_generator_fixed',
+    'DOCGenerator': '.doc_generator',
+    'TemplateManager': '.template_manager',
+    'DocumentGenerator': '.document_generator',
+}
+
+__all__ = list(_EXPORTS)
+
+
+def __getattr__(name):
+    if name in _EXPORTS:
+        value = getattr(importlib.import_module(_EXPORTS[name], __name__), name)
+        globals()[name] = value
+        return value
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
 
-# Import all generator classes
-from .base_generator import BaseGenerator
-from .html_generator import HTMLGenerator
-from .pdf_generator_fixed import FixedPDFGenerator
-from .doc_generator import DOCGenerator
-from .template_manager import TemplateManager
-from .document_generator import DocumentGenerator
 
-__all__ = [
-    'BaseGenerator',
-    'HTMLGenerator',
-    'FixedPDFGenerator',
-    'DOCGenerator',
-    'TemplateManager',
-    'DocumentGenerator'
-]
\ No newline at end of file
+def __dir__():
+    return sorted(set(globals()) | set(__all__))
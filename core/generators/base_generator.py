@@ -2,10 +2,30 @@
 Base Generator - Base class for all document generators
 """
 import pandas as pd
-from typing import Dict, Any
+from typing import Dict, Any, Iterator
 from datetime import datetime
 from jinja2 import Environment, FileSystemLoader
+from core.processors.title_dates import lookup_title_date
 import os
+import threading
+
+TEMPLATE_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.dirname(__file__))), 'templates')
+
+_template_env = None
+_template_env_lock = threading.Lock()
+
+def get_template_environment() -> Environment:
+    """
+    Shared Jinja2 environment
+    
+    Compiled templates are cached on the environment, so every generator
+    (and the startup warm-up) reuses them instead of recompiling per bill.
+    """
+    global _template_env
+    with _template_env_lock:
+        if _template_env is None:
+            _template_env = Environment(loader=FileSystemLoader(TEMPLATE_DIR))
+    return _template_env
 
 class BaseGenerator:
     """Base class for all document generators"""
@@ -16,10 +36,13 @@ class BaseGenerator:
         self.work_order_data = data.get('work_order_data', pd.DataFrame())
         self.bill_quantity_data = data.get('bill_quantity_data', pd.DataFrame())
         self.extra_items_data = data.get('extra_items_data', pd.DataFrame())
+        # BillSchema from ExcelProcessor(columnar=True); None for untyped data
+        self.schema = data.get('schema')
+        # Title-sheet dates parsed by ExcelProcessor (parsed on demand if absent)
+        self.title_dates = data.get('title_dates') or {}
         
-        # Set up Jinja2 environment for templates
-        template_dir = os.path.join(os.path.dirname(os.path.dirname(os.path.dirname(__file__))), 'templates')
-        self.jinja_env = Environment(loader=FileSystemLoader(template_dir))
+        # Shared Jinja2 environment for templates
+        self.jinja_env = get_template_environment()
         
         # Template cache
         self._template_cache = {}
@@ -33,6 +56,38 @@ class BaseGenerator:
         except (ValueError, TypeError):
             return 0.0
     
+    def _bill_rows(self, df: pd.DataFrame, sheet_key: str) -> Iterator[Dict[str, Any]]:
+        """
+        Iterate Work Order / Bill Quantity rows as plain dicts
+        
+        Typed sheets are read column-wise through their schema; untyped
+        sheets fall back to iterrows with per-cell conversion.
+        
+        Args:
+            df: Sheet DataFrame
+            sheet_key: 'work_order_data' or 'bill_quantity_data'
+            
+        Yields:
+            Dict with item, description, unit, quantity, quantity_upto, rate, amount, bsr
+        """
+        sheet_schema = self.schema.get(sheet_key) if self.schema is not None else None
+        if sheet_schema is not None and sheet_schema.rows == len(df):
+            yield from sheet_schema.iter_rows(df)
+            return
+        
+        for _, row in df.iterrows():
+            quantity = self._safe_float(row.get('Quantity Since', row.get('Quantity', 0)))
+            yield {
+                'item': row.get('Item No.', row.get('Item', '')),
+                'description': row.get('Description', ''),
+                'unit': row.get('Unit', ''),
+                'quantity': quantity,
+                'quantity_upto': self._safe_float(row.get('Quantity Upto', quantity)),
+                'rate': self._safe_float(row.get('Rate', 0)),
+                'amount': self._safe_float(row.get('Amount', 0)),
+                'bsr': row.get('BSR', ''),
+            }
+    
     def _safe_serial_no(self, value) -> str:
         """Safely convert serial number to string"""
         if pd.isna(value) or value is None:
@@ -121,38 +176,15 @@ class BaseGenerator:
             return not self.extra_items_data.empty
         return False
     
+    def _title_date(self, *keys: str):
+        """Parsed Title-sheet date for the first key that has one (None if absent)"""
+        return lookup_title_date(self.title_dates, self.title_data, *keys)
+    
     def _calculate_delay_days(self) -> int:
         """Calculate delay days between scheduled and actual completion dates"""
         try:
-            from datetime import datetime
-            
-            # Get scheduled completion date
-            scheduled_str = self.title_data.get('St. date of completion :', '')
-            # Get actual completion date
-            actual_str = self.title_data.get('Date of actual completion of work :', '')
-            
-            if not scheduled_str or not actual_str:
-                return 0
-            
-            # Parse dates - try multiple formats
-            date_formats = ['%d/%m/%Y', '%Y-%m-%d', '%d-%m-%Y', '%m/%d/%Y']
-            
-            scheduled_date = None
-            actual_date = None
-            
-            for fmt in date_formats:
-                try:
-                    scheduled_date = datetime.strptime(str(scheduled_str).strip(), fmt)
-                    break
-                except:
-                    continue
-            
-            for fmt in date_formats:
-                try:
-                    actual_date = datetime.strptime(str(actual_str).strip(), fmt)
-                    break
-                except:
-                    continue
+            scheduled_date = self._title_date('St. date of completion :')
+            actual_date = self._title_date('Date of actual completion of work :')
             
             if scheduled_date and actual_date:
                 delay = (actual_date - scheduled_date).days
@@ -183,35 +215,10 @@ class BaseGenerator:
             Liquidated damages amount in whole rupees (rounded)
         """
         try:
-            # Get project dates from title_data
-            scheduled_str = self.title_data.get('St. date of completion :', '')
-            actual_str = self.title_data.get('Date of actual completion of work :', '')
-            start_str = self.title_data.get('Date of written order to commence work :', 
-                                           self.title_data.get('St. date of Start :', ''))
-            
-            if not scheduled_str or not actual_str or not start_str:
-                return 0
-            
-            # Parse dates
-            from datetime import datetime
-            date_formats = ['%d/%m/%Y', '%Y-%m-%d', '%d-%m-%Y', '%m/%d/%Y']
-            
-            start_date = None
-            scheduled_date = None
-            actual_date = None
-            
-            for fmt in date_formats:
-                try:
-                    if not start_date:
-                        start_date = datetime.strptime(str(start_str).strip(), fmt)
-                    if not scheduled_date:
-                        scheduled_date = datetime.strptime(str(scheduled_str).strip(), fmt)
-                    if not actual_date:
-                        actual_date = datetime.strptime(str(actual_str).strip(), fmt)
-                    if start_date and scheduled_date and actual_date:
-                        break
-                except:
-                    continue
+            # Project dates parsed once by ExcelProcessor
+            start_date = self._title_date('Date of written order to commence work :', 'St. date of Start :')
+            scheduled_date = self._title_date('St. date of completion :')
+            actual_date = self._title_date('Date of actual completion of work :')
             
             if not (start_date and scheduled_date and actual_date):
                 return 0
@@ -0,0 +1,371 @@
+"""
+Bill Layout - Shared layout model for the native PDF and DOCX renderers
+Column widths, headers, first-page item filtering, totals rows and the
+certificate text live here once; ReportLabRenderer and DocxBuilder only
+decide how a cell, paragraph or bold segment is drawn.
+"""
+from typing import Dict, Any, Iterator, List, Tuple
+
+
+# Summary labels that come through from Excel as item rows (skipped on First Page)
+SUMMARY_LABELS = {'TOTAL', 'PREM', 'PREMIUM', 'GRAND TOTAL', 'ADD TENDER PREMIUM'}
+
+# Column widths (mm) - First Page matches the HTML template; Deviation gives
+# amount columns enough room for full rupee figures on a 277mm landscape frame
+FIRST_PAGE_COLUMNS_MM = [11, 16, 16, 11, 70, 15, 22, 17, 12]
+DEVIATION_COLUMNS_MM = [8, 100, 12, 13, 13, 16, 13, 16, 13, 16, 13, 16, 28]
+CERTIFICATE_III_COLUMNS_MM = [11, 84, 19, 19, 23, 15, 19]
+FIRST_PAGE_INFO_COLUMNS_MM = [66, 124]
+
+FIRST_PAGE_HEADER = [
+    'Unit',
+    'Quantity executed (or supplied) since last certificate',
+    'Quantity executed (or supplied) upto date as per MB',
+    'S. No.',
+    'Item of Work supplies (Grouped under "sub-head" and "sub work" of estimate)',
+    'Rate',
+    'Upto date Amount',
+    'Amount Since previous bill (Total for each sub-head)',
+    'Remarks',
+]
+
+DEVIATION_HEADER = [
+    'ITEM No.', 'Description', 'Unit', 'Qty as per Work Order', 'Rate',
+    'Amt as per Work Order Rs.', 'Qty Executed', 'Amt as per Executed Rs.',
+    'Excess Qty', 'Excess Amt Rs.', 'Saving Qty', 'Saving Amt Rs.', 'REMARKS/ REASON.',
+]
+
+CERTIFICATE_III_HEADER = ['S.No.', 'Description', '', '', 'Amount Rs.', 'Entry No.', 'Amount Rs.']
+
+FIRST_PAGE_BANNER = 'FOR CONTRACTORS & SUPPLIERS ONLY FOR PAYMENT FOR WORK OR SUPPLIES ACTUALLY MEASURED'
+
+# (label, title sheet keys) for the First Page information block
+FIRST_PAGE_INFO_FIELDS = [
+    ('Name of Contractor or supplier :', ('Name of Contractor or supplier :', 'Name of Contractor or supplier')),
+    ('Name of Work :-', ('Name of Work ;-', 'Name of Work')),
+    ('Serial No. of this bill :', ('Serial No. of this bill :', 'Serial No. of this bill')),
+    ('No. and date of the last bill-', ('No. and date of the last bill-', 'No. and date of the last bill')),
+    ('Reference to work order or Agreement :', ('Reference to work order or Agreement :',
+                                                'Reference to work order or Agreement')),
+    ('Agreement No.', ('Agreement No.',)),
+    ('Date of written order to commence work :', ('Date of written order to commence work :',
+                                                  'Date of written order to commence work')),
+    ('St. date of Start :', ('St. date of Start :', 'St. date of Start')),
+    ('St. date of completion :', ('St. date of completion :', 'St. date of completion')),
+    ('Date of actual completion of work :', ('Date of actual completion of work :',
+                                             'Date of actual completion of work')),
+    ('Date of measurement :', ('Date of measurement :', 'Date of measurement')),
+]
+
+# (label, title sheet keys) for the header lines above statement tables
+BILL_HEADER_FIELDS = [
+    ('Name of Work :-', ('Name of Work ;-',)),
+    ('Name of Contractor or supplier :', ('Name of Contractor or supplier :',)),
+    ('Serial No. of this bill :', ('Serial No. of this bill :', 'Serial No. of this bill')),
+    ('Agreement No.', ('Agreement No.',)),
+]
+
+# Text segments are (text, bold) pairs; each renderer draws bold its own way
+Segments = List[Tuple[str, bool]]
+
+CERTIFICATE_II_STATEMENTS: List[Segments] = [
+    [('*Certified', True),
+     (' that in addition to and quite apart from the quantities of work actually executed, as shown in column 4 '
+      'of Account I, some work has actually been done in connection with several items and the value of such '
+      'work (after deduction therefrom the proportionate amount of secured advances, if any, ultimately '
+      'recoverable on account of the quantities of materials used therein) is in no case, less than the advance '
+      'payments as per item 2 of the Memorandum, if payment is made.', False)],
+    [('+Certified', True),
+     (' that the contractor has made satisfactory progress with the work, and that the quantities and amounts '
+      'claimed are correct and the work has been executed in accordance with the specifications and the terms '
+      'of the contract.', False)],
+    [('I also certify that the amount claimed is not more than the amount admissible under the contract.', False)],
+]
+
+CERTIFICATE_II_FOOTNOTES = ['* Strike out if not applicable', '+ Strike out if not applicable']
+
+# (heading, name key, name default, designation key, designation default, date key)
+CERTIFICATE_II_SIGNATORIES = [
+    ('Dated signature of officer preparing the bill', 'officer_name', 'Name of Officer',
+     'officer_designation', 'Assistant Engineer', 'bill_date'),
+    ('+Dated signature of officer authorising payment', 'authorising_officer_name',
+     'Name of Authorising Officer', 'authorising_officer_designation', 'Executive Engineer',
+     'authorisation_date'),
+]
+
+
+def format_number(value: Any, fmt: str = '{:.2f}') -> str:
+    """Format a number, blank for zero/empty (matches template behaviour)"""
+    try:
+        value = float(value or 0)
+    except (TypeError, ValueError):
+        return ''
+    return fmt.format(value) if value != 0 else ''
+
+
+def format_rupees(value: Any) -> str:
+    """Format a whole-rupee amount with thousands separators"""
+    try:
+        return '{:,}'.format(int(round(float(value or 0))))
+    except (TypeError, ValueError):
+        return '0'
+
+
+def title_value(title_data: Dict[str, Any], *keys: str, default: str = 'N/A') -> str:
+    """Look up a title sheet value under any of its known labels"""
+    for key in keys:
+        value = title_data.get(key)
+        if value not in (None, ''):
+            return str(value)
+    return default
+
+
+# ----------------------------------------------------------------------
+# First Page Summary
+# ----------------------------------------------------------------------
+
+def first_page_heading(title_data: Dict[str, Any]) -> str:
+    """Bill heading shown under the First Page banner"""
+    bill_num = title_data.get('Bill Number', '')
+    running_final = title_data.get('Running or Final', '')
+    if bill_num and running_final:
+        return f"{bill_num} & {running_final} Bill"
+    return title_value(title_data, 'Serial No. of this bill :', 'Serial No. of this bill', default='WORK ORDER')
+
+
+def first_page_info(title_data: Dict[str, Any]) -> List[Tuple[str, str]]:
+    """(label, value) rows of the First Page information block"""
+    return [(label, title_value(title_data, *keys)) for label, keys in FIRST_PAGE_INFO_FIELDS]
+
+
+def first_page_items(items: List[Dict[str, Any]]) -> Iterator[Tuple[Dict[str, Any], List[str]]]:
+    """
+    Item rows shown on the First Page
+
+    Summary labels without data (TOTAL, PREMIUM, ...) and blank rows are
+    skipped. Parent/header items (no rate) only carry serial number and
+    description.
+
+    Yields:
+        (item, cells) with the nine First Page cells as text
+    """
+    for item in items or []:
+        qty_since = item.get('quantity_since_last') or 0
+        qty_upto = item.get('quantity_upto_date') or item.get('quantity') or 0
+        rate = item.get('rate') or 0
+        amount = item.get('amount') or 0
+        amount_prev = item.get('amount_previous') or 0
+        desc = str(item.get('description') or '').strip()
+        desc_upper = desc.upper()
+
+        is_summary_label = bool(desc) and (
+            desc_upper in SUMMARY_LABELS or desc_upper.startswith('TOTAL/') or 'TENDER PREMIUM' in desc_upper
+        )
+        is_empty_data = not any((qty_since, qty_upto, rate, amount, amount_prev))
+        if (is_summary_label and is_empty_data) or desc_upper == 'ADD TENDER PREMIUM':
+            continue
+        if is_empty_data and not desc:
+            continue
+
+        if not rate:
+            cells = ['', '', '', item.get('serial_no', ''), desc, '', '', '']
+        else:
+            cells = [item.get('unit', ''), format_number(qty_since), format_number(qty_upto),
+                     item.get('serial_no', ''), desc, format_number(rate), format_number(amount),
+                     format_number(amount_prev)]
+        cells.append(item.get('remark', ''))
+        yield item, cells
+
+
+def first_page_totals(data: Dict[str, Any]) -> List[List[str]]:
+    """
+    Totals rows below the First Page items
+
+    Each row has six cells: the merged first four columns, then description,
+    rate, upto-date amount, amount since previous bill and remarks. The last
+    row (Net Payable) is the highlighted one.
+    """
+    title_data = data.get('title_data', {}) or {}
+    totals = data.get('totals', {}) or {}
+
+    premium = totals.get('premium', {}) or {}
+    premium_pct = format_number((premium.get('percent') or 0) * 100, '{:.2f}%')
+    extra_sum = totals.get('extra_items_sum') or 0
+    payable_total = (totals.get('payable') or 0) + extra_sum
+    is_first_bill = (
+        str(title_data.get('Bill Number', '')).lower() == 'first'
+        or 'first' in str(title_data.get('Serial No. of this bill :', '')).lower()
+    )
+    last_bill = '0.00' if is_first_bill else (format_number(totals.get('last_bill_amount')) or '0.00')
+    net_payable = totals.get('net_payable') or totals.get('payable') or 0
+    grand_total = format_number(totals.get('grand_total'))
+    premium_amount = format_number(premium.get('amount'))
+
+    return [
+        ['', 'Grand Total Rs.', '', grand_total, grand_total, ''],
+        ['', f'Tender Premium @ {premium_pct}', premium_pct, premium_amount, premium_amount, ''],
+        [f'Rs. {extra_sum:.2f}' if extra_sum > 0 else 'NIL',
+         '<<<<<< Sum of Extra Items (including Tender Premium)', '', '', '', ''],
+        ['', 'Payable Amount Rs.', '', f'{payable_total:.2f}', f'{payable_total:.2f}', ''],
+        ['', 'Less Amount Paid vide Last Bill Rs.', '', last_bill, last_bill, ''],
+        ['', 'Net Payable Amount Rs.', '', format_number(net_payable), format_number(net_payable), ''],
+    ]
+
+
+# ----------------------------------------------------------------------
+# Deviation Statement
+# ----------------------------------------------------------------------
+
+def deviation_item_cells(item: Dict[str, Any]) -> List[str]:
+    """Thirteen Deviation Statement cells for an item (serial and description only without a rate)"""
+    if not item.get('rate'):
+        cells = [''] * 13
+        cells[0] = item.get('serial_no', '')
+        cells[1] = item.get('description', '')
+        return cells
+    return [
+        item.get('serial_no', ''), item.get('description', ''), item.get('unit', ''),
+        format_number(item.get('qty_wo'), '{:.0f}'), format_number(item.get('rate')),
+        format_number(item.get('amt_wo')), format_number(item.get('qty_bill'), '{:.0f}'),
+        format_number(item.get('amt_bill')), format_number(item.get('excess_qty'), '{:.0f}'),
+        format_number(item.get('excess_amt')), format_number(item.get('saving_qty'), '{:.0f}'),
+        format_number(item.get('saving_amt')), item.get('remark', ''),
+    ]
+
+
+def deviation_totals(summary: Dict[str, Any]) -> List[Tuple[List[str], bool]]:
+    """
+    Totals rows below the Deviation Statement items
+
+    Returns:
+        (cells, bold) rows; the overall excess/saving lands in the Excess
+        Amt or Saving Amt column
+    """
+    premium = summary.get('premium', {}) or {}
+    premium_pct = '%.2f%%' % ((premium.get('percent') or 0) * 100)
+    rows = []
+    for label, keys in (
+        ('Grand Total Rs.', ('work_order_total', 'executed_total', 'overall_excess', 'overall_saving')),
+        (f'Add Tender Premium ({premium_pct})',
+         ('tender_premium_f', 'tender_premium_h', 'tender_premium_j', 'tender_premium_l')),
+        ('Grand Total including Tender Premium Rs.',
+         ('grand_total_f', 'grand_total_h', 'grand_total_j', 'grand_total_l')),
+    ):
+        cells = [''] * 13
+        cells[1] = label
+        for col, key in zip((5, 7, 9, 11), keys):
+            cells[col] = format_number(summary.get(key))
+        rows.append((cells, False))
+
+    is_saving = summary.get('is_saving')
+    target_col = 11 if is_saving else 9
+    kind = 'Saving' if is_saving else 'Excess'
+
+    cells = [''] * 13
+    cells[1] = f'Overall {kind} With Respect to the Work Order Amount Rs.'
+    cells[target_col] = format_number(summary.get('net_difference'))
+    rows.append((cells, False))
+
+    cells = [''] * 13
+    cells[1] = f'Percentage of {kind} %'
+    cells[target_col] = '%0.2f%%' % (summary.get('percentage_deviation') or 0)
+    rows.append((cells, True))
+    return rows
+
+
+# ----------------------------------------------------------------------
+# Certificates
+# ----------------------------------------------------------------------
+
+def measurement_statement(data: Dict[str, Any]) -> Segments:
+    """Certificate II opening sentence, measurement details in bold"""
+    return [
+        ("The measurements on which are based the entries in columns 1 to 6 of Account I, were made by ", False),
+        (str(data.get('measurement_officer', 'Junior Engineer')), True),
+        (" on ", False),
+        (str(data.get('measurement_date', '_______________')), True),
+        (", and are recorded at page ", False),
+        (str(data.get('measurement_book_page', '_______')), True),
+        (" of Measurement Book No. ", False),
+        (str(data.get('measurement_book_no', '_______')), True),
+        (".", False),
+    ]
+
+
+def certificate_ii_signatures(data: Dict[str, Any]) -> List[List[str]]:
+    """Signature blocks: heading, name, designation and date lines"""
+    return [
+        [heading, str(data.get(name_key, name_default)), str(data.get(desig_key, desig_default)),
+         f"Date: {data.get(date_key, '_______________')}"]
+        for heading, name_key, name_default, desig_key, desig_default, date_key in CERTIFICATE_II_SIGNATORIES
+    ]
+
+
+def _bill_total(totals: Dict[str, Any]) -> float:
+    return (totals.get('payable') or 0) + (totals.get('extra_items_sum') or 0)
+
+
+def memorandum_rows(totals: Dict[str, Any]) -> List[Tuple[List[str], bool]]:
+    """
+    Certificate III memorandum of payments
+
+    Returns:
+        (cells, bold) rows: S.No., Description, two sub-columns, Amount,
+        Entry No. and Amount
+    """
+    total_bill = _bill_total(totals)
+    total_bill_text = format_rupees(total_bill) if totals.get('payable') else '0'
+    by_cheque = (
+        format_rupees(total_bill - totals.get('total_deductions', 0))
+        if totals.get('payable') and totals.get('total_deductions') else '0'
+    )
+    return [
+        (['1.', 'Total value of work actually measured, as per Account I, Col. 5, Entry',
+          '', '', '', '[A]', total_bill_text], False),
+        (['2.', 'Total up-to-date advance payments for work not yet measured as per details given below',
+          '', '', '', '', ''], False),
+        (['', '(a) Total as per previous bill', '', '', '', '[B]', 'Nil'], False),
+        (['', '(b) Since previous bill', '', '', '', '[D]', 'Nil'], False),
+        (['3.', 'Total up-to-date secured advances on security of materials', '', '', '', '[C]', 'Nil'], False),
+        (['4.', 'Total (Items 1 + 2 + 3)', '', '', '', '', total_bill_text], True),
+        (['5.', 'Deduct: Amount Withheld', '', '', 'Amount Rs.', '', ''], False),
+        (['', '(a) From previous bill as per last Running Account Bill', '', '', 'Nil', '[5]', 'Nil'], False),
+        (['', '(b) From this bill', '', '', '', '', total_bill_text], False),
+        (['6.', 'Balance i.e. "up-to-date" payments (Item 4-5)', '', '', '', '', '0'], True),
+        (['7.', 'Total Amount of Payments Already Made as per Entry (K)', '', '', '', '[K]',
+          format_rupees(totals.get('last_bill_amount'))], False),
+        (['8.', 'Payments Now to be Made as detailed below', '', '', '', '', ''], True),
+        (['', '(a) By recovery of amounts creditable to this work', '', '[a]', 'Amount Rs.', '', ''], False),
+        (['', '', 'SD @10%', '', format_rupees(totals.get('sd_amount')), '', ''], False),
+        (['', '', 'IT @2%', '', format_rupees(totals.get('it_amount')), '', ''], False),
+        (['', '', 'GST@2% Even', '', format_rupees(totals.get('gst_amount')), '', ''], False),
+        (['', '', 'LC @1%', '', format_rupees(totals.get('lc_amount')), '', ''], False),
+        (['', '', 'Deposit-V', '', '0', '', ''], False),
+        (['', '(a) By recovery of amounts creditable to this work', '', '',
+          format_rupees(totals.get('total_deductions')), '', ''], False),
+        (['', 'Total 5(b) + 8(a)', '', '[G]', 'Amount Rs.', '', ''], False),
+        (['', '(b) By recovery of amount creditable to other works or heads of account',
+          '', '(b)', 'Nil', '', ''], False),
+        (['', '(c) By cheque', '', '(c)', by_cheque, '', ''], True),
+        (['', 'Total 8(b) + 8(c)', '', '', '', '', ''], False),
+    ]
+
+
+def payment_lines(data: Dict[str, Any]) -> List[Tuple[str, bool]]:
+    """(text, bold) lines under the memorandum: pay order, receipt and signatures"""
+    total_bill_int = format_rupees(_bill_total(data.get('totals', {}) or {}))
+    words = data.get('amount_words') or 'Zero'
+    return [
+        (f"Pay Rs. {total_bill_int}", True),
+        (f"Rupees {words}", True),
+        ("Dated initials of Disbursing Officer: _______________", False),
+        (f"Received Rs. {total_bill_int}", True),
+        (f"Rupees {words}", True),
+        ("as per above memorandum on account of this bill.", False),
+        ("Dated: _______________", False),
+        ("Witness: _______________", False),
+        ("Signature of Contractor: _______________", False),
+        ("Paid by me, vide Treasury/cheque No. _______ dated ____ / ____ / ________", False),
+        ("Dated initials of person actually making the payment: _______________", False),
+        ("Signature of Pay Authority: _______________", False),
+    ]
@@ -1,19 +1,35 @@
 """
 Document Generator - Main entry point for document generation
 """
-from typing import Dict, Any
+from pathlib import Path
+from typing import Dict, Any, Union
 from core.generators.html_generator import HTMLGenerator
 from core.generators.pdf_generator_fixed import FixedPDFGenerator
-from core.generators.doc_generator import DOCGenerator
 
 class DocumentGenerator:
     """Main document generator that coordinates specialized generators"""
     
-    def __init__(self, data: Dict[str, Any]):
+    def __init__(self, data: Union[Dict[str, Any], str, Path]):
+        """
+        Args:
+            data: Processed bill data, or a bill folder written by
+                core.processors.bill_store.save_bill (loaded memory-mapped)
+        """
+        if isinstance(data, (str, Path)):
+            from core.processors.bill_store import load_bill
+            data = load_bill(data)
         self.data = data
         self.html_generator = HTMLGenerator(data)
         self.pdf_generator = FixedPDFGenerator(margin_mm=10)
-        self.doc_generator = DOCGenerator(data)
+        self._doc_generator = None
+    
+    @property
+    def doc_generator(self):
+        """DOC generator, created on first use so HTML/PDF runs never load python-docx"""
+        if self._doc_generator is None:
+            from core.generators.doc_generator import DOCGenerator
+            self._doc_generator = DOCGenerator(self.data, template_data=self.html_generator.template_data)
+        return self._doc_generator
     
     def generate_all_documents(self) -> Dict[str, str]:
         """
@@ -45,6 +61,35 @@ class DocumentGenerator:
         """
         return self.pdf_generator.create_pdf_documents(documents)
     
+    def create_native_pdf_documents(self, documents: Dict[str, str]) -> Dict[str, bytes]:
+        """
+        Render PDFs natively with ReportLab where a layout exists
+        
+        First Page, Deviation Statement and Certificates are built straight
+        from template data; other documents fall back to HTML conversion.
+        
+        Args:
+            documents: Dictionary of HTML documents
+            
+        Returns:
+            Dictionary of PDF documents as bytes
+        """
+        from core.generators.reportlab_renderer import ReportLabRenderer
+        renderer = ReportLabRenderer(margin_mm=self.pdf_generator.margin_mm)
+        
+        pdf_documents = {}
+        for doc_name, html_content in documents.items():
+            if renderer.supports(doc_name):
+                try:
+                    pdf_documents[doc_name] = renderer.render(doc_name, self.html_generator.template_data)
+                    continue
+                except Exception as e:
+                    print(f"[WARN] Native render failed for {doc_name}, falling back to HTML: {e}")
+            pdf_documents[doc_name] = self.pdf_generator.auto_convert(
+                html_content, landscape=renderer.is_landscape(doc_name), doc_name=doc_name
+            )
+        return pdf_documents
+    
     def batch_convert(self, html_documents: Dict[str, str], 
                      output_dir: str = "output_pdfs",
                      enable_fallback: bool = True) -> Dict[str, str]:
@@ -0,0 +1,479 @@
+"""
+DOCX Builder - Build Word documents directly from template data
+Tables are written from the prepared row records as one WordprocessingML
+fragment per table, instead of filling python-docx cells one at a time.
+"""
+import io
+import threading
+from typing import Dict, Any, List, Optional
+from xml.sax.saxutils import escape
+
+from docx import Document
+from docx.enum.section import WD_ORIENT
+from docx.enum.style import WD_STYLE_TYPE
+from docx.enum.text import WD_ALIGN_PARAGRAPH
+from docx.oxml import parse_xml
+from docx.oxml.ns import nsdecls, qn
+from docx.shared import Mm, Pt
+
+from core.generators import bill_layout as layout
+from core.generators.bill_layout import format_number, title_value
+
+
+# 1 mm in twentieths of a point (Word table units)
+TWIPS_PER_MM = 56.7
+
+# Column widths (mm) of the Bill Scrutiny Sheet key/value tables
+KEY_VALUE_COLUMNS_MM = [95, 95]
+
+HEADER_SHADE = 'F0F0F0'
+
+# Styles kept in the document skeleton. The stock python-docx template ships
+# ~160 styles plus latent styles, which dominate the cost of loading it.
+SKELETON_STYLES = {
+    'Normal', 'DefaultParagraphFont', 'TableNormal', 'NoList', 'TableGrid', 'ListNumber', 'BillTitle',
+}
+
+
+def _row(cells: List[Any], bold: bool = False, shade: bool = False) -> Dict[str, Any]:
+    """Row record: cells are text or (text, column_span) tuples"""
+    return {'cells': cells, 'bold': bold, 'shade': shade}
+
+
+class DocxBuilder:
+    """
+    Word document builder for bill documents
+
+    Builds every document from HTMLGenerator.template_data:
+    - Exact 10mm margins, landscape Deviation Statement
+    - Table rows built in bulk as XML and attached in one step
+    - Header rows repeat on every page
+    - Page setup and styles built once per document type, cached as bytes
+    """
+
+    # (doc_name, margin_mm) -> skeleton .docx bytes, shared by all builders
+    _skeletons: Dict[tuple, bytes] = {}
+    _skeleton_lock = threading.Lock()
+
+    def __init__(self, margin_mm: int = 10, font_size: float = 8):
+        """
+        Initialize DOCX builder
+
+        Args:
+            margin_mm: Margin size in millimeters (default: 10mm)
+            font_size: Font size (pt) for table cells
+        """
+        self.margin_mm = margin_mm
+        self.font_size = font_size
+
+        # (column widths, header) -> table properties, grid and header row XML
+        self._table_heads: Dict[tuple, str] = {}
+
+        # Document name -> (content builder, landscape)
+        self._layouts = {
+            'First Page Summary': (self._build_first_page, False),
+            'Deviation Statement': (self._build_deviation_statement, True),
+            'BILL SCRUTINY SHEET': (self._build_note_sheet, False),
+            'Extra Items Statement': (self._build_extra_items, False),
+            'Certificate II': (self._build_certificate_ii, False),
+            'Certificate III': (self._build_certificate_iii, False),
+        }
+
+    def supports(self, doc_name: str) -> bool:
+        """Check whether a document has a native DOCX layout"""
+        return doc_name in self._layouts
+
+    def preload(self) -> int:
+        """
+        Build every skeleton ahead of the first render
+
+        Returns:
+            Number of cached skeletons
+        """
+        for doc_name in self._layouts:
+            self._skeleton(doc_name)
+        return len(self._layouts)
+
+    def render(self, doc_name: str, template_data: Dict[str, Any]) -> bytes:
+        """
+        Build one Word document
+
+        Args:
+            doc_name: Document name as produced by HTMLGenerator
+            template_data: Prepared data from HTMLGenerator.template_data
+
+        Returns:
+            Word document as bytes
+        """
+        if doc_name not in self._layouts:
+            raise ValueError(f"No DOCX layout for: {doc_name}")
+
+        build_content, _ = self._layouts[doc_name]
+        doc = Document(io.BytesIO(self._skeleton(doc_name)))
+        build_content(doc, template_data)
+
+        buffer = io.BytesIO()
+        doc.save(buffer)
+        return buffer.getvalue()
+
+    def render_all(self, template_data: Dict[str, Any],
+                   doc_names: Optional[List[str]] = None) -> Dict[str, bytes]:
+        """
+        Build every supported document
+
+        Args:
+            template_data: Prepared data from HTMLGenerator.template_data
+            doc_names: Documents to build (default: all layouts)
+
+        Returns:
+            Dict of {doc_name: docx_bytes}
+        """
+        docx_documents = {}
+        for doc_name in (doc_names or list(self._layouts)):
+            if not self.supports(doc_name):
+                continue
+            try:
+                docx_documents[doc_name] = self.render(doc_name, template_data)
+            except Exception as e:
+                print(f"Error generating Word document for {doc_name}: {e}")
+        return docx_documents
+
+    # ------------------------------------------------------------------
+    # Document / XML helpers
+    # ------------------------------------------------------------------
+
+    def _skeleton(self, doc_name: str) -> bytes:
+        """Cached empty document (page setup + styles) for a document type"""
+        key = (doc_name, self.margin_mm)
+        skeleton = self._skeletons.get(key)
+        if skeleton is None:
+            with self._skeleton_lock:
+                skeleton = self._skeletons.get(key)
+                if skeleton is None:
+                    buffer = io.BytesIO()
+                    self._new_document(self._layouts[doc_name][1]).save(buffer)
+                    skeleton = self._skeletons[key] = buffer.getvalue()
+        return skeleton
+
+    def _new_document(self, landscape: bool = False):
+        """Create a document with 10mm margins, compact default font and only the styles in use"""
+        doc = Document()
+        section = doc.sections[0]
+        if landscape:
+            section.orientation = WD_ORIENT.LANDSCAPE
+            section.page_width, section.page_height = Mm(297), Mm(210)
+        else:
+            section.page_width, section.page_height = Mm(210), Mm(297)
+        section.top_margin = Mm(self.margin_mm)
+        section.bottom_margin = Mm(self.margin_mm)
+        section.left_margin = Mm(self.margin_mm)
+        section.right_margin = Mm(self.margin_mm)
+
+        normal = doc.styles['Normal']
+        normal.font.name = 'Calibri'
+        normal.font.size = Pt(9)
+        normal.paragraph_format.space_after = Pt(2)
+
+        title = doc.styles.add_style('Bill Title', WD_STYLE_TYPE.PARAGRAPH)
+        title.base_style = normal
+        title.font.bold = True
+        title.font.size = Pt(13)
+        title.paragraph_format.alignment = WD_ALIGN_PARAGRAPH.CENTER
+
+        styles = doc.styles.element
+        for style in list(styles):
+            if style.tag == qn('w:latentStyles') or (
+                    style.tag == qn('w:style') and style.get(qn('w:styleId')) not in SKELETON_STYLES):
+                styles.remove(style)
+        return doc
+
+    def _cell_xml(self, text: Any, width: int, bold: bool, span: int = 1, shade: bool = False,
+                  center: bool = False) -> str:
+        """WordprocessingML for a single table cell"""
+        props = f'<w:tcW w:w="{width}" w:type="dxa"/>'
+        if span > 1:
+            props += f'<w:gridSpan w:val="{span}"/>'
+        if shade:
+            props += f'<w:shd w:val="clear" w:color="auto" w:fill="{HEADER_SHADE}"/>'
+
+        para_props = '<w:spacing w:before="0" w:after="0"/>'
+        if center:
+            para_props += '<w:jc w:val="center"/>'
+
+        text = '' if text is None else str(text)
+        run = ''
+        if text:
+            run_props = ('<w:b/>' if bold else '') + f'<w:sz w:val="{int(self.font_size * 2)}"/>'
+            run = f'<w:r><w:rPr>{run_props}</w:rPr><w:t xml:space="preserve">{escape(text)}</w:t></w:r>'
+        return f'<w:tc><w:tcPr>{props}</w:tcPr><w:p><w:pPr>{para_props}</w:pPr>{run}</w:p></w:tc>'
+
+    def _add_table(self, doc, columns_mm: List[float], rows: List[Dict[str, Any]],
+                   header: Optional[List[str]] = None) -> None:
+        """
+        Append a full table built as a single XML fragment
+
+        Args:
+            doc: python-docx Document
+            columns_mm: Column widths in millimeters
+            rows: Row records from _row()
+            header: Optional header cells (repeated on each page)
+        """
+        widths = [int(w * TWIPS_PER_MM) for w in columns_mm]
+        parts = [self._table_head(widths, header)]
+
+        for row in rows:
+            parts.append('<w:tr><w:trPr><w:cantSplit/></w:trPr>')
+            col = 0
+            for cell in row['cells']:
+                text, span = cell if isinstance(cell, tuple) else (cell, 1)
+                parts.append(self._cell_xml(
+                    text, sum(widths[col:col + span]), bold=row['bold'], span=span, shade=row['shade']
+                ))
+                col += span
+            parts.append('</w:tr>')
+
+        parts.append('</w:tbl>')
+        doc.element.body.insert_element_before(parse_xml(''.join(parts)), 'w:sectPr')
+
+    def _table_head(self, widths: List[int], header: Optional[List[str]]) -> str:
+        """Opening table XML (properties, grid, repeated header row), cached per layout"""
+        key = (tuple(widths), tuple(header) if header else None)
+        head = self._table_heads.get(key)
+        if head is None:
+            parts = [
+                f'<w:tbl {nsdecls("w")}>',
+                '<w:tblPr><w:tblStyle w:val="TableGrid"/>',
+                f'<w:tblW w:w="{sum(widths)}" w:type="dxa"/><w:tblLayout w:type="fixed"/></w:tblPr>',
+                '<w:tblGrid>',
+            ]
+            parts.extend(f'<w:gridCol w:w="{w}"/>' for w in widths)
+            parts.append('</w:tblGrid>')
+
+            if header:
+                parts.append('<w:tr><w:trPr><w:tblHeader/></w:trPr>')
+                parts.extend(
+                    self._cell_xml(text, width, bold=True, shade=True, center=True)
+                    for text, width in zip(header, widths)
+                )
+                parts.append('</w:tr>')
+            head = self._table_heads[key] = ''.join(parts)
+        return head
+
+    @staticmethod
+    def _add_title(doc, text: str) -> None:
+        """Centered bold document title"""
+        doc.add_paragraph(text, style='Bill Title')
+
+    @staticmethod
+    def _add_label(doc, label: str, value: Any) -> None:
+        """'Label: value' line with bold label"""
+        para = doc.add_paragraph()
+        para.add_run(f"{label} ").bold = True
+        para.add_run('' if value is None else str(value))
+
+    @staticmethod
+    def _add_segments(doc, segments: layout.Segments) -> None:
+        """Paragraph from (text, bold) segments"""
+        para = doc.add_paragraph()
+        for text, bold in segments:
+            para.add_run(text).bold = bold
+
+    def _add_bill_header(self, doc, title_data: Dict[str, Any]) -> None:
+        """Name of work / contractor / bill / agreement lines"""
+        for label, keys in layout.BILL_HEADER_FIELDS:
+            self._add_label(doc, label, title_value(title_data, *keys))
+
+    # ------------------------------------------------------------------
+    # First Page Summary
+    # ------------------------------------------------------------------
+
+    def _build_first_page(self, doc, data: Dict[str, Any]) -> None:
+        """First Page Summary: title block, items and totals"""
+        title_data = data.get('title_data', {}) or {}
+
+        info_rows = [
+            _row([(layout.FIRST_PAGE_BANNER, 2)], bold=True),
+            _row([(layout.first_page_heading(title_data), 2)], bold=True),
+            _row(['Cash Book Voucher No.', 'Date-']),
+        ]
+        info_rows.extend(_row([label, value]) for label, value in layout.first_page_info(title_data))
+        self._add_table(doc, layout.FIRST_PAGE_INFO_COLUMNS_MM, info_rows)
+        doc.add_paragraph()
+
+        rows = [_row(cells, bold=bool(item.get('bold')))
+                for item, cells in layout.first_page_items(data.get('items', []))]
+        totals_rows = layout.first_page_totals(data)
+        for index, (merged, *cells) in enumerate(totals_rows):
+            # Net Payable (last row) is highlighted
+            highlight = index == len(totals_rows) - 1
+            rows.append(_row([(merged, 4)] + cells, bold=highlight, shade=highlight))
+        self._add_table(doc, layout.FIRST_PAGE_COLUMNS_MM, rows, header=layout.FIRST_PAGE_HEADER)
+
+    # ------------------------------------------------------------------
+    # Deviation Statement
+    # ------------------------------------------------------------------
+
+    def _build_deviation_statement(self, doc, data: Dict[str, Any]) -> None:
+        """Deviation Statement (landscape)"""
+        self._add_title(doc, 'DEVIATION STATEMENT')
+        self._add_bill_header(doc, data.get('title_data', {}) or {})
+
+        rows = []
+        for item in data.get('deviation_items', []) or []:
+            if item.get('is_separator') or item.get('is_divider'):
+                cells = [''] * 13
+                cells[1] = item.get('description', '')
+                rows.append(_row(cells, bold=True, shade=True))
+            else:
+                rows.append(_row(layout.deviation_item_cells(item), bold=bool(item.get('bold'))))
+        rows.extend(_row(cells, bold=bold) for cells, bold in layout.deviation_totals(data.get('summary', {}) or {}))
+        self._add_table(doc, layout.DEVIATION_COLUMNS_MM, rows, header=layout.DEVIATION_HEADER)
+
+    # ------------------------------------------------------------------
+    # Bill Scrutiny Sheet
+    # ------------------------------------------------------------------
+
+    def _build_note_sheet(self, doc, data: Dict[str, Any]) -> None:
+        """Bill Scrutiny Sheet: numbered key/value tables"""
+        title_data = data.get('title_data', {}) or {}
+        totals = data.get('totals', {}) or {}
+        summary = data.get('summary', {}) or {}
+
+        bill_serial = title_value(title_data, 'Serial No. of this bill :', 'Serial No. of this bill', default='')
+        self._add_title(doc, f"{bill_serial}     SCRUTINY SHEET".strip())
+
+        work_order_amount = totals.get('work_order_amount') or 0
+        last_bill = totals.get('last_bill_amount') or 0
+        this_bill = ((totals.get('payable') or 0) + (totals.get('extra_items_sum') or 0)) if totals.get('payable') else 0
+        balance = (work_order_amount - (last_bill + this_bill)) if work_order_amount else 0
+
+        def rs(value):
+            return f"Rs. {value:,.0f}"
+
+        general = [
+            ('1. Budget Head', title_data.get('Budget Head', '')),
+            ('2. Agreement No.', title_data.get('Agreement No.', '')),
+            ('3. A&F Sanction', title_data.get('A&F Sanction', 'Refer Agreement')),
+            ('4. Technical Section', title_data.get('Technical Section', 'Refer Agreement')),
+            ('5. MB No. & Page', f"{title_data.get('Measurement Book No', '')}     /Page No. "
+                                 f"{title_data.get('Measurement Book Page', '')}"),
+            ('6. Name of Sub Division', title_data.get('Sub Division', '')),
+            ('7. Name of Work', title_value(title_data, 'Name of Work ;-', 'Name of Work', default='')),
+            ('8. Name of Contractor', title_value(
+                title_data, 'Name of Contractor or supplier :', 'Name of Contractor or supplier', default='')),
+            ('9. Original/Deposit', title_data.get('Original or Deposit', 'Original')),
+            ('10. Budget Provision', 'Adequate'),
+            ('11. Scheduled Date of Commencement', title_value(
+                title_data, 'Date of written order to commence work :', 'St. date of Start :', default='')),
+            ('12. Scheduled Date of Completion', title_data.get('St. date of completion :', '')),
+            ('13. Actual date of completion', title_data.get('Date of actual completion of work :', '')),
+            ('14. In case Delay whether provisional extension given', 'Yes/No.     No._____ Date _______'),
+            ('15. Whether any notice issued', 'Not applicable.'),
+            ('16. Total Amount of work order', rs(work_order_amount)),
+            ('17.A. Sum of payment upto last bill', rs(last_bill)),
+            ('B. Amount of this bill', rs(this_bill)),
+            ('C. Actual expenditure upto this bill = ( A + B)', rs(last_bill + this_bill) if this_bill else rs(0)),
+            ('18. Balance to be done = (16 - 17 C)', 'Nil' if balance < 0 else rs(balance)),
+            ('19. Prorata Progress on the work maintained by the contractor', 'Evident from para 13 and 17 above.'),
+            ('20. Date on which record measurement taken by AEN', title_data.get('Date of measurement :', '')),
+            ('21. Date of and % of work checked by AEN', ''),
+            ('22. Number of selective Items checked by XEN', ''),
+        ]
+        extra_sum = totals.get('extra_items_sum') or 0
+        other_inputs = [
+            ('23. Other Inputs', '-------------------'),
+            ('(A) Is It a Repair / Maintenance Work', title_data.get('Is Repair Maintenance Work', 'No')),
+            ('(B) Extra Item', 'Yes' if extra_sum > 0 else 'No'),
+            ('Amount of Extra Items Rs.', f"{extra_sum:,.0f}"),
+            ('(C) Any Excess Item', 'Yes' if (summary.get('grand_total_j') or 0) > 0 else 'No'),
+            ('(D) Any Inadvertent Delay in Bill Submission', title_data.get('Delay in Bill Submission', 'No')),
+        ]
+        deductions = [
+            ('23. Deductions', ''),
+            ('SD @ 10%', rs(totals.get('sd_amount') or 0)),
+            ('IT @ 2%', rs(totals.get('it_amount') or 0)),
+            ('GST @ 2%', rs(totals.get('gst_amount') or 0)),
+            ('LC @ 1%', rs(totals.get('lc_amount') or 0)),
+            ('Dep-V', 'Rs. 0'),
+            ('Cheque Amount', rs(this_bill - (totals.get('total_deductions') or 0)) if this_bill else rs(0)),
+            ('Total', f"{this_bill:,.0f}"),
+        ]
+        for section in (general, other_inputs, deductions):
+            self._add_table(doc, KEY_VALUE_COLUMNS_MM, [_row([label, value]) for label, value in section])
+            doc.add_paragraph()
+
+    # ------------------------------------------------------------------
+    # Extra Items Statement
+    # ------------------------------------------------------------------
+
+    def _build_extra_items(self, doc, data: Dict[str, Any]) -> None:
+        """Extra Items Slip"""
+        totals = data.get('totals', {}) or {}
+        self._add_title(doc, 'EXTRA ITEMS SLIP')
+        self._add_bill_header(doc, data.get('title_data', {}) or {})
+
+        rows = []
+        for item in data.get('extra_items_only', []) or []:
+            rows.append(_row([
+                item.get('unit', ''), format_number(item.get('quantity_since_last')),
+                format_number(item.get('quantity_upto_date') or item.get('quantity')),
+                item.get('serial_no', ''), item.get('description', ''), format_number(item.get('rate')),
+                format_number(item.get('amount')), format_number(item.get('amount_previous')), item.get('remark', ''),
+            ]))
+
+        premium = totals.get('premium', {}) or {}
+        premium_pct = '%.2f%%' % ((premium.get('percent') or 0) * 100)
+        extra_total = '%.2f' % (data.get('extra_total') or 0)
+        extra_premium = '%.2f' % (data.get('extra_premium') or 0)
+        extra_grand_total = '%.2f' % (data.get('extra_grand_total') or 0)
+        rows.extend([
+            _row([('', 4), 'Total Rs.', '', extra_total, extra_total, '']),
+            _row([('', 4), f'Add Tender Premium @ {premium_pct}', premium_pct, extra_premium, extra_premium, '']),
+            _row([('', 4), 'Grand Total Rs.', '', extra_grand_total, extra_grand_total, ''], bold=True, shade=True),
+        ])
+        self._add_table(doc, layout.FIRST_PAGE_COLUMNS_MM, rows, header=layout.FIRST_PAGE_HEADER)
+
+        doc.add_paragraph()
+        self._add_label(doc, 'Certified that:', '')
+        for text in (
+            'The extra items listed above have been actually executed and measured.',
+            'The rates quoted are as per the schedule of rates of the work order or as agreed.',
+            'The work has been carried out in accordance with the terms and conditions of the agreement.',
+            'All deductions as per rules have been made.',
+        ):
+            doc.add_paragraph(text, style='List Number')
+        for signatory in ('Prepared by:', 'Checked by:', 'Authorized Signatory:'):
+            doc.add_paragraph()
+            self._add_label(doc, signatory, '_____________________')
+            for field in ('Name', 'Designation', 'Date'):
+                doc.add_paragraph(f"{field}: _____________________")
+
+    # ------------------------------------------------------------------
+    # Certificates
+    # ------------------------------------------------------------------
+
+    def _build_certificate_ii(self, doc, data: Dict[str, Any]) -> None:
+        """Certificate II - certificate and signatures"""
+        self._add_title(doc, 'II. CERTIFICATE AND SIGNATURES')
+        self._add_segments(doc, layout.measurement_statement(data))
+        for segments in layout.CERTIFICATE_II_STATEMENTS:
+            self._add_segments(doc, segments)
+        doc.add_paragraph('\n'.join(layout.CERTIFICATE_II_FOOTNOTES))
+
+        for lines in layout.certificate_ii_signatures(data):
+            doc.add_paragraph()
+            for line in lines:
+                doc.add_paragraph(line)
+
+    def _build_certificate_iii(self, doc, data: Dict[str, Any]) -> None:
+        """Certificate III - memorandum of payments"""
+        self._add_title(doc, 'III. MEMORANDUM OF PAYMENTS')
+        self._add_table(
+            doc, layout.CERTIFICATE_III_COLUMNS_MM,
+            [_row(cells, bold=bold) for cells, bold in layout.memorandum_rows(data.get('totals', {}) or {})],
+            header=layout.CERTIFICATE_III_HEADER
+        )
+
+        doc.add_paragraph()
+        for text, bold in layout.payment_lines(data):
+            doc.add_paragraph().add_run(text).bold = bold
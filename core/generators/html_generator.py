@@ -86,43 +86,22 @@ class HTMLGenerator(BaseGenerator):
         # IMPORTANT: First Page uses Bill Quantity data, NOT Work Order data
         # Process bill quantity data - check if it's a valid DataFrame
         if isinstance(self.bill_quantity_data, pd.DataFrame) and not self.bill_quantity_data.empty:
-            for index, row in self.bill_quantity_data.iterrows():
-                quantity_since = self._safe_float(row.get('Quantity Since', row.get('Quantity', 0)))
-                rate = self._safe_float(row.get('Rate', 0))
-                amount = quantity_since * rate
-                total_amount += amount
-                
-                # Use BSR column as remark (there's no separate Remark column)
-                bsr = row.get('BSR', '')
-                
-                # If BSR is not blank, use it as remark (without prefix)
-                if pd.notna(bsr) and str(bsr).strip():
-                    combined_remark = str(bsr).strip()
-                else:
-                    combined_remark = ''
-                
-                work_items.append({
-                    'unit': row.get('Unit', ''),
-                    'quantity_since': quantity_since,
-                    'quantity_upto': self._safe_float(row.get('Quantity Upto', quantity_since)),
-                    'item_no': self._safe_serial_no(row.get('Item No.', row.get('Item', ''))),
-                    'description': row.get('Description', ''),
-                    'rate': rate,
-                    'amount_upto': amount,
-                    'amount_since': amount,
-                    'remark': combined_remark,
-                    'children': []  # Initialize children for hierarchy
-                })
+            source, sheet_key = self.bill_quantity_data, 'bill_quantity_data'
         elif isinstance(self.work_order_data, pd.DataFrame) and not self.work_order_data.empty:
             # Fallback to work order data if bill quantity data is not available
-            for index, row in self.work_order_data.iterrows():
-                quantity_since = self._safe_float(row.get('Quantity Since', row.get('Quantity', 0)))
-                rate = self._safe_float(row.get('Rate', 0))
+            source, sheet_key = self.work_order_data, 'work_order_data'
+        else:
+            source, sheet_key = None, None
+        
+        if source is not None:
+            for row in self._bill_rows(source, sheet_key):
+                quantity_since = row['quantity']
+                rate = row['rate']
                 amount = quantity_since * rate
                 total_amount += amount
                 
-                # Use BSR column as remark (if available in work order)
-                bsr = row.get('BSR', '')
+                # Use BSR column as remark (there's no separate Remark column)
+                bsr = row['bsr']
                 
                 # If BSR is not blank, use it as remark (without prefix)
                 if pd.notna(bsr) and str(bsr).strip():
@@ -131,11 +110,11 @@ class HTMLGenerator(BaseGenerator):
                     combined_remark = ''
                 
                 work_items.append({
-                    'unit': row.get('Unit', ''),
+                    'unit': row['unit'],
                     'quantity_since': quantity_since,
-                    'quantity_upto': self._safe_float(row.get('Quantity Upto', quantity_since)),
-                    'item_no': self._safe_serial_no(row.get('Item No.', row.get('Item', ''))),
-                    'description': row.get('Description', ''),
+                    'quantity_upto': row['quantity_upto'],
+                    'item_no': self._safe_serial_no(row['item']),
+                    'description': row['description'],
                     'rate': rate,
                     'amount_upto': amount,
                     'amount_since': amount,
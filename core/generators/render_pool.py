@@ -0,0 +1,157 @@
+"""
+Render Pool - Shared worker pool for PDF and DOCX rendering
+Documents from one or many bills are submitted together and collected
+as they complete, with per-document timing.
+"""
+import os
+import time
+import threading
+from concurrent.futures import ThreadPoolExecutor, Future, as_completed
+from dataclasses import dataclass
+from typing import Dict, Any, Iterable, Iterator, List, Optional
+
+
+@dataclass
+class RenderResult:
+    """Outcome of one document conversion"""
+    bill: str
+    doc_name: str
+    fmt: str
+    content: Optional[bytes] = None
+    seconds: float = 0.0
+    error: Optional[str] = None
+
+    @property
+    def success(self) -> bool:
+        return self.error is None and self.content is not None
+
+
+class RenderPool:
+    """
+    Shared thread pool for document rendering
+
+    PDF and DOCX conversions for every bill go into the same pool so Word
+    output no longer waits for the PDF pass (or vice versa).
+    """
+
+    def __init__(self, max_workers: Optional[int] = None, margin_mm: int = 10):
+        """
+        Initialize render pool
+
+        Args:
+            max_workers: Worker threads (default: CPU count, capped at 8)
+            margin_mm: Page margin passed to the PDF/DOCX engines
+        """
+        self.max_workers = max_workers or min(8, os.cpu_count() or 4)
+        self.margin_mm = margin_mm
+        self._executor = ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix='render')
+        self._local = threading.local()
+
+    # Engines are created once per worker thread
+    def _pdf_generator(self):
+        if not hasattr(self._local, 'pdf_generator'):
+            from core.generators.pdf_generator_fixed import FixedPDFGenerator
+            self._local.pdf_generator = FixedPDFGenerator(margin_mm=self.margin_mm)
+        return self._local.pdf_generator
+
+    def _native_renderer(self):
+        if not hasattr(self._local, 'native_renderer'):
+            from core.generators.reportlab_renderer import ReportLabRenderer
+            self._local.native_renderer = ReportLabRenderer(margin_mm=self.margin_mm)
+        return self._local.native_renderer
+
+    def _docx_builder(self):
+        if not hasattr(self._local, 'docx_builder'):
+            from core.generators.docx_builder import DocxBuilder
+            self._local.docx_builder = DocxBuilder(margin_mm=self.margin_mm)
+        return self._local.docx_builder
+
+    def _run(self, bill: str, doc_name: str, fmt: str, render) -> RenderResult:
+        """Run a render callable, capturing timing and errors"""
+        start = time.perf_counter()
+        try:
+            content = render()
+            return RenderResult(bill, doc_name, fmt, content, time.perf_counter() - start)
+        except Exception as e:
+            return RenderResult(bill, doc_name, fmt, None, time.perf_counter() - start, str(e))
+
+    def _render_pdf(self, html_content: str, doc_name: str,
+                    template_data: Optional[Dict[str, Any]], native: bool) -> bytes:
+        renderer = self._native_renderer()
+        if native and template_data is not None and renderer.supports(doc_name):
+            return renderer.render(doc_name, template_data)
+        return self._pdf_generator().auto_convert(
+            html_content, landscape=renderer.is_landscape(doc_name), doc_name=doc_name
+        )
+
+    def _render_docx(self, html_content: str, doc_name: str,
+                     template_data: Optional[Dict[str, Any]]) -> bytes:
+        builder = self._docx_builder()
+        if template_data is not None and builder.supports(doc_name):
+            return builder.render(doc_name, template_data)
+        from core.generators.word_generator import WordGenerator
+        return WordGenerator().html_to_docx(html_content, doc_name)
+
+    def submit_pdf(self, bill: str, doc_name: str, html_content: str,
+                   template_data: Optional[Dict[str, Any]] = None, native: bool = False) -> Future:
+        """Queue one PDF conversion"""
+        return self._executor.submit(
+            self._run, bill, doc_name, 'pdf',
+            lambda: self._render_pdf(html_content, doc_name, template_data, native)
+        )
+
+    def submit_docx(self, bill: str, doc_name: str, html_content: str,
+                    template_data: Optional[Dict[str, Any]] = None) -> Future:
+        """Queue one DOCX build"""
+        return self._executor.submit(
+            self._run, bill, doc_name, 'docx',
+            lambda: self._render_docx(html_content, doc_name, template_data)
+        )
+
+    def submit_bill(self, bill: str, html_documents: Dict[str, str],
+                    template_data: Optional[Dict[str, Any]] = None,
+                    pdf: bool = True, docx: bool = True, native_pdf: bool = False) -> List[Future]:
+        """
+        Queue every requested output for one bill
+
+        Args:
+            bill: Bill identifier (e.g. source file prefix)
+            html_documents: Dictionary of document names to HTML content
+            template_data: Prepared data from HTMLGenerator.template_data
+            pdf: Generate PDFs
+            docx: Generate Word documents
+            native_pdf: Use the native ReportLab renderer where available
+
+        Returns:
+            List of futures resolving to RenderResult
+        """
+        futures = []
+        for doc_name, html_content in html_documents.items():
+            if docx:
+                futures.append(self.submit_docx(bill, doc_name, html_content, template_data))
+            if pdf:
+                futures.append(self.submit_pdf(bill, doc_name, html_content, template_data, native_pdf))
+        return futures
+
+    @staticmethod
+    def iter_completed(futures: Iterable[Future]) -> Iterator[RenderResult]:
+        """Yield results in completion order"""
+        for future in as_completed(list(futures)):
+            yield future.result()
+
+    def shutdown(self, wait: bool = True) -> None:
+        """Stop the worker threads"""
+        self._executor.shutdown(wait=wait)
+
+
+# Global instance
+_render_pool = None
+_render_pool_lock = threading.Lock()
+
+def get_render_pool() -> RenderPool:
+    """Get global render pool instance"""
+    global _render_pool
+    with _render_pool_lock:
+        if _render_pool is None:
+            _render_pool = RenderPool()
+    return _render_pool
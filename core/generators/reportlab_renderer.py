@@ -0,0 +1,310 @@
+"""
+Native ReportLab Renderer - Build bill PDFs directly from template data
+No HTML round-trip: First Page, Deviation Statement and Certificates are laid
+out from the prepared row records with exact 10mm margins.
+"""
+import io
+from typing import Dict, Any, List, Optional
+from xml.sax.saxutils import escape
+
+from reportlab.lib import colors
+from reportlab.lib.enums import TA_CENTER
+from reportlab.lib.pagesizes import A4, landscape as rl_landscape
+from reportlab.lib.styles import ParagraphStyle
+from reportlab.lib.units import mm
+from reportlab.platypus import SimpleDocTemplate, Paragraph, Table, TableStyle, Spacer
+
+from core.generators import bill_layout as layout
+
+
+class ReportLabRenderer:
+    """
+    Native PDF renderer for bill documents
+
+    Builds ReportLab flowables straight from HTMLGenerator.template_data:
+    - Exact 10mm margins on all sides
+    - Landscape A4 for Deviation Statement
+    - Header rows repeat and long tables split across pages
+    """
+
+    def __init__(self, margin_mm: int = 10, font_size: float = 8):
+        """
+        Initialize native renderer
+
+        Args:
+            margin_mm: Margin size in millimeters (default: 10mm)
+            font_size: Base font size for table cells
+        """
+        self.margin_mm = margin_mm
+        self.font_size = font_size
+
+        self.cell_style = ParagraphStyle(
+            'BillCell', fontName='Helvetica', fontSize=font_size, leading=font_size + 1.5
+        )
+        self.bold_cell_style = ParagraphStyle(
+            'BillCellBold', parent=self.cell_style, fontName='Helvetica-Bold'
+        )
+        self.header_cell_style = ParagraphStyle(
+            'BillHeaderCell', parent=self.bold_cell_style, alignment=TA_CENTER
+        )
+        self.title_style = ParagraphStyle(
+            'BillTitle', fontName='Helvetica-Bold', fontSize=12, leading=15,
+            alignment=TA_CENTER, spaceAfter=6
+        )
+        self.text_style = ParagraphStyle(
+            'BillText', fontName='Helvetica', fontSize=9, leading=12, spaceAfter=6
+        )
+
+        # Document name -> (story builder, landscape)
+        self._layouts = {
+            'First Page Summary': (self._first_page_story, False),
+            'Deviation Statement': (self._deviation_story, True),
+            'Certificate II': (self._certificate_ii_story, False),
+            'Certificate III': (self._certificate_iii_story, False),
+        }
+
+    def supports(self, doc_name: str) -> bool:
+        """Check whether a document has a native layout"""
+        return doc_name in self._layouts
+
+    def is_landscape(self, doc_name: str) -> bool:
+        """
+        Page orientation for a document
+
+        Native layouts use their own setting; any other document follows the
+        HTML templates (only the Deviation Statement is landscape), so an HTML
+        fallback renders in the same orientation as the native path would.
+        """
+        if doc_name in self._layouts:
+            return self._layouts[doc_name][1]
+        return 'deviation' in doc_name.lower()
+
+    def render(self, doc_name: str, template_data: Dict[str, Any]) -> bytes:
+        """
+        Render one document to PDF
+
+        Args:
+            doc_name: Document name as produced by HTMLGenerator
+            template_data: Prepared data from HTMLGenerator.template_data
+
+        Returns:
+            PDF bytes
+        """
+        if doc_name not in self._layouts:
+            raise ValueError(f"No native ReportLab layout for: {doc_name}")
+
+        build_story, _ = self._layouts[doc_name]
+        pagesize = rl_landscape(A4) if self.is_landscape(doc_name) else A4
+
+        buffer = io.BytesIO()
+        doc = SimpleDocTemplate(
+            buffer,
+            pagesize=pagesize,
+            leftMargin=self.margin_mm * mm,
+            rightMargin=self.margin_mm * mm,
+            topMargin=self.margin_mm * mm,
+            bottomMargin=self.margin_mm * mm,
+            title=doc_name
+        )
+        doc.build(build_story(template_data, doc.width))
+
+        pdf_bytes = buffer.getvalue()
+        buffer.close()
+        return pdf_bytes
+
+    def render_all(self, template_data: Dict[str, Any],
+                   doc_names: Optional[List[str]] = None) -> Dict[str, bytes]:
+        """
+        Render every supported document
+
+        Args:
+            template_data: Prepared data from HTMLGenerator.template_data
+            doc_names: Documents to render (default: all native layouts)
+
+        Returns:
+            Dict of {doc_name: pdf_bytes}
+        """
+        pdf_documents = {}
+        for doc_name in (doc_names or list(self._layouts)):
+            if not self.supports(doc_name):
+                continue
+            try:
+                pdf_documents[doc_name] = self.render(doc_name, template_data)
+            except Exception as e:
+                print(f"[ERROR] ReportLab native render failed for {doc_name}: {e}")
+        return pdf_documents
+
+    # ------------------------------------------------------------------
+    # Cell helpers
+    # ------------------------------------------------------------------
+
+    def _p(self, text: Any, style: Optional[ParagraphStyle] = None) -> Paragraph:
+        """Wrap text in a paragraph so long cells wrap instead of overflowing"""
+        return Paragraph(escape('' if text is None else str(text)), style or self.cell_style)
+
+    def _segments(self, segments: layout.Segments, style: Optional[ParagraphStyle] = None) -> Paragraph:
+        """Paragraph from (text, bold) segments"""
+        markup = ''.join(f"<b>{escape(text)}</b>" if bold else escape(text) for text, bold in segments)
+        return Paragraph(markup, style or self.text_style)
+
+    @staticmethod
+    def _scaled_widths(widths: List[float], available: float) -> List[float]:
+        """Scale relative column widths to the available frame width"""
+        total = float(sum(widths))
+        return [available * w / total for w in widths]
+
+    def _grid_style(self, header_rows: int = 1, font_size: Optional[float] = None) -> List[tuple]:
+        """Common table style: full grid, grey header, top-aligned cells"""
+        commands = [
+            ('GRID', (0, 0), (-1, -1), 0.5, colors.black),
+            ('VALIGN', (0, 0), (-1, -1), 'TOP'),
+            ('FONTNAME', (0, 0), (-1, -1), 'Helvetica'),
+            ('FONTSIZE', (0, 0), (-1, -1), font_size or self.font_size),
+            ('LEFTPADDING', (0, 0), (-1, -1), 2),
+            ('RIGHTPADDING', (0, 0), (-1, -1), 2),
+            ('TOPPADDING', (0, 0), (-1, -1), 2),
+            ('BOTTOMPADDING', (0, 0), (-1, -1), 2),
+        ]
+        if header_rows:
+            commands.append(('BACKGROUND', (0, 0), (-1, header_rows - 1), colors.HexColor('#f0f0f0')))
+        return commands
+
+    # ------------------------------------------------------------------
+    # First Page Summary
+    # ------------------------------------------------------------------
+
+    def _first_page_story(self, data: Dict[str, Any], width: float) -> list:
+        """Build First Page Summary flowables"""
+        title_data = data.get('title_data', {}) or {}
+
+        info_rows = [
+            [self._p(layout.FIRST_PAGE_BANNER, self.header_cell_style), ''],
+            [self._p(layout.first_page_heading(title_data), self.header_cell_style), ''],
+            [self._p('Cash Book Voucher No.'), self._p('Date-')],
+        ]
+        for label, value in layout.first_page_info(title_data):
+            info_rows.append([self._p(label), self._p(value)])
+
+        info_table = Table(info_rows, colWidths=self._scaled_widths(layout.FIRST_PAGE_INFO_COLUMNS_MM, width))
+        info_table.setStyle(TableStyle(self._grid_style(header_rows=0) + [
+            ('SPAN', (0, 0), (-1, 0)),
+            ('SPAN', (0, 1), (-1, 1)),
+        ]))
+        story = [info_table, Spacer(1, 4 * mm)]
+
+        # Items table: text columns wrap, number columns stay plain strings
+        rows = [[self._p(text, self.header_cell_style) for text in layout.FIRST_PAGE_HEADER]]
+        style = self._grid_style()
+        for item, cells in layout.first_page_items(data.get('items', [])):
+            desc_style = self.bold_cell_style if item.get('bold') else self.cell_style
+            for col in (0, 3, 8):
+                cells[col] = self._p(cells[col])
+            cells[4] = self._p(cells[4], desc_style)
+            rows.append(cells)
+
+        totals_start = len(rows)
+        totals_rows = layout.first_page_totals(data)
+        for index, (merged, label, rate, upto_date, since_previous, remark) in enumerate(totals_rows):
+            # Net Payable (last row) is highlighted
+            label_style = self.bold_cell_style if index == len(totals_rows) - 1 else self.cell_style
+            rows.append([merged, '', '', '', self._p(label, label_style), rate, upto_date, since_previous, remark])
+
+        for row_idx in range(totals_start, len(rows)):
+            style.append(('SPAN', (0, row_idx), (3, row_idx)))
+        style.extend([
+            ('ALIGN', (0, totals_start + 2), (0, totals_start + 2), 'CENTER'),
+            ('BACKGROUND', (0, len(rows) - 1), (-1, len(rows) - 1), colors.HexColor('#f0f0f0')),
+            ('FONTNAME', (6, len(rows) - 1), (7, len(rows) - 1), 'Helvetica-Bold'),
+        ])
+
+        items_table = Table(rows, colWidths=self._scaled_widths(layout.FIRST_PAGE_COLUMNS_MM, width), repeatRows=1)
+        items_table.setStyle(TableStyle(style))
+        story.append(items_table)
+        return story
+
+    # ------------------------------------------------------------------
+    # Deviation Statement
+    # ------------------------------------------------------------------
+
+    def _deviation_story(self, data: Dict[str, Any], width: float) -> list:
+        """Build Deviation Statement flowables (landscape)"""
+        title_data = data.get('title_data', {}) or {}
+        story = [Paragraph('DEVIATION STATEMENT', self.title_style)]
+        for label, keys in layout.BILL_HEADER_FIELDS:
+            story.append(self._segments([(label, True), (' ' + layout.title_value(title_data, *keys), False)]))
+
+        rows = [[self._p(text, self.header_cell_style) for text in layout.DEVIATION_HEADER]]
+        style = self._grid_style(font_size=self.font_size - 1)
+
+        for item in data.get('deviation_items', []) or []:
+            desc = escape(str(item.get('description') or ''))
+            if item.get('is_separator') or item.get('is_divider'):
+                row = [''] * 13
+                row[1] = Paragraph(f"<b><u>{desc}</u></b>", self.cell_style)
+                style.append(('BACKGROUND', (0, len(rows)), (-1, len(rows)), colors.HexColor('#f0f0f0')))
+                rows.append(row)
+                continue
+
+            if item.get('underline'):
+                desc = f"<u>{desc}</u>"
+            if item.get('bold'):
+                desc = f"<b>{desc}</b>"
+            row = layout.deviation_item_cells(item)
+            row[0] = self._p(row[0])
+            row[1] = Paragraph(desc, self.cell_style)
+            row[2] = self._p(row[2])
+            row[12] = self._p(row[12])
+            rows.append(row)
+
+        for cells, bold in layout.deviation_totals(data.get('summary', {}) or {}):
+            cells[1] = self._p(cells[1], self.bold_cell_style if bold else self.cell_style)
+            if bold:
+                style.append(('FONTNAME', (2, len(rows)), (-1, len(rows)), 'Helvetica-Bold'))
+            rows.append(cells)
+
+        table = Table(rows, colWidths=self._scaled_widths(layout.DEVIATION_COLUMNS_MM, width), repeatRows=1)
+        table.setStyle(TableStyle(style))
+        story.append(table)
+        return story
+
+    # ------------------------------------------------------------------
+    # Certificates
+    # ------------------------------------------------------------------
+
+    def _certificate_ii_story(self, data: Dict[str, Any], width: float) -> list:
+        """Build Certificate II flowables"""
+        story = [Paragraph('II. CERTIFICATE AND SIGNATURES', self.title_style)]
+        story.append(self._segments(layout.measurement_statement(data)))
+        for segments in layout.CERTIFICATE_II_STATEMENTS:
+            story.append(self._segments(segments))
+        story.append(Paragraph('<br/>'.join(escape(n) for n in layout.CERTIFICATE_II_FOOTNOTES), self.text_style))
+
+        for lines in layout.certificate_ii_signatures(data):
+            story.append(Spacer(1, 8 * mm))
+            story.extend(Paragraph(escape(line), self.text_style) for line in lines)
+        return story
+
+    def _certificate_iii_story(self, data: Dict[str, Any], width: float) -> list:
+        """Build Certificate III (Memorandum of Payments) flowables"""
+        story = [Paragraph('III. MEMORANDUM OF PAYMENTS', self.title_style)]
+
+        rows = [[self._p(text, self.header_cell_style) for text in layout.CERTIFICATE_III_HEADER]]
+        style = self._grid_style()
+        style.extend([
+            ('ALIGN', (4, 1), (4, -1), 'RIGHT'),
+            ('ALIGN', (6, 1), (6, -1), 'RIGHT'),
+        ])
+        for cells, bold in layout.memorandum_rows(data.get('totals', {}) or {}):
+            if bold:
+                style.append(('FONTNAME', (0, len(rows)), (-1, len(rows)), 'Helvetica-Bold'))
+            cells[1] = self._p(cells[1], self.bold_cell_style if bold else self.cell_style)
+            rows.append(cells)
+
+        table = Table(rows, colWidths=self._scaled_widths(layout.CERTIFICATE_III_COLUMNS_MM, width), repeatRows=1)
+        table.setStyle(TableStyle(style))
+        story.append(table)
+        story.append(Spacer(1, 4 * mm))
+
+        for text, bold in layout.payment_lines(data):
+            story.append(self._segments([(text, bold)]))
+        return story
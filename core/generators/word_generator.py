@@ -6,16 +6,17 @@ from docx.shared import Pt, Inches, RGBColor
 from docx.enum.text import WD_ALIGN_PARAGRAPH
 from bs4 import BeautifulSoup
 import re
-from typing import Dict, Any
+from typing import Dict, Any, Optional
 from pathlib import Path
+from core.generators.docx_builder import DocxBuilder
 
 
 class WordGenerator:
-    """Generate Word documents from HTML content"""
+    """Generate Word documents from template data (HTML content as fallback)"""
     
     def __init__(self):
         """Initialize Word generator"""
-        pass
+        self.builder = DocxBuilder(margin_mm=10)
     
     def html_to_docx(self, html_content: str, doc_name: str) -> bytes:
         """
@@ -92,23 +93,36 @@ class WordGenerator:
         buffer.seek(0)
         return buffer.getvalue()
     
-    def generate_all_docx(self, html_documents: Dict[str, str]) -> Dict[str, bytes]:
+    def generate_all_docx(self, html_documents: Dict[str, str],
+                          template_data: Optional[Dict[str, Any]] = None) -> Dict[str, bytes]:
         """
         Generate Word documents for all HTML documents
         
+        When template data is supplied, documents are built directly from the
+        prepared row records; HTML is only parsed for unknown documents.
+        Documents are built concurrently on the shared render pool.
+        
         Args:
             html_documents: Dictionary of document names to HTML content
+            template_data: Prepared data from HTMLGenerator.template_data
             
         Returns:
             Dictionary of document names to Word document bytes
         """
-        docx_documents = {}
+        from core.generators.render_pool import get_render_pool
+        pool = get_render_pool()
+        
+        futures = [
+            pool.submit_docx('', doc_name, html_content, template_data)
+            for doc_name, html_content in html_documents.items()
+        ]
         
-        for doc_name, html_content in html_documents.items():
-            try:
-                docx_bytes = self.html_to_docx(html_content, doc_name)
-                docx_documents[doc_name] = docx_bytes
-            except Exception as e:
-                print(f"Error generating Word document for {doc_name}: {e}")
+        built = {}
+        for result in pool.iter_completed(futures):
+            if result.success:
+                built[result.doc_name] = result.content
+            else:
+                print(f"Error generating Word document for {result.doc_name}: {result.error}")
         
-        return docx_documents
+        # Keep the caller's document order
+        return {doc_name: built[doc_name] for doc_name in html_documents if doc_name in built}
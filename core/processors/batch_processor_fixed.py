@@ -5,15 +5,30 @@ With automatic cache cleaning and centralized output management
 """
 import streamlit as st
 from pathlib import Path
-import io
-import zipfile
 from datetime import datetime
 import time
 import gc
+from collections import deque
 
 # Import utilities
 from core.utils.output_manager import get_output_manager
 from core.utils.cache_cleaner import CacheCleaner
+from core.ui.job_panel import remember_jobs, show_job_panel
+
+# Bills whose renders may be queued at once; older bills are collected
+# (and their HTML/template data released) before the next one is parsed
+BILLS_IN_FLIGHT = 2
+
+
+def _unique_prefix(prefix, taken):
+    """File prefix not used by an earlier upload ('bill', 'bill (2)', ...)"""
+    taken = set(taken)
+    candidate, counter = prefix, 2
+    while candidate in taken:
+        candidate = f"{prefix} ({counter})"
+        counter += 1
+    return candidate
+
 
 def show_batch_mode(config):
     """Show batch processing interface with correct template flow"""
@@ -78,10 +93,35 @@ def show_batch_mode(config):
         save_to_output = st.checkbox("💾 Save to OUTPUT folder", value=True,
                                     help="Uncheck to download ZIP only")
         
+        fast_pdf = st.checkbox(
+            "⚡ Fast PDF (native ReportLab)",
+            value=getattr(getattr(config, 'processing', None), 'pdf_engine', '') == 'reportlab',
+            help="Render First Page, Deviation and Certificates directly with ReportLab "
+                 "(no HTML layout) - fastest for large batches"
+        )
+        
+        run_in_background = st.checkbox(
+            "🕒 Run in background", value=False,
+            help="Queue one job per file on the server's worker pool; progress and downloads appear below"
+        )
+        
         st.markdown("<br>", unsafe_allow_html=True)
         
         # Large prominent batch run button
-        if st.button("⚡ RUN BATCH PROCESSING", type="primary", use_container_width=True):
+        run_clicked = st.button("⚡ RUN BATCH PROCESSING", type="primary", use_container_width=True)
+        if run_clicked and run_in_background:
+            from core.batch.job_queue import get_job_queue
+            job_queue = get_job_queue(getattr(getattr(config, 'processing', None), 'pdf_engine', None))
+            options = {'html': generate_html, 'pdf': generate_pdf, 'docx': generate_word,
+                       'native_pdf': fast_pdf, 'save_to_output': save_to_output}
+            remember_jobs('batch_jobs', [
+                job_queue.submit_workbook(uploaded_file.getvalue(), uploaded_file.name, options)
+                for uploaded_file in uploaded_files
+            ])
+            st.success(f"✅ Queued {len(uploaded_files)} files on {job_queue.max_workers} worker processes")
+            run_clicked = False
+        
+        if run_clicked:
             # Clean cache before processing
             CacheCleaner.clean_cache(verbose=False)
             
@@ -97,6 +137,52 @@ def show_batch_mode(config):
             total_files = len(uploaded_files)
             results = []
             saved_files = []
+            timings = []
+            
+            # Shared pool: DOCX and PDF jobs for up to BILLS_IN_FLIGHT bills run side by side
+            from core.generators.render_pool import get_render_pool
+            render_pool = get_render_pool()
+            in_flight = deque()
+            bill_folders = {}
+            bill_results = {}
+            bill_prefixes = {}
+            
+            def collect(futures):
+                """Gather one bill's rendered documents"""
+                for render_result in render_pool.iter_completed(futures):
+                    bill_id = render_result.bill
+                    file_prefix = bill_prefixes[bill_id]
+                    status_text.text(
+                        f"Rendering {file_prefix} - {render_result.doc_name} ({render_result.fmt.upper()})"
+                    )
+                    timings.append({
+                        'file': file_prefix,
+                        'document': render_result.doc_name,
+                        'format': render_result.fmt.upper(),
+                        'seconds': round(render_result.seconds, 3)
+                    })
+                    
+                    if not render_result.success:
+                        bill_results[bill_id].setdefault('failed', []).append(
+                            f"{render_result.doc_name}.{render_result.fmt}: {render_result.error}"
+                        )
+                        continue
+                    
+                    output_name = f"{file_prefix}_{render_result.doc_name}.{render_result.fmt}"
+                    if render_result.fmt == 'pdf':
+                        all_pdfs.append((file_prefix, output_name, render_result.content))
+                    else:
+                        all_words.append((file_prefix, output_name, render_result.content))
+                    
+                    # Save to OUTPUT folder if requested
+                    if save_to_output and output_mgr:
+                        saved_path = output_mgr.save_file(
+                            render_result.content,
+                            render_result.doc_name,  # Just doc name, no prefix (folder has it)
+                            render_result.fmt,
+                            folder=bill_folders.get(bill_id)
+                        )
+                        saved_files.append(saved_path)
             
             for idx, uploaded_file in enumerate(uploaded_files):
                 status_text.text(f"Processing {idx+1}/{total_files}: {uploaded_file.name}")
@@ -107,90 +193,59 @@ def show_batch_mode(config):
                     processor = ExcelProcessor()
                     processed_data = processor.process_excel(uploaded_file)
                     
-                    # Get file prefix for subfolder
-                    file_prefix = uploaded_file.name.split('.')[0]
+                    # Get file prefix for subfolder; uploads may share a name, the bill id never does
+                    file_prefix = _unique_prefix(uploaded_file.name.split('.')[0], bill_prefixes.values())
+                    bill_id = f"{idx}:{file_prefix}"
+                    bill_prefixes[bill_id] = file_prefix
                     
                     # Create subfolder for this file if saving to OUTPUT
                     if save_to_output and output_mgr:
-                        output_mgr.set_source_file(file_prefix)
+                        bill_folders[bill_id] = output_mgr.set_source_file(file_prefix)
                     
                     # Step 2: Generate HTML using templates
                     from core.generators.document_generator import DocumentGenerator
                     doc_gen = DocumentGenerator(processed_data)
                     html_documents = doc_gen.generate_all_documents()
                     
-                    # Step 3: Generate Word documents if requested
-                    if generate_word:
-                        from core.generators.word_generator import WordGenerator
-                        word_gen = WordGenerator()
-                        word_documents = word_gen.generate_all_docx(html_documents)
-                        
-                        for doc_name, docx_bytes in word_documents.items():
-                            word_filename = f"{file_prefix}_{doc_name}.docx"
-                            all_words.append((word_filename, docx_bytes))
-                            
-                            # Save to OUTPUT folder if requested
-                            if save_to_output and output_mgr:
-                                saved_path = output_mgr.save_file(
-                                    docx_bytes,
-                                    doc_name,
-                                    'docx'
-                                )
-                                saved_files.append(saved_path)
-                    
-                    # Step 4: Convert to PDF if requested
-                    if generate_pdf:
-                        from core.generators.pdf_generator_fixed import FixedPDFGenerator
-                        pdf_generator = FixedPDFGenerator(margin_mm=10)
-                        
+                    if generate_html:
                         for doc_name, html_content in html_documents.items():
-                            landscape = 'deviation' in doc_name.lower()
-                            pdf_bytes = pdf_generator.auto_convert(
-                                html_content,
-                                landscape=landscape,
-                                doc_name=doc_name
-                            )
+                            all_htmls.append((file_prefix, f"{file_prefix}_{doc_name}.html", html_content))
                             
-                            pdf_filename = f"{file_prefix}_{doc_name}.pdf"
-                            all_pdfs.append((pdf_filename, pdf_bytes))
-                            
-                            # Save to OUTPUT folder if requested
+                            # Save HTML to OUTPUT folder if requested
                             if save_to_output and output_mgr:
-                                saved_path = output_mgr.save_file(
-                                    pdf_bytes,
+                                saved_path = output_mgr.save_text_file(
+                                    html_content,
                                     doc_name,  # Just doc name, no prefix (folder has it)
-                                    'pdf'
+                                    'html'
                                 )
                                 saved_files.append(saved_path)
-                            
-                            if generate_html:
-                                html_filename = f"{file_prefix}_{doc_name}.html"
-                                all_htmls.append((html_filename, html_content))
-                                
-                                # Save HTML to OUTPUT folder if requested
-                                if save_to_output and output_mgr:
-                                    saved_path = output_mgr.save_text_file(
-                                        html_content,
-                                        doc_name,  # Just doc name, no prefix (folder has it)
-                                        'html'
-                                    )
-                                    saved_files.append(saved_path)
-                        
-                        # Clean up memory
-                        del pdf_generator
-                        gc.collect()
                     
-                    # Clean up after each file
+                    # Steps 3 & 4: queue Word and PDF conversion
+                    in_flight.append(render_pool.submit_bill(
+                        bill_id,
+                        html_documents,
+                        template_data=doc_gen.html_generator.template_data,
+                        pdf=generate_pdf,
+                        docx=generate_word,
+                        native_pdf=fast_pdf
+                    ))
+                    
+                    result = {
+                        'file': uploaded_file.name,
+                        'status': 'success',
+                        'docs': len(html_documents)
+                    }
+                    bill_results[bill_id] = result
+                    results.append(result)
+                    
+                    # Clean up after each file (queued renders hold the only remaining references)
                     del html_documents
                     del processed_data
                     del doc_gen
-                    gc.collect()
                     
-                    results.append({
-                        'file': uploaded_file.name,
-                        'status': 'success',
-                        'docs': len(all_pdfs) // (idx + 1) if all_pdfs else 0
-                    })
+                    # Collect the oldest bill before parsing more, so memory stays bounded
+                    while len(in_flight) > BILLS_IN_FLIGHT:
+                        collect(in_flight.popleft())
                     
                     # Clean cache every 10 files
                     if (idx + 1) % 10 == 0:
@@ -204,7 +259,14 @@ def show_batch_mode(config):
                         'error': str(e)
                     })
                 
-                progress_bar.progress((idx + 1) / total_files)
+                progress_bar.progress((idx + 1) / (total_files + 1))
+            
+            # Collect the bills still rendering
+            while in_flight:
+                collect(in_flight.popleft())
+            
+            gc.collect()
+            progress_bar.progress(1.0)
             
             status_text.text("✅ Batch processing complete!")
             
@@ -229,46 +291,41 @@ def show_batch_mode(config):
             # Show detailed results
             with st.expander("📋 Detailed Results", expanded=False):
                 for result in results:
-                    if result['status'] == 'success':
+                    if result['status'] == 'success' and result.get('failed'):
+                        st.warning(f"⚠️ {result['file']}: " + '; '.join(result['failed']))
+                    elif result['status'] == 'success':
                         st.success(f"✅ {result['file']}")
                     else:
                         st.error(f"❌ {result['file']}: {result.get('error', 'Unknown error')}")
             
+            # Per-document render timing
+            if timings:
+                with st.expander("⏱️ Rendering Times", expanded=False):
+                    st.dataframe(timings, use_container_width=True)
+            
             # Create ZIP download
             if all_pdfs:
                 st.markdown("---")
                 st.markdown("### 📥 Download Results")
                 
                 with st.spinner("Creating ZIP archive..."):
-                    zip_buffer = io.BytesIO()
-                    with zipfile.ZipFile(zip_buffer, 'w', zipfile.ZIP_DEFLATED) as zip_file:
-                        # Add PDFs
-                        for pdf_name, pdf_bytes in all_pdfs:
-                            if create_folders:
-                                # Organize by file
-                                file_prefix = pdf_name.split('_')[0]
-                                zip_file.writestr(f"{file_prefix}/pdf/{pdf_name}", pdf_bytes)
-                            else:
-                                zip_file.writestr(f"pdf/{pdf_name}", pdf_bytes)
-                        
-                        # Add HTMLs
+                    # Entries are streamed into a spooled temp file, not a second in-memory copy
+                    from core.utils.streaming_zip import StreamingZipWriter, archive_bytes
+                    with StreamingZipWriter() as zip_file:
+                        # Add PDFs, then HTMLs and Word documents
+                        outputs = [('pdf', all_pdfs)]
                         if generate_html:
-                            for html_name, html_content in all_htmls:
-                                if create_folders:
-                                    # Organize by file
-                                    file_prefix = html_name.split('_')[0]
-                                    zip_file.writestr(f"{file_prefix}/html/{html_name}", html_content)
-                                else:
-                                    zip_file.writestr(f"html/{html_name}", html_content)
-                        
-                        # Add Word documents
+                            outputs.append(('html', all_htmls))
                         if generate_word:
-                            for word_name, word_bytes in all_words:
+                            outputs.append(('word', all_words))
+                        for subfolder, documents in outputs:
+                            for file_prefix, doc_file_name, content in documents:
                                 if create_folders:
-                                    file_prefix = word_name.split('_')[0]
-                                    zip_file.writestr(f"{file_prefix}/word/{word_name}", word_bytes)
+                                    # Organize by file
+                                    zip_file.add_bytes(f"{file_prefix}/{subfolder}/{doc_file_name}", content)
                                 else:
-                                    zip_file.writestr(f"word/{word_name}", word_bytes)
+                                    zip_file.add_bytes(f"{subfolder}/{doc_file_name}", content)
+                    zip_bytes = archive_bytes(zip_file.close())
                 
                 timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
                 
@@ -284,7 +341,7 @@ def show_batch_mode(config):
                 
                 st.download_button(
                     label=f"📦 Download All Documents ({' + '.join(doc_summary)})",
-                    data=zip_buffer.getvalue(),
+                    data=zip_bytes,
                     file_name=f"batch_output_{timestamp}.zip",
                     mime="application/zip",
                     type="primary",
@@ -304,3 +361,6 @@ def show_batch_mode(config):
             
             # Clean cache after processing
             CacheCleaner.clean_cache(verbose=False)
+    
+    # Background jobs survive reruns and are shown until cleared
+    show_job_panel('batch_jobs')
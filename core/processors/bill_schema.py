@@ -0,0 +1,191 @@
+"""
+Bill Schema - Typed, columnar layout for Work Order / Bill Quantity sheets
+Normalises a sheet once into float64 amounts, categorical units and
+Arrow-backed strings, and records where each logical column lives so
+generators can read whole columns instead of converting cell by cell.
+"""
+from dataclasses import asdict, dataclass, field
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+# Logical column -> accepted sheet headers (first match wins)
+COLUMN_CANDIDATES = {
+    'item': ('Item No.', 'Item'),
+    'description': ('Description',),
+    'unit': ('Unit',),
+    'quantity': ('Quantity Since', 'Quantity'),
+    'quantity_upto': ('Quantity Upto',),
+    'rate': ('Rate',),
+    'amount': ('Amount',),
+    'bsr': ('BSR',),
+}
+
+NUMERIC_HEADERS = ('Quantity', 'Quantity Since', 'Quantity Upto', 'Rate', 'Amount')
+STRING_HEADERS = ('Item No.', 'Item', 'Description', 'BSR')
+CATEGORY_HEADERS = ('Unit',)
+
+BILL_SHEETS = ('work_order_data', 'bill_quantity_data')
+
+_string_dtype = None
+
+
+def string_dtype():
+    """
+    Arrow-backed string dtype with NaN as the missing value
+
+    NaN (rather than pd.NA) keeps ``pd.notna``/``str()`` behaviour identical
+    to the untyped frames. Falls back to the plain string dtype when pyarrow
+    or the ``na_value`` option is unavailable.
+    """
+    global _string_dtype
+    if _string_dtype is None:
+        for args in ({'storage': 'pyarrow', 'na_value': np.nan}, {'storage': 'pyarrow'}, {}):
+            try:
+                _string_dtype = pd.StringDtype(**args)
+                break
+            except (ImportError, TypeError, ValueError):
+                continue
+    return _string_dtype
+
+
+def _as_text(series: pd.Series) -> pd.Series:
+    # str() per non-null cell keeps item codes exactly as generators print them (e.g. '1.0')
+    return series.astype(object).map(str, na_action='ignore').astype(string_dtype())
+
+
+@dataclass(frozen=True)
+class SheetSchema:
+    """Where each logical column lives in one typed sheet"""
+    item: Optional[str] = None
+    description: Optional[str] = None
+    unit: Optional[str] = None
+    quantity: Optional[str] = None
+    quantity_upto: Optional[str] = None
+    rate: Optional[str] = None
+    amount: Optional[str] = None
+    bsr: Optional[str] = None
+    rows: int = 0
+    units: Tuple[str, ...] = ()
+
+    @classmethod
+    def from_frame(cls, df: pd.DataFrame) -> 'SheetSchema':
+        """
+        Resolve logical columns against a sheet's headers
+
+        Args:
+            df: Work Order or Bill Quantity DataFrame
+
+        Returns:
+            SheetSchema for the frame
+        """
+        columns = {}
+        for name, candidates in COLUMN_CANDIDATES.items():
+            columns[name] = next((c for c in candidates if c in df.columns), None)
+        units = ()
+        if columns['unit'] and isinstance(df[columns['unit']].dtype, pd.CategoricalDtype):
+            units = tuple(str(u) for u in df[columns['unit']].cat.categories)
+        return cls(rows=len(df), units=units, **columns)
+
+    def iter_rows(self, df: pd.DataFrame) -> Iterator[Dict[str, Any]]:
+        """
+        Iterate rows as plain dicts built from whole columns
+
+        Numeric fields are already float64 with blanks as 0.0; missing text
+        fields are NaN, matching what ``row.get(...)`` returned before.
+
+        Args:
+            df: Frame this schema was built from
+
+        Yields:
+            Dict with item, description, unit, quantity, quantity_upto, rate, amount, bsr
+        """
+        def text(name: str) -> List[Any]:
+            column = getattr(self, name)
+            return df[column].tolist() if column else [''] * len(df)
+
+        def number(name: str, default: Optional[List[float]] = None) -> List[float]:
+            column = getattr(self, name)
+            if column is None:
+                return default if default is not None else [0.0] * len(df)
+            return df[column].fillna(0.0).tolist()
+
+        quantity = number('quantity')
+        columns = {
+            'item': text('item'),
+            'description': text('description'),
+            'unit': text('unit'),
+            'quantity': quantity,
+            'quantity_upto': number('quantity_upto', quantity),
+            'rate': number('rate'),
+            'amount': number('amount'),
+            'bsr': text('bsr'),
+        }
+        names = list(columns)
+        for values in zip(*columns.values()):
+            yield dict(zip(names, values))
+
+    def to_dict(self) -> Dict[str, Any]:
+        return asdict(self)
+
+
+@dataclass(frozen=True)
+class BillSchema:
+    """Schemas for the typed sheets of one processed bill"""
+    sheets: Dict[str, SheetSchema] = field(default_factory=dict)
+
+    def get(self, sheet_key: str) -> Optional[SheetSchema]:
+        return self.sheets.get(sheet_key)
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {key: schema.to_dict() for key, schema in self.sheets.items()}
+
+
+def normalize_sheet(df: pd.DataFrame) -> Tuple[pd.DataFrame, SheetSchema]:
+    """
+    Convert a Work Order / Bill Quantity frame to typed columns
+
+    Quantities, rates and amounts become float64 (non-numeric cells such as
+    'Above' become NaN), units become categorical and item codes,
+    descriptions and BSR references become Arrow strings.
+
+    Args:
+        df: Sheet as read by ExcelProcessor
+
+    Returns:
+        Tuple of (typed DataFrame, SheetSchema)
+    """
+    if df is None or df.empty:
+        frame = df if df is not None else pd.DataFrame()
+        return frame, SheetSchema.from_frame(frame)
+
+    typed = df.copy()
+    for column in typed.columns:
+        if column in NUMERIC_HEADERS:
+            typed[column] = pd.to_numeric(typed[column], errors='coerce').astype('float64')
+        elif column in STRING_HEADERS:
+            typed[column] = _as_text(typed[column])
+        elif column in CATEGORY_HEADERS:
+            typed[column] = _as_text(typed[column]).astype('category')
+    return typed, SheetSchema.from_frame(typed)
+
+
+def normalize_bill(processed_data: Dict[str, Any]) -> BillSchema:
+    """
+    Normalise the bill sheets of processed data in place
+
+    Args:
+        processed_data: Output of ExcelProcessor.process_excel
+
+    Returns:
+        BillSchema (also stored under processed_data['schema'])
+    """
+    sheets = {}
+    for key in BILL_SHEETS:
+        frame = processed_data.get(key)
+        if isinstance(frame, pd.DataFrame):
+            processed_data[key], sheets[key] = normalize_sheet(frame)
+    schema = BillSchema(sheets=sheets)
+    processed_data['schema'] = schema
+    return schema
@@ -0,0 +1,78 @@
+"""
+Bill Sets - Find the bills packed into one workbook
+A workbook may carry several running bills as repeated sheet groups named
+with a common suffix ('Title 2' / 'Bill Quantity 2', 'Title (RA-3)' /
+'Bill Quantity (RA-3)', 'Title_2' ...). Every group with both a Title and a
+Bill Quantity sheet is one bill; Work Order, Extra Items and Deviation come
+from the same group when present, otherwise from the unsuffixed sheets.
+"""
+import re
+from dataclasses import dataclass, field
+from typing import Dict, List, Sequence
+
+BILL_SHEET_ROLES = ('Title', 'Work Order', 'Bill Quantity', 'Extra Items', 'Deviation')
+
+# Roles every bill needs its own copy of
+BILL_SET_KEY_ROLES = ('Title', 'Bill Quantity')
+
+_SUFFIXED_SHEET = re.compile(
+    r'^(?P<role>' + '|'.join(re.escape(role) for role in BILL_SHEET_ROLES) + r')'
+    r'(?:\s*\((?P<paren>[^)]+)\)|\s*[-_ ]\s*(?P<plain>\S.*))?$'
+)
+
+
+@dataclass(frozen=True)
+class BillSheetSet:
+    """Sheet names making up one bill (role -> sheet name)"""
+    suffix: str = ''
+    sheets: Dict[str, str] = field(default_factory=lambda: {role: role for role in BILL_SHEET_ROLES})
+
+    def sheet(self, role: str) -> str:
+        return self.sheets.get(role, role)
+
+    @property
+    def label(self) -> str:
+        return self.suffix or 'main'
+
+
+def split_sheet_name(sheet_name: str):
+    """
+    Split a sheet name into (role, suffix)
+
+    Returns:
+        Tuple of (role, suffix), or (None, None) if not a bill sheet
+    """
+    match = _SUFFIXED_SHEET.match(sheet_name.strip())
+    if not match:
+        return None, None
+    return match.group('role'), (match.group('paren') or match.group('plain') or '').strip()
+
+
+def detect_bill_sets(sheet_names: Sequence[str]) -> List[BillSheetSet]:
+    """
+    Group a workbook's sheets into bills
+
+    Args:
+        sheet_names: Sheet names in workbook order
+
+    Returns:
+        One BillSheetSet per bill, in the order their Title sheets appear
+    """
+    groups: Dict[str, Dict[str, str]] = {}
+    for name in sheet_names:
+        role, suffix = split_sheet_name(name)
+        if role is not None:
+            # First sheet wins if two names normalise to the same role/suffix
+            groups.setdefault(suffix, {}).setdefault(role, name)
+
+    shared = groups.get('', {})
+    bill_sets = []
+    for suffix, sheets in groups.items():
+        if not all(role in sheets for role in BILL_SET_KEY_ROLES):
+            continue
+        resolved = {role: sheets.get(role, shared.get(role, role)) for role in BILL_SHEET_ROLES}
+        bill_sets.append(BillSheetSet(suffix=suffix, sheets=resolved))
+
+    order = {name: position for position, name in enumerate(sheet_names)}
+    bill_sets.sort(key=lambda bill_set: order[bill_set.sheets['Title']])
+    return bill_sets
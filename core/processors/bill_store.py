@@ -0,0 +1,269 @@
+"""
+Bill Store - On-disk interchange format for processed bills
+A processed bill is saved as a folder: one Arrow IPC (or Parquet) table per
+sheet plus a JSON manifest with the title block. Arrow tables are read
+through a memory map, so a render worker or a rerun loads the bill without
+copying the column buffers and without touching the Excel file.
+
+    bill/
+      bill.json                  title data, parsed dates, table index
+      work_order_data.arrow
+      bill_quantity_data.arrow
+      extra_items_data.arrow
+      ...
+"""
+import json
+from datetime import date, datetime
+from pathlib import Path
+from typing import Any, Dict, Union
+
+import numpy as np
+import pandas as pd
+
+from core.utils.lazy_imports import lazy_import
+
+pa = lazy_import('pyarrow', 'pip install pyarrow')
+pq = lazy_import('pyarrow.parquet', 'pip install pyarrow')
+
+BILL_STORE_FORMAT = 'bill-store'
+BILL_STORE_VERSION = 1
+MANIFEST_NAME = 'bill.json'
+
+# Table format -> file suffix ('arrow' memory-maps zero-copy, 'parquet' is smaller)
+TABLE_FORMATS = {'arrow': '.arrow', 'parquet': '.parquet'}
+
+# Schema metadata key holding column names and encoded object columns
+_META_KEY = b'bill_store'
+
+# Cell kinds for object (mixed-type) columns
+_NULL, _STR, _INT, _FLOAT, _BOOL, _DATETIME, _DATE = range(7)
+
+
+def _encode_value(value: Any) -> Any:
+    """JSON-safe form of a title/metadata value (dates are tagged)"""
+    if isinstance(value, np.generic):
+        value = value.item()
+    if isinstance(value, datetime):
+        return None if value != value else {'__datetime__': value.isoformat()}
+    if isinstance(value, date):
+        return {'__date__': value.isoformat()}
+    if isinstance(value, dict):
+        return {str(k): _encode_value(v) for k, v in value.items()}
+    if isinstance(value, (list, tuple)):
+        return [_encode_value(v) for v in value]
+    if value is None or isinstance(value, (str, int, float, bool)):
+        return value
+    return str(value)
+
+
+def _decode_value(value: Any) -> Any:
+    if isinstance(value, dict):
+        if '__datetime__' in value:
+            return pd.Timestamp(value['__datetime__'])
+        if '__date__' in value:
+            return date.fromisoformat(value['__date__'])
+        return {k: _decode_value(v) for k, v in value.items()}
+    if isinstance(value, list):
+        return [_decode_value(v) for v in value]
+    return value
+
+
+def _cell_kind(value: Any) -> int:
+    if value is None:
+        return _NULL
+    if isinstance(value, (bool, np.bool_)):
+        return _BOOL
+    if isinstance(value, (int, np.integer)):
+        return _INT
+    if isinstance(value, (float, np.floating)):
+        return _FLOAT
+    if isinstance(value, datetime):
+        return _NULL if value != value else _DATETIME
+    if isinstance(value, date):
+        return _DATE
+    return _STR
+
+
+def _encode_object_column(series: pd.Series):
+    """Object column -> (text, kind) arrays that round-trip every cell exactly"""
+    kinds = np.fromiter((_cell_kind(v) for v in series), dtype=np.int8, count=len(series))
+    text = []
+    for value, kind in zip(series, kinds):
+        if kind == _NULL:
+            text.append(None)
+        elif kind == _FLOAT:
+            text.append(repr(float(value)))
+        elif kind in (_DATETIME, _DATE):
+            text.append(value.isoformat())
+        else:
+            text.append(str(value))
+    return pa.array(text, type=pa.string()), pa.array(kinds, type=pa.int8())
+
+
+_PARSERS = {
+    _STR: str,
+    _INT: int,
+    _FLOAT: float,
+    _BOOL: lambda s: s == 'True',
+    _DATETIME: pd.Timestamp,
+    _DATE: date.fromisoformat,
+}
+
+
+def _decode_object_column(text, kinds) -> np.ndarray:
+    text = text.to_pylist()
+    kinds = kinds.to_numpy(zero_copy_only=False)
+    return np.array(
+        [None if kind == _NULL else _PARSERS[kind](s) for s, kind in zip(text, kinds)],
+        dtype=object
+    )
+
+
+def frame_to_table(df: pd.DataFrame):
+    """
+    Convert a sheet DataFrame to an Arrow table without losing cell types
+
+    Typed columns (float64, Arrow strings, categoricals, datetimes) map
+    directly. Object columns, which hold mixed cells such as 'Above' next to
+    numbers, are stored as text plus a per-cell kind so they come back as
+    the same Python values.
+
+    Args:
+        df: Sheet DataFrame
+
+    Returns:
+        pyarrow.Table
+    """
+    fields = [f"c{i}" for i in range(df.shape[1])]
+    flat = df.copy(deep=False)
+    flat.columns = fields
+    object_columns = [f for f, dtype in zip(fields, flat.dtypes) if dtype == object]
+    plain = flat.drop(columns=object_columns)
+
+    table = pa.Table.from_pandas(plain, preserve_index=None)
+    for name in object_columns:
+        text, kinds = _encode_object_column(flat[name])
+        table = table.append_column(name, text).append_column(f"{name}.kind", kinds)
+
+    meta = {
+        'columns': _encode_value(list(df.columns)),
+        'range_columns': isinstance(df.columns, pd.RangeIndex),
+        'fields': fields,
+        'object_columns': object_columns,
+    }
+    schema_meta = dict(table.schema.metadata or {})
+    schema_meta[_META_KEY] = json.dumps(meta).encode('utf-8')
+    return table.replace_schema_metadata(schema_meta)
+
+
+def table_to_frame(table) -> pd.DataFrame:
+    """
+    Convert a table written by frame_to_table back to the original DataFrame
+
+    Numeric and string columns keep referencing the table's buffers where
+    pandas allows it (memory-mapped tables stay zero-copy).
+    """
+    meta = json.loads(table.schema.metadata[_META_KEY])
+    object_columns = meta['object_columns']
+    kind_fields = [f"{name}.kind" for name in object_columns]
+
+    plain = table.drop_columns(object_columns + kind_fields)
+    frame = plain.to_pandas(split_blocks=True)
+    for name in object_columns:
+        frame[name] = _decode_object_column(table.column(name), table.column(f"{name}.kind"))
+
+    frame = frame[meta['fields']]
+    columns = _decode_value(meta['columns'])
+    frame.columns = pd.RangeIndex(len(columns)) if meta.get('range_columns') else columns
+    return frame
+
+
+def save_bill(data: Dict[str, Any], path: Union[str, Path], table_format: str = 'arrow') -> Path:
+    """
+    Save processed bill data (as returned by ExcelProcessor) to a bill folder
+
+    Args:
+        data: Processed bill data (DataFrames, title dict, metadata)
+        path: Folder to write (created if needed; existing tables are replaced)
+        table_format: 'arrow' (memory-mapped on load) or 'parquet' (compressed)
+
+    Returns:
+        Path of the bill folder
+    """
+    if table_format not in TABLE_FORMATS:
+        raise ValueError(f"Unknown table format: {table_format}")
+    folder = Path(path)
+    folder.mkdir(parents=True, exist_ok=True)
+
+    tables = {}
+    values = {}
+    for key, value in data.items():
+        if key == 'schema':
+            # Rebuilt from the typed frames on load
+            continue
+        if isinstance(value, pd.DataFrame):
+            file_name = f"{key}{TABLE_FORMATS[table_format]}"
+            table = frame_to_table(value)
+            if table_format == 'arrow':
+                with pa.OSFile(str(folder / file_name), 'wb') as sink:
+                    with pa.ipc.new_file(sink, table.schema) as writer:
+                        writer.write_table(table)
+            else:
+                pq.write_table(table, str(folder / file_name), compression='zstd')
+            tables[key] = file_name
+        else:
+            values[key] = _encode_value(value)
+
+    manifest = {
+        'format': BILL_STORE_FORMAT,
+        'version': BILL_STORE_VERSION,
+        'tables': tables,
+        'values': values,
+        'columnar': data.get('schema') is not None,
+    }
+    with open(folder / MANIFEST_NAME, 'w', encoding='utf-8') as f:
+        json.dump(manifest, f, indent=2, ensure_ascii=False)
+    return folder
+
+
+def is_bill_store(path: Union[str, Path]) -> bool:
+    """Check whether a path is a bill folder written by save_bill"""
+    return (Path(path) / MANIFEST_NAME).is_file()
+
+
+def load_bill(path: Union[str, Path], memory_map: bool = True) -> Dict[str, Any]:
+    """
+    Load a bill folder into the dict DocumentGenerator expects
+
+    Args:
+        path: Bill folder written by save_bill
+        memory_map: Map Arrow tables instead of reading them into memory
+
+    Returns:
+        Processed bill data (with 'schema' rebuilt for columnar bills)
+    """
+    folder = Path(path)
+    with open(folder / MANIFEST_NAME, 'r', encoding='utf-8') as f:
+        manifest = json.load(f)
+    if manifest.get('format') != BILL_STORE_FORMAT:
+        raise ValueError(f"Not a bill folder: {folder}")
+    if manifest.get('version', 0) > BILL_STORE_VERSION:
+        raise ValueError(f"Bill folder version {manifest['version']} is newer than supported ({BILL_STORE_VERSION})")
+
+    data = {key: _decode_value(value) for key, value in manifest['values'].items()}
+    for key, file_name in manifest['tables'].items():
+        table_path = str(folder / file_name)
+        if file_name.endswith(TABLE_FORMATS['parquet']):
+            table = pq.read_table(table_path, memory_map=memory_map)
+        else:
+            # Closing the file keeps the mapped buffers alive but releases the handle
+            with (pa.memory_map(table_path, 'r') if memory_map else pa.OSFile(table_path, 'rb')) as source:
+                table = pa.ipc.open_file(source).read_all()
+        data[key] = table_to_frame(table)
+
+    if manifest.get('columnar'):
+        from core.processors.bill_schema import BILL_SHEETS, BillSchema, SheetSchema
+        data['schema'] = BillSchema(sheets={
+            key: SheetSchema.from_frame(data[key]) for key in BILL_SHEETS if key in data
+        })
+    return data
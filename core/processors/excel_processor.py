@@ -1,12 +1,30 @@
 import pandas as pd
-from typing import Dict, Any
-import io
+from datetime import date
+from pathlib import Path
+from typing import Dict, Any, Iterator, Tuple
+from core.processors.bill_sets import BillSheetSet, detect_bill_sets
+from core.processors.excel_engines import AUTO, open_workbook
+from core.processors.header_resolver import resolve_headers
 from core.processors.hierarchical_filter import apply_hierarchical_filtering
+from core.processors.title_dates import (
+    DISPLAY_FORMAT, TITLE_DATE_FIELDS, format_title_date, parse_title_date
+)
 
 class ExcelProcessor:
     """Process Excel files and extract bill data"""
     
-    def __init__(self):
+    def __init__(self, columnar: bool = False, engine: str = AUTO):
+        """
+        Args:
+            columnar: Normalise Work Order / Bill Quantity into typed columns
+                (float64 amounts, categorical units, Arrow strings) and attach
+                a BillSchema under 'schema'
+            engine: 'auto' (calamine when installed, else openpyxl/xlrd) or a pandas engine name
+        """
+        self.columnar = columnar
+        self.engine = engine
+        self.last_engine = None
+        self.header_resolutions = {}
         self.required_sheets = ['Title', 'Work Order', 'Bill Quantity']
         self.optional_sheets = ['Extra Items', 'Deviation']
         
@@ -38,54 +56,85 @@ class ExcelProcessor:
             }
         }
     
-    def process_excel(self, file, required_cols_only=True) -> Dict[str, Any]:
+    def process_excel(self, file, required_cols_only=True, columnar=None) -> Dict[str, Any]:
         """
         Process Excel file and extract all necessary data with optimization
         
         Args:
-            file: Uploaded file object or file path
+            file: Uploaded file object, file path, or IngestedUpload (read from its memory map)
             required_cols_only: Whether to load only required columns for better performance
+            columnar: Override the processor's columnar setting for this file
             
         Returns:
             Dictionary containing processed data
         """
         # Store filename for reference
-        filename = None
+        filename = self._source_filename(file)
+        
+        # Read Excel file with the fastest installed engine (calamine, then openpyxl/xlrd)
+        excel_data, self.last_engine = open_workbook(file, self.engine)
+        return self._process_sheet_set(excel_data, BillSheetSet(), filename, required_cols_only, columnar)
+    
+    def iter_bills(self, file, required_cols_only=True, columnar=None) -> Iterator[Dict[str, Any]]:
+        """
+        Lazily process every bill packed into one workbook
+        
+        The workbook is opened once; repeated Title / Bill Quantity sheet sets
+        ('Title 2' / 'Bill Quantity 2', 'Title (RA-3)' / ...) are detected and
+        each is parsed only when the caller asks for it. Records can be passed
+        straight to BatchJobRunner.run_batch.
+        
+        Args:
+            file: Uploaded file object, file path, or IngestedUpload (read from its memory map)
+            required_cols_only: Whether to load only required columns for better performance
+            columnar: Override the processor's columnar setting for this file
+            
+        Yields:
+            Bill record: {'id', 'bill', 'source_filename', 'sheets', 'data'}
+        """
+        filename = self._source_filename(file)
+        stem = Path(filename).stem if filename else 'workbook'
+        
+        excel_data, self.last_engine = open_workbook(file, self.engine)
+        try:
+            # A workbook without a complete set is still read as a single bill
+            for sheet_set in detect_bill_sets(excel_data.sheet_names) or [BillSheetSet()]:
+                data = self._process_sheet_set(excel_data, sheet_set, filename, required_cols_only, columnar)
+                yield {
+                    'id': f"{stem}#{sheet_set.label}",
+                    'bill': sheet_set.suffix,
+                    'source_filename': filename,
+                    'sheets': dict(sheet_set.sheets),
+                    'data': data,
+                }
+        finally:
+            excel_data.close()
+    
+    @staticmethod
+    def _source_filename(file):
+        """Filename recorded with the processed data"""
         if hasattr(file, 'name'):
-            filename = file.name
+            return file.name
         elif isinstance(file, (str, type(None))):
-            filename = str(file) if file else None
-        else:
-            filename = "uploaded_file.xlsx"
-        
-        # Read Excel file
-        if hasattr(file, 'read'):
-            # It's a file-like object (BytesIO or file object)
-            if isinstance(file, io.BytesIO):
-                # It's already a BytesIO object
-                excel_data = pd.ExcelFile(file, engine='openpyxl')
-            else:
-                # It's a file object
-                file_bytes = file.read()
-                # Reset file pointer if possible
-                if hasattr(file, 'seek') and hasattr(file, 'tell'):
-                    file.seek(0)
-                
-                # Try to determine the file type from the first bytes
-                if file_bytes.startswith(b'PK'):
-                    # Likely an .xlsx file
-                    excel_data = pd.ExcelFile(io.BytesIO(file_bytes), engine='openpyxl')
-                else:
-                    # Likely an .xls file
-                    excel_data = pd.ExcelFile(io.BytesIO(file_bytes), engine='xlrd')
-        else:
-            # It's a file path
-            # Determine engine based on file extension
-            file_str = str(file).lower()
-            if file_str.endswith('.xlsx') or file_str.endswith('.xlsm'):
-                excel_data = pd.ExcelFile(file, engine='openpyxl')
-            else:
-                excel_data = pd.ExcelFile(file, engine='xlrd')
+            return str(file) if file else None
+        return "uploaded_file.xlsx"
+    
+    def _process_sheet_set(self, excel_data, sheet_set, filename, required_cols_only, columnar) -> Dict[str, Any]:
+        """
+        Process one bill's sheets from an open workbook
+        
+        Args:
+            excel_data: ExcelFile object
+            sheet_set: BillSheetSet naming the bill's sheets
+            filename: Source filename for reference
+            required_cols_only: Whether to load only required columns
+            columnar: Override the processor's columnar setting
+            
+        Returns:
+            Dictionary containing processed data
+        """
+        self.header_resolutions = {}
+        sheet_names = excel_data.sheet_names
         
         # Define required columns per sheet for optimization
         required_cols = {
@@ -97,45 +146,31 @@ class ExcelProcessor:
         processed_data = {}
         
         # Process Title sheet
-        if 'Title' in excel_data.sheet_names:
-            title_df = pd.read_excel(excel_data, 'Title', header=None)
-            processed_data['title_data'] = self._process_title_sheet(title_df)
+        title_sheet = sheet_set.sheet('Title')
+        if title_sheet in sheet_names:
+            title_df = pd.read_excel(excel_data, title_sheet, header=None)
+            processed_data['title_data'], processed_data['title_dates'] = self._parse_title_sheet(title_df)
         else:
             processed_data['title_data'] = {}
+            processed_data['title_dates'] = {}
         
-        # Process Work Order sheet with column selection
-        if 'Work Order' in excel_data.sheet_names:
-            cols = required_cols['Work Order'] if required_cols_only else None
-            work_order_df = self._read_sheet_with_flexible_columns(
-                excel_data, 'Work Order', cols, self.column_mappings['Work Order']
-            )
-            processed_data['work_order_data'] = work_order_df
-        else:
-            processed_data['work_order_data'] = pd.DataFrame()
-        
-        # Process Bill Quantity sheet with column selection
-        if 'Bill Quantity' in excel_data.sheet_names:
-            cols = required_cols['Bill Quantity'] if required_cols_only else None
-            bill_qty_df = self._read_sheet_with_flexible_columns(
-                excel_data, 'Bill Quantity', cols, self.column_mappings['Bill Quantity']
-            )
-            processed_data['bill_quantity_data'] = bill_qty_df
-        else:
-            processed_data['bill_quantity_data'] = pd.DataFrame()
-        
-        # Process Extra Items sheet (optional) with column selection
-        if 'Extra Items' in excel_data.sheet_names:
-            cols = required_cols['Extra Items'] if required_cols_only else None
-            extra_items_df = self._read_sheet_with_flexible_columns(
-                excel_data, 'Extra Items', cols, self.column_mappings['Extra Items']
-            )
-            processed_data['extra_items_data'] = extra_items_df
-        else:
-            processed_data['extra_items_data'] = pd.DataFrame()
+        # Process Work Order, Bill Quantity and Extra Items (optional) with column selection
+        for role, key in (('Work Order', 'work_order_data'),
+                          ('Bill Quantity', 'bill_quantity_data'),
+                          ('Extra Items', 'extra_items_data')):
+            sheet_name = sheet_set.sheet(role)
+            if sheet_name in sheet_names:
+                cols = required_cols[role] if required_cols_only else None
+                processed_data[key] = self._read_sheet_with_flexible_columns(
+                    excel_data, sheet_name, cols, self.column_mappings[role], role=role
+                )
+            else:
+                processed_data[key] = pd.DataFrame()
         
         # Process Deviation sheet (optional)
-        if 'Deviation' in excel_data.sheet_names:
-            deviation_df = pd.read_excel(excel_data, 'Deviation')
+        deviation_sheet = sheet_set.sheet('Deviation')
+        if deviation_sheet in sheet_names:
+            deviation_df = pd.read_excel(excel_data, deviation_sheet)
             processed_data['deviation_data'] = deviation_df
         else:
             processed_data['deviation_data'] = pd.DataFrame()
@@ -147,78 +182,62 @@ class ExcelProcessor:
         )
         processed_data.update(filtered_data)
         
+        # Typed columnar sheets (after filtering, which works row by row)
+        if self.columnar if columnar is None else columnar:
+            from core.processors.bill_schema import normalize_bill
+            normalize_bill(processed_data)
+        
+        # How each sheet's headers were mapped (including missing/ambiguous columns)
+        processed_data['header_resolution'] = {
+            sheet: resolution.to_dict() for sheet, resolution in self.header_resolutions.items()
+        }
+        
         # Add source filename for reference
         processed_data['source_filename'] = filename
         
         return processed_data
     
-    def _read_sheet_with_flexible_columns(self, excel_data, sheet_name, required_cols, column_mapping):
+    def _read_sheet_with_flexible_columns(self, excel_data, sheet_name, required_cols, column_mapping, role=None):
         """
         Read Excel sheet with flexible column handling to support different naming conventions
         
+        The sheet is read once; its header row is resolved against the
+        required columns by the cached header resolver. Missing and
+        ambiguous columns are reported rather than retried.
+        
         Args:
             excel_data: ExcelFile object
             sheet_name: Name of the sheet to read
             required_cols: List of required column names (expected names)
             column_mapping: Dictionary mapping expected names to actual names
+            role: Bill sheet role when the sheet name carries a suffix (e.g. 'Extra Items 2')
             
         Returns:
             DataFrame with standardized column names
         """
-        try:
-            # First, read the sheet to see what columns are available
-            df_sample = pd.read_excel(excel_data, sheet_name, nrows=1)
-            available_columns = list(df_sample.columns)
-            
-            # Special handling for Extra Items sheet which has irregular structure
-            if sheet_name == 'Extra Items':
-                # For Extra Items, we'll just read the whole sheet without column selection
-                df = pd.read_excel(excel_data, sheet_name)
-                return df  # Don't rename columns for Extra Items as it has a different structure
-            
-            # If we're not selecting specific columns, just read the whole sheet
-            if required_cols is None:
-                df = pd.read_excel(excel_data, sheet_name)
-                # Rename columns to standard names if needed
-                return self._standardize_column_names(df, column_mapping)
-            
-            # Otherwise, map required columns to actual column names
-            actual_cols = []
-            for expected_col in required_cols:
-                if expected_col in column_mapping:
-                    actual_col_name = column_mapping[expected_col]
-                    # Check if the actual column exists in the sheet
-                    if actual_col_name in available_columns:
-                        actual_cols.append(actual_col_name)
-                    else:
-                        # Try to find a column that might match (case-insensitive partial match)
-                        found = False
-                        for col in available_columns:
-                            if expected_col.lower() in col.lower() or col.lower() in expected_col.lower():
-                                actual_cols.append(col)
-                                found = True
-                                break
-                        if not found:
-                            # If we can't find it, we'll still try to read with the expected name
-                            # This will raise an error which we'll catch below
-                            actual_cols.append(expected_col)
-                else:
-                    actual_cols.append(expected_col)
-            
-            # Read the sheet with the mapped column names
-            df = pd.read_excel(excel_data, sheet_name, usecols=actual_cols)
-            
-            # Rename columns to standard names
-            return self._standardize_column_names(df, column_mapping)
-            
-        except ValueError as e:
-            # If there's an error with column selection, fall back to reading all columns
-            print(f"Warning: Column selection failed for sheet '{sheet_name}', reading all columns. Error: {e}")
-            df = pd.read_excel(excel_data, sheet_name)
-            # Don't rename columns for Extra Items as it has a different structure
-            if sheet_name == 'Extra Items':
-                return df
+        df = pd.read_excel(excel_data, sheet_name)
+        
+        # Special handling for Extra Items sheet which has irregular structure
+        # Don't rename columns for Extra Items as it has a different structure
+        if (role or sheet_name) == 'Extra Items':
+            return df
+        
+        # If we're not selecting specific columns, keep the whole sheet
+        if required_cols is None:
             return self._standardize_column_names(df, column_mapping)
+        
+        resolution = resolve_headers(df.columns, required_cols, column_mapping)
+        self.header_resolutions[sheet_name] = resolution
+        for name, headers in resolution.ambiguous.items():
+            print(f"Warning: Ambiguous columns for '{name}' in sheet '{sheet_name}': "
+                  f"{', '.join(headers)}; using '{resolution.columns[name]}'")
+        if resolution.missing:
+            print(f"Warning: Sheet '{sheet_name}' has no column for: {', '.join(resolution.missing)}")
+        
+        # Keep sheet order; fuzzy matches get their standard names
+        selected = set(resolution.selected)
+        df = df[[col for col in df.columns if col in selected]].rename(columns=resolution.renames)
+        return self._standardize_column_names(df, column_mapping)
     
     def _standardize_column_names(self, df, column_mapping):
         """
@@ -259,58 +278,54 @@ class ExcelProcessor:
         Column 0: Key names
         Column 1: Values
         """
-        title_data = {}
+        return self._parse_title_sheet(df)[0]
+    
+    def _parse_title_sheet(self, df: pd.DataFrame) -> Tuple[Dict[str, Any], Dict[str, date]]:
+        """
+        Parse Title sheet key-value pairs and its dates in one pass
         
-        # Date field keys that should be formatted
-        date_fields = [
-            'Date of written order to commence work :',
-            'Date of written order to commence work',
-            'St. date of Start :',
-            'St. date of Start',
-            'St. date of completion :',
-            'St. date of completion',
-            'Date of actual completion of work :',
-            'Date of actual completion of work',
-            'Date of measurement :',
-            'Date of measurement',
-        ]
+        Recognised date fields are stored as 'dd/mm/YYYY' strings in the
+        title data and as date objects in the second dict, so later
+        calculations do not parse them again.
+        
+        Args:
+            df: Title sheet read with header=None
+            
+        Returns:
+            Tuple of (title data, parsed dates keyed like the title data)
+        """
+        title_data = {}
+        title_dates = {}
         
         # Process all rows but specifically track first 20 for validation
-        first_20_rows = {}
+        first_20_rows = set()
         
-        for index, row in df.iterrows():
-            if len(row) >= 2:
-                key = str(row[0]).strip() if pd.notna(row[0]) else None
-                value = row[1] if pd.notna(row[1]) else None
+        if len(df.columns) >= 2:
+            for index, (raw_key, raw_value) in enumerate(zip(df.iloc[:, 0], df.iloc[:, 1])):
+                key = str(raw_key).strip() if pd.notna(raw_key) else None
+                if not key or key == 'nan':
+                    continue
+                value = raw_value if pd.notna(raw_value) else None
+                
+                # Format date fields to remove timestamp
+                if value is not None and key in TITLE_DATE_FIELDS:
+                    parsed = parse_title_date(value)
+                    if parsed is not None:
+                        title_dates[key] = parsed
+                        # Text dates without a time part are kept as entered
+                        if not isinstance(value, str) or (' ' in value and ':' in value):
+                            value = format_title_date(parsed)
+                    elif hasattr(value, 'strftime'):
+                        value = value.strftime(DISPLAY_FORMAT)
+                
+                title_data[key] = value
                 
-                if key and key != 'nan':
-                    # Format date fields to remove timestamp
-                    if key in date_fields and value is not None:
-                        if isinstance(value, pd.Timestamp):
-                            value = value.strftime('%d/%m/%Y')
-                        elif hasattr(value, 'strftime'):
-                            value = value.strftime('%d/%m/%Y')
-                        else:
-                            # Try to parse as string if it contains timestamp
-                            value_str = str(value)
-                            if ' ' in value_str and ':' in value_str:
-                                # Has timestamp, extract date part only
-                                try:
-                                    from datetime import datetime
-                                    dt = pd.to_datetime(value_str)
-                                    value = dt.strftime('%d/%m/%Y')
-                                except:
-                                    # Keep original if parsing fails
-                                    pass
-                    
-                    title_data[key] = value
-                    
-                    # Track first 20 rows for validation purposes
-                    if index < 20:
-                        first_20_rows[key] = value
+                # Track first 20 rows for validation purposes
+                if index < 20:
+                    first_20_rows.add(key)
         
         # Add metadata about first 20 rows processing
         title_data['_first_20_rows_processed'] = True
         title_data['_first_20_rows_count'] = len(first_20_rows)
         
-        return title_data
\ No newline at end of file
+        return title_data, title_dates
@@ -7,14 +7,19 @@ Standards: PEP-8, Type Hints, Modular Architecture
 """
 
 import logging
+import re
+import threading
+from concurrent.futures import ThreadPoolExecutor
 from dataclasses import dataclass, field
 from enum import Enum
 from pathlib import Path
-from typing import Any, Dict, List, Optional, Union
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple, Union
 
 import pandas as pd
 import numpy as np
 
+from core.processors.excel_engines import open_workbook
+
 
 # Configure logging
 logging.basicConfig(
@@ -40,9 +45,18 @@ FORMULA_INJECTION_PATTERNS = [
     r'^=', r'^@', r'^\+', r'^-', r'^\|', r'^%'
 ]
 
+# All patterns combined and compiled once
+FORMULA_INJECTION_RE = re.compile('|'.join(f'(?:{p})' for p in FORMULA_INJECTION_PATTERNS))
+
+# Every pattern starts with one of these; other cells skip the regex entirely
+FORMULA_TRIGGER_CHARS = frozenset('=@+-|%')
+
 # Performance: Default chunk size for large files
 DEFAULT_CHUNK_SIZE = 10000
 
+# Sheets that can grow to measurement-book size and are streamed in chunks
+STREAMED_SHEETS = ['Work Order', 'Bill Quantity']
+
 # Validation: File size limits (in bytes)
 MAX_FILE_SIZE = 100 * 1024 * 1024  # 100 MB
 
@@ -105,6 +119,16 @@ class ValidationResult:
         self.warnings.append(warning)
 
 
+@dataclass
+class SheetChunk:
+    """One cleaned and validated block of rows from a streamed sheet."""
+    sheet_name: str
+    index: int
+    start_row: int
+    data: pd.DataFrame
+    warnings: List[str] = field(default_factory=list)
+
+
 @dataclass
 class ProcessingResult:
     """Result of processing operation."""
@@ -191,14 +215,40 @@ class ExcelValidator:
         str_value = str(value)
         
         # Check for formula injection patterns
-        import re
-        for pattern in FORMULA_INJECTION_PATTERNS:
-            if re.match(pattern, str_value):
-                # Neutralize by prepending single quote
-                return f"'{str_value}"
+        if str_value[:1] in FORMULA_TRIGGER_CHARS and FORMULA_INJECTION_RE.match(str_value):
+            # Neutralize by prepending single quote
+            return f"'{str_value}"
         
         return str_value
     
+    @staticmethod
+    def sanitize_series(series: pd.Series) -> pd.Series:
+        """
+        Vectorised sanitize_string for a whole column.
+        
+        Non-null cells are converted to text once; only cells whose first
+        character can start a formula are matched against the combined regex.
+        
+        Args:
+            series: Column to sanitize
+            
+        Returns:
+            Sanitized column (missing values become empty strings)
+        """
+        present = series.notna().to_numpy()
+        result = np.full(len(series), '', dtype=object)
+        if present.any():
+            # Positional from here on, so duplicate index labels cannot misalign
+            text = series[present].astype(str).reset_index(drop=True)
+            candidates = text.str[:1].isin(FORMULA_TRIGGER_CHARS).to_numpy()
+            if candidates.any():
+                flagged = np.zeros(len(text), dtype=bool)
+                flagged[candidates] = text[candidates].str.match(FORMULA_INJECTION_RE).to_numpy(dtype=bool)
+                # Neutralize by prepending single quote
+                text = text.mask(flagged, "'" + text)
+            result[present] = text.to_numpy(dtype=object)
+        return pd.Series(result, index=series.index, name=series.name)
+    
     @staticmethod
     def validate_sheet_schema(
         df: pd.DataFrame,
@@ -294,7 +344,8 @@ class ExcelProcessor:
         self,
         sanitize_strings: bool = True,
         validate_schemas: bool = True,
-        chunk_size: int = DEFAULT_CHUNK_SIZE
+        chunk_size: int = DEFAULT_CHUNK_SIZE,
+        max_workers: int = 1
     ):
         """
         Initialize Excel processor.
@@ -303,16 +354,18 @@ class ExcelProcessor:
             sanitize_strings: Enable string sanitization for security
             validate_schemas: Enable schema validation
             chunk_size: Chunk size for processing large files
+            max_workers: Threads for processing independent sheets (1 = sequential)
         """
         self.sanitize_strings = sanitize_strings
         self.validate_schemas = validate_schemas
         self.chunk_size = chunk_size
+        self.max_workers = max(1, max_workers)
         self.validator = ExcelValidator()
         
         logger.info(
             f"ExcelProcessor initialized: "
             f"sanitize={sanitize_strings}, validate={validate_schemas}, "
-            f"chunk_size={chunk_size}"
+            f"chunk_size={chunk_size}, max_workers={self.max_workers}"
         )
     
     def process_file(
@@ -341,53 +394,43 @@ class ExcelProcessor:
                 result.errors = validation.errors
                 return result
             
-            # Step 2: Detect sheets
-            available_sheets = self.validator.detect_sheets(file_path)
-            sheets_to_process = sheet_names if sheet_names else available_sheets
+            # Step 2: Open the workbook once; every sheet is read from this handle
+            try:
+                workbook, engine = open_workbook(str(file_path))
+            except Exception as e:
+                logger.error(f"Failed to detect sheets: {e}")
+                raise ValidationError(f"Cannot read Excel file: {e}")
             
-            # Step 3: Determine file type and engine
-            path = Path(file_path)
-            extension = path.suffix.lower().lstrip('.')
-            engine = 'openpyxl' if extension in ['xlsx', 'xlsm'] else 'xlrd'
+            with workbook:
+                available_sheets = workbook.sheet_names
+                logger.info(f"Detected {len(available_sheets)} sheets: {', '.join(available_sheets)}")
+                sheets_to_process = sheet_names if sheet_names else available_sheets
+                
+                for sheet_name in sheets_to_process:
+                    if sheet_name not in available_sheets:
+                        result.warnings.append(f"Sheet not found: {sheet_name}")
+                sheets_to_process = [name for name in sheets_to_process if name in available_sheets]
+                
+                # Step 3: Process each sheet (independent sheets may run in parallel)
+                read_lock = threading.Lock()
+                
+                def process_sheet(sheet_name: str):
+                    return self._process_sheet(workbook, sheet_name, engine, schemas, read_lock)
+                
+                if self.max_workers > 1 and len(sheets_to_process) > 1:
+                    workers = min(self.max_workers, len(sheets_to_process))
+                    with ThreadPoolExecutor(max_workers=workers, thread_name_prefix='sheet') as executor:
+                        outcomes = list(executor.map(process_sheet, sheets_to_process))
+                else:
+                    outcomes = [process_sheet(name) for name in sheets_to_process]
             
-            # Step 4: Process each sheet
+            # Step 4: Merge per-sheet outcomes in sheet order
             processed_data = {}
-            
-            for sheet_name in sheets_to_process:
-                if sheet_name not in available_sheets:
-                    result.warnings.append(f"Sheet not found: {sheet_name}")
-                    continue
-                
-                try:
-                    df = self._load_sheet(file_path, sheet_name, engine)
-                    
-                    if df is None:
-                        result.warnings.append(f"Failed to load sheet: {sheet_name}")
-                        continue
-                    
-                    # Validate schema if provided
-                    if self.validate_schemas and schemas and sheet_name in schemas:
-                        schema_validation = self.validator.validate_sheet_schema(
-                            df, schemas[sheet_name]
-                        )
-                        if not schema_validation.is_valid:
-                            result.errors.extend(schema_validation.errors)
-                            continue
-                        result.warnings.extend(schema_validation.warnings)
-                    
-                    # Clean and process DataFrame
-                    df_clean = self._clean_dataframe(df, sheet_name)
+            for sheet_name, (df_clean, errors, warnings) in zip(sheets_to_process, outcomes):
+                result.errors.extend(errors)
+                result.warnings.extend(warnings)
+                if df_clean is not None:
                     processed_data[sheet_name] = df_clean
-                    
-                    logger.info(
-                        f"Processed sheet '{sheet_name}': "
-                        f"{len(df_clean)} rows, {len(df_clean.columns)} columns"
-                    )
-                    
-                except Exception as e:
-                    error_msg = f"Error processing sheet '{sheet_name}': {e}"
-                    logger.error(error_msg)
-                    result.errors.append(error_msg)
             
             # Step 5: Finalize result
             if processed_data:
@@ -396,7 +439,8 @@ class ExcelProcessor:
                 result.metadata = {
                     'file_path': str(file_path),
                     'sheets_processed': len(processed_data),
-                    'total_sheets': len(available_sheets)
+                    'total_sheets': len(available_sheets),
+                    'engine': engine
                 }
                 logger.info(f"Successfully processed {len(processed_data)} sheets")
             else:
@@ -409,26 +453,86 @@ class ExcelProcessor:
         
         return result
     
+    def _process_sheet(
+        self,
+        workbook: pd.ExcelFile,
+        sheet_name: str,
+        engine: str,
+        schemas: Optional[Dict[str, SheetSchema]],
+        read_lock: threading.Lock
+    ) -> Tuple[Optional[pd.DataFrame], List[str], List[str]]:
+        """
+        Load, validate and clean one sheet from an open workbook.
+        
+        Args:
+            workbook: Open workbook shared by all sheets
+            sheet_name: Name of sheet to process
+            engine: Engine the workbook was opened with
+            schemas: Optional schema definitions for validation
+            read_lock: Serialises reads from the shared handle
+            
+        Returns:
+            Tuple of (cleaned DataFrame or None, errors, warnings)
+        """
+        errors: List[str] = []
+        warnings: List[str] = []
+        
+        try:
+            # Reader objects are not thread-safe; validation and cleaning run unlocked
+            with read_lock:
+                df = self._load_sheet(workbook, sheet_name, engine)
+            
+            if df is None:
+                warnings.append(f"Failed to load sheet: {sheet_name}")
+                return None, errors, warnings
+            
+            # Validate schema if provided
+            if self.validate_schemas and schemas and sheet_name in schemas:
+                schema_validation = self.validator.validate_sheet_schema(
+                    df, schemas[sheet_name]
+                )
+                if not schema_validation.is_valid:
+                    errors.extend(schema_validation.errors)
+                    return None, errors, warnings
+                warnings.extend(schema_validation.warnings)
+            
+            # Clean and process DataFrame
+            df_clean = self._clean_dataframe(df, sheet_name)
+            
+            logger.info(
+                f"Processed sheet '{sheet_name}': "
+                f"{len(df_clean)} rows, {len(df_clean.columns)} columns"
+            )
+            return df_clean, errors, warnings
+            
+        except Exception as e:
+            error_msg = f"Error processing sheet '{sheet_name}': {e}"
+            logger.error(error_msg)
+            errors.append(error_msg)
+            return None, errors, warnings
+    
     def _load_sheet(
         self,
-        file_path: Union[str, Path],
+        source: Union[str, Path, pd.ExcelFile],
         sheet_name: str,
         engine: str
     ) -> Optional[pd.DataFrame]:
         """
-        Load single sheet from Excel file.
+        Load single sheet from an open workbook or an Excel file path.
         
         Args:
-            file_path: Path to Excel file
+            source: Open pd.ExcelFile (preferred) or path to Excel file
             sheet_name: Name of sheet to load
-            engine: Pandas engine to use
+            engine: Pandas engine to use when opening a path
             
         Returns:
             DataFrame or None if loading fails
         """
         try:
+            if isinstance(source, pd.ExcelFile):
+                return source.parse(sheet_name)
             df = pd.read_excel(
-                file_path,
+                source,
                 sheet_name=sheet_name,
                 engine=engine
             )
@@ -437,10 +541,197 @@ class ExcelProcessor:
             logger.error(f"Failed to load sheet '{sheet_name}': {e}")
             return None
     
+    def stream_file(
+        self,
+        file_path: Union[str, Path],
+        schemas: Optional[Dict[str, SheetSchema]] = None,
+        sheet_names: Optional[List[str]] = None
+    ) -> Iterator[SheetChunk]:
+        """
+        Stream large sheets as cleaned, validated row chunks.
+        
+        Memory stays bounded by chunk_size rather than sheet size. Sheets
+        missing from the workbook are skipped with a warning in the log.
+        
+        Args:
+            file_path: Path to Excel file
+            schemas: Optional schema definitions for validation
+            sheet_names: Sheets to stream (default: Work Order, Bill Quantity)
+            
+        Yields:
+            SheetChunk objects, sheet by sheet in order
+            
+        Raises:
+            ValidationError: If the file or a chunk fails validation
+        """
+        validation = self.validator.validate_file_path(file_path)
+        if not validation.is_valid:
+            raise ValidationError("; ".join(validation.errors))
+        
+        for sheet_name in sheet_names or STREAMED_SHEETS:
+            schema = schemas.get(sheet_name) if schemas else None
+            yield from self.stream_sheet(file_path, sheet_name, schema)
+    
+    def stream_sheet(
+        self,
+        file_path: Union[str, Path],
+        sheet_name: str,
+        schema: Optional[SheetSchema] = None
+    ) -> Iterator[SheetChunk]:
+        """
+        Stream one sheet in chunks of chunk_size rows.
+        
+        .xlsx/.xlsm sheets are read through openpyxl's read-only row
+        iterator; .xls sheets are loaded whole and then sliced. The header
+        is fixed by the first row, so empty columns are kept (a column may
+        be empty in one chunk but not the next). Required columns are
+        checked against the header, column types per chunk, and row limits
+        against the running total.
+        
+        Args:
+            file_path: Path to Excel file
+            sheet_name: Name of sheet to stream
+            schema: Optional schema definition for validation
+            
+        Yields:
+            SheetChunk objects
+            
+        Raises:
+            ValidationError: If the header or a chunk fails validation
+        """
+        # Row limits apply to the whole sheet, not to each chunk
+        chunk_schema = None
+        if self.validate_schemas and schema:
+            chunk_schema = SheetSchema(
+                name=schema.name,
+                required_columns=schema.required_columns,
+                optional_columns=schema.optional_columns,
+                column_types=schema.column_types,
+                allow_empty=True
+            )
+        
+        total_rows = 0
+        chunk_index = 0
+        for start_row, chunk in self._iter_row_chunks(file_path, sheet_name):
+            warnings: List[str] = []
+            if chunk_schema:
+                chunk_validation = self.validator.validate_sheet_schema(chunk, chunk_schema)
+                if not chunk_validation.is_valid:
+                    raise ValidationError("; ".join(chunk_validation.errors))
+                warnings.extend(chunk_validation.warnings)
+            
+            df_clean = self._clean_dataframe(chunk, sheet_name, drop_empty_columns=False)
+            if df_clean.empty:
+                continue
+            
+            total_rows += len(df_clean)
+            # Warn once, on the chunk that crosses the limit
+            if chunk_schema and schema.max_rows and total_rows - len(df_clean) <= schema.max_rows < total_rows:
+                warnings.append(
+                    f"Sheet '{schema.name}' has more than {schema.max_rows} rows, "
+                    f"maximum expected: {schema.max_rows}"
+                )
+            
+            yield SheetChunk(
+                sheet_name=sheet_name,
+                index=chunk_index,
+                start_row=start_row,
+                data=df_clean,
+                warnings=warnings
+            )
+            chunk_index += 1
+        
+        if chunk_schema and total_rows < schema.min_rows:
+            raise ValidationError(
+                f"Sheet '{schema.name}' has {total_rows} rows, "
+                f"minimum required: {schema.min_rows}"
+            )
+        
+        logger.info(f"Streamed sheet '{sheet_name}': {total_rows} rows in {chunk_index} chunks")
+    
+    def _iter_row_chunks(
+        self,
+        file_path: Union[str, Path],
+        sheet_name: str
+    ) -> Iterator[Tuple[int, pd.DataFrame]]:
+        """
+        Yield (first data row number, raw DataFrame) blocks of chunk_size rows.
+        
+        Row numbers are 1-based Excel rows, so the first data row is 2.
+        Column dtypes are inferred per chunk.
+        """
+        extension = Path(file_path).suffix.lower().lstrip('.')
+        if extension == FileType.XLS.value:
+            # No streaming reader for legacy .xls; slice the loaded sheet
+            workbook, engine = open_workbook(str(file_path))
+            with workbook:
+                if sheet_name not in workbook.sheet_names:
+                    logger.warning(f"Sheet not found: {sheet_name}")
+                    return
+                df = self._load_sheet(workbook, sheet_name, engine)
+            if df is None:
+                raise ProcessingError(f"Failed to load sheet: {sheet_name}")
+            for start in range(0, len(df), self.chunk_size):
+                yield start + 2, df.iloc[start:start + self.chunk_size]
+            return
+        
+        import openpyxl
+        workbook = openpyxl.load_workbook(file_path, read_only=True, data_only=True)
+        try:
+            if sheet_name not in workbook.sheetnames:
+                logger.warning(f"Sheet not found: {sheet_name}")
+                return
+            worksheet = workbook[sheet_name]
+            # Stored dimensions are often wrong; read until the data ends
+            worksheet.reset_dimensions()
+            rows = worksheet.iter_rows(values_only=True)
+            header = next(rows, None)
+            if header is None:
+                return
+            columns = self._header_names(header)
+            width = len(columns)
+            
+            block: List[Tuple[Any, ...]] = []
+            start_row = 2
+            for row in rows:
+                # Blank strings count as missing, as they do in pd.read_excel
+                values = tuple(None if value == '' else value for value in row[:width])
+                block.append(values + (None,) * (width - len(values)))
+                if len(block) >= self.chunk_size:
+                    yield start_row, self._chunk_frame(block, columns, start_row)
+                    start_row += len(block)
+                    block = []
+            if block:
+                yield start_row, self._chunk_frame(block, columns, start_row)
+        finally:
+            workbook.close()
+    
+    @staticmethod
+    def _chunk_frame(block: List[Tuple[Any, ...]], columns: List[str], start_row: int) -> pd.DataFrame:
+        # Index continues across chunks, matching a whole-sheet read
+        offset = start_row - 2
+        return pd.DataFrame(block, columns=columns, index=range(offset, offset + len(block)))
+    
+    @staticmethod
+    def _header_names(header: Iterable[Any]) -> List[str]:
+        """Column names as pandas would give them (Unnamed: N, duplicates as A.1)"""
+        names: List[str] = []
+        seen: Dict[str, int] = {}
+        for position, value in enumerate(header):
+            name = f"Unnamed: {position}" if value is None or str(value).strip() == '' else str(value)
+            if name in seen:
+                seen[name] += 1
+                name = f"{name}.{seen[name]}"
+            else:
+                seen[name] = 0
+            names.append(name)
+        return names
+    
     def _clean_dataframe(
         self,
         df: pd.DataFrame,
-        sheet_name: str
+        sheet_name: str,
+        drop_empty_columns: bool = True
     ) -> pd.DataFrame:
         """
         Clean DataFrame: remove empty rows/columns, sanitize strings.
@@ -448,6 +739,7 @@ class ExcelProcessor:
         Args:
             df: DataFrame to clean
             sheet_name: Name of sheet (for logging)
+            drop_empty_columns: Remove all-empty columns (off for streamed chunks)
             
         Returns:
             Cleaned DataFrame
@@ -458,13 +750,15 @@ class ExcelProcessor:
         df_clean = df_clean.dropna(how='all')
         
         # Remove completely empty columns
-        df_clean = df_clean.dropna(axis=1, how='all')
+        if drop_empty_columns:
+            df_clean = df_clean.dropna(axis=1, how='all')
         
-        # Sanitize strings if enabled
+        # Sanitize strings if enabled (object and string-dtype columns)
         if self.sanitize_strings:
             for col in df_clean.columns:
-                if df_clean[col].dtype == 'object':
-                    df_clean[col] = df_clean[col].apply(self.validator.sanitize_string)
+                dtype = df_clean[col].dtype
+                if dtype == 'object' or isinstance(dtype, pd.StringDtype):
+                    df_clean[col] = self.validator.sanitize_series(df_clean[col])
         
         logger.debug(
             f"Cleaned sheet '{sheet_name}': "
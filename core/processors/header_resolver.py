@@ -0,0 +1,125 @@
+"""
+Header Resolver - Map sheet headers to the columns the processor expects
+Headers are normalised and scored once per layout; resolutions are cached
+by header signature, so repeat layouts (same department template) resolve
+with a dictionary lookup. Ties are reported instead of guessed silently.
+"""
+import re
+from dataclasses import dataclass, field
+from functools import lru_cache
+from typing import Dict, List, Optional, Sequence, Tuple
+
+# Extra spellings seen in department templates (normalised form)
+HEADER_ALIASES = {
+    'Item No.': ('item', 'item number', 's no', 'sl no', 'sr no'),
+    'Quantity': ('qty',),
+    'Description': ('particulars', 'description of item'),
+    'BSR': ('bsr no', 'bsr ref'),
+}
+
+# Match strength, best first
+EXACT, NORMALISED, PARTIAL = 3, 2, 1
+
+_NON_ALNUM = re.compile(r'[^0-9a-z]+')
+
+
+def normalize_header(name: object) -> str:
+    """'Item No.' -> 'item no', ' QTY. ' -> 'qty'"""
+    return _NON_ALNUM.sub(' ', str(name).lower()).strip()
+
+
+@dataclass(frozen=True)
+class HeaderResolution:
+    """How one header layout maps onto the expected columns"""
+    columns: Dict[str, str] = field(default_factory=dict)
+    renames: Dict[str, str] = field(default_factory=dict)
+    missing: Tuple[str, ...] = ()
+    ambiguous: Dict[str, Tuple[str, ...]] = field(default_factory=dict)
+
+    @property
+    def selected(self) -> List[str]:
+        """Resolved sheet headers (in expected-column order)"""
+        return list(self.columns.values())
+
+    def to_dict(self) -> Dict[str, object]:
+        return {
+            'columns': dict(self.columns),
+            'renames': dict(self.renames),
+            'missing': list(self.missing),
+            'ambiguous': {name: list(headers) for name, headers in self.ambiguous.items()},
+        }
+
+
+def _score(header: str, names: Sequence[str], normalised: Sequence[str]) -> int:
+    if header in names:
+        return EXACT
+    key = normalize_header(header)
+    if not key:
+        return 0
+    if key in normalised:
+        return NORMALISED
+    if any(n and (n in key or key in n) for n in normalised):
+        return PARTIAL
+    return 0
+
+
+@lru_cache(maxsize=256)
+def _resolve(headers: Tuple[str, ...], expected: Tuple[Tuple[str, str], ...]) -> HeaderResolution:
+    candidates = [h for h in headers if not h.startswith('Unnamed:')]
+    columns: Dict[str, str] = {}
+    renames: Dict[str, str] = {}
+    missing: List[str] = []
+    ambiguous: Dict[str, Tuple[str, ...]] = {}
+    taken = set()
+
+    for name, target in expected:
+        names = (name, target)
+        normalised = {normalize_header(n) for n in names} | set(HEADER_ALIASES.get(name, ()))
+        scored = [(_score(h, names, tuple(normalised)), h) for h in candidates if h not in taken]
+        best = max((score for score, _ in scored), default=0)
+        if best == 0:
+            missing.append(name)
+            continue
+        top = [h for score, h in scored if score == best]
+        if len(top) > 1:
+            ambiguous[name] = tuple(top)
+        # First in sheet order wins (reported above when there was a tie)
+        header = top[0]
+        taken.add(header)
+        columns[name] = header
+        if best != EXACT:
+            renames[header] = target
+
+    return HeaderResolution(columns=columns, renames=renames, missing=tuple(missing), ambiguous=ambiguous)
+
+
+def resolve_headers(headers: Sequence[object], required: Sequence[str],
+                    column_mapping: Optional[Dict[str, str]] = None) -> HeaderResolution:
+    """
+    Resolve expected columns against a sheet's header row
+
+    Exact headers (the expected name or its mapped name) keep their own
+    name; normalised, alias and partial matches are renamed to the mapped
+    name so generators find them.
+
+    Args:
+        headers: Header row as read
+        required: Expected column names (e.g. 'Item No.', 'Quantity')
+        column_mapping: Expected name -> standard sheet name (e.g. 'Item No.' -> 'Item')
+
+    Returns:
+        HeaderResolution (cached per header signature)
+    """
+    mapping = column_mapping or {}
+    signature = tuple(str(h) for h in headers)
+    expected = tuple((name, mapping.get(name, name)) for name in required)
+    return _resolve(signature, expected)
+
+
+def cache_info():
+    """lru_cache statistics for the resolution cache"""
+    return _resolve.cache_info()
+
+
+def clear_cache() -> None:
+    _resolve.cache_clear()
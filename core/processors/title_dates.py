@@ -0,0 +1,86 @@
+"""
+Title Dates - Recognise and parse Title-sheet dates once
+ExcelProcessor stores the parsed dates next to the display strings so the
+generators' delay and liquidated-damages calculations do not re-parse them.
+"""
+from datetime import date, datetime
+from typing import Any, Dict, Optional
+
+# Title-sheet keys that hold dates (with and without the trailing colon)
+TITLE_DATE_FIELDS = frozenset([
+    'Date of written order to commence work :',
+    'Date of written order to commence work',
+    'St. date of Start :',
+    'St. date of Start',
+    'St. date of completion :',
+    'St. date of completion',
+    'Date of actual completion of work :',
+    'Date of actual completion of work',
+    'Date of measurement :',
+    'Date of measurement',
+])
+
+# Accepted text layouts, day-first as entered on the Title sheet
+DATE_FORMATS = ('%d/%m/%Y', '%Y-%m-%d', '%d-%m-%Y', '%m/%d/%Y')
+
+DISPLAY_FORMAT = '%d/%m/%Y'
+
+
+def parse_title_date(value: Any) -> Optional[date]:
+    """
+    Parse a Title-sheet date cell
+
+    Args:
+        value: Cell value (datetime/Timestamp/date or text, possibly with a time part)
+
+    Returns:
+        date, or None if the value is not a recognisable date
+    """
+    if value is None:
+        return None
+    if isinstance(value, datetime):
+        # Also covers pd.Timestamp; NaT has no valid date
+        return None if value != value else value.date()
+    if isinstance(value, date):
+        return value
+
+    text = str(value).strip()
+    if not text:
+        return None
+    # '2024-03-15 00:00:00' and similar: the date part decides
+    text = text.split(' ', 1)[0]
+    for fmt in DATE_FORMATS:
+        try:
+            return datetime.strptime(text, fmt).date()
+        except ValueError:
+            continue
+    return None
+
+
+def format_title_date(value: date) -> str:
+    """Display string used on the Title sheet and in documents"""
+    return value.strftime(DISPLAY_FORMAT)
+
+
+def lookup_title_date(title_dates: Optional[Dict[str, date]], title_data: Dict[str, Any], *keys: str) -> Optional[date]:
+    """
+    First date found under any of the keys
+
+    Pre-parsed dates from ExcelProcessor are used when available; title data
+    from other sources (online entry, older pickles) is parsed on demand.
+
+    Args:
+        title_dates: Parsed dates keyed like title_data (may be None)
+        title_data: Title key/value pairs
+        *keys: Keys to try in order
+
+    Returns:
+        date or None
+    """
+    for key in keys:
+        if title_dates and key in title_dates:
+            return title_dates[key]
+        parsed = parse_title_date(title_data.get(key))
+        if parsed is not None:
+            return parsed
+    return None
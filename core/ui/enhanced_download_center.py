@@ -12,6 +12,7 @@ import io
 import base64
 
 from core.utils.optimized_zip_processor import OptimizedZipProcessor, OptimizedZipConfig, ZipMetrics
+from core.utils.streaming_zip import archive_bytes
 from core.utils.download_manager import EnhancedDownloadManager, DownloadItem, DownloadCategory, FileType
 
 class EnhancedDownloadCenter:
@@ -149,7 +150,8 @@ class EnhancedDownloadCenter:
                     processor.add_file_from_memory(item.content, archive_path)
                     
                 # Create ZIP
-                zip_buffer, metrics = processor.create_zip()
+                zip_stream, metrics = processor.create_zip()
+                zip_bytes = archive_bytes(zip_stream)
                 
             # Clear progress indicators
             progress_bar.empty()
@@ -158,7 +160,7 @@ class EnhancedDownloadCenter:
             # Download button
             st.download_button(
                 label="📥 Download Macro Sheets ZIP",
-                data=zip_buffer,
+                data=zip_bytes,
                 file_name="macro_scrutiny_sheets.zip",
                 mime="application/zip",
                 key="macro_sheets_zip_download",
@@ -397,7 +399,8 @@ class EnhancedDownloadCenter:
                     processor.add_file_from_memory(item.content, archive_path)
                     
                 # Create ZIP
-                zip_buffer, metrics = processor.create_zip()
+                zip_stream, metrics = processor.create_zip()
+                zip_bytes = archive_bytes(zip_stream)
                 
             # Clear progress indicators
             progress_bar.empty()
@@ -423,6 +426,14 @@ class EnhancedDownloadCenter:
                 with detail_cols[2]:
                     st.metric("Streaming Files", metrics.streaming_files_count)
                     
+                policy_cols = st.columns(3)
+                with policy_cols[0]:
+                    st.metric("Stored (already compressed)", metrics.stored_files_count)
+                with policy_cols[1]:
+                    st.metric("Bytes Saved", f"{metrics.bytes_saved / 1024 / 1024:.1f} MB")
+                with policy_cols[2]:
+                    st.metric("Time Saved (est.)", f"{metrics.time_saved_seconds:.2f}s")
+                    
                 if metrics.cached_files_count > 0:
                     st.success(f"✅ {metrics.cached_files_count} files loaded from cache")
                     
@@ -432,7 +443,7 @@ class EnhancedDownloadCenter:
             # Download button
             st.download_button(
                 label=f"📥 Download {zip_name}",
-                data=zip_buffer,
+                data=zip_bytes,
                 file_name=zip_name,
                 mime="application/zip",
                 key=f"final_download_{zip_name}",
@@ -13,6 +13,7 @@ import gc
 # Import utilities
 from core.utils.output_manager import get_output_manager
 from core.utils.cache_cleaner import CacheCleaner
+from core.ui.job_panel import remember_jobs, show_job_panel
 
 def show_excel_mode(config):
     """Show Excel upload interface with correct template flow"""
@@ -88,10 +89,27 @@ def show_excel_mode(config):
             save_to_output = st.checkbox("💾 Save", value=True, 
                                         help="Save to OUTPUT folder")
         
+        run_in_background = st.checkbox(
+            "🕒 Run in background", value=False,
+            help="Queue the job on the server's worker pool; progress and downloads appear below"
+        )
+        
         st.markdown("<br>", unsafe_allow_html=True)
         
         # Generate button - large and prominent
-        if st.button("🚀 Generate All Documents", type="primary", use_container_width=True):
+        generate_clicked = st.button("🚀 Generate All Documents", type="primary", use_container_width=True)
+        if generate_clicked and run_in_background:
+            from core.batch.job_queue import get_job_queue
+            job_id = get_job_queue(config.processing.pdf_engine).submit_workbook(
+                uploaded_file.getvalue(), uploaded_file.name,
+                {'html': generate_html, 'pdf': generate_pdf, 'docx': generate_word,
+                 'save_to_output': save_to_output}
+            )
+            remember_jobs('excel_jobs', [job_id])
+            st.success(f"✅ Queued {uploaded_file.name} - you can keep working while it renders")
+            generate_clicked = False
+        
+        if generate_clicked:
             # Clean cache before processing
             CacheCleaner.clean_cache(verbose=False)
             
@@ -129,7 +147,10 @@ def show_excel_mode(config):
                     if generate_word:
                         from core.generators.word_generator import WordGenerator
                         word_gen = WordGenerator()
-                        word_documents = word_gen.generate_all_docx(html_documents)
+                        word_documents = word_gen.generate_all_docx(
+                            html_documents,
+                            template_data=doc_gen.html_generator.template_data
+                        )
                         
                         # Save to OUTPUT folder if requested
                         if save_to_output and output_mgr:
@@ -407,3 +428,6 @@ def show_excel_mode(config):
                     if hasattr(config, 'ui') and hasattr(config.ui, 'show_debug') and config.ui.show_debug:
                         import traceback
                         st.code(traceback.format_exc())
+    
+    # Background jobs survive reruns and are shown until cleared
+    show_job_panel('excel_jobs')
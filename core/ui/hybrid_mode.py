@@ -8,8 +8,10 @@ from datetime import datetime
 import io
 import zipfile
 import json
+from pathlib import Path
 from core.utils.excel_exporter import ExcelExporter
 from core.utils.safe_conversions import safe_float, safe_quantity, safe_rate
+from core.ui.job_panel import remember_jobs, show_job_panel
 
 # PHASE 1.2: Change Log / Audit Trail System
 class ChangeLogger:
@@ -63,6 +65,171 @@ class ChangeLogger:
         """Clear change log"""
         st.session_state.change_log = []
 
+def _generate_documents(data, edited_df, title_data, uploaded_file,
+                        generate_html, generate_pdf, generate_word):
+    """Render the edited bill in this session and show the downloads"""
+    from core.generators.html_generator import HTMLGenerator
+    
+    # Generate HTML
+    generator = HTMLGenerator(data)
+    html_documents = generator.generate_all_documents()
+    
+    st.success(f"✅ Generated {len(html_documents)} HTML documents")
+    
+    # Generate PDF if requested
+    pdf_documents = {}
+    if generate_pdf:
+        from core.generators.pdf_generator_fixed import FixedPDFGenerator
+        pdf_generator = FixedPDFGenerator(margin_mm=10)
+    
+        progress_bar = st.progress(0)
+        for idx, (doc_name, html_content) in enumerate(html_documents.items()):
+            landscape = 'deviation' in doc_name.lower()
+            pdf_bytes = pdf_generator.auto_convert(html_content, landscape=landscape, doc_name=doc_name)
+            pdf_documents[doc_name] = pdf_bytes
+            progress_bar.progress((idx + 1) / len(html_documents))
+    
+        st.success(f"✅ Generated {len(pdf_documents)} PDF documents")
+    
+    # Generate Word if requested
+    word_documents = {}
+    if generate_word:
+        from core.generators.word_generator import WordGenerator
+        word_gen = WordGenerator()
+        word_documents = word_gen.generate_all_docx(
+            html_documents,
+            template_data=generator.template_data
+        )
+        st.success(f"✅ Generated {len(word_documents)} Word documents")
+    
+    # Download section
+    st.markdown("---")
+    st.markdown("### 📥 Download Documents")
+    
+    # PHASE 1.3: Excel Export with Formatting
+    st.markdown("#### 📊 Excel Export (Round-Trip)")
+    st.markdown("""
+    <div style='background: #e8f5e9; padding: 10px; border-radius: 5px; margin-bottom: 10px;'>
+        <p style='color: #2e7d32; margin: 0; font-size: 0.9rem;'>
+            <strong>💡 Excel Round-Trip:</strong> Download your edited data back to Excel with formatting preserved.
+            Includes change log sheet for audit trail.
+        </p>
+    </div>
+    """, unsafe_allow_html=True)
+    
+    col1, col2 = st.columns(2)
+    
+    with col1:
+        # Export edited data to new Excel file
+        try:
+            excel_output = ExcelExporter.create_new_excel(
+                edited_df=edited_df,
+                title_data=title_data,
+                include_formatting=True
+            )
+    
+            # Add change log sheet if changes exist
+            changes = ChangeLogger.get_changes()
+            if len(changes) > 0:
+                change_df = ChangeLogger.export_to_dataframe()
+                excel_output = ExcelExporter.add_change_log_sheet(excel_output, change_df)
+    
+            st.download_button(
+                "📊 Download Edited Excel",
+                data=excel_output.getvalue(),
+                file_name=f"edited_bill_{datetime.now().strftime('%Y%m%d_%H%M%S')}.xlsx",
+                mime="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet",
+                use_container_width=True,
+                help="Download edited data as Excel file with formatting and change log"
+            )
+        except Exception as e:
+            st.error(f"Excel export error: {str(e)}")
+    
+    with col2:
+        # Export with original file formatting (if available)
+        if uploaded_file is not None:
+            try:
+                # Reset file pointer
+                uploaded_file.seek(0)
+    
+                excel_output_original = ExcelExporter.export_with_formatting(
+                    original_file=uploaded_file,
+                    edited_df=edited_df,
+                    sheet_name='Bill Quantity',
+                    preserve_formulas=True
+                )
+    
+                st.download_button(
+                    "📊 Download with Original Formatting",
+                    data=excel_output_original.getvalue(),
+                    file_name=f"updated_{uploaded_file.name}",
+                    mime="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet",
+                    use_container_width=True,
+                    help="Update original Excel file preserving all formatting"
+                )
+            except Exception as e:
+                st.warning(f"Could not preserve original formatting: {str(e)}")
+    
+    st.markdown("---")
+    
+    # Create ZIP
+    zip_buffer = io.BytesIO()
+    with zipfile.ZipFile(zip_buffer, 'w', zipfile.ZIP_DEFLATED) as zip_file:
+        if generate_html:
+            for doc_name, html_content in html_documents.items():
+                zip_file.writestr(f"html/{doc_name}.html", html_content)
+        if generate_pdf:
+            for doc_name, pdf_bytes in pdf_documents.items():
+                zip_file.writestr(f"pdf/{doc_name}.pdf", pdf_bytes)
+        if generate_word:
+            for doc_name, docx_bytes in word_documents.items():
+                zip_file.writestr(f"word/{doc_name}.docx", docx_bytes)
+    
+    zip_buffer.seek(0)
+    
+    # ZIP download
+    st.download_button(
+        "📦 Download All (ZIP)",
+        data=zip_buffer.getvalue(),
+        file_name=f"hybrid_documents_{datetime.now().strftime('%Y%m%d_%H%M%S')}.zip",
+        mime="application/zip",
+        use_container_width=True
+    )
+    
+    # Individual downloads
+    if generate_html:
+        st.markdown("#### 📄 HTML Documents")
+        for doc_name, html_content in html_documents.items():
+            st.download_button(
+                f"📄 {doc_name}",
+                data=html_content,
+                file_name=f"{doc_name}.html",
+                mime="text/html",
+                key=f"html_{doc_name}"
+            )
+    
+    if generate_pdf:
+        st.markdown("#### 📕 PDF Documents")
+        for doc_name, pdf_bytes in pdf_documents.items():
+            st.download_button(
+                f"📕 {doc_name}",
+                data=pdf_bytes,
+                file_name=f"{doc_name}.pdf",
+                mime="application/pdf",
+                key=f"pdf_{doc_name}"
+            )
+    
+    if generate_word:
+        st.markdown("#### 📝 Word Documents")
+        for doc_name, docx_bytes in word_documents.items():
+            st.download_button(
+                f"📝 {doc_name}",
+                data=docx_bytes,
+                file_name=f"{doc_name}.docx",
+                mime="application/vnd.openxmlformats-officedocument.wordprocessingml.document",
+                key=f"docx_{doc_name}"
+            )
+
 def show_hybrid_mode(config):
     """Show hybrid Excel upload + rate editor interface"""
     
@@ -666,12 +833,15 @@ def show_hybrid_mode(config):
                 with col3:
                     generate_word = st.checkbox("📝 DOCX", value=False)
                 
+                run_in_background = st.checkbox(
+                    "🕒 Run in background", value=False,
+                    help="Queue the job on the server's worker pool; progress and downloads appear below"
+                )
+                
                 if st.button("🚀 Generate All Documents", type="primary", use_container_width=True):
                     with st.spinner("Generating documents with edited rates..."):
                         try:
                             # Prepare data for document generation
-                            from core.generators.html_generator import HTMLGenerator
-                            
                             # CRITICAL FIX: HTMLGenerator expects DataFrames, not lists
                             # Filter to only include items with Bill Quantity > 0
                             active_items_df = edited_df[edited_df['Bill Quantity'] > 0].copy()
@@ -732,162 +902,19 @@ def show_hybrid_mode(config):
                                 'hybrid_mode': True  # Flag to indicate hybrid mode
                             }
                             
-                            # Generate HTML
-                            generator = HTMLGenerator(data)
-                            html_documents = generator.generate_all_documents()
-                            
-                            st.success(f"✅ Generated {len(html_documents)} HTML documents")
-                            
-                            # Generate PDF if requested
-                            pdf_documents = {}
-                            if generate_pdf:
-                                from core.generators.pdf_generator_fixed import FixedPDFGenerator
-                                pdf_generator = FixedPDFGenerator(margin_mm=10)
-                                
-                                progress_bar = st.progress(0)
-                                for idx, (doc_name, html_content) in enumerate(html_documents.items()):
-                                    landscape = 'deviation' in doc_name.lower()
-                                    pdf_bytes = pdf_generator.auto_convert(html_content, landscape=landscape, doc_name=doc_name)
-                                    pdf_documents[doc_name] = pdf_bytes
-                                    progress_bar.progress((idx + 1) / len(html_documents))
-                                
-                                st.success(f"✅ Generated {len(pdf_documents)} PDF documents")
-                            
-                            # Generate Word if requested
-                            word_documents = {}
-                            if generate_word:
-                                from core.generators.word_generator import WordGenerator
-                                word_gen = WordGenerator()
-                                word_documents = word_gen.generate_all_docx(html_documents)
-                                st.success(f"✅ Generated {len(word_documents)} Word documents")
-                            
-                            # Download section
-                            st.markdown("---")
-                            st.markdown("### 📥 Download Documents")
-                            
-                            # PHASE 1.3: Excel Export with Formatting
-                            st.markdown("#### 📊 Excel Export (Round-Trip)")
-                            st.markdown("""
-                            <div style='background: #e8f5e9; padding: 10px; border-radius: 5px; margin-bottom: 10px;'>
-                                <p style='color: #2e7d32; margin: 0; font-size: 0.9rem;'>
-                                    <strong>💡 Excel Round-Trip:</strong> Download your edited data back to Excel with formatting preserved.
-                                    Includes change log sheet for audit trail.
-                                </p>
-                            </div>
-                            """, unsafe_allow_html=True)
-                            
-                            col1, col2 = st.columns(2)
-                            
-                            with col1:
-                                # Export edited data to new Excel file
-                                try:
-                                    excel_output = ExcelExporter.create_new_excel(
-                                        edited_df=edited_df,
-                                        title_data=title_data,
-                                        include_formatting=True
-                                    )
-                                    
-                                    # Add change log sheet if changes exist
-                                    changes = ChangeLogger.get_changes()
-                                    if len(changes) > 0:
-                                        change_df = ChangeLogger.export_to_dataframe()
-                                        excel_output = ExcelExporter.add_change_log_sheet(excel_output, change_df)
-                                    
-                                    st.download_button(
-                                        "📊 Download Edited Excel",
-                                        data=excel_output.getvalue(),
-                                        file_name=f"edited_bill_{datetime.now().strftime('%Y%m%d_%H%M%S')}.xlsx",
-                                        mime="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet",
-                                        use_container_width=True,
-                                        help="Download edited data as Excel file with formatting and change log"
-                                    )
-                                except Exception as e:
-                                    st.error(f"Excel export error: {str(e)}")
-                            
-                            with col2:
-                                # Export with original file formatting (if available)
-                                if uploaded_file is not None:
-                                    try:
-                                        # Reset file pointer
-                                        uploaded_file.seek(0)
-                                        
-                                        excel_output_original = ExcelExporter.export_with_formatting(
-                                            original_file=uploaded_file,
-                                            edited_df=edited_df,
-                                            sheet_name='Bill Quantity',
-                                            preserve_formulas=True
-                                        )
-                                        
-                                        st.download_button(
-                                            "📊 Download with Original Formatting",
-                                            data=excel_output_original.getvalue(),
-                                            file_name=f"updated_{uploaded_file.name}",
-                                            mime="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet",
-                                            use_container_width=True,
-                                            help="Update original Excel file preserving all formatting"
-                                        )
-                                    except Exception as e:
-                                        st.warning(f"Could not preserve original formatting: {str(e)}")
-                            
-                            st.markdown("---")
-                            
-                            # Create ZIP
-                            zip_buffer = io.BytesIO()
-                            with zipfile.ZipFile(zip_buffer, 'w', zipfile.ZIP_DEFLATED) as zip_file:
-                                if generate_html:
-                                    for doc_name, html_content in html_documents.items():
-                                        zip_file.writestr(f"html/{doc_name}.html", html_content)
-                                if generate_pdf:
-                                    for doc_name, pdf_bytes in pdf_documents.items():
-                                        zip_file.writestr(f"pdf/{doc_name}.pdf", pdf_bytes)
-                                if generate_word:
-                                    for doc_name, docx_bytes in word_documents.items():
-                                        zip_file.writestr(f"word/{doc_name}.docx", docx_bytes)
-                            
-                            zip_buffer.seek(0)
-                            
-                            # ZIP download
-                            st.download_button(
-                                "📦 Download All (ZIP)",
-                                data=zip_buffer.getvalue(),
-                                file_name=f"hybrid_documents_{datetime.now().strftime('%Y%m%d_%H%M%S')}.zip",
-                                mime="application/zip",
-                                use_container_width=True
-                            )
-                            
-                            # Individual downloads
-                            if generate_html:
-                                st.markdown("#### 📄 HTML Documents")
-                                for doc_name, html_content in html_documents.items():
-                                    st.download_button(
-                                        f"📄 {doc_name}",
-                                        data=html_content,
-                                        file_name=f"{doc_name}.html",
-                                        mime="text/html",
-                                        key=f"html_{doc_name}"
-                                    )
-                            
-                            if generate_pdf:
-                                st.markdown("#### 📕 PDF Documents")
-                                for doc_name, pdf_bytes in pdf_documents.items():
-                                    st.download_button(
-                                        f"📕 {doc_name}",
-                                        data=pdf_bytes,
-                                        file_name=f"{doc_name}.pdf",
-                                        mime="application/pdf",
-                                        key=f"pdf_{doc_name}"
-                                    )
-                            
-                            if generate_word:
-                                st.markdown("#### 📝 Word Documents")
-                                for doc_name, docx_bytes in word_documents.items():
-                                    st.download_button(
-                                        f"📝 {doc_name}",
-                                        data=docx_bytes,
-                                        file_name=f"{doc_name}.docx",
-                                        mime="application/vnd.openxmlformats-officedocument.wordprocessingml.document",
-                                        key=f"docx_{doc_name}"
-                                    )
+                            if run_in_background:
+                                from core.batch.job_queue import get_job_queue
+                                job_id = get_job_queue(config.processing.pdf_engine).submit_data(
+                                    data, Path(uploaded_file.name).stem,
+                                    {'html': generate_html, 'pdf': generate_pdf, 'docx': generate_word}
+                                )
+                                remember_jobs('hybrid_jobs', [job_id])
+                                st.success("✅ Queued with your edited rates - progress and downloads appear below")
+                            else:
+                                _generate_documents(
+                                    data, edited_df, title_data, uploaded_file,
+                                    generate_html, generate_pdf, generate_word
+                                )
                         
                         except Exception as e:
                             st.error(f"❌ Error generating documents: {str(e)}")
@@ -939,3 +966,6 @@ def show_hybrid_mode(config):
             | 002  | ₹1000   | ₹1000     | Full rate |
             | 003  | ₹750    | ₹500      | Revised rate |
             """)
+    
+    # Background jobs survive reruns and are shown until cleared
+    show_job_panel('hybrid_jobs')
@@ -0,0 +1,85 @@
+"""
+Background Job Panel - Status, progress and downloads for queued jobs
+Job IDs are kept in st.session_state, so reruns only re-read the queue
+and never restart generation.
+"""
+import streamlit as st
+from pathlib import Path
+from typing import List
+
+
+def remember_jobs(state_key: str, job_ids: List[str]) -> None:
+    """Add job IDs to the session list shown by show_job_panel"""
+    st.session_state.setdefault(state_key, [])
+    st.session_state[state_key].extend(job_ids)
+
+
+def show_job_panel(state_key: str, title: str = "🕒 Background Jobs") -> None:
+    """
+    Show progress for the jobs this session submitted
+
+    Args:
+        state_key: Session state key holding the list of job IDs
+        title: Section heading
+    """
+    job_ids = st.session_state.get(state_key) or []
+    if not job_ids:
+        return
+
+    from core.batch.job_queue import get_job_queue
+    from core.batch.job_runner_enterprise import JobStatus
+    queue = get_job_queue()
+
+    st.markdown("---")
+    st.markdown(f"### {title}")
+
+    jobs = [job for job in (queue.get(job_id) for job_id in job_ids) if job is not None]
+    active = [job for job in jobs if not job.finished]
+
+    for job in jobs:
+        col1, col2 = st.columns([3, 1])
+        with col1:
+            if job.status == JobStatus.PENDING:
+                ahead = queue.queue_position(job.job_id)
+                st.markdown(f"**{job.label}** — ⏳ queued ({ahead} ahead)")
+            elif job.status == JobStatus.RUNNING:
+                st.markdown(f"**{job.label}** — ⚙️ {job.message}")
+                st.progress(job.progress)
+            elif job.status in (JobStatus.SUCCESS, JobStatus.PARTIAL):
+                icon = "✅" if job.status == JobStatus.SUCCESS else "⚠️"
+                st.markdown(f"**{job.label}** — {icon} {job.message} ({job.duration_seconds:.1f}s)")
+                if job.error:
+                    with st.expander("Documents that failed"):
+                        st.code(job.error)
+            elif job.status == JobStatus.CANCELLED:
+                st.markdown(f"**{job.label}** — 🚫 cancelled")
+            else:
+                st.markdown(f"**{job.label}** — ❌ failed")
+                with st.expander("Error details"):
+                    st.code(job.error or "")
+        with col2:
+            if job.status == JobStatus.PENDING:
+                if st.button("Cancel", key=f"cancel_{job.job_id}", use_container_width=True):
+                    queue.cancel(job.job_id)
+                    st.rerun()
+            elif job.result_path and Path(job.result_path).exists():
+                with open(job.result_path, 'rb') as f:
+                    st.download_button(
+                        "📦 Download ZIP",
+                        data=f,
+                        file_name=f"{job.label}.zip",
+                        mime="application/zip",
+                        key=f"job_zip_{job.job_id}",
+                        use_container_width=True
+                    )
+
+    col1, col2 = st.columns(2)
+    with col1:
+        if active and st.button("🔄 Refresh Status", key=f"{state_key}_refresh", use_container_width=True):
+            st.rerun()
+    with col2:
+        if not active and st.button("🧹 Clear Finished Jobs", key=f"{state_key}_clear", use_container_width=True):
+            for job in jobs:
+                queue.purge(job.job_id)
+            st.session_state[state_key] = []
+            st.rerun()
@@ -7,7 +7,6 @@ import streamlit as st
 import pandas as pd
 from datetime import datetime
 import io
-import zipfile
 
 
 # ═══════════════════════════════════════════════════════════════════════════
@@ -631,6 +630,7 @@ def _generate(config: dict) -> None:
     with st.spinner("🔄 Generating documents..."):
         try:
             from core.generators.document_generator import DocumentGenerator
+            from core.utils.streaming_zip import StreamingZipWriter, archive_bytes
             
             # Extract config
             project_name = config.get("project_name", "")
@@ -679,21 +679,19 @@ def _generate(config: dict) -> None:
             
             st.success("✅ Documents generated successfully!")
             
-            # Create ZIP file
-            buf = io.BytesIO()
-            with zipfile.ZipFile(buf, "w", zipfile.ZIP_DEFLATED) as zf:
+            # Create ZIP file (streamed into a spooled temp file)
+            with StreamingZipWriter() as zf:
                 # Add HTML documents
                 for name, content in html_docs.items():
-                    b = content.encode() if isinstance(content, str) else content
-                    zf.writestr(f"html/{name}.html", b)
+                    zf.add_bytes(f"html/{name}.html", content)
                 
                 # Add PDF documents
                 for name, content in pdf_docs.items():
-                    zf.writestr(f"pdf/{name}.pdf", content)
+                    zf.add_bytes(f"pdf/{name}.pdf", content)
                 
                 # Add DOCX documents
                 for name, content in doc_docs.items():
-                    zf.writestr(f"word/{name}", content)
+                    zf.add_bytes(f"word/{name}", content)
                 
                 # Add change log Excel if changes exist
                 if change_log:
@@ -702,15 +700,16 @@ def _generate(config: dict) -> None:
                     with pd.ExcelWriter(xl_buf, engine="openpyxl") as writer:
                         items_df.to_excel(writer, sheet_name="Items", index=False)
                         cl_df.to_excel(writer, sheet_name="Change Log", index=False)
-                    zf.writestr("data/bill_with_changelog.xlsx", xl_buf.getvalue())
+                    xl_buf.seek(0)
+                    zf.add_stream("data/bill_with_changelog.xlsx", xl_buf)
             
-            buf.seek(0)
+            zip_bytes = archive_bytes(zf.close())
             ts = datetime.now().strftime("%Y%m%d_%H%M%S")
             
             # ZIP download button
             st.download_button(
                 "📦 Download All (ZIP)",
-                data=buf.getvalue(),
+                data=zip_bytes,
                 file_name=f"bill_{ts}.zip",
                 mime="application/zip",
                 use_container_width=True,
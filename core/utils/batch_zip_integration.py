@@ -4,6 +4,7 @@ Utility to integrate batch processing results with enhanced ZIP download capabil
 """
 
 import os
+import shutil
 import logging
 from pathlib import Path
 from typing import List, Dict, Any
@@ -158,12 +159,13 @@ class BatchZipIntegration:
                     zip_path = Path(output_folder) / zip_filename
                     
                     with open(zip_path, 'wb') as f:
-                        f.write(zip_buffer.getvalue())
+                        shutil.copyfileobj(zip_buffer, f)
+                    zip_buffer.close()
                         
                     # Add ZIP to download manager
                     self.download_manager.add_item(
                         zip_filename,
-                        zip_buffer.getvalue(),
+                        zip_path.read_bytes(),
                         FileType.ZIP,
                         f"ZIP archive for {filename}",
                         DownloadCategory.GENERAL
@@ -239,12 +241,13 @@ class BatchZipIntegration:
                 output_path.parent.mkdir(parents=True, exist_ok=True)
                 
                 with open(output_path, 'wb') as f:
-                    f.write(zip_buffer.getvalue())
+                    shutil.copyfileobj(zip_buffer, f)
+                zip_buffer.close()
                     
                 # Add to download manager
                 self.download_manager.add_item(
                     archive_name,
-                    zip_buffer.getvalue(),
+                    output_path.read_bytes(),
                     FileType.ZIP,
                     "Combined ZIP archive of all batch results",
                     DownloadCategory.GENERAL
@@ -0,0 +1,122 @@
+"""
+Blob Store - Content-addressed storage for generated documents
+Identical artefacts (e.g. certificates repeated across running bills) are
+stored once under OUTPUT/.blobs and hard-linked into each bill folder.
+"""
+import hashlib
+import os
+import shutil
+import tempfile
+from pathlib import Path
+from typing import Dict, Iterator, Tuple, Union
+
+
+class BlobStore:
+    """
+    Content-addressed blob store
+
+    - Blobs live at <root>/<first 2 hex chars>/<sha256>
+    - Bill folders reference blobs through hard links, so every copy
+      shares one inode and the space is counted once
+    - A blob whose link count drops to 1 is no longer referenced
+    """
+
+    def __init__(self, root: Union[str, Path]):
+        """
+        Initialize blob store
+
+        Args:
+            root: Directory holding the blobs (created if missing)
+        """
+        self.root = Path(root)
+        self.root.mkdir(parents=True, exist_ok=True)
+
+    def blob_path(self, digest: str) -> Path:
+        """Path of the blob for a SHA-256 hex digest"""
+        return self.root / digest[:2] / digest
+
+    def put(self, content: bytes) -> Path:
+        """
+        Store content once
+
+        Args:
+            content: File content
+
+        Returns:
+            Path to the blob
+        """
+        digest = hashlib.sha256(content).hexdigest()
+        blob = self.blob_path(digest)
+        if not blob.exists():
+            blob.parent.mkdir(exist_ok=True)
+            # Write to a temp file first so readers never see a partial blob
+            fd, tmp_path = tempfile.mkstemp(dir=blob.parent, suffix='.tmp')
+            with os.fdopen(fd, 'wb') as f:
+                f.write(content)
+            os.replace(tmp_path, blob)
+        return blob
+
+    def link(self, content: bytes, dest: Union[str, Path]) -> Path:
+        """
+        Store content and make dest refer to it
+
+        Falls back to a plain copy where hard links are not supported
+        (e.g. another filesystem).
+
+        Args:
+            content: File content
+            dest: Path in a bill folder
+
+        Returns:
+            dest
+        """
+        dest = Path(dest)
+        blob = self.put(content)
+        if dest.exists() or dest.is_symlink():
+            dest.unlink()
+        try:
+            os.link(blob, dest)
+        except OSError:
+            shutil.copyfile(blob, dest)
+        return dest
+
+    def iter_blobs(self) -> Iterator[Path]:
+        """All stored blobs"""
+        for blob in self.root.glob('*/*'):
+            if blob.is_file() and not blob.name.endswith('.tmp'):
+                yield blob
+
+    def collect_garbage(self) -> Tuple[int, int]:
+        """
+        Remove blobs no bill folder links to any more
+
+        Returns:
+            Tuple of (blobs_deleted, space_freed_bytes)
+        """
+        deleted = 0
+        freed = 0
+        for blob in self.iter_blobs():
+            stat = blob.stat()
+            if stat.st_nlink <= 1:
+                blob.unlink()
+                deleted += 1
+                freed += stat.st_size
+        return deleted, freed
+
+    def stats(self) -> Dict[str, int]:
+        """
+        Blob store usage
+
+        Returns:
+            Dict with blob count, stored bytes and bytes saved by sharing
+        """
+        blobs = 0
+        stored = 0
+        saved = 0
+        for blob in self.iter_blobs():
+            stat = blob.stat()
+            blobs += 1
+            stored += stat.st_size
+            # Every link beyond the blob itself and its first reference is a saved copy
+            saved += stat.st_size * max(0, stat.st_nlink - 2)
+        return {'blobs': blobs, 'stored_bytes': stored, 'saved_bytes': saved}
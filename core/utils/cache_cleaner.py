@@ -1,7 +1,9 @@
 """
 Cache Cleaner - Automatic cache cleaning utility
-Cleans Python cache files after each run
+Cleans tool caches; Python bytecode is kept unless explicitly requested,
+since deleting it forces every module to recompile on the next start
 """
+import os
 import shutil
 from pathlib import Path
 from typing import Tuple, List
@@ -14,23 +16,28 @@ class CacheCleaner:
     
     # Cache patterns to clean
     CACHE_PATTERNS = [
-        '**/__pycache__',
-        '**/*.pyc',
-        '**/*.pyo',
-        '**/*.pyd',
         '.pytest_cache',
         '.mypy_cache',
         '.ruff_cache',
     ]
     
+    # Bytecode patterns (only removed on request)
+    BYTECODE_PATTERNS = [
+        '**/__pycache__',
+        '**/*.pyc',
+        '**/*.pyo',
+    ]
+    
     @staticmethod
-    def clean_cache(root_dir: str = '.', verbose: bool = False) -> Tuple[int, int]:
+    def clean_cache(root_dir: str = '.', verbose: bool = False,
+                    include_bytecode: bool = False) -> Tuple[int, int]:
         """
-        Clean all cache files and directories
+        Clean cache files and directories
         
         Args:
             root_dir: Root directory to clean from
             verbose: Print cleaning progress
+            include_bytecode: Also delete __pycache__ and *.pyc (slows the next start)
             
         Returns:
             Tuple of (directories_removed, files_removed)
@@ -39,8 +46,12 @@ class CacheCleaner:
         dirs_removed = 0
         files_removed = 0
         
+        patterns = list(CacheCleaner.CACHE_PATTERNS)
+        if include_bytecode:
+            patterns = CacheCleaner.BYTECODE_PATTERNS + patterns
+        
         # Clean cache directories
-        for pattern in CacheCleaner.CACHE_PATTERNS:
+        for pattern in patterns:
             if '**' in pattern:
                 # Recursive pattern
                 for path in root_path.glob(pattern):
@@ -83,7 +94,7 @@ class CacheCleaner:
     def clean_on_exit():
         """Clean cache on application exit"""
         try:
-            dirs, files = CacheCleaner.clean_cache(verbose=False)
+            dirs, files = CacheCleaner.clean_cache(verbose=False, include_bytecode=True)
             if dirs > 0 or files > 0:
                 logger.info(f"Cache cleaned: {dirs} directories, {files} files")
         except Exception as e:
@@ -96,5 +107,6 @@ class CacheCleaner:
         atexit.register(CacheCleaner.clean_on_exit)
 
 
-# Auto-register exit handler
-CacheCleaner.register_exit_handler()
+# Full clean on exit is opt-in: it throws away the bytecode of every module
+if os.getenv('CLEAN_CACHE_ON_EXIT', 'false').lower() == 'true':
+    CacheCleaner.register_exit_handler()
@@ -0,0 +1,369 @@
+"""
+Content Scanner - Single-pass risk scan over a byte stream
+Every rule (blocked patterns, suspicious indicators, HTML tags/attributes,
+external links) is found in one pass: a combined trigger regex locates
+candidate positions and only the rules whose literal prefix starts there
+are checked. Input is read in chunks with a carried-over window, so
+matches that straddle a chunk boundary are still found and memory stays
+bounded. Office containers (.xlsx/.docx) are scanned through the text of
+their inner XML parts rather than the compressed bytes.
+"""
+import fnmatch
+import re
+import zipfile
+from collections import defaultdict
+from dataclasses import dataclass, field
+from typing import Dict, Iterable, Iterator, List, Optional, Sequence, Tuple
+
+try:
+    from re import _parser as sre_parse
+except ImportError:  # Python < 3.11
+    import sre_parse
+
+SCAN_CHUNK_SIZE = 1024 * 1024
+
+# Regex rules must match within this many bytes of where they start
+MATCH_WINDOW = 64 * 1024
+
+BLOCKED, HTML, SUSPICIOUS = 'blocked', 'html', 'suspicious'
+
+SUSPICIOUS_INDICATORS = (
+    'base64_decode',
+    'eval(',
+    'exec(',
+    'system(',
+    'shell_exec',
+    'passthru',
+    '<?php',
+    '<%',
+    '<script',
+    'javascript:',
+)
+
+DANGEROUS_HTML_TAGS = ('<script', '<iframe', '<object', '<embed', '<form', '<input', '<link', '<meta')
+
+DANGEROUS_HTML_ATTRS = (
+    'onload=',
+    'onerror=',
+    'onclick=',
+    'onmouseover=',
+    'javascript:',
+    'vbscript:',
+    'data:text/html',
+)
+
+EXTERNAL_RESOURCE_PATTERNS = (
+    r'http[s]?://[^"\s>]+',
+    r'href\s*=\s*["\']?http',
+    r'src\s*=\s*["\']?http',
+)
+
+# Inner parts of Office containers that carry user text
+CONTAINER_PARTS = {
+    '.xlsx': ('xl/sharedStrings.xml', 'xl/workbook.xml', 'xl/worksheets/*.xml',
+              'xl/comments*.xml', 'xl/threadedComments/*.xml', 'xl/externalLinks/*.xml'),
+    '.docx': ('word/document.xml', 'word/header*.xml', 'word/footer*.xml',
+              'word/comments.xml', 'word/footnotes.xml', 'word/endnotes.xml'),
+}
+CONTAINER_PARTS['.xlsm'] = CONTAINER_PARTS['.xlsx']
+
+_XML_ENTITIES = {b'&lt;': b'<', b'&gt;': b'>', b'&quot;': b'"', b'&apos;': b"'", b'&amp;': b'&'}
+_XML_ENTITY_RE = re.compile(b'|'.join(re.escape(e) for e in _XML_ENTITIES))
+_XML_TAG_RE = re.compile(rb'<[^>]*>')
+
+
+@dataclass(frozen=True)
+class ScanRule:
+    """One thing to look for and what it adds to the risk score"""
+    name: str
+    group: str
+    pattern: str
+    weight: float
+    count: bool = False     # weight per (non-overlapping) match, else once if present
+    literal: bool = False   # pattern is plain text, not a regex
+
+
+@dataclass
+class ScanResult:
+    """Match counts per rule"""
+    counts: Dict[ScanRule, int] = field(default_factory=lambda: defaultdict(int))
+
+    def score(self, group: str) -> float:
+        total = 0.0
+        for rule, count in self.counts.items():
+            if rule.group == group and count:
+                total += rule.weight * (count if rule.count else 1)
+        return total
+
+    def matches(self, group: str) -> List[Tuple[ScanRule, int]]:
+        return [(rule, count) for rule, count in self.counts.items() if rule.group == group and count]
+
+
+def default_rules(blocked_patterns: Sequence[str], html: bool = False) -> List[ScanRule]:
+    """
+    Rules matching SecurityManager's content checks
+
+    Args:
+        blocked_patterns: SecurityConfig.blocked_patterns (10 per match)
+        html: Include the HTML tag/attribute/external-link rules
+    """
+    rules = [ScanRule(p, BLOCKED, p, 10, count=True) for p in blocked_patterns]
+    rules += [ScanRule(i, SUSPICIOUS, i, 5, literal=True) for i in SUSPICIOUS_INDICATORS]
+    if html:
+        rules += [ScanRule(t, HTML, t, 5, count=True, literal=True) for t in DANGEROUS_HTML_TAGS]
+        rules += [ScanRule(a, HTML, a, 10, literal=True) for a in DANGEROUS_HTML_ATTRS]
+        rules += [ScanRule(p, HTML, p, 3) for p in EXTERNAL_RESOURCE_PATTERNS]
+    return rules
+
+
+def _literal_prefix(pattern: str) -> bytes:
+    """Leading literal text every match of a regex starts with ('' if none)"""
+    prefix = []
+    try:
+        for op, arg in sre_parse.parse(pattern):
+            if op is not sre_parse.LITERAL:
+                break
+            prefix.append(chr(arg))
+    except (re.error, TypeError, ValueError):
+        return b''
+    try:
+        return ''.join(prefix).lower().encode('ascii')
+    except UnicodeEncodeError:
+        return b''
+
+
+class _CompiledRule:
+    __slots__ = ('rule', 'prefix', 'regex', 'length')
+
+    def __init__(self, rule: ScanRule):
+        self.rule = rule
+        if rule.literal:
+            self.prefix = rule.pattern.lower().encode('utf-8')
+            self.regex = None
+            self.length = len(self.prefix)
+        else:
+            self.prefix = _literal_prefix(rule.pattern)
+            self.regex = re.compile(rule.pattern.encode('utf-8'), re.IGNORECASE | re.DOTALL)
+            self.length = 0
+
+
+class _StreamState:
+    """Per-stream bookkeeping (absolute positions)"""
+
+    def __init__(self):
+        self.next_start: Dict[_CompiledRule, int] = {}
+
+
+class ContentScanner:
+    """
+    Scan bytes for a fixed rule set in a single pass
+
+    Input is lowercased chunk by chunk; rules are matched case-insensitively.
+    """
+
+    def __init__(self, rules: Sequence[ScanRule], chunk_size: int = SCAN_CHUNK_SIZE):
+        self.rules = list(rules)
+        self.chunk_size = chunk_size
+        compiled = [_CompiledRule(rule) for rule in self.rules]
+
+        # Rules with a literal prefix are found through one trigger regex
+        self._by_prefix: Dict[bytes, List[_CompiledRule]] = defaultdict(list)
+        self._fallback: List[_CompiledRule] = []
+        for rule in compiled:
+            if rule.prefix:
+                self._by_prefix[rule.prefix].append(rule)
+            else:
+                self._fallback.append(rule)
+        self._by_first: Dict[int, List[bytes]] = defaultdict(list)
+        for prefix in self._by_prefix:
+            self._by_first[prefix[0]].append(prefix)
+
+        self._triggers: Dict[frozenset, Optional[re.Pattern]] = {}
+        longest = max((len(p) for p in self._by_prefix), default=1)
+        self._keep = max(MATCH_WINDOW, longest)
+
+    def _trigger(self, result: ScanResult) -> Optional[re.Pattern]:
+        """
+        Combined regex over the rules still worth looking for
+
+        Literal rules contribute their text and (lowercase) regex rules the
+        regex itself, so a search mostly stops where some rule really
+        matches; other regex rules contribute their literal prefix.
+        Presence-only rules drop out once found, so a common string (e.g.
+        'http') stops costing a check per occurrence.
+        """
+        counts = result.counts
+        active = frozenset(
+            rule for rules in self._by_prefix.values() for rule in rules
+            if rule.rule.count or not counts[rule.rule]
+        )
+        if active not in self._triggers:
+            # Input is already lowercase; IGNORECASE here would make every search several times slower
+            exact = [rule for rule in active if rule.regex is not None and rule.regex.pattern == rule.regex.pattern.lower()]
+            literals = sorted({rule.prefix for rule in active if rule not in exact}, key=len, reverse=True)
+            alternatives = [re.escape(p) for p in literals] + [b'(?:' + r.regex.pattern + b')' for r in exact]
+            try:
+                trigger = re.compile(b'|'.join(alternatives), re.DOTALL) if alternatives else None
+            except re.error:
+                # e.g. inline flags inside a custom pattern: trigger on prefixes instead
+                prefixes = sorted({rule.prefix for rule in active}, key=len, reverse=True)
+                trigger = re.compile(b'|'.join(re.escape(p) for p in prefixes)) if prefixes else None
+            self._triggers[active] = trigger
+        return self._triggers[active]
+
+    # ------------------------------------------------------------------ input
+
+    def scan(self, content, extension: str = '', result: Optional[ScanResult] = None) -> ScanResult:
+        """
+        Scan a whole file's content
+
+        Args:
+            content: bytes, str, mmap or any buffer
+            extension: File extension; Office containers are scanned part by part
+            result: Accumulate into an existing result
+
+        Returns:
+            ScanResult
+        """
+        result = result if result is not None else ScanResult()
+        if isinstance(content, str):
+            content = content.encode('utf-8')
+        view = memoryview(content)
+        try:
+            parts = CONTAINER_PARTS.get(extension.lower())
+            if parts and view[:2] == b'PK':
+                try:
+                    return self._scan_container(view, parts, result)
+                except zipfile.BadZipFile:
+                    pass
+            return self.scan_stream(self._chunks(view), result)
+        finally:
+            view.release()
+
+    def _chunks(self, view: memoryview) -> Iterator[bytes]:
+        for start in range(0, len(view), self.chunk_size):
+            yield view[start:start + self.chunk_size].tobytes()
+
+    def _scan_container(self, view: memoryview, parts: Sequence[str], result: ScanResult) -> ScanResult:
+        from core.utils.upload_ingest import MappedReader
+
+        with MappedReader(view) as reader, zipfile.ZipFile(reader) as archive:
+            for name in archive.namelist():
+                if not any(fnmatch.fnmatchcase(name, part) for part in parts):
+                    continue
+                with archive.open(name) as member:
+                    chunks = iter(lambda: member.read(self.chunk_size), b'')
+                    self.scan_stream(_xml_text(chunks), result)
+        return result
+
+    # ------------------------------------------------------------------ scan
+
+    def scan_stream(self, chunks: Iterable[bytes], result: Optional[ScanResult] = None) -> ScanResult:
+        """
+        Scan a stream of byte chunks
+
+        The last MATCH_WINDOW bytes of each chunk are carried into the next,
+        so a match is found wherever the chunks split it.
+        """
+        result = result if result is not None else ScanResult()
+        state = _StreamState()
+        pending = b''
+        offset = 0
+        for chunk in chunks:
+            if not chunk:
+                continue
+            buffer = pending + chunk.lower()
+            limit = len(buffer) - self._keep
+            if limit <= 0:
+                pending = buffer
+                continue
+            self._scan_buffer(buffer, limit, offset, state, result)
+            pending = buffer[limit:]
+            offset += limit
+        if pending:
+            self._scan_buffer(pending, len(pending), offset, state, result)
+        return result
+
+    def _scan_buffer(self, buffer: bytes, limit: int, offset: int,
+                     state: _StreamState, result: ScanResult) -> None:
+        """Check every match starting in buffer[:limit] (later bytes are look-ahead only)"""
+        counts = result.counts
+        trigger = self._trigger(result)
+        pos = -1
+        while trigger is not None:
+            match = trigger.search(buffer, pos + 1)
+            if match is None or match.start() >= limit:
+                break
+            pos = match.start()
+            # Prefixes can overlap ('shell_exec' / 'exec('): test all of them here
+            found = False
+            for prefix in self._by_first[buffer[pos]]:
+                if buffer.startswith(prefix, pos):
+                    for rule in self._by_prefix[prefix]:
+                        found |= self._check(rule, buffer, pos, offset, state, counts)
+            if found:
+                trigger = self._trigger(result)
+
+        for rule in self._fallback:
+            if not rule.rule.count and counts[rule.rule]:
+                continue
+            start = max(state.next_start.get(rule, 0) - offset, 0)
+            for match in rule.regex.finditer(buffer, start):
+                if match.start() >= limit:
+                    break
+                if match.start() < state.next_start.get(rule, 0) - offset:
+                    continue
+                counts[rule.rule] += 1
+                if not rule.rule.count:
+                    break
+                end = match.end() if match.end() > match.start() else match.start() + 1
+                state.next_start[rule] = offset + end
+
+    @staticmethod
+    def _check(rule: _CompiledRule, buffer: bytes, pos: int, offset: int,
+               state: _StreamState, counts: Dict[ScanRule, int]) -> bool:
+        """Count a match of rule at pos; True when a presence-only rule is newly found"""
+        if rule.rule.count:
+            # Non-overlapping, like findall / str.count
+            if offset + pos < state.next_start.get(rule, 0):
+                return False
+        elif counts[rule.rule]:
+            return False
+
+        if rule.regex is None:
+            end = pos + rule.length
+        else:
+            match = rule.regex.match(buffer, pos, min(len(buffer), pos + MATCH_WINDOW))
+            if match is None:
+                return False
+            end = match.end() if match.end() > pos else pos + 1
+        counts[rule.rule] += 1
+        state.next_start[rule] = offset + end
+        return not rule.rule.count
+
+
+def _xml_text(chunks: Iterable[bytes]) -> Iterator[bytes]:
+    """
+    Text content of a streamed XML part, entities decoded
+
+    Markup is dropped (an attribute such as fullCalcOnLoad= is not user
+    content) and '&lt;script' becomes '<script'. Tags and entities split
+    across chunks are carried into the next chunk.
+    """
+    carry = b''
+    for chunk in chunks:
+        data = carry + chunk
+        carry = b''
+        cut = data.rfind(b'<')
+        if cut != -1 and data.find(b'>', cut) == -1:
+            data, carry = data[:cut], data[cut:]
+        cut = data.rfind(b'&', max(len(data) - 6, 0))
+        if cut != -1 and b';' not in data[cut:]:
+            data, carry = data[:cut], data[cut:] + carry
+        yield _decode_xml_text(data)
+    if carry:
+        yield _decode_xml_text(carry)
+
+
+def _decode_xml_text(data: bytes) -> bytes:
+    return _XML_ENTITY_RE.sub(lambda m: _XML_ENTITIES[m.group()], _XML_TAG_RE.sub(b' ', data))
@@ -3,8 +3,11 @@ Download Manager for BillGeneratorUnified
 Organizes and manages download items with metadata and categorization
 """
 
-from dataclasses import dataclass, field
-from typing import List, Dict, Optional
+import os
+import tempfile
+import threading
+from collections import deque
+from typing import Deque, List, Dict, Optional
 from datetime import datetime
 from enum import Enum
 
@@ -32,28 +35,122 @@ class FileType(Enum):
     ZIP = "application/zip"
 
 
-@dataclass
 class DownloadItem:
-    """Represents a downloadable item"""
-    name: str
-    content: bytes
-    file_type: FileType
-    description: str = ""
-    category: DownloadCategory = DownloadCategory.GENERAL
-    size_bytes: int = 0
-    created_at: datetime = field(default_factory=datetime.now)
+    """Represents a downloadable item (content in memory or spilled to disk)"""
     
-    def __post_init__(self):
-        if self.size_bytes == 0 and self.content:
-            self.size_bytes = len(self.content)
+    def __init__(self, name: str, content: Optional[bytes], file_type: FileType,
+                 description: str = "", category: DownloadCategory = DownloadCategory.GENERAL,
+                 size_bytes: int = 0, created_at: Optional[datetime] = None):
+        self.name = name
+        self.file_type = file_type
+        self.description = description
+        self.category = category
+        self.size_bytes = size_bytes or (len(content) if content else 0)
+        self.created_at = created_at or datetime.now()
+        self._data = content
+        self._spill: Optional['SpillStore'] = None
+        self._spill_offset = 0
+    
+    def __repr__(self) -> str:
+        return (f"DownloadItem(name={self.name!r}, file_type={self.file_type}, "
+                f"category={self.category}, size_bytes={self.size_bytes})")
+    
+    @property
+    def content(self) -> bytes:
+        """Item content as bytes (read back from the spill store if spilled)"""
+        if self._data is not None:
+            return self._data
+        if self._spill is not None:
+            return self._spill.read(self._spill_offset, self.size_bytes)
+        return b''
+    
+    @property
+    def in_memory(self) -> bool:
+        """True while the content is held in RAM"""
+        return self._data is not None
+    
+    def spill(self, store: 'SpillStore'):
+        """Move content to the spill store, keeping only metadata in memory"""
+        if self._data is None:
+            return
+        self._spill_offset = store.append(self._data)
+        self._spill = store
+        self._data = None
 
 
-class EnhancedDownloadManager:
-    """Manages download items with organization and statistics"""
+class SpillStore:
+    """Append-only temp file holding spilled download contents"""
     
     def __init__(self):
+        self._file = tempfile.TemporaryFile()
+        self._lock = threading.Lock()
+        self.size_bytes = 0
+        
+    def append(self, content: bytes) -> int:
+        """Write content at the end of the file and return its offset"""
+        with self._lock:
+            offset = self._file.seek(0, os.SEEK_END)
+            self._file.write(content)
+            self.size_bytes += len(content)
+            return offset
+        
+    def read(self, offset: int, size: int) -> bytes:
+        """Read back one item"""
+        with self._lock:
+            self._file.seek(offset)
+            return self._file.read(size)
+        
+    def close(self):
+        self._file.close()
+
+
+class EnhancedDownloadManager:
+    """
+    Manages download items with organization and statistics
+    
+    Item contents stay in memory up to memory_threshold_mb; beyond that the
+    oldest contents are spilled to a temp file. Category/type indexes and
+    totals are updated as items are added, so statistics and filters do
+    not rescan the item list.
+    """
+    
+    def __init__(self, memory_threshold_mb: float = 64):
+        """
+        Initialize download manager
+        
+        Args:
+            memory_threshold_mb: Content kept in RAM before spilling to disk
+        """
         self.download_items: List[DownloadItem] = []
         self.created_at = datetime.now()
+        self.memory_threshold_bytes = int(memory_threshold_mb * 1024 * 1024)
+        self._reset_indexes()
+        
+    def _reset_indexes(self):
+        self._by_category: Dict[DownloadCategory, List[DownloadItem]] = {}
+        self._by_type: Dict[FileType, List[DownloadItem]] = {}
+        self._total_size = 0
+        self._memory_bytes = 0
+        self._in_memory: Deque[DownloadItem] = deque()
+        self._spill_store: Optional[SpillStore] = None
+        
+    def _index(self, item: DownloadItem):
+        self.download_items.append(item)
+        self._by_category.setdefault(item.category, []).append(item)
+        self._by_type.setdefault(item.file_type, []).append(item)
+        self._total_size += item.size_bytes
+        if item.in_memory:
+            self._in_memory.append(item)
+            self._memory_bytes += item.size_bytes
+        
+    def _enforce_memory_threshold(self):
+        """Spill oldest in-memory contents until under the threshold"""
+        while self._memory_bytes > self.memory_threshold_bytes and self._in_memory:
+            item = self._in_memory.popleft()
+            if self._spill_store is None:
+                self._spill_store = SpillStore()
+            item.spill(self._spill_store)
+            self._memory_bytes -= item.size_bytes
         
     def add_item(self, name: str, content: bytes, file_type: FileType, 
                  description: str = "", category: DownloadCategory = DownloadCategory.GENERAL):
@@ -65,7 +162,8 @@ class EnhancedDownloadManager:
             description=description,
             category=category
         )
-        self.download_items.append(item)
+        self._index(item)
+        self._enforce_memory_threshold()
         
     def add_html_document(self, name: str, content: str, description: str = ""):
         """Add an HTML document"""
@@ -93,36 +191,17 @@ class EnhancedDownloadManager:
         
     def get_items_by_category(self) -> Dict[DownloadCategory, List[DownloadItem]]:
         """Organize items by category"""
-        categorized = {}
-        for item in self.download_items:
-            if item.category not in categorized:
-                categorized[item.category] = []
-            categorized[item.category].append(item)
-        return categorized
+        return {category: items[:] for category, items in self._by_category.items()}
         
     def get_items_by_type(self) -> Dict[FileType, List[DownloadItem]]:
         """Organize items by file type"""
-        typed = {}
-        for item in self.download_items:
-            if item.file_type not in typed:
-                typed[item.file_type] = []
-            typed[item.file_type].append(item)
-        return typed
+        return {file_type: items[:] for file_type, items in self._by_type.items()}
         
     def get_statistics(self) -> Dict:
         """Get download statistics"""
-        total_size = sum(item.size_bytes for item in self.download_items)
-        category_counts = {}
-        type_counts = {}
-        
-        for item in self.download_items:
-            # Count by category
-            category = item.category.value
-            category_counts[category] = category_counts.get(category, 0) + 1
-            
-            # Count by type
-            file_type = item.file_type.value
-            type_counts[file_type] = type_counts.get(file_type, 0) + 1
+        total_size = self._total_size
+        category_counts = {category.value: len(items) for category, items in self._by_category.items()}
+        type_counts = {file_type.value: len(items) for file_type, items in self._by_type.items()}
             
         return {
             'total_items': len(self.download_items),
@@ -130,26 +209,29 @@ class EnhancedDownloadManager:
             'total_size_mb': round(total_size / 1024 / 1024, 2),
             'categories': category_counts,
             'file_types': type_counts,
+            'memory_bytes': self._memory_bytes,
+            'spilled_bytes': self._spill_store.size_bytes if self._spill_store else 0,
             'created_at': self.created_at.isoformat()
         }
         
     def get_items_by_filter(self, category: Optional[DownloadCategory] = None, 
                            file_type: Optional[FileType] = None) -> List[DownloadItem]:
         """Get items filtered by category and/or file type"""
-        filtered_items = self.download_items
-        
+        if category and file_type:
+            return [item for item in self._by_category.get(category, []) if item.file_type == file_type]
         if category:
-            filtered_items = [item for item in filtered_items if item.category == category]
-            
+            return self._by_category.get(category, [])[:]
         if file_type:
-            filtered_items = [item for item in filtered_items if item.file_type == file_type]
-            
-        return filtered_items
+            return self._by_type.get(file_type, [])[:]
+        return self.download_items[:]
         
     def clear_items(self):
         """Clear all download items"""
         self.download_items.clear()
+        if self._spill_store:
+            self._spill_store.close()
+        self._reset_indexes()
         
     def get_all_items(self) -> List[DownloadItem]:
         """Get all download items"""
-        return self.download_items[:]
\ No newline at end of file
+        return self.download_items[:]
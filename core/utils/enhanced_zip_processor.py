@@ -9,7 +9,6 @@ import os
 from dataclasses import dataclass
 from typing import Dict, List, Callable, Optional, Union
 from pathlib import Path
-import psutil
 from datetime import datetime
 import tempfile
 import shutil
@@ -19,6 +18,11 @@ import time
 import threading
 from concurrent.futures import ThreadPoolExecutor, as_completed
 
+from core.utils.lazy_imports import lazy_import
+
+# Only needed for memory/CPU monitoring while a ZIP is being built
+psutil = lazy_import('psutil', 'pip install psutil')
+
 
 @dataclass
 class ZipConfig:
@@ -0,0 +1,72 @@
+"""
+Lazy Imports - Defer heavy or optional dependencies until first use
+Keeps `import core...` cheap for CLI runs and lets modules that only
+sometimes need python-magic, psutil, python-docx or bs4 load without them.
+"""
+import importlib
+import importlib.util
+import threading
+from types import ModuleType
+from typing import Optional
+
+
+class LazyModule(ModuleType):
+    """
+    Module proxy that imports the real module on first attribute access
+
+    A missing dependency raises ImportError at the point of use (with an
+    install hint) instead of when the importing module is loaded.
+    """
+
+    def __init__(self, name: str, install_hint: Optional[str] = None):
+        super().__init__(name)
+        self.__dict__['_lazy_hint'] = install_hint
+        self.__dict__['_lazy_module'] = None
+        self.__dict__['_lazy_lock'] = threading.Lock()
+
+    def _load(self) -> ModuleType:
+        module = self.__dict__['_lazy_module']
+        if module is None:
+            with self.__dict__['_lazy_lock']:
+                module = self.__dict__['_lazy_module']
+                if module is None:
+                    try:
+                        module = importlib.import_module(self.__name__)
+                    except ImportError as e:
+                        hint = self.__dict__['_lazy_hint']
+                        message = f"Optional dependency '{self.__name__}' is not installed"
+                        raise ImportError(f"{message} ({hint})" if hint else message) from e
+                    self.__dict__['_lazy_module'] = module
+        return module
+
+    def __getattr__(self, attr: str):
+        return getattr(self._load(), attr)
+
+    def __dir__(self):
+        return dir(self._load())
+
+    def __repr__(self) -> str:
+        state = 'loaded' if self.__dict__['_lazy_module'] is not None else 'not loaded'
+        return f"<lazy module '{self.__name__}' ({state})>"
+
+
+def lazy_import(name: str, install_hint: Optional[str] = None) -> LazyModule:
+    """
+    Get a proxy for a module that is imported on first use
+
+    Args:
+        name: Module name (e.g. 'psutil')
+        install_hint: Shown if the module turns out to be missing
+
+    Returns:
+        LazyModule proxy
+    """
+    return LazyModule(name, install_hint)
+
+
+def is_available(name: str) -> bool:
+    """Check whether a module can be imported, without importing it"""
+    try:
+        return importlib.util.find_spec(name) is not None
+    except (ImportError, ValueError):
+        return False
@@ -4,22 +4,26 @@ Provides high-performance, secure, and memory-efficient ZIP processing with adva
 """
 
 import zipfile
-import io
+import zlib
 import os
-from dataclasses import dataclass
-from typing import Dict, List, Callable, Optional, Union
+from dataclasses import asdict, dataclass
+from typing import BinaryIO, Dict, List, Callable, Optional, Union
 from pathlib import Path
-import psutil
-from datetime import datetime
-import tempfile
 import shutil
 import hashlib
-import pickle
+import json
 import time
 import threading
+from collections import deque
 from concurrent.futures import ThreadPoolExecutor, as_completed
 import logging
 
+from core.utils.lazy_imports import lazy_import
+from core.utils.streaming_zip import StreamingZipWriter, deflate_entry, verify_zip_stream
+
+# Only needed for memory/CPU monitoring while a ZIP is being built
+psutil = lazy_import('psutil', 'pip install psutil')
+
 # Configure logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
@@ -36,10 +40,18 @@ class OptimizedZipConfig:
     preserve_directory_structure: bool = True  # Maintain folder hierarchy
     streaming_threshold_mb: int = 5  # Files larger than this will be streamed
     chunk_size: int = 16384  # Chunk size for streaming (16KB)
+    spool_max_mb: int = 16  # Archives larger than this are spooled to a temp file on disk
     temp_dir: Optional[str] = None  # Temporary directory for streaming
     enable_caching: bool = True  # Enable caching for repeated operations
     cache_max_age_hours: int = 24  # Maximum age for cache entries
+    cache_sweep_interval_minutes: int = 30  # How often the background sweeper removes old entries
     max_workers: int = 4  # Maximum workers for parallel processing
+    parallel_compression: bool = True  # Deflate entries on worker threads (zlib releases the GIL)
+    parallel_min_files: int = 8  # Archives with fewer entries are compressed serially
+    content_aware_compression: bool = True  # Choose store/deflate per entry (see ZipCompressionPolicy)
+    text_compression_level: int = 6  # Deflate level for text entries (9 costs ~4x the time for ~7% on bill HTML)
+    compression_sample_bytes: int = 16384  # Sample size used to test compressibility
+    min_compression_gain: float = 0.1  # Store entries whose sample shrinks by less than this fraction
     
     def __post_init__(self):
         # Ensure compression level is within valid range
@@ -49,7 +61,10 @@ class OptimizedZipConfig:
         self.max_total_size_mb = max(10, self.max_total_size_mb)
         self.streaming_threshold_mb = max(1, self.streaming_threshold_mb)
         self.chunk_size = max(1024, self.chunk_size)
+        self.spool_max_mb = max(1, self.spool_max_mb)
         self.max_workers = max(1, min(8, self.max_workers))
+        self.text_compression_level = max(0, min(9, self.text_compression_level))
+        self.compression_sample_bytes = max(1024, self.compression_sample_bytes)
 
 
 @dataclass
@@ -64,12 +79,129 @@ class ZipMetrics:
     streaming_files_count: int = 0
     cached_files_count: int = 0
     errors_count: int = 0
+    stored_files_count: int = 0  # Entries written with ZIP_STORED by the compression policy
+    bytes_saved: int = 0  # Uncompressed size minus archive size
+    time_saved_seconds: float = 0.0  # Estimated deflate time skipped for stored entries
+
+
+# Already-compressed formats (PDF streams are deflated; DOCX/XLSX are ZIPs)
+STORED_EXTENSIONS = {
+    '.pdf', '.docx', '.xlsx', '.xlsm', '.pptx', '.zip', '.gz', '.png', '.jpg', '.jpeg', '.gif', '.webp'
+}
+TEXT_EXTENSIONS = {'.html', '.htm', '.css', '.js', '.csv', '.json', '.txt', '.xml', '.md', '.svg'}
+
+
+class ZipCompressionPolicy:
+    """
+    Per-entry compression choice
+
+    - Known compressed formats are stored (ZIP_STORED)
+    - Text formats are deflated at text_compression_level
+    - Anything else is deflated only if a sample actually shrinks
+    """
+
+    def __init__(self, config: OptimizedZipConfig):
+        self.config = config
+
+    def _read_sample(self, file_info: Dict) -> bytes:
+        size = self.config.compression_sample_bytes
+        if file_info['type'] == 'memory':
+            return file_info['content'][:size]
+        with open(file_info['source'], 'rb') as f:
+            return f.read(size)
+
+    def choose(self, file_info: Dict) -> tuple[int, int, float]:
+        """
+        Pick compression for one entry
+
+        Returns:
+            Tuple of (compress_type, compress_level, estimated deflate seconds skipped)
+        """
+        if not self.config.content_aware_compression:
+            return zipfile.ZIP_DEFLATED, self.config.compression_level, 0.0
+
+        ext = Path(file_info['archive_name']).suffix.lower()
+        if ext in TEXT_EXTENSIONS:
+            return zipfile.ZIP_DEFLATED, self.config.text_compression_level, 0.0
+
+        sample = self._read_sample(file_info)
+        if not sample:
+            return zipfile.ZIP_STORED, 0, 0.0
+
+        start = time.perf_counter()
+        compressed_len = len(zlib.compress(sample, self.config.compression_level))
+        elapsed = time.perf_counter() - start
+        gain = 1 - compressed_len / len(sample)
+
+        if ext in STORED_EXTENSIONS or gain < self.config.min_compression_gain:
+            # Time a full deflate would have taken, extrapolated from the sample
+            return zipfile.ZIP_STORED, 0, elapsed * file_info['size'] / len(sample)
+        return zipfile.ZIP_DEFLATED, self.config.compression_level, 0.0
+
+
+def merkle_root(leaves: List[bytes]) -> bytes:
+    """Combine leaf digests pairwise into a single root digest"""
+    if not leaves:
+        return hashlib.blake2b(b'', digest_size=16).digest()
+    level = list(leaves)
+    while len(level) > 1:
+        if len(level) % 2:
+            level.append(level[-1])
+        level = [
+            hashlib.blake2b(level[i] + level[i + 1], digest_size=16).digest()
+            for i in range(0, len(level), 2)
+        ]
+    return level[0]
+
+
+def sweep_zip_cache(cache_dir: Path, max_age_hours: float) -> int:
+    """Remove cached archives (and their metadata) older than max_age_hours"""
+    current_time = time.time()
+    cleaned_count = 0
+    
+    for cache_file in Path(cache_dir).glob("*.zip"):
+        try:
+            file_age_hours = (current_time - cache_file.stat().st_mtime) / 3600
+            if file_age_hours > max_age_hours:
+                cache_file.unlink()
+                # Also remove corresponding metadata (and legacy pickle metadata)
+                for suffix in ('.json', '.meta'):
+                    meta_file = cache_file.with_suffix(suffix)
+                    if meta_file.exists():
+                        meta_file.unlink()
+                cleaned_count += 1
+        except Exception:
+            pass  # Ignore errors during cleanup
+            
+    return cleaned_count
+
+
+# One background sweeper per cache directory
+_cache_sweepers: Dict[str, threading.Thread] = {}
+_cache_sweepers_lock = threading.Lock()
+
+def start_cache_sweeper(cache_dir: Path, max_age_hours: float, interval_minutes: float) -> threading.Thread:
+    """Start (once per directory) a daemon thread that periodically sweeps old cache entries"""
+    key = str(Path(cache_dir).resolve())
+    with _cache_sweepers_lock:
+        sweeper = _cache_sweepers.get(key)
+        if sweeper is None or not sweeper.is_alive():
+            def run():
+                while True:
+                    sweep_zip_cache(Path(key), max_age_hours)
+                    time.sleep(max(1.0, interval_minutes * 60))
+            
+            sweeper = threading.Thread(target=run, name="zip-cache-sweeper", daemon=True)
+            sweeper.start()
+            _cache_sweepers[key] = sweeper
+    return sweeper
 
 
 class OptimizedZipProcessor:
     """
     Highly optimized ZIP processor with advanced features:
     - Memory-efficient streaming for large files
+    - Content-aware compression (store PDF/DOCX/XLSX, deflate text)
     - Intelligent caching system
     - Parallel processing capabilities
     - Comprehensive security features
@@ -85,6 +217,9 @@ class OptimizedZipProcessor:
         self.temp_files = []  # Track temporary files for cleanup
         self.cache_dir = Path(".zip_cache_optimized")  # Cache directory for ZIP operations
         self.cache_dir.mkdir(exist_ok=True)
+        if self.config.enable_caching:
+            start_cache_sweeper(self.cache_dir, self.config.cache_max_age_hours,
+                                self.config.cache_sweep_interval_minutes)
         
         # Resource monitoring
         self.max_memory_percent = 85.0
@@ -105,6 +240,7 @@ class OptimizedZipProcessor:
             
         # Initialize metrics
         self.metrics = ZipMetrics()
+        self.compression_policy = ZipCompressionPolicy(self.config)
         
     def __enter__(self):
         return self
@@ -195,72 +331,19 @@ class OptimizedZipProcessor:
             # Reduce streaming threshold to start streaming earlier
             self.config.streaming_threshold_mb = max(1, self.config.streaming_threshold_mb // 2)
             
-    def _verify_zip_integrity(self, zip_data: bytes) -> bool:
-        """Verify ZIP file integrity"""
+    def _verify_zip_integrity(self, zip_stream: BinaryIO) -> bool:
+        """Verify ZIP file integrity entry by entry (CRC checked per entry)"""
         if self.config.enable_integrity_check:
-            try:
-                with zipfile.ZipFile(io.BytesIO(zip_data), 'r') as zip_file:
-                    bad_file = zip_file.testzip()
-                    if bad_file:
-                        raise ValueError(f"Corrupted file in ZIP: {bad_file}")
-            except Exception as e:
-                raise ValueError(f"ZIP integrity check failed: {str(e)}")
+            verify_zip_stream(zip_stream, self.config.chunk_size)
         return True
         
-    def _stream_file_to_zip(self, zip_file: zipfile.ZipFile, file_info: Dict):
-        """Stream a large file to ZIP to reduce memory usage"""
-        source_path = Path(file_info['source'])
+    def _stream_file_to_zip(self, writer: StreamingZipWriter, file_info: Dict):
+        """Stream a large file to ZIP in chunks to reduce memory usage"""
         archive_name = file_info['archive_name']
-        
-        # Report progress
         self._report_progress(0, f"Streaming {archive_name}...")
-        
-        # For files that need to be streamed, we'll write them in chunks
-        file_size = source_path.stat().st_size
-        bytes_written = 0
-        
-        with open(source_path, 'rb') as source_file:
-            # Create temporary file for streaming
-            if self.config.temp_dir:
-                temp_path = Path(self.config.temp_dir) / f"stream_{int(datetime.now().timestamp() * 1000)}.tmp"
-            else:
-                temp_fd, temp_path = tempfile.mkstemp(suffix='.tmp')
-                os.close(temp_fd)
-                
-            self.temp_files.append(str(temp_path))
-            
-            try:
-                # Copy file in chunks to temporary location
-                with open(temp_path, 'wb') as temp_file:
-                    while bytes_written < file_size:
-                        chunk = source_file.read(self.config.chunk_size)
-                        if not chunk:
-                            break
-                        temp_file.write(chunk)
-                        bytes_written += len(chunk)
-                        
-                        # Report progress periodically
-                        if self.config.enable_progress_tracking and bytes_written % (self.config.chunk_size * 50) == 0:
-                            progress = (bytes_written / file_size) * 100
-                            self._report_progress(
-                                progress, 
-                                f"Streaming {archive_name} ({progress:.1f}%)")
-                
-                # Add the temporary file to ZIP
-                zip_file.write(temp_path, archive_name)
-                
-                # Update metrics
-                self.metrics.streaming_files_count += 1
-                
-            finally:
-                # Clean up temporary file
-                try:
-                    if Path(temp_path).exists():
-                        Path(temp_path).unlink()
-                    if str(temp_path) in self.temp_files:
-                        self.temp_files.remove(str(temp_path))
-                except Exception:
-                    pass  # Ignore cleanup errors
+        compress_type, compress_level = self._compression_for(file_info)
+        writer.add_file(file_info['source'], archive_name, compress_type, compress_level)
+        self.metrics.streaming_files_count += 1
         
     def _cleanup_temp_files(self):
         """Clean up temporary files"""
@@ -286,37 +369,27 @@ class OptimizedZipProcessor:
                 
     def cleanup_old_cache(self, max_age_hours: int | None = None):
         """Clean up cache files older than specified hours"""
-        max_age_hours = max_age_hours or self.config.cache_max_age_hours
-        current_time = time.time()
-        cleaned_count = 0
-        
-        for cache_file in self.cache_dir.glob("*.zip"):
-            try:
-                file_age_hours = (current_time - cache_file.stat().st_mtime) / 3600
-                if file_age_hours > max_age_hours:
-                    cache_file.unlink()
-                    # Also remove corresponding meta file
-                    meta_file = cache_file.with_suffix('.meta')
-                    if meta_file.exists():
-                        meta_file.unlink()
-                    cleaned_count += 1
-            except Exception:
-                pass  # Ignore errors during cleanup
-                
-        return cleaned_count
+        max_age_hours = max_age_hours if max_age_hours is not None else self.config.cache_max_age_hours
+        return sweep_zip_cache(self.cache_dir, max_age_hours)
         
     def _generate_cache_key(self, file_list: List[Dict]) -> str:
-        """Generate a cache key based on file list"""
-        # Create a hash of the file list to use as cache key
-        file_info = []
+        """
+        Generate a cache key from per-entry digests (Merkle root)
+        
+        Entry digests are computed once in add_file_*, so this is O(entries).
+        Compression settings are part of the key since they change the archive.
+        """
+        settings = (
+            f"{self.config.compression_level}:{self.config.text_compression_level}:"
+            f"{self.config.content_aware_compression}:{self.config.min_compression_gain}"
+        )
+        leaves = [hashlib.blake2b(settings.encode(), digest_size=16).digest()]
         for file_item in file_list:
-            if file_item['type'] in ['file', 'streaming_file']:
-                file_info.append((file_item['source'], file_item['archive_name'], file_item['size']))
-            else:
-                file_info.append((file_item['archive_name'], len(file_item.get('content', b''))))
-                
-        file_info_str = str(sorted(file_info))
-        return hashlib.md5(file_info_str.encode()).hexdigest()
+            leaves.append(hashlib.blake2b(
+                file_item['archive_name'].encode('utf-8') + b'\0' + file_item['digest'],
+                digest_size=16
+            ).digest())
+        return merkle_root(leaves).hex()
         
     def get_cache_stats(self) -> Dict:
         """Get cache statistics"""
@@ -370,19 +443,27 @@ class OptimizedZipProcessor:
             
         # For large files, create a streaming reference instead of loading into memory
         file_size_mb = file_size / 1024 / 1024
+        # Digest identifies the file version without reading it
+        stat = file_path.stat()
+        digest = hashlib.blake2b(
+            f"{file_path.resolve()}:{stat.st_size}:{stat.st_mtime_ns}".encode('utf-8'), digest_size=16
+        ).digest()
+        
         if file_size_mb > self.config.streaming_threshold_mb:
             self.processed_files.append({
                 'type': 'streaming_file',
                 'source': file_path,
                 'archive_name': archive_name,
-                'size': file_size
+                'size': file_size,
+                'digest': digest
             })
         else:
             self.processed_files.append({
                 'type': 'file',
                 'source': file_path,
                 'archive_name': archive_name,
-                'size': file_size
+                'size': file_size,
+                'digest': digest
             })
         self.total_size += file_size
         
@@ -404,14 +485,105 @@ class OptimizedZipProcessor:
             'type': 'memory',
             'content': content,
             'archive_name': archive_name,
-            'size': content_size
+            'size': content_size,
+            'digest': hashlib.blake2b(content, digest_size=16).digest()
         })
         self.total_size += content_size
         
-    def create_zip(self, use_cache: bool | None = None, max_retries: int = 3) -> tuple[io.BytesIO, ZipMetrics]:
+    def _add_progress(self, idx: int, total_files: int, file_info: Dict):
+        """Report per-entry progress and check memory periodically"""
+        progress = (idx + 1) / total_files * 100
+        self._report_progress(
+            progress, 
+            f"Adding {file_info['archive_name']} ({idx+1}/{total_files})"
+        )
+        if idx % 5 == 0:
+            self._check_memory_limit()
+            
+    def _write_entries(self, writer: StreamingZipWriter):
+        """Compress and write entries one after another"""
+        total_files = len(self.processed_files)
+        for idx, file_info in enumerate(self.processed_files):
+            self._add_progress(idx, total_files, file_info)
+            
+            if file_info['type'] == 'streaming_file':
+                # Stream large file to reduce memory usage
+                self._stream_file_to_zip(writer, file_info)
+                continue
+                
+            compress_type, compress_level = self._compression_for(file_info)
+            if file_info['type'] == 'file':
+                # Add file from disk
+                writer.add_file(file_info['source'], file_info['archive_name'], compress_type, compress_level)
+            else:
+                # Add file from memory
+                writer.add_bytes(file_info['archive_name'], file_info['content'], compress_type, compress_level)
+                
+    def _compression_for(self, file_info: Dict) -> tuple[int, int]:
+        """Apply the compression policy to one entry and record what it skipped"""
+        compress_type, compress_level, time_saved = self.compression_policy.choose(file_info)
+        if compress_type == zipfile.ZIP_STORED:
+            self.metrics.stored_files_count += 1
+            self.metrics.time_saved_seconds += time_saved
+        return compress_type, compress_level
+        
+    def _deflate_file_info(self, file_info: Dict, compress_type: int,
+                           compress_level: int) -> tuple[bytes, int, int]:
+        """Compress (or just checksum, for stored entries) one entry in a worker thread"""
+        if file_info['type'] == 'file':
+            data = Path(file_info['source']).read_bytes()
+        else:
+            data = file_info['content']
+        if compress_type == zipfile.ZIP_STORED:
+            return data, zlib.crc32(data), len(data)
+        return deflate_entry(data, compress_level)
+        
+    def _write_entries_parallel(self, writer: StreamingZipWriter):
+        """
+        Deflate entries on worker threads and append them in order
+        
+        At most 2 x max_workers compressed entries are held at once; large
+        (streaming) files are still copied in chunks on the calling thread.
+        """
+        total_files = len(self.processed_files)
+        window = deque()
+        
+        def write_next():
+            idx, file_info, compress_type, future = window.popleft()
+            self._add_progress(idx, total_files, file_info)
+            payload, crc, size = future.result()
+            writer.add_compressed(file_info['archive_name'], payload, crc, size, compress_type)
+        
+        with ThreadPoolExecutor(max_workers=self.config.max_workers) as executor:
+            for idx, file_info in enumerate(self.processed_files):
+                if file_info['type'] == 'streaming_file':
+                    # Keep archive order: flush pending entries first
+                    while window:
+                        write_next()
+                    self._add_progress(idx, total_files, file_info)
+                    self._stream_file_to_zip(writer, file_info)
+                    continue
+                    
+                compress_type, compress_level = self._compression_for(file_info)
+                window.append((idx, file_info, compress_type, executor.submit(
+                    self._deflate_file_info, file_info, compress_type, compress_level
+                )))
+                if len(window) >= self.config.max_workers * 2:
+                    write_next()
+                    
+            while window:
+                write_next()
+        
+    def create_zip(self, use_cache: bool | None = None, max_retries: int = 3) -> tuple[BinaryIO, ZipMetrics]:
         """
         Create ZIP file from added files with retry logic and enhanced features
-        Returns: (zip_buffer, metrics)
+        
+        The archive is streamed into a spooled temp file (moved to disk above
+        spool_max_mb), one entry at a time, and verified entry by entry.
+        
+        Returns: (zip_stream, metrics) - a readable binary file object at position 0.
+        The caller closes it; for st.download_button use streaming_zip.archive_bytes,
+        which reads and closes it (a cache hit is an open file on the cache).
         """
         # Use config setting if not explicitly provided
         use_cache = use_cache if use_cache is not None else self.config.enable_caching
@@ -420,9 +592,6 @@ class OptimizedZipProcessor:
         initial_memory = self._check_memory_usage()
         last_error = None
         
-        # Clean up old cache entries
-        self.cleanup_old_cache()
-        
         for attempt in range(max_retries):
             try:
                 self._report_progress(0, f"Starting ZIP creation (attempt {attempt + 1}/{max_retries})...")
@@ -441,24 +610,21 @@ class OptimizedZipProcessor:
                 if use_cache and self.config.enable_caching:
                     cache_key = self._generate_cache_key(self.processed_files)
                     cache_file = self.cache_dir / f"{cache_key}.zip"
-                    cache_meta_file = self.cache_dir / f"{cache_key}.meta"
+                    cache_meta_file = self.cache_dir / f"{cache_key}.json"
                     
                     if cache_file.exists() and cache_meta_file.exists():
                         try:
                             # Load cached result
-                            with open(cache_meta_file, 'rb') as f:
-                                cached_metrics = pickle.load(f)
-                            
-                            # Load cached ZIP data
-                            with open(cache_file, 'rb') as f:
-                                zip_data = f.read()
+                            with open(cache_meta_file, 'r', encoding='utf-8') as f:
+                                cached_metrics = ZipMetrics(**json.load(f))
                             
-                            # Verify integrity
-                            self._verify_zip_integrity(zip_data)
-                            
-                            # Create BytesIO buffer
-                            zip_buffer = io.BytesIO(zip_data)
-                            zip_buffer.seek(0)
+                            # Open cached ZIP and verify integrity without reading it whole
+                            zip_stream = open(cache_file, 'rb')
+                            try:
+                                self._verify_zip_integrity(zip_stream)
+                            except Exception:
+                                zip_stream.close()
+                                raise
                             
                             self._report_progress(100, "Loaded from cache")
                             
@@ -469,7 +635,7 @@ class OptimizedZipProcessor:
                             self.metrics = cached_metrics
                             self.metrics.cached_files_count = len(self.processed_files)
                             
-                            return zip_buffer, self.metrics
+                            return zip_stream, self.metrics
                             
                         except Exception as e:
                             # If cache is corrupted, continue with normal creation
@@ -477,107 +643,75 @@ class OptimizedZipProcessor:
                 
                 # Check memory before starting
                 self._check_memory_limit()
+                self.metrics = ZipMetrics()
                 
-                # Create in-memory zip file
-                zip_buffer = io.BytesIO()
-                
-                with zipfile.ZipFile(
-                    zip_buffer, 
-                    'w', 
+                # Stream entries into a spooled temp file
+                writer = StreamingZipWriter(
                     compression=zipfile.ZIP_DEFLATED,
-                    compresslevel=self.config.compression_level
-                ) as zip_file:
-                    
-                    total_files = len(self.processed_files)
-                    for idx, file_info in enumerate(self.processed_files):
-                        # Report progress
-                        progress = (idx + 1) / total_files * 100
-                        self._report_progress(
-                            progress, 
-                            f"Adding {file_info['archive_name']} ({idx+1}/{total_files})"
-                        )
-                        
-                        # Check memory periodically
-                        if idx % 5 == 0:
-                            self._check_memory_limit()
-                        
-                        if file_info['type'] == 'file':
-                            # Add file from disk
-                            zip_file.write(file_info['source'], file_info['archive_name'])
-                        elif file_info['type'] == 'streaming_file':
-                            # Stream large file to reduce memory usage
-                            self._stream_file_to_zip(zip_file, file_info)
-                        else:
-                            # Add file from memory
-                            zip_file.writestr(file_info['archive_name'], file_info['content'])
-                            
-                # Finalize buffer
-                zip_buffer.seek(0)
+                    compresslevel=self.config.compression_level,
+                    spool_max_mb=self.config.spool_max_mb,
+                    chunk_size=self.config.chunk_size
+                )
+                
+                total_files = len(self.processed_files)
+                if (self.config.parallel_compression and self.config.max_workers > 1
+                        and total_files >= self.config.parallel_min_files):
+                    self._write_entries_parallel(writer)
+                else:
+                    self._write_entries(writer)
+                
+                # Finalize archive and verify integrity
+                zip_stream = writer.close()
+                if self.config.enable_integrity_check:
+                    writer.verify()
+                compressed_size = zip_stream.seek(0, os.SEEK_END)
+                zip_stream.seek(0)
                 
-                # Verify integrity
-                zip_data = zip_buffer.getvalue()
-                self._verify_zip_integrity(zip_data)
+                # Calculate final metrics
+                final_memory = self._check_memory_usage()
+                compression_ratio = (1 - compressed_size / self.total_size) * 100 if self.total_size > 0 else 0
+                
+                self.metrics = ZipMetrics(
+                    total_files=total_files,
+                    total_size_bytes=self.total_size,
+                    compressed_size_bytes=compressed_size,
+                    processing_time_seconds=time.time() - start_time,
+                    memory_usage_peak_mb=max(initial_memory, final_memory),
+                    compression_ratio_percent=compression_ratio,
+                    streaming_files_count=self.metrics.streaming_files_count,
+                    cached_files_count=0,
+                    errors_count=0,
+                    stored_files_count=self.metrics.stored_files_count,
+                    bytes_saved=self.total_size - compressed_size,
+                    time_saved_seconds=self.metrics.time_saved_seconds
+                )
                 
                 # Cache result if enabled
                 if use_cache and self.config.enable_caching and cache_key:
                     try:
                         cache_file = self.cache_dir / f"{cache_key}.zip"
-                        cache_meta_file = self.cache_dir / f"{cache_key}.meta"
+                        cache_meta_file = self.cache_dir / f"{cache_key}.json"
                         
-                        # Save ZIP data
+                        # Copy ZIP data in chunks
                         with open(cache_file, 'wb') as f:
-                            f.write(zip_data)
-                        
-                        # Calculate final metrics
-                        final_memory = self._check_memory_usage()
-                        compressed_size = len(zip_data)
-                        compression_ratio = (1 - compressed_size / self.total_size) * 100 if self.total_size > 0 else 0
-                        
-                        # Update metrics
-                        self.metrics = ZipMetrics(
-                            total_files=total_files,
-                            total_size_bytes=self.total_size,
-                            compressed_size_bytes=compressed_size,
-                            processing_time_seconds=time.time() - start_time,
-                            memory_usage_peak_mb=max(initial_memory, final_memory),
-                            compression_ratio_percent=compression_ratio,
-                            streaming_files_count=self.metrics.streaming_files_count,
-                            cached_files_count=0,
-                            errors_count=0
-                        )
+                            shutil.copyfileobj(zip_stream, f, self.config.chunk_size)
+                        zip_stream.seek(0)
                         
                         # Save metadata
-                        with open(cache_meta_file, 'wb') as f:
-                            pickle.dump(self.metrics, f)
+                        with open(cache_meta_file, 'w', encoding='utf-8') as f:
+                            json.dump(asdict(self.metrics), f)
                             
                     except Exception as e:
                         # Don't fail if caching fails
+                        zip_stream.seek(0)
                         self._report_progress(0, f"Warning: Caching failed: {str(e)}")
                 
-                # Calculate final metrics if not cached
-                if self.metrics.total_files == 0:  # Not loaded from cache
-                    final_memory = self._check_memory_usage()
-                    compressed_size = len(zip_data)
-                    compression_ratio = (1 - compressed_size / self.total_size) * 100 if self.total_size > 0 else 0
-                    
-                    self.metrics = ZipMetrics(
-                        total_files=total_files,
-                        total_size_bytes=self.total_size,
-                        compressed_size_bytes=compressed_size,
-                        processing_time_seconds=time.time() - start_time,
-                        memory_usage_peak_mb=max(initial_memory, final_memory),
-                        compression_ratio_percent=compression_ratio,
-                        streaming_files_count=self.metrics.streaming_files_count,
-                        cached_files_count=0,
-                        errors_count=0
-                    )
-                
                 self._report_progress(100, "ZIP creation completed successfully")
                 
                 # Update statistics
                 self._update_stats(True, total_files, self.metrics.memory_usage_peak_mb)
                 
-                return zip_buffer, self.metrics
+                return zip_stream, self.metrics
                 
             except Exception as e:
                 last_error = e
@@ -604,7 +738,7 @@ class OptimizedZipProcessor:
 
 # Convenience functions for common use cases
 def create_zip_from_files(file_paths: List[Union[str, Path]], 
-                         config: OptimizedZipConfig | None = None) -> tuple[io.BytesIO, ZipMetrics]:
+                         config: OptimizedZipConfig | None = None) -> tuple[BinaryIO, ZipMetrics]:
     """Create ZIP from a list of file paths"""
     with OptimizedZipProcessor(config) as processor:
         for file_path in file_paths:
@@ -613,7 +747,7 @@ def create_zip_from_files(file_paths: List[Union[str, Path]],
 
 
 def create_zip_from_dict(data_dict: Dict[str, Union[str, bytes]], 
-                        config: OptimizedZipConfig | None = None) -> tuple[io.BytesIO, ZipMetrics]:
+                        config: OptimizedZipConfig | None = None) -> tuple[BinaryIO, ZipMetrics]:
     """Create ZIP from a dictionary of filename -> content"""
     with OptimizedZipProcessor(config) as processor:
         for filename, content in data_dict.items():
@@ -623,7 +757,7 @@ def create_zip_from_dict(data_dict: Dict[str, Union[str, bytes]],
 
 def create_zip_from_mixed_sources(file_paths: List[Union[str, Path]], 
                                  data_dict: Dict[str, Union[str, bytes]],
-                                 config: OptimizedZipConfig | None = None) -> tuple[io.BytesIO, ZipMetrics]:
+                                 config: OptimizedZipConfig | None = None) -> tuple[BinaryIO, ZipMetrics]:
     """Create ZIP from both file paths and in-memory data"""
     with OptimizedZipProcessor(config) as processor:
         # Add files from paths
@@ -5,25 +5,37 @@ Handles timestamped files in file-wise subfolders within OUTPUT folder
 from pathlib import Path
 from datetime import datetime
 import shutil
-import zipfile
-import io
-from typing import Dict, List, Tuple, Optional
+import time
+from typing import BinaryIO, Dict, List, Tuple, Optional
+
+from core.utils.blob_store import BlobStore
+from core.utils.streaming_zip import StreamingZipWriter
+
+# Content-addressed store for deduplicated outputs (inside OUTPUT/)
+BLOB_DIR_NAME = '.blobs'
+
+# How long the sidebar's usage summary is reused across Streamlit reruns
+USAGE_CACHE_SECONDS = 30
 
 class OutputManager:
     """Manages output files in file-wise subfolders with date/time stamps"""
     
-    def __init__(self, base_output_dir: str = "OUTPUT", source_filename: Optional[str] = None):
+    def __init__(self, base_output_dir: str = "OUTPUT", source_filename: Optional[str] = None,
+                 dedup: bool = True):
         """
         Initialize output manager
         
         Args:
             base_output_dir: Base output directory name (default: OUTPUT)
             source_filename: Source Excel filename (without extension) for subfolder creation
+            dedup: Store identical files once (hard-linked from OUTPUT/.blobs)
         """
         self.base_output_dir = Path(base_output_dir)
         self.base_output_dir.mkdir(exist_ok=True)
+        self.blob_store = BlobStore(self.base_output_dir / BLOB_DIR_NAME) if dedup else None
         self.source_filename = source_filename
         self.current_subfolder = None
+        self._usage: Optional[Tuple[float, Dict[str, int]]] = None
         
         # Create subfolder if source filename provided
         if source_filename:
@@ -90,7 +102,8 @@ class OutputManager:
         ext = extension if extension.startswith('.') else f'.{extension}'
         return f"{base_name}_{timestamp}{ext}"
     
-    def save_file(self, content: bytes, base_name: str, extension: str) -> Path:
+    def save_file(self, content: bytes, base_name: str, extension: str,
+                  folder: Optional[Path] = None) -> Path:
         """
         Save file with timestamp in appropriate folder
         
@@ -98,24 +111,30 @@ class OutputManager:
             content: File content (bytes)
             base_name: Base name without extension
             extension: File extension
+            folder: Target folder (default: current subfolder)
             
         Returns:
             Path to saved file
         """
         # Get output folder (subfolder if set, otherwise base)
-        output_folder = self.get_output_folder()
+        output_folder = folder or self.get_output_folder()
         
         # Create simple filename without timestamp (timestamp is in folder name)
         ext = extension if extension.startswith('.') else f'.{extension}'
         filename = f"{base_name}{ext}"
         filepath = output_folder / filename
+        self._usage = None
+        
+        if self.blob_store:
+            return self.blob_store.link(content, filepath)
         
         with open(filepath, 'wb') as f:
             f.write(content)
         
         return filepath
     
-    def save_text_file(self, content: str, base_name: str, extension: str) -> Path:
+    def save_text_file(self, content: str, base_name: str, extension: str,
+                       folder: Optional[Path] = None) -> Path:
         """
         Save text file in appropriate folder
         
@@ -123,23 +142,59 @@ class OutputManager:
             content: File content (string)
             base_name: Base name without extension
             extension: File extension
+            folder: Target folder (default: current subfolder)
             
         Returns:
             Path to saved file
         """
         # Get output folder (subfolder if set, otherwise base)
-        output_folder = self.get_output_folder()
+        output_folder = folder or self.get_output_folder()
         
         # Create simple filename without timestamp (timestamp is in folder name)
         ext = extension if extension.startswith('.') else f'.{extension}'
         filename = f"{base_name}{ext}"
         filepath = output_folder / filename
+        self._usage = None
+        
+        if self.blob_store:
+            return self.blob_store.link(content.encode('utf-8'), filepath)
         
         with open(filepath, 'w', encoding='utf-8') as f:
             f.write(content)
         
         return filepath
     
+    def _zip_filename(self, zip_name: Optional[str]) -> str:
+        """ZIP filename for the current subfolder (or a timestamped default)"""
+        if zip_name is None:
+            if self.current_subfolder:
+                zip_name = self.current_subfolder.name
+            else:
+                zip_name = f"output_{datetime.now().strftime('%Y%m%d_%H%M%S')}"
+        return f"{zip_name}.zip"
+    
+    def _write_zip(self, target: Optional[BinaryIO] = None, exclude: Optional[Path] = None) -> BinaryIO:
+        """Stream current folder contents into a ZIP, one file at a time"""
+        output_folder = self.get_output_folder()
+        writer = StreamingZipWriter(target)
+        with writer:
+            for file_path in output_folder.glob('*'):
+                if file_path.is_file() and file_path != exclude:
+                    writer.add_file(file_path, file_path.name)
+        return writer.close()
+    
+    def open_zip(self, zip_name: Optional[str] = None) -> Tuple[BinaryIO, str]:
+        """
+        Create ZIP of current subfolder contents in a spooled temp file
+        
+        Args:
+            zip_name: Optional custom ZIP filename (without extension)
+            
+        Returns:
+            Tuple of (readable zip stream, zip_filename)
+        """
+        return self._write_zip(), self._zip_filename(zip_name)
+    
     def create_zip(self, zip_name: Optional[str] = None) -> Tuple[bytes, str]:
         """
         Create ZIP file of current subfolder contents
@@ -150,27 +205,9 @@ class OutputManager:
         Returns:
             Tuple of (zip_bytes, zip_filename)
         """
-        output_folder = self.get_output_folder()
-        
-        # Generate ZIP filename
-        if zip_name is None:
-            if self.current_subfolder:
-                zip_name = self.current_subfolder.name
-            else:
-                zip_name = f"output_{datetime.now().strftime('%Y%m%d_%H%M%S')}"
-        
-        zip_filename = f"{zip_name}.zip"
-        
-        # Create ZIP in memory
-        zip_buffer = io.BytesIO()
-        with zipfile.ZipFile(zip_buffer, 'w', zipfile.ZIP_DEFLATED) as zip_file:
-            # Add all files from output folder
-            for file_path in output_folder.glob('*'):
-                if file_path.is_file():
-                    zip_file.write(file_path, file_path.name)
-        
-        zip_buffer.seek(0)
-        return zip_buffer.getvalue(), zip_filename
+        zip_stream, zip_filename = self.open_zip(zip_name)
+        with zip_stream:
+            return zip_stream.read(), zip_filename
     
     def save_zip(self, zip_name: Optional[str] = None) -> Path:
         """
@@ -182,23 +219,41 @@ class OutputManager:
         Returns:
             Path to saved ZIP file
         """
-        zip_bytes, zip_filename = self.create_zip(zip_name)
-        
-        # Save ZIP to base OUTPUT folder
-        zip_path = self.base_output_dir / zip_filename
+        # Stream straight into the base OUTPUT folder
+        zip_path = self.base_output_dir / self._zip_filename(zip_name)
         with open(zip_path, 'wb') as f:
-            f.write(zip_bytes)
+            self._write_zip(f, exclude=zip_path)
         
         return zip_path
     
     def get_all_files(self) -> List[Path]:
         """Get all files in OUTPUT folder"""
-        return list(self.base_output_dir.glob('*'))
+        return [p for p in self.base_output_dir.glob('*') if p.name != BLOB_DIR_NAME]
+    
+    def _disk_usage(self) -> Tuple[int, int]:
+        """Files and bytes under OUTPUT, counting each hard-linked inode once"""
+        seen = set()
+        files = 0
+        total_size = 0
+        for file in self.base_output_dir.rglob('*'):
+            if not file.is_file():
+                continue
+            stat = file.stat()
+            if (stat.st_dev, stat.st_ino) in seen:
+                continue
+            seen.add((stat.st_dev, stat.st_ino))
+            files += 1
+            total_size += stat.st_size
+        return files, total_size
     
     def clean_old_files(self, keep_latest: int = 10) -> Tuple[int, int]:
         """
         Clean old files, keeping only the latest N files
         
+        Bill subfolders are left alone, as before. Blobs no longer linked
+        from any file are dropped, so space freed is the actual drop in
+        disk usage (removing one link to a shared blob frees nothing).
+        
         Args:
             keep_latest: Number of latest files to keep
             
@@ -206,30 +261,56 @@ class OutputManager:
             Tuple of (files_deleted, space_freed_bytes)
         """
         files = sorted(
-            self.base_output_dir.glob('*'),
+            self.get_all_files(),
             key=lambda p: p.stat().st_mtime,
             reverse=True
         )
         
         files_to_delete = files[keep_latest:]
-        space_freed = 0
+        _, size_before = self._disk_usage()
         files_deleted = 0
         
         for file in files_to_delete:
             if file.is_file():
-                space_freed += file.stat().st_size
                 file.unlink()
                 files_deleted += 1
         
-        return files_deleted, space_freed
+        if self.blob_store:
+            self.blob_store.collect_garbage()
+        
+        _, size_after = self._disk_usage()
+        self._usage = None
+        return files_deleted, size_before - size_after
     
     def get_folder_size(self) -> int:
-        """Get total size of OUTPUT folder in bytes"""
-        total_size = 0
-        for file in self.base_output_dir.glob('*'):
-            if file.is_file():
-                total_size += file.stat().st_size
-        return total_size
+        """Get total size of OUTPUT folder in bytes (deduplicated files counted once)"""
+        return self._disk_usage()[1]
+    
+    def get_dedup_stats(self) -> Dict[str, int]:
+        """Blob store usage (blobs, stored_bytes, saved_bytes)"""
+        if not self.blob_store:
+            return {'blobs': 0, 'stored_bytes': 0, 'saved_bytes': 0}
+        return self.blob_store.stats()
+    
+    def get_usage_summary(self, max_age: float = USAGE_CACHE_SECONDS) -> Dict[str, int]:
+        """
+        Entry count, folder size and dedup savings for display
+        
+        Walking OUTPUT is too slow to repeat on every Streamlit rerun, so the
+        result is reused for max_age seconds (writes and cleans through this
+        manager refresh it straight away).
+        
+        Returns:
+            Dict with entries, size_bytes and saved_bytes
+        """
+        now = time.monotonic()
+        if self._usage is None or now - self._usage[0] > max_age:
+            self._usage = (now, {
+                'entries': len(self.get_all_files()),
+                'size_bytes': self.get_folder_size(),
+                'saved_bytes': self.get_dedup_stats()['saved_bytes'],
+            })
+        return self._usage[1]
     
     def format_size(self, size_bytes: int) -> str:
         """Format size in human readable format"""
@@ -246,17 +327,21 @@ class OutputManager:
         Returns:
             Tuple of (files_deleted, space_freed_bytes)
         """
-        files = list(self.base_output_dir.glob('*'))
-        space_freed = 0
+        files = self.get_all_files()
+        _, size_before = self._disk_usage()
         files_deleted = 0
         
         for file in files:
             if file.is_file():
-                space_freed += file.stat().st_size
                 file.unlink()
                 files_deleted += 1
         
-        return files_deleted, space_freed
+        if self.blob_store:
+            self.blob_store.collect_garbage()
+        
+        _, size_after = self._disk_usage()
+        self._usage = None
+        return files_deleted, size_before - size_after
 
 
 # Global instance
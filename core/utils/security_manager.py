@@ -4,18 +4,25 @@ Handles file validation, input sanitization, and security checks
 """
 import os
 import hashlib
-import magic
-import tempfile
-import secrets
 from pathlib import Path
 from typing import Dict, List, Optional, Union, Tuple
-from dataclasses import dataclass
+from dataclasses import dataclass, replace
 import logging
 import re
 import mimetypes
 
+from core.utils.content_scanner import BLOCKED, HTML, SUSPICIOUS, ContentScanner, default_rules
+from core.utils.lazy_imports import lazy_import
+from core.utils.upload_ingest import IngestedUpload, ingest_upload
+
+# python-magic is optional: MIME detection falls back to mimetypes without it
+magic = lazy_import('magic', 'pip install python-magic')
+
 logger = logging.getLogger(__name__)
 
+# libmagic reads at most this much of a buffer (its default bytes_max)
+MIME_SNIFF_BYTES = 1024 * 1024
+
 @dataclass
 class SecurityConfig:
     """Security configuration"""
@@ -74,12 +81,22 @@ class SecurityManager:
         self._blocked_files: Dict[str, str] = {}  # checksum -> reason
         self._scanned_files: Dict[str, ValidationResult] = {}
         
-        # Compile regex patterns for performance
-        self._compiled_patterns = [re.compile(pattern, re.IGNORECASE | re.DOTALL) 
-                                for pattern in self.config.blocked_patterns]
+        # Single-pass content scanners (blocked patterns + indicators, and with HTML rules)
+        self._scanner = ContentScanner(default_rules(self.config.blocked_patterns))
+        self._html_scanner = ContentScanner(default_rules(self.config.blocked_patterns, html=True))
+        self._html_only_scanner = ContentScanner([r for r in self._html_scanner.rules if r.group == HTML])
     
     def validate_file(self, file_path: Union[str, Path], file_content: Optional[bytes] = None) -> ValidationResult:
-        """Comprehensive file validation"""
+        """
+        Comprehensive file validation
+        
+        The file is memory-mapped once; checksum, MIME sniffing and the
+        content scan all read that mapping.
+        
+        Args:
+            file_path: File to validate
+            file_content: Contents if already in memory (bytes or any buffer)
+        """
         file_path = Path(file_path)
         
         try:
@@ -87,68 +104,85 @@ class SecurityManager:
             if not file_path.exists():
                 return ValidationResult(False, "File does not exist")
             
-            # Get file info
-            file_size = file_path.stat().st_size
-            checksum = self._calculate_checksum(file_path)
-            
-            # Check if already blocked
-            if checksum in self._blocked_files:
-                return ValidationResult(False, f"File blocked: {self._blocked_files[checksum]}")
-            
-            # Check cached result
-            if checksum in self._scanned_files:
-                return self._scanned_files[checksum]
-            
-            # Size validation
-            if file_size > self.config.max_file_size_mb * 1024 * 1024:
-                return ValidationResult(False, f"File too large: {file_size / (1024*1024):.1f}MB")
-            
-            # Extension validation
-            if file_path.suffix.lower() not in self.config.allowed_extensions:
-                return ValidationResult(False, f"File type not allowed: {file_path.suffix}")
-            
-            # MIME type validation
-            mime_type = self._get_mime_type(file_path, file_content)
-            if mime_type not in self.config.allowed_mime_types:
-                return ValidationResult(False, f"MIME type not allowed: {mime_type}")
-            
-            # Content validation
-            risk_score = 0.0
-            if self.config.validate_content and file_content is None:
-                with open(file_path, 'rb') as f:
-                    file_content = f.read()
-            
-            if self.config.validate_content and file_content:
-                content_validation = self._validate_content(file_content, file_path.suffix)
-                if not content_validation[0]:
-                    return ValidationResult(False, content_validation[1])
-                risk_score += content_validation[2]
-            
-            # Create result
-            result = ValidationResult(
-                is_valid=True,
-                file_size=file_size,
-                file_type=file_path.suffix.lower(),
-                mime_type=mime_type,
-                checksum=checksum,
-                risk_score=risk_score
-            )
-            
-            # Cache result
-            self._scanned_files[checksum] = result
-            
-            return result
+            if file_content is None:
+                with ingest_upload(file_path) as upload:
+                    return self._validate_buffer(file_path, upload.buffer, upload.checksum)
+            return self._validate_buffer(file_path, file_content)
             
         except Exception as e:
             logger.error(f"Security validation error for {file_path}: {e}")
             return ValidationResult(False, f"Validation error: {str(e)}")
     
+    def validate_upload(self, upload: IngestedUpload) -> ValidationResult:
+        """
+        Validate an ingested upload from its mapped buffer
+        
+        Args:
+            upload: IngestedUpload (see core.utils.upload_ingest)
+        """
+        try:
+            return self._validate_buffer(upload.path, upload.buffer, upload.checksum)
+        except Exception as e:
+            logger.error(f"Security validation error for {upload.name}: {e}")
+            return ValidationResult(False, f"Validation error: {str(e)}")
+    
+    def _validate_buffer(self, file_path: Path, content, checksum: Optional[str] = None) -> ValidationResult:
+        """Run every check against one in-memory or mapped buffer"""
+        file_path = Path(file_path)
+        
+        # Get file info
+        file_size = len(content) if content else file_path.stat().st_size
+        checksum = checksum or self._calculate_checksum(file_path, content)
+        
+        # Check if already blocked
+        if checksum in self._blocked_files:
+            return ValidationResult(False, f"File blocked: {self._blocked_files[checksum]}")
+        
+        # Check cached result
+        if checksum in self._scanned_files:
+            return self._scanned_files[checksum]
+        
+        # Size validation
+        if file_size > self.config.max_file_size_mb * 1024 * 1024:
+            return ValidationResult(False, f"File too large: {file_size / (1024*1024):.1f}MB")
+        
+        # Extension validation
+        if file_path.suffix.lower() not in self.config.allowed_extensions:
+            return ValidationResult(False, f"File type not allowed: {file_path.suffix}")
+        
+        # MIME type validation
+        mime_type = self._get_mime_type(file_path, content)
+        if mime_type not in self.config.allowed_mime_types:
+            return ValidationResult(False, f"MIME type not allowed: {mime_type}")
+        
+        # Content validation
+        risk_score = 0.0
+        if self.config.validate_content and content:
+            content_validation = self._validate_content(content, file_path.suffix)
+            if not content_validation[0]:
+                return ValidationResult(False, content_validation[1])
+            risk_score += content_validation[2]
+        
+        # Create result
+        result = ValidationResult(
+            is_valid=True,
+            file_size=file_size,
+            file_type=file_path.suffix.lower(),
+            mime_type=mime_type,
+            checksum=checksum,
+            risk_score=risk_score
+        )
+        
+        # Cache result
+        self._scanned_files[checksum] = result
+        
+        return result
+    
     def validate_uploaded_file(self, uploaded_file, max_total_size: Optional[int] = None) -> ValidationResult:
         """Validate Streamlit uploaded file"""
         try:
             # Get file info
             file_size = uploaded_file.size if hasattr(uploaded_file, 'size') else 0
-            filename = uploaded_file.name if hasattr(uploaded_file, 'name') else 'unknown'
             
             # Check total size limit
             if max_total_size:
@@ -156,27 +190,19 @@ class SecurityManager:
                 if current_total + file_size > max_total_size:
                     return ValidationResult(False, f"Total size limit exceeded: {current_total + file_size}MB")
             
-            # Read content for validation
-            content = uploaded_file.read()
-            uploaded_file.seek(0)  # Reset file pointer
-            
-            # Create temporary file for validation
-            with self._secure_temp_file(suffix=Path(filename).suffix) as temp_path:
-                with open(temp_path, 'wb') as f:
-                    f.write(content)
-                
-                # Validate the temporary file
-                result = self.validate_file(temp_path, content)
-                result.file_size = file_size
-                
-                return result
+            # Spool once and validate from the memory map (no bytes copy of the upload)
+            with ingest_upload(uploaded_file, temp_dir=self.config.temp_dir) as upload:
+                # A copy: the cached result is shared by every upload of the same content
+                return replace(self.validate_upload(upload), file_size=file_size or upload.size)
                 
         except Exception as e:
             logger.error(f"Uploaded file validation error: {e}")
             return ValidationResult(False, f"Upload validation error: {str(e)}")
     
-    def _calculate_checksum(self, file_path: Path) -> str:
-        """Calculate SHA-256 checksum of file"""
+    def _calculate_checksum(self, file_path: Path, content=None) -> str:
+        """Calculate SHA-256 checksum of file (from content when given)"""
+        if content:
+            return hashlib.sha256(content).hexdigest()
         sha256_hash = hashlib.sha256()
         with open(file_path, "rb") as f:
             for chunk in iter(lambda: f.read(8192), b""):
@@ -188,7 +214,7 @@ class SecurityManager:
         try:
             # Try python-magic first (more accurate)
             if file_content:
-                mime_type = magic.from_buffer(file_content, mime=True)
+                mime_type = magic.from_buffer(bytes(file_content[:MIME_SNIFF_BYTES]), mime=True)
             else:
                 mime_type = magic.from_file(str(file_path), mime=True)
             
@@ -202,49 +228,35 @@ class SecurityManager:
         return mime_type or 'application/octet-stream'
     
     def _validate_content(self, content: bytes, file_extension: str) -> Tuple[bool, str, float]:
-        """Validate file content for security threats"""
+        """
+        Validate file content for security threats
+        
+        One streaming pass scores every rule; .xlsx/.docx are scanned
+        through their inner XML parts.
+        
+        Args:
+            content: bytes, str, or a mapped buffer
+            file_extension: File extension (selects HTML rules / container parts)
+        """
         try:
-            # Convert to string for text-based validation
-            try:
-                content_str = content.decode('utf-8', errors='ignore')
-            except:
-                # Binary file, skip content validation
-                return True, "", 0.0
-            
-            risk_score = 0.0
+            is_html = file_extension.lower() in ['.html', '.htm']
+            scanner = self._html_scanner if is_html else self._scanner
+            scan = scanner.scan(content, file_extension)
             
             # Check for blocked patterns
-            for pattern in self._compiled_patterns:
-                matches = pattern.findall(content_str)
-                if matches:
-                    risk_score += len(matches) * 10
-                    logger.warning(f"Blocked pattern found in {file_extension}: {len(matches)} matches")
+            for rule, count in scan.matches(BLOCKED):
+                logger.warning(f"Blocked pattern found in {file_extension}: {count} matches")
+            risk_score = scan.score(BLOCKED)
             
             # Additional checks for HTML files
-            if file_extension.lower() in ['.html', '.htm']:
-                html_risks = self._validate_html_content(content_str)
-                risk_score += html_risks[1]
-                if not html_risks[0]:
-                    return False, html_risks[2], risk_score
+            if is_html:
+                html_score = scan.score(HTML)
+                risk_score += html_score
+                if html_score > 30:
+                    return False, f"HTML content too risky: {html_score}", risk_score
             
             # Check for suspicious content
-            suspicious_indicators = [
-                'base64_decode',
-                'eval(',
-                'exec(',
-                'system(',
-                'shell_exec',
-                'passthru',
-                '<?php',
-                '<%',
-                '<script',
-                'javascript:',
-            ]
-            
-            content_lower = content_str.lower()
-            for indicator in suspicious_indicators:
-                if indicator in content_lower:
-                    risk_score += 5
+            risk_score += scan.score(SUSPICIOUS)
             
             # Determine if content is safe
             if risk_score > 50:  # High risk threshold
@@ -261,51 +273,7 @@ class SecurityManager:
     def _validate_html_content(self, content: str) -> Tuple[bool, float, str]:
         """Specific validation for HTML content"""
         try:
-            # Check for dangerous HTML elements
-            dangerous_tags = [
-                '<script',
-                '<iframe',
-                '<object',
-                '<embed',
-                '<form',
-                '<input',
-                '<link',
-                '<meta'
-            ]
-            
-            content_lower = content.lower()
-            risk_score = 0.0
-            
-            for tag in dangerous_tags:
-                count = content_lower.count(tag)
-                if count > 0:
-                    risk_score += count * 5
-            
-            # Check for dangerous attributes
-            dangerous_attrs = [
-                'onload=',
-                'onerror=',
-                'onclick=',
-                'onmouseover=',
-                'javascript:',
-                'vbscript:',
-                'data:text/html'
-            ]
-            
-            for attr in dangerous_attrs:
-                if attr in content_lower:
-                    risk_score += 10
-            
-            # Check for external resources
-            external_patterns = [
-                r'http[s]?://[^"\s>]+',
-                r'href\s*=\s*["\']?http',
-                r'src\s*=\s*["\']?http'
-            ]
-            
-            for pattern in external_patterns:
-                if re.search(pattern, content_lower):
-                    risk_score += 3
+            risk_score = self._html_only_scanner.scan(content).score(HTML)
             
             if risk_score > 30:
                 return False, risk_score, f"HTML content too risky: {risk_score}"
@@ -315,35 +283,6 @@ class SecurityManager:
         except Exception as e:
             return False, 100.0, f"HTML validation error: {str(e)}"
     
-    def _secure_temp_file(self, suffix: str = ''):
-        """Context manager for secure temporary file creation"""
-        class SecureTempFile:
-            def __init__(self, suffix: str):
-                self.suffix = suffix
-                self.temp_path = None
-                
-            def __enter__(self):
-                # Create secure temporary file
-                if self.config.temp_dir:
-                    temp_dir = Path(self.config.temp_dir)
-                    temp_dir.mkdir(parents=True, exist_ok=True)
-                else:
-                    temp_dir = Path(tempfile.gettempdir())
-                
-                # Use cryptographically secure random name
-                filename = f"secure_{secrets.token_urlsafe(16)}{self.suffix}"
-                self.temp_path = temp_dir / filename
-                return str(self.temp_path)
-            
-            def __exit__(self, exc_type, exc_val, exc_tb):
-                if self.temp_path and self.temp_path.exists():
-                    try:
-                        self.temp_path.unlink()
-                    except Exception as e:
-                        logger.error(f"Failed to cleanup temp file {self.temp_path}: {e}")
-        
-        return SecureTempFile(suffix)
-    
     def sanitize_filename(self, filename: str) -> str:
         """Sanitize filename for security"""
         # Remove path traversal attempts
@@ -0,0 +1,422 @@
+"""
+Streaming ZIP Writer - Build ZIP archives without holding them in memory
+Entries are written one at a time to a spooled temp file, a file on disk
+or any writable stream (e.g. an HTTP response), with CRCs computed as the
+data is written and checked when the archive is verified. Local headers,
+data descriptors and the central directory are written here from the ZIP
+specification (APPNOTE 6.3), so pre-compressed entries can be appended
+without reaching into zipfile.ZipFile internals.
+"""
+import io
+import shutil
+import struct
+import tempfile
+import zipfile
+import zlib
+from datetime import datetime
+from pathlib import Path
+from typing import BinaryIO, Iterator, List, Optional, Tuple, Union
+
+# Record layouts (little-endian) from the ZIP specification
+_LOCAL_HEADER = struct.Struct('<4s5H3L2H')
+_CENTRAL_HEADER = struct.Struct('<4s6H3L5HLL')
+_END_OF_CENTRAL_DIR = struct.Struct('<4s4H2LH')
+_ZIP64_END_OF_CENTRAL_DIR = struct.Struct('<4sQ2H2L4Q')
+_ZIP64_LOCATOR = struct.Struct('<4sLQL')
+
+_LOCAL_SIGNATURE = b'PK\x03\x04'
+_CENTRAL_SIGNATURE = b'PK\x01\x02'
+_END_SIGNATURE = b'PK\x05\x06'
+_ZIP64_END_SIGNATURE = b'PK\x06\x06'
+_ZIP64_LOCATOR_SIGNATURE = b'PK\x06\x07'
+_DESCRIPTOR_SIGNATURE = b'PK\x07\x08'
+
+_ZIP64_EXTRA_ID = 0x0001
+_FLAG_DATA_DESCRIPTOR = 0x08
+_FLAG_UTF8 = 0x800
+_VERSION_DEFAULT = 20
+_VERSION_ZIP64 = 45
+_MADE_BY_UNIX = 3 << 8
+_MAX_32 = 0xFFFFFFFF
+_MAX_16 = 0xFFFF
+
+SUPPORTED_COMPRESSION = (zipfile.ZIP_STORED, zipfile.ZIP_DEFLATED)
+
+
+def _dos_datetime(moment: Tuple[int, ...]) -> Tuple[int, int]:
+    """(time, date) in MS-DOS format"""
+    year, month, day, hour, minute, second = moment[:6]
+    return (hour << 11) | (minute << 5) | (second // 2), ((year - 1980) << 9) | (month << 5) | day
+
+
+class _CountingWriter:
+    """Forwards writes and tracks the archive offset (targets need not support tell())"""
+
+    def __init__(self, target: BinaryIO):
+        self.target = target
+        self.offset = 0
+
+    def write(self, data: bytes) -> None:
+        self.target.write(data)
+        self.offset += len(data)
+
+
+class StreamingZipWriter:
+    """
+    ZIP writer that holds at most one entry (or one chunk) in memory
+
+    - target=None spools to a temp file (kept in RAM only below spool_max_mb)
+    - Files on disk are copied in chunks, never read whole
+    - CRC-32 is computed incrementally and compared with the stored value
+    - Seekable targets get sizes patched into the local header; forward-only
+      targets get a data descriptor after each entry
+    - ZIP_STORED and ZIP_DEFLATED entries, ZIP64 when sizes or counts need it
+    """
+
+    def __init__(self, target: Optional[BinaryIO] = None,
+                 compression: int = zipfile.ZIP_DEFLATED,
+                 compresslevel: Optional[int] = 6,
+                 spool_max_mb: int = 16,
+                 chunk_size: int = 64 * 1024):
+        """
+        Initialize streaming ZIP writer
+
+        Args:
+            target: Writable binary stream (default: spooled temp file)
+            compression: Default compression method (ZIP_STORED or ZIP_DEFLATED)
+            compresslevel: Default compression level
+            spool_max_mb: Size above which the spooled archive moves to disk
+            chunk_size: Read/write chunk size in bytes
+        """
+        self.target = target if target is not None else tempfile.SpooledTemporaryFile(
+            max_size=spool_max_mb * 1024 * 1024
+        )
+        self.compression = self._check_compression(compression)
+        self.compresslevel = compresslevel
+        self.chunk_size = chunk_size
+        self.entries: List[zipfile.ZipInfo] = []
+        self.bytes_in = 0
+        self._out = _CountingWriter(self.target)
+        self._seekable = self.target.seekable()
+        # Archive offsets are relative to where the target stood when we started
+        self._base = self.target.tell() if self._seekable else 0
+        self._finished = False
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self._finish()
+
+    @staticmethod
+    def _check_compression(compress_type: int) -> int:
+        if compress_type not in SUPPORTED_COMPRESSION:
+            raise NotImplementedError(f"Unsupported ZIP compression method: {compress_type}")
+        return compress_type
+
+    def _new_info(self, archive_name: str, compress_type: Optional[int]) -> zipfile.ZipInfo:
+        info = zipfile.ZipInfo(archive_name, date_time=datetime.now().timetuple()[:6])
+        info.compress_type = self._check_compression(self.compression if compress_type is None else compress_type)
+        info.external_attr = 0o644 << 16
+        info.create_system = 3
+        info.flag_bits = _FLAG_UTF8 if not info.filename.isascii() else 0
+        info.CRC = info.file_size = info.compress_size = 0
+        return info
+
+    def _write_local_header(self, info: zipfile.ZipInfo, zip64: bool) -> None:
+        """Local file header; ZIP64 headers carry the sizes in an extra field"""
+        if self._finished:
+            raise ValueError("Archive already closed")
+        info.header_offset = self._out.offset
+        name = info.filename.encode('utf-8')
+        extra = b''
+        crc, compress_size, file_size = info.CRC, info.compress_size, info.file_size
+        if zip64:
+            extra = struct.pack('<2H2Q', _ZIP64_EXTRA_ID, 16, file_size, compress_size)
+            compress_size = file_size = _MAX_32
+        dos_time, dos_date = _dos_datetime(info.date_time)
+        self._out.write(_LOCAL_HEADER.pack(
+            _LOCAL_SIGNATURE, _VERSION_ZIP64 if zip64 else _VERSION_DEFAULT, info.flag_bits,
+            info.compress_type, dos_time, dos_date, crc, compress_size, file_size, len(name), len(extra)
+        ))
+        self._out.write(name)
+        self._out.write(extra)
+
+    def _patch_local_header(self, info: zipfile.ZipInfo) -> None:
+        """Rewrite CRC and sizes in the local header of a finished entry (seekable targets)"""
+        end = self.target.tell()
+        # CRC and both sizes sit 14 bytes into the local header
+        self.target.seek(self._base + info.header_offset + 14)
+        self.target.write(struct.pack('<3L', info.CRC, info.compress_size, info.file_size))
+        self.target.seek(end)
+
+    def _add_entry(self, info: zipfile.ZipInfo) -> None:
+        self.bytes_in += info.file_size
+        self.entries.append(info)
+
+    def add_stream(self, archive_name: str, source: BinaryIO,
+                   compress_type: Optional[int] = None,
+                   compresslevel: Optional[int] = None,
+                   size_hint: Optional[int] = None) -> zipfile.ZipInfo:
+        """
+        Copy a readable stream into the archive chunk by chunk
+
+        Args:
+            archive_name: Path inside the archive
+            source: Readable binary stream
+            compress_type: Override compression method for this entry
+            compresslevel: Override compression level for this entry
+            size_hint: Expected uncompressed size (entries above 4 GiB need one)
+
+        Returns:
+            ZipInfo of the written entry
+        """
+        info = self._new_info(archive_name, compress_type)
+        zip64 = size_hint is not None and size_hint * 1.05 > zipfile.ZIP64_LIMIT
+        if not self._seekable:
+            info.flag_bits |= _FLAG_DATA_DESCRIPTOR
+        self._write_local_header(info, zip64)
+
+        level = self.compresslevel if compresslevel is None else compresslevel
+        compressor = None
+        if info.compress_type == zipfile.ZIP_DEFLATED:
+            compressor = zlib.compressobj(zlib.Z_DEFAULT_COMPRESSION if level is None else level,
+                                          zlib.DEFLATED, -15)
+        crc = 0
+        size = 0
+        compress_size = 0
+        while True:
+            chunk = source.read(self.chunk_size)
+            if not chunk:
+                break
+            crc = zlib.crc32(chunk, crc)
+            size += len(chunk)
+            if compressor is not None:
+                chunk = compressor.compress(chunk)
+            compress_size += len(chunk)
+            self._out.write(chunk)
+        if compressor is not None:
+            tail = compressor.flush()
+            compress_size += len(tail)
+            self._out.write(tail)
+
+        info.CRC, info.file_size, info.compress_size = crc, size, compress_size
+        if not zip64 and max(size, compress_size) > zipfile.ZIP64_LIMIT:
+            raise zipfile.LargeZipFile(f"{archive_name} exceeds 4 GiB; pass size_hint to write a ZIP64 header")
+        if zip64 and self._seekable:
+            # Sizes live in the ZIP64 extra field, just after the name
+            end = self.target.tell()
+            self.target.seek(self._base + info.header_offset + _LOCAL_HEADER.size + len(info.filename.encode('utf-8')) + 4)
+            self.target.write(struct.pack('<2Q', size, compress_size))
+            self.target.seek(self._base + info.header_offset + 14)
+            self.target.write(struct.pack('<L', crc))
+            self.target.seek(end)
+        elif self._seekable:
+            self._patch_local_header(info)
+        elif zip64:
+            self._out.write(struct.pack('<4sL2Q', _DESCRIPTOR_SIGNATURE, crc, compress_size, size))
+        else:
+            self._out.write(struct.pack('<4s3L', _DESCRIPTOR_SIGNATURE, crc, compress_size, size))
+
+        self._add_entry(info)
+        return info
+
+    def add_bytes(self, archive_name: str, content: Union[str, bytes],
+                  compress_type: Optional[int] = None,
+                  compresslevel: Optional[int] = None) -> zipfile.ZipInfo:
+        """Add in-memory content (str is UTF-8 encoded)"""
+        if isinstance(content, str):
+            content = content.encode('utf-8')
+        return self.add_stream(archive_name, io.BytesIO(content), compress_type, compresslevel, len(content))
+
+    def add_file(self, file_path: Union[str, Path], archive_name: Optional[str] = None,
+                 compress_type: Optional[int] = None,
+                 compresslevel: Optional[int] = None) -> zipfile.ZipInfo:
+        """Add a file from disk without reading it into memory"""
+        file_path = Path(file_path)
+        with open(file_path, 'rb') as source:
+            return self.add_stream(archive_name or file_path.name, source, compress_type, compresslevel,
+                                   file_path.stat().st_size)
+
+    def add_compressed(self, archive_name: str, payload: bytes, crc: int, file_size: int,
+                       compress_type: int = zipfile.ZIP_DEFLATED) -> zipfile.ZipInfo:
+        """
+        Append an entry whose data was already compressed (see deflate_entry)
+
+        Sizes and CRC are known up front, so the local header is written
+        once and no data descriptor is needed, even on forward-only streams.
+
+        Args:
+            archive_name: Path inside the archive
+            payload: Raw compressed bytes (raw deflate, or the data for ZIP_STORED)
+            crc: CRC-32 of the uncompressed data
+            file_size: Uncompressed size in bytes
+            compress_type: Method used to produce payload
+
+        Returns:
+            ZipInfo of the written entry
+        """
+        info = self._new_info(archive_name, compress_type)
+        info.CRC, info.file_size, info.compress_size = crc, file_size, len(payload)
+        self._write_local_header(info, max(file_size, len(payload)) > zipfile.ZIP64_LIMIT)
+        self._out.write(payload)
+        self._add_entry(info)
+        return info
+
+    def _finish(self) -> None:
+        """Write the central directory and end records (once)"""
+        if self._finished:
+            return
+        self._finished = True
+        central_start = self._out.offset
+        for info in self.entries:
+            name = info.filename.encode('utf-8')
+            extra_values = []
+            file_size, compress_size, offset = info.file_size, info.compress_size, info.header_offset
+            if file_size > _MAX_32:
+                extra_values.append(file_size)
+                file_size = _MAX_32
+            if compress_size > _MAX_32:
+                extra_values.append(compress_size)
+                compress_size = _MAX_32
+            if offset > _MAX_32:
+                extra_values.append(offset)
+                offset = _MAX_32
+            extra = struct.pack(f'<2H{len(extra_values)}Q', _ZIP64_EXTRA_ID, 8 * len(extra_values),
+                                *extra_values) if extra_values else b''
+            version = _VERSION_ZIP64 if extra_values else _VERSION_DEFAULT
+            dos_time, dos_date = _dos_datetime(info.date_time)
+            self._out.write(_CENTRAL_HEADER.pack(
+                _CENTRAL_SIGNATURE, _MADE_BY_UNIX | version, version, info.flag_bits, info.compress_type,
+                dos_time, dos_date, info.CRC, compress_size, file_size, len(name), len(extra), 0, 0, 0,
+                info.external_attr, offset
+            ))
+            self._out.write(name)
+            self._out.write(extra)
+
+        central_size = self._out.offset - central_start
+        count = len(self.entries)
+        if count > _MAX_16 or central_start > _MAX_32 or central_size > _MAX_32:
+            zip64_end = self._out.offset
+            self._out.write(_ZIP64_END_OF_CENTRAL_DIR.pack(
+                _ZIP64_END_SIGNATURE, _ZIP64_END_OF_CENTRAL_DIR.size - 12, _MADE_BY_UNIX | _VERSION_ZIP64,
+                _VERSION_ZIP64, 0, 0, count, count, central_size, central_start
+            ))
+            self._out.write(_ZIP64_LOCATOR.pack(_ZIP64_LOCATOR_SIGNATURE, 0, zip64_end, 1))
+        self._out.write(_END_OF_CENTRAL_DIR.pack(
+            _END_SIGNATURE, 0, 0, min(count, _MAX_16), min(count, _MAX_16),
+            min(central_size, _MAX_32), min(central_start, _MAX_32), 0
+        ))
+        if hasattr(self.target, 'flush'):
+            self.target.flush()
+
+    def close(self) -> BinaryIO:
+        """
+        Finish the archive (writes the central directory)
+
+        Returns:
+            Target stream, rewound to the start when seekable
+        """
+        self._finish()
+        if self._seekable:
+            self.target.seek(self._base)
+        return self.target
+
+    def verify(self) -> bool:
+        """
+        Re-read every entry in chunks; zipfile checks each CRC at end of entry
+
+        Only possible when the target is seekable (temp file or file on disk).
+
+        Returns:
+            True if all entries match the CRCs recorded while writing
+        """
+        archive = self.close()
+        verify_zip_stream(archive, self.chunk_size)
+        recorded = {info.filename: info.CRC for info in self.entries}
+        with zipfile.ZipFile(archive, 'r') as zip_file:
+            for info in zip_file.infolist():
+                if recorded.get(info.filename, info.CRC) != info.CRC:
+                    raise ValueError(f"ZIP integrity check failed: CRC mismatch for {info.filename}")
+        archive.seek(0)
+        return True
+
+    def iter_chunks(self, chunk_size: Optional[int] = None) -> Iterator[bytes]:
+        """Yield the finished archive in chunks (for streaming responses)"""
+        archive = self.close()
+        while True:
+            chunk = archive.read(chunk_size or self.chunk_size)
+            if not chunk:
+                break
+            yield chunk
+
+    def save(self, path: Union[str, Path]) -> Path:
+        """Copy the finished archive to a file on disk"""
+        archive = self.close()
+        path = Path(path)
+        with open(path, 'wb') as f:
+            shutil.copyfileobj(archive, f, self.chunk_size)
+        archive.seek(0)
+        return path
+
+
+def archive_bytes(archive: BinaryIO) -> bytes:
+    """
+    Read a finished archive and close its stream
+
+    st.download_button only accepts bytes, BytesIO or a BufferedReader (it
+    copies the data to bytes either way), not the spooled temp file the
+    writer returns. Closing here also releases a temp file or an open cache
+    file once the download data has been handed over.
+
+    Args:
+        archive: Stream returned by StreamingZipWriter.close() or a create_zip()
+
+    Returns:
+        Archive bytes
+    """
+    with archive:
+        archive.seek(0)
+        return archive.read()
+
+
+def deflate_entry(data: Union[str, bytes], level: int = 6) -> Tuple[bytes, int, int]:
+    """
+    Compress one entry as a raw deflate stream (zlib releases the GIL)
+
+    Args:
+        data: Entry content (str is UTF-8 encoded)
+        level: Deflate level 0-9
+
+    Returns:
+        Tuple of (compressed bytes, CRC-32, uncompressed size)
+    """
+    if isinstance(data, str):
+        data = data.encode('utf-8')
+    compressor = zlib.compressobj(level, zlib.DEFLATED, -15)
+    return compressor.compress(data) + compressor.flush(), zlib.crc32(data), len(data)
+
+
+def verify_zip_stream(archive: BinaryIO, chunk_size: int = 64 * 1024) -> bool:
+    """
+    Verify a ZIP archive entry by entry without loading it into memory
+
+    Args:
+        archive: Seekable binary stream containing a ZIP archive
+        chunk_size: Read size used while checking each entry
+
+    Returns:
+        True if every entry decompresses and matches its CRC
+    """
+    archive.seek(0)
+    try:
+        with zipfile.ZipFile(archive, 'r') as zip_file:
+            for info in zip_file.infolist():
+                with zip_file.open(info) as entry:
+                    while entry.read(chunk_size):
+                        pass
+    except (zipfile.BadZipFile, zlib.error, EOFError) as e:
+        raise ValueError(f"ZIP integrity check failed: {e}")
+    finally:
+        archive.seek(0)
+    return True
@@ -0,0 +1,203 @@
+"""
+Upload Ingest - Spool an upload to disk once and memory-map it
+Checksum, MIME sniffing, the content scan and workbook parsing all read the
+same mapped buffer instead of each taking their own bytes copy. Uploads that
+already live on disk (paths, open files) are mapped in place, unspooled.
+"""
+import hashlib
+import io
+import mmap
+import os
+import shutil
+import tempfile
+import weakref
+from pathlib import Path
+from typing import Any, Optional, Union
+
+SPOOL_CHUNK_SIZE = 1024 * 1024
+
+# Leading bytes handed to MIME sniffers
+SNIFF_SIZE = 2048
+
+
+class MappedReader(io.RawIOBase):
+    """Seekable, read-only file object over a buffer (bytes are copied only when read)"""
+
+    def __init__(self, buffer):
+        super().__init__()
+        self._view = memoryview(buffer)
+        self._pos = 0
+
+    def readable(self) -> bool:
+        return True
+
+    def seekable(self) -> bool:
+        return True
+
+    def tell(self) -> int:
+        return self._pos
+
+    def seek(self, offset: int, whence: int = io.SEEK_SET) -> int:
+        if whence == io.SEEK_CUR:
+            offset += self._pos
+        elif whence == io.SEEK_END:
+            offset += len(self._view)
+        if offset < 0:
+            raise ValueError("negative seek position")
+        self._pos = offset
+        return self._pos
+
+    def readinto(self, buffer) -> int:
+        end = min(self._pos + len(buffer), len(self._view))
+        size = max(end - self._pos, 0)
+        buffer[:size] = self._view[self._pos:end]
+        self._pos += size
+        return size
+
+    def read(self, size: int = -1) -> bytes:
+        end = len(self._view) if size is None or size < 0 else min(self._pos + size, len(self._view))
+        data = self._view[self._pos:end].tobytes() if end > self._pos else b''
+        self._pos += len(data)
+        return data
+
+    def readall(self) -> bytes:
+        return self.read()
+
+    def close(self) -> None:
+        if not self.closed:
+            self._view.release()
+        super().close()
+
+
+def _release(mapping: Optional[mmap.mmap], handle, spool_path: Optional[str]) -> None:
+    if mapping is not None:
+        try:
+            mapping.close()
+        except BufferError:
+            # A reader still holds a view; the map is freed with it
+            pass
+    handle.close()
+    if spool_path:
+        try:
+            os.unlink(spool_path)
+        except OSError:
+            pass
+
+
+def _disk_path(source: Any) -> Optional[str]:
+    """Path of an upload that is already a regular file on disk"""
+    if isinstance(source, (str, Path)):
+        return str(source)
+    if isinstance(source, (io.BufferedReader, io.FileIO)) and isinstance(source.name, str):
+        return source.name if os.path.isfile(source.name) else None
+    return None
+
+
+def _spool(source: Any, suffix: str, temp_dir: Optional[str]) -> str:
+    """Write an in-memory or streamed upload to a private temp file"""
+    if temp_dir:
+        Path(temp_dir).mkdir(parents=True, exist_ok=True)
+    fd, path = tempfile.mkstemp(prefix='upload_', suffix=suffix, dir=temp_dir)
+    try:
+        with os.fdopen(fd, 'wb') as f:
+            if isinstance(source, (bytes, bytearray, memoryview)):
+                f.write(source)
+            elif hasattr(source, 'getbuffer'):
+                # BytesIO / Streamlit UploadedFile: write the buffer without a bytes copy
+                with source.getbuffer() as view:
+                    f.write(view)
+            else:
+                position = source.tell() if hasattr(source, 'tell') else None
+                if hasattr(source, 'seek'):
+                    source.seek(0)
+                shutil.copyfileobj(source, f, SPOOL_CHUNK_SIZE)
+                if position is not None:
+                    source.seek(position)
+    except Exception:
+        os.unlink(path)
+        raise
+    return path
+
+
+class IngestedUpload:
+    """
+    An uploaded file spooled once and memory-mapped
+
+    Use as a context manager (or call close()) to unmap and remove the
+    spool file; it is also cleaned up when garbage collected.
+    """
+
+    def __init__(self, source: Any, name: Optional[str] = None, temp_dir: Optional[str] = None):
+        """
+        Args:
+            source: Streamlit UploadedFile, BytesIO, bytes, open file or path
+            name: Original filename (defaults to source.name / the path)
+            temp_dir: Spool directory (system temp dir by default)
+        """
+        self.name = name or str(getattr(source, 'name', None) or (source if isinstance(source, (str, Path)) else 'upload'))
+        self.suffix = Path(self.name).suffix.lower()
+
+        path = _disk_path(source)
+        spool_path = None if path else _spool(source, self.suffix, temp_dir)
+        self.path = Path(path or spool_path)
+        self.spooled = spool_path is not None
+
+        handle = open(self.path, 'rb')
+        self.size = os.fstat(handle.fileno()).st_size
+        # mmap cannot map an empty file
+        self._mapping = mmap.mmap(handle.fileno(), 0, access=mmap.ACCESS_READ) if self.size else None
+        self._checksum: Optional[str] = None
+        self._finalizer = weakref.finalize(self, _release, self._mapping, handle, spool_path)
+
+    @property
+    def buffer(self) -> Union[mmap.mmap, bytes]:
+        """The mapped file contents (read-only)"""
+        return self._mapping if self._mapping is not None else b''
+
+    def head(self, size: int = SNIFF_SIZE) -> bytes:
+        """Leading bytes (for magic-number / MIME sniffing)"""
+        return bytes(self.buffer[:size])
+
+    @property
+    def checksum(self) -> str:
+        """SHA-256 of the contents, hashed straight from the map"""
+        if self._checksum is None:
+            self._checksum = hashlib.sha256(self.buffer).hexdigest()
+        return self._checksum
+
+    def reader(self) -> MappedReader:
+        """New file object over the map, for parsers that want read()/seek()"""
+        return MappedReader(self.buffer)
+
+    @property
+    def closed(self) -> bool:
+        return not self._finalizer.alive
+
+    def close(self) -> None:
+        self._finalizer()
+
+    def __enter__(self) -> 'IngestedUpload':
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb) -> None:
+        self.close()
+
+    def __repr__(self) -> str:
+        return f"<IngestedUpload {self.name!r} {self.size} bytes{' spooled' if self.spooled else ''}>"
+
+
+def ingest_upload(source: Any, name: Optional[str] = None, temp_dir: Optional[str] = None) -> IngestedUpload:
+    """
+    Spool (if needed) and memory-map an upload
+
+    Args:
+        source: Streamlit UploadedFile, BytesIO, bytes, open file or path
+        name: Original filename
+        temp_dir: Spool directory
+
+    Returns:
+        IngestedUpload
+    """
+    if isinstance(source, IngestedUpload):
+        return source
+    return IngestedUpload(source, name=name, temp_dir=temp_dir)
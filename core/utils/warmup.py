@@ -0,0 +1,181 @@
+"""
+Warm Startup - Preload the heavy document stack in the background
+Imports pandas/openpyxl/python-docx/ReportLab, compiles the Jinja2
+templates, builds DOCX skeletons and initialises PDF fonts while the
+first page is drawn, so the first bill does not pay for them.
+"""
+import io
+import threading
+import time
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+PROJECT_ROOT = Path(__file__).parent.parent.parent
+
+HEAVY_MODULES = [
+    'pandas',
+    'openpyxl',
+    'docx',
+    'jinja2',
+    'reportlab.platypus',
+    'core.processors.excel_processor',
+    'core.generators.document_generator',
+    'core.generators.docx_builder',
+    'core.generators.render_pool',
+    'core.utils.streaming_zip',
+]
+
+_status: Dict[str, Any] = {'started': False, 'done': False, 'steps': {}}
+_status_lock = threading.Lock()
+_done = threading.Event()
+_thread: Optional[threading.Thread] = None
+
+
+def _import_modules() -> int:
+    import importlib
+    for name in HEAVY_MODULES:
+        importlib.import_module(name)
+    return len(HEAVY_MODULES)
+
+
+def _compile_templates() -> int:
+    from core.generators.base_generator import get_template_environment
+    env = get_template_environment()
+    names = [name for name in env.list_templates() if name.endswith('.html')]
+    for name in names:
+        env.get_template(name)
+    return len(names)
+
+
+def _warm_openpyxl() -> int:
+    import openpyxl
+    buffer = io.BytesIO()
+    workbook = openpyxl.Workbook()
+    workbook.active.append(['Item', 'Quantity', 'Rate'])
+    workbook.save(buffer)
+    buffer.seek(0)
+    openpyxl.load_workbook(buffer, data_only=True).close()
+    return 1
+
+
+def _warm_docx() -> int:
+    from core.generators.docx_builder import DocxBuilder
+    return DocxBuilder().preload()
+
+
+def _warm_reportlab() -> int:
+    from reportlab.lib.styles import getSampleStyleSheet
+    from reportlab.platypus import Paragraph, SimpleDocTemplate
+    SimpleDocTemplate(io.BytesIO()).build([Paragraph('warm-up', getSampleStyleSheet()['Normal'])])
+    return 1
+
+
+def _warm_weasyprint() -> int:
+    # First render loads Pango/fontconfig and scans system fonts
+    from weasyprint import HTML
+    HTML(string='<p style="font-family: Arial">warm-up</p>').write_pdf()
+    return 1
+
+
+def _compile_bytecode() -> int:
+    # Modules imported lazily (UI modes, enterprise processors) get .pyc files too
+    import compileall
+    compileall.compile_dir(str(PROJECT_ROOT / 'core'), quiet=1, workers=1)
+    return 1
+
+
+def warmup_steps(pdf_engine: str = 'reportlab') -> List[Tuple[str, Callable[[], int]]]:
+    """
+    Ordered warm-up steps (most valuable first)
+
+    Args:
+        pdf_engine: Configured PDF engine; WeasyPrint fonts are only loaded when selected
+
+    Returns:
+        List of (step name, callable)
+    """
+    steps = [
+        ('modules', _import_modules),
+        ('templates', _compile_templates),
+        ('openpyxl', _warm_openpyxl),
+        ('docx', _warm_docx),
+        ('reportlab', _warm_reportlab),
+    ]
+    if pdf_engine == 'weasyprint':
+        steps.append(('weasyprint', _warm_weasyprint))
+    steps.append(('bytecode', _compile_bytecode))
+    return steps
+
+
+def run_warmup(pdf_engine: str = 'reportlab') -> Dict[str, Dict[str, Any]]:
+    """
+    Run every warm-up step in the calling thread
+
+    A failing step (e.g. WeasyPrint without Pango) is recorded and skipped.
+
+    Returns:
+        Dict of step name -> {'seconds', 'items'} or {'seconds', 'error'}
+    """
+    for name, step in warmup_steps(pdf_engine):
+        started = time.perf_counter()
+        try:
+            result = {'items': step()}
+        except Exception as e:
+            result = {'error': str(e)}
+        result['seconds'] = round(time.perf_counter() - started, 3)
+        with _status_lock:
+            _status['steps'][name] = result
+    with _status_lock:
+        _status['done'] = True
+    _done.set()
+    return warmup_status()['steps']
+
+
+def start_warmup(pdf_engine: str = 'reportlab') -> threading.Thread:
+    """
+    Start warming in a daemon thread (once per process)
+
+    Args:
+        pdf_engine: Configured PDF engine
+
+    Returns:
+        The warm-up thread
+    """
+    global _thread
+    with _status_lock:
+        if _thread is None:
+            _status['started'] = True
+            _thread = threading.Thread(target=run_warmup, args=(pdf_engine,), name="warmup", daemon=True)
+            _thread.start()
+    return _thread
+
+
+def warm_worker(pdf_engine: str = 'reportlab') -> None:
+    """
+    ProcessPoolExecutor initializer: warm each worker process as it spawns
+
+    Args:
+        pdf_engine: Configured PDF engine (pass it through initargs)
+    """
+    for name, step in warmup_steps(pdf_engine):
+        if name == 'bytecode':
+            continue
+        try:
+            step()
+        except Exception:
+            pass
+
+
+def wait_for_warmup(timeout: Optional[float] = None) -> bool:
+    """Block until warm-up has finished; False on timeout"""
+    return _done.wait(timeout)
+
+
+def warmup_status() -> Dict[str, Any]:
+    """Snapshot of warm-up progress"""
+    with _status_lock:
+        return {
+            'started': _status['started'],
+            'done': _status['done'],
+            'steps': {name: dict(result) for name, result in _status['steps'].items()},
+        }
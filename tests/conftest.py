@@ -0,0 +1,29 @@
+"""
+Shared test fixtures
+"""
+import pandas as pd
+import pytest
+
+
+@pytest.fixture
+def bill_data_factory():
+    """Build minimal processed-bill dictionaries (rows items, extra items empty)"""
+    def make(rows: int = 5, rate: float = 100.0) -> dict:
+        bill_df = pd.DataFrame({
+            'Item No.': [f"{i + 1}.0" for i in range(rows)],
+            'Description': [f"Item <{i}> & description" for i in range(rows)],
+            'Unit': ['Each'] * rows,
+            'Quantity': [float(i + 1) for i in range(rows)],
+            'Rate': [rate] * rows,
+        })
+        return {
+            'title_data': {
+                'Name of Work ;-': 'Electric Repair Work',
+                'Serial No. of this bill :': 'Second & Final Bill',
+                'TENDER PREMIUM %': 5,
+            },
+            'work_order_data': bill_df.copy(),
+            'bill_quantity_data': bill_df,
+            'extra_items_data': pd.DataFrame(),
+        }
+    return make
@@ -0,0 +1,185 @@
+"""
+Unit tests for the headless HTTP API
+"""
+import asyncio
+import io
+import json
+import sys
+import threading
+import zipfile
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from core.api import server as api_server
+from core.api.server import BillAPIServer, main
+
+WORKBOOK = Path(__file__).parent.parent / 'TEST_INPUT_FILES' / '3rdRunningNoExtra.xlsx'
+
+
+async def _request(port: int, method: str, path: str, body: bytes = b'',
+                   headers: dict = None) -> tuple:
+    """Minimal HTTP/1.1 client returning (status, headers, body)"""
+    reader, writer = await asyncio.open_connection('127.0.0.1', port)
+    head = [f"{method} {path} HTTP/1.1", "Host: localhost", f"Content-Length: {len(body)}"]
+    head += [f"{name}: {value}" for name, value in (headers or {}).items()]
+    writer.write(("\r\n".join(head) + "\r\n\r\n").encode() + body)
+    await writer.drain()
+    response = await reader.read()
+    writer.close()
+    raw_head, _, payload = response.partition(b'\r\n\r\n')
+    status_line, *lines = raw_head.decode('latin-1').split('\r\n')
+    response_headers = dict(line.split(': ', 1) for line in lines)
+    return int(status_line.split()[1]), response_headers, payload
+
+
+def _run(scenario, **server_kwargs):
+    """Run a scenario coroutine against a server on a free port"""
+    async def wrapper():
+        server = BillAPIServer(executor=ThreadPoolExecutor(max_workers=2), **server_kwargs)
+        await server.start('127.0.0.1', 0)
+        try:
+            return await scenario(server)
+        finally:
+            await server.close()
+    return asyncio.run(wrapper())
+
+
+class TestBillAPIServer:
+    """Routing, limits and backpressure"""
+
+    def test_health_and_unknown_route(self):
+        async def scenario(server):
+            health = await _request(server.port, 'GET', '/v1/health')
+            missing = await _request(server.port, 'GET', '/nope')
+            wrong_method = await _request(server.port, 'GET', '/v1/bills')
+            return health, missing, wrong_method
+
+        health, missing, wrong_method = _run(scenario, max_concurrent=2, max_queue=3)
+        assert health[0] == 200
+        assert json.loads(health[2])['capacity'] == 5
+        assert missing[0] == 404
+        assert wrong_method[0] == 405
+
+    def test_upload_limit(self):
+        async def scenario(server):
+            return await _request(server.port, 'POST', '/v1/bills', b'x' * (1024 * 1024 + 1))
+
+        status, _, body = _run(scenario, max_upload_mb=1)
+        assert status == 413
+        assert 'error' in json.loads(body)
+
+    @pytest.mark.parametrize('length', ['abc', '-1'])
+    def test_invalid_content_length(self, length):
+        async def scenario(server):
+            return await _request(server.port, 'POST', '/v1/bills', b'data', {'Content-Length': length})
+
+        status, _, body = _run(scenario)
+        assert status == 400
+        assert json.loads(body)['error'] == "invalid Content-Length"
+
+    def test_queue_full_returns_429(self, monkeypatch):
+        release = threading.Event()
+
+        def slow_render(input_path, work_dir, label, options):
+            release.wait(10)
+            result = Path(work_dir) / 'result.zip'
+            result.write_bytes(b'PK')
+            return str(result), 1, []
+        monkeypatch.setattr(api_server, 'render_upload', slow_render)
+
+        async def scenario(server):
+            first = asyncio.create_task(_request(server.port, 'POST', '/v1/bills', b'data'))
+            while server.health()['in_flight'] < 1:
+                await asyncio.sleep(0.01)
+            rejected = await _request(server.port, 'POST', '/v1/bills', b'data')
+            release.set()
+            return await first, rejected
+
+        accepted, rejected = _run(scenario, max_concurrent=1, max_queue=0)
+        assert accepted[0] == 200
+        assert accepted[2] == b'PK'
+        assert rejected[0] == 429
+        assert rejected[1]['Retry-After'] == '5'
+
+    def test_timeout_keeps_slot_until_worker_finishes(self, monkeypatch, tmp_path):
+        release = threading.Event()
+
+        def slow_render(input_path, work_dir, label, options):
+            release.wait(10)
+            assert Path(input_path).exists()
+            return str(input_path), 1, []
+        monkeypatch.setattr(api_server, 'render_upload', slow_render)
+
+        async def scenario(server):
+            status, _, _ = await _request(server.port, 'POST', '/v1/bills', b'data')
+            # Answered 504, but the worker still runs in the request's folder
+            busy = server.health()['in_flight'], len(list(tmp_path.iterdir()))
+            release.set()
+            while server.health()['in_flight']:
+                await asyncio.sleep(0.01)
+            return status, busy
+
+        status, busy = _run(scenario, request_timeout=0.1, work_dir=str(tmp_path))
+        assert status == 504
+        assert busy == (1, 1)
+        assert not list(tmp_path.iterdir())
+
+    def test_download_name_cannot_inject_headers(self, monkeypatch):
+        def render(input_path, work_dir, label, options):
+            return str(input_path), 1, []
+        monkeypatch.setattr(api_server, 'render_upload', render)
+
+        async def scenario(server):
+            # bill\r\nX-Injected: 1"ब.xlsx
+            name = 'bill%0D%0AX-Injected:%201%22%E0%A4%AC.xlsx'
+            return await _request(server.port, 'POST', f'/v1/bills?filename={name}', b'data')
+
+        status, headers, _ = _run(scenario)
+        assert status == 200
+        assert 'X-Injected' not in headers
+        assert headers['Content-Disposition'] == (
+            'attachment; filename="billX-Injected: 1_.zip"; filename*=UTF-8\'\'billX-Injected%3A%201%E0%A4%AC.zip'
+        )
+
+    def test_generation_failure_is_422(self):
+        async def scenario(server):
+            return await _request(server.port, 'POST', '/v1/bills?filename=bad.xlsx', b'not a workbook')
+
+        status, _, body = _run(scenario)
+        assert status == 422
+        assert 'could not generate' in json.loads(body)['error']
+
+    @pytest.mark.skipif(not WORKBOOK.exists(), reason="sample workbook not available")
+    def test_multipart_upload_streams_package(self):
+        boundary = 'billboundary'
+        body = (
+            f'--{boundary}\r\nContent-Disposition: form-data; name="file"; filename="{WORKBOOK.name}"\r\n'
+            f'Content-Type: application/octet-stream\r\n\r\n'
+        ).encode() + WORKBOOK.read_bytes() + f'\r\n--{boundary}--\r\n'.encode()
+
+        async def scenario(server):
+            return await _request(
+                server.port, 'POST', '/v1/bills?pdf=0', body,
+                {'Content-Type': f'multipart/form-data; boundary={boundary}'}
+            )
+
+        status, headers, payload = _run(scenario)
+        assert status == 200
+        assert headers['Content-Disposition'] == (
+            f'attachment; filename="{WORKBOOK.stem}.zip"; filename*=UTF-8\'\'{WORKBOOK.stem}.zip'
+        )
+        with zipfile.ZipFile(io.BytesIO(payload)) as zf:
+            names = zf.namelist()
+        assert int(headers['X-Documents']) > 0
+        assert any(name.startswith('word/') for name in names)
+        assert not any(name.startswith('pdf/') for name in names)
+
+
+def test_main_requires_api_access(monkeypatch, capsys):
+    monkeypatch.setenv('FEATURE_API_ACCESS', 'false')
+    assert main(['--config', 'config/v01.json']) == 1
+    assert 'API access is disabled' in capsys.readouterr().out
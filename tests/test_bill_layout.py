@@ -0,0 +1,48 @@
+"""
+Unit tests for the layout model shared by the PDF and DOCX renderers
+"""
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from core.generators import bill_layout as layout
+
+
+class TestFirstPage:
+    """Item filtering and totals rows"""
+
+    def test_summary_labels_and_blank_rows_skipped(self):
+        items = [
+            {'serial_no': '1', 'description': 'Wiring', 'unit': 'Mtr', 'quantity': 2, 'rate': 10, 'amount': 20},
+            {'serial_no': '2', 'description': 'Sub-head'},
+            {'description': 'GRAND TOTAL'},
+            {'description': 'Add Tender Premium', 'amount': 5},
+            {'description': ''},
+        ]
+        rows = [cells for _, cells in layout.first_page_items(items)]
+        assert rows == [
+            ['Mtr', '', '2.00', '1', 'Wiring', '10.00', '20.00', '', ''],
+            ['', '', '', '2', 'Sub-head', '', '', '', ''],
+        ]
+
+    def test_first_bill_has_no_previous_payment(self):
+        data = {'title_data': {'Bill Number': 'First'}, 'totals': {'last_bill_amount': 500, 'payable': 100}}
+        rows = layout.first_page_totals(data)
+        assert rows[4][1:4] == ['Less Amount Paid vide Last Bill Rs.', '', '0.00']
+        assert rows[-1][1] == 'Net Payable Amount Rs.'
+
+
+class TestDeviationAndCertificates:
+    """Totals placement and memorandum figures"""
+
+    def test_saving_lands_in_saving_column(self):
+        rows = layout.deviation_totals({'is_saving': True, 'net_difference': 250, 'percentage_deviation': 2.5})
+        overall, percentage = rows[-2][0], rows[-1]
+        assert overall[11] == '250.00' and overall[9] == ''
+        assert percentage == (['', 'Percentage of Saving %'] + [''] * 9 + ['2.50%', ''], True)
+
+    def test_memorandum_cheque_amount(self):
+        rows = layout.memorandum_rows({'payable': 1000, 'extra_items_sum': 234.4, 'total_deductions': 200})
+        assert rows[0][0][6] == '1,234'
+        assert rows[-2] == (['', '(c) By cheque', '', '(c)', '1,034', '', ''], True)
@@ -0,0 +1,91 @@
+"""
+Unit tests for the typed, columnar bill layout
+"""
+import sys
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+import pytest
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from core.generators.base_generator import BaseGenerator
+from core.generators.html_generator import HTMLGenerator
+from core.processors.bill_schema import BillSchema, normalize_bill, normalize_sheet
+from core.processors.excel_processor import ExcelProcessor
+
+WORKBOOK = Path(__file__).parent.parent / 'TEST_INPUT_FILES' / '3rdRunningNoExtra.xlsx'
+
+
+def _sheet() -> pd.DataFrame:
+    return pd.DataFrame({
+        'Item': [1.0, np.nan, 2.0],
+        'Description': ['Cable laying', 'Sub item', None],
+        'Unit': ['Mtr', 'Mtr', 'Each'],
+        'Quantity': [10.0, np.nan, 2.0],
+        'Rate': ['Above', 50, 400.5],
+        'Amount': [0.0, 500.0, 801.0],
+        'BSR': [np.nan, 'B-1', 7],
+    })
+
+
+class TestNormalizeSheet:
+    """Dtypes and schema resolution"""
+
+    def test_typed_columns(self):
+        typed, schema = normalize_sheet(_sheet())
+        assert typed['Quantity'].dtype == 'float64'
+        assert typed['Rate'].dtype == 'float64'
+        assert np.isnan(typed['Rate'].iloc[0])
+        assert isinstance(typed['Unit'].dtype, pd.CategoricalDtype)
+        assert isinstance(typed['Description'].dtype, pd.StringDtype)
+        assert typed['Item'].tolist()[0] == '1.0'
+        assert pd.isna(typed['Item'].iloc[1])
+        assert typed['BSR'].tolist()[2] == '7'
+        assert schema.item == 'Item'
+        assert schema.quantity_upto is None
+        assert schema.units == ('Each', 'Mtr')
+        assert schema.rows == 3
+
+    def test_empty_sheet(self):
+        typed, schema = normalize_sheet(pd.DataFrame())
+        assert typed.empty
+        assert schema.rows == 0
+
+    def test_schema_rows_match_row_wise_conversion(self):
+        raw = _sheet()
+        data = {'bill_quantity_data': raw}
+        slow = list(BaseGenerator(data)._bill_rows(raw, 'bill_quantity_data'))
+        schema = normalize_bill(data)
+        assert isinstance(schema, BillSchema)
+        typed = data['bill_quantity_data']
+        fast = list(BaseGenerator(data)._bill_rows(typed, 'bill_quantity_data'))
+        assert len(fast) == len(slow)
+        for a, b in zip(fast, slow):
+            assert a.keys() == b.keys()
+            for key in a:
+                if pd.isna(b[key]):
+                    assert pd.isna(a[key])
+                elif key in ('item', 'bsr'):
+                    assert a[key] == str(b[key])
+                else:
+                    assert a[key] == b[key]
+
+
+@pytest.mark.skipif(not WORKBOOK.exists(), reason="sample workbook not available")
+class TestColumnarProcessing:
+    """ExcelProcessor(columnar=True) end to end"""
+
+    def test_documents_unchanged(self):
+        plain = ExcelProcessor().process_excel(str(WORKBOOK))
+        typed = ExcelProcessor(columnar=True).process_excel(str(WORKBOOK))
+        assert 'schema' not in plain
+        assert typed['schema'].get('bill_quantity_data').rows == len(typed['bill_quantity_data'])
+        assert HTMLGenerator(typed).generate_all_documents() == HTMLGenerator(plain).generate_all_documents()
+
+    def test_smaller_frames(self):
+        plain = ExcelProcessor().process_excel(str(WORKBOOK), columnar=False)
+        typed = ExcelProcessor().process_excel(str(WORKBOOK), columnar=True)
+        for key in ('work_order_data', 'bill_quantity_data'):
+            assert typed[key].memory_usage(deep=True).sum() < plain[key].memory_usage(deep=True).sum()
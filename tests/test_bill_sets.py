@@ -0,0 +1,108 @@
+"""
+Unit tests for multi-bill workbooks (repeated Title / Bill Quantity sets)
+"""
+import sys
+import types
+from pathlib import Path
+
+import pandas as pd
+import pytest
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from core.batch.job_runner_enterprise import BatchConfig, BatchJobRunner, JobStatus, RetryPolicy
+from core.processors import excel_processor as excel_processor_module
+from core.processors.bill_sets import BillSheetSet, detect_bill_sets, split_sheet_name
+from core.processors.excel_processor import ExcelProcessor
+
+SAMPLE = Path(__file__).parent.parent / 'TEST_INPUT_FILES' / '3rdRunningNoExtra.xlsx'
+
+
+@pytest.fixture
+def multi_bill_workbook(tmp_path):
+    """Sample bill plus two suffixed copies with their own Title and Bill Quantity"""
+    raw = pd.read_excel(SAMPLE, sheet_name=None, header=None)
+    path = tmp_path / 'three_bills.xlsx'
+    with pd.ExcelWriter(path, engine='openpyxl') as writer:
+        for name in ('Title', 'Work Order', 'Bill Quantity'):
+            raw[name].to_excel(writer, sheet_name=name, header=False, index=False)
+        for suffix in ('2', '(RA-3)'):
+            title = raw['Title'].copy()
+            title.iloc[0, 1] = f"Bill {suffix}"
+            title.to_excel(writer, sheet_name=f"Title {suffix}", header=False, index=False)
+            quantities = raw['Bill Quantity'].head(4)
+            quantities.to_excel(writer, sheet_name=f"Bill Quantity {suffix}", header=False, index=False)
+    return path
+
+
+class TestDetectBillSets:
+    """Sheet-name grouping"""
+
+    def test_split_sheet_name(self):
+        assert split_sheet_name('Title') == ('Title', '')
+        assert split_sheet_name('Bill Quantity 2') == ('Bill Quantity', '2')
+        assert split_sheet_name('Title (RA-3)') == ('Title', 'RA-3')
+        assert split_sheet_name('Work Order_B') == ('Work Order', 'B')
+        assert split_sheet_name('Summary') == (None, None)
+
+    def test_groups_by_suffix_with_shared_sheets(self):
+        sheets = ['Title', 'Work Order', 'Bill Quantity', 'Title 2', 'Bill Quantity 2',
+                  'Extra Items 2', 'Title (RA-3)', 'Bill Quantity (RA-3)', 'Title 4']
+        bill_sets = detect_bill_sets(sheets)
+        assert [b.label for b in bill_sets] == ['main', '2', 'RA-3']
+        second = bill_sets[1]
+        assert second.sheet('Title') == 'Title 2'
+        assert second.sheet('Work Order') == 'Work Order'
+        assert second.sheet('Extra Items') == 'Extra Items 2'
+        # 'Title 4' has no Bill Quantity, so it is not a bill
+
+    def test_single_bill_workbook(self):
+        assert detect_bill_sets(['Title', 'Work Order', 'Bill Quantity']) == [BillSheetSet()]
+
+
+class TestIterBills:
+    """Lazy per-bill records from one open workbook"""
+
+    def test_bills_are_lazy_and_share_one_open(self, multi_bill_workbook, monkeypatch):
+        opens = []
+        real_open = excel_processor_module.open_workbook
+
+        def counting_open(file, engine):
+            opens.append(file)
+            return real_open(file, engine)
+
+        monkeypatch.setattr(excel_processor_module, 'open_workbook', counting_open)
+        bills = ExcelProcessor().iter_bills(str(multi_bill_workbook))
+        assert isinstance(bills, types.GeneratorType)
+        assert opens == []
+
+        records = list(bills)
+        assert len(opens) == 1
+        assert [r['id'] for r in records] == ['three_bills#main', 'three_bills#2', 'three_bills#RA-3']
+        assert records[2]['sheets']['Bill Quantity'] == 'Bill Quantity (RA-3)'
+
+    def test_each_bill_matches_its_sheets(self, multi_bill_workbook):
+        main, second, _ = ExcelProcessor().iter_bills(str(multi_bill_workbook))
+        single = ExcelProcessor().process_excel(str(multi_bill_workbook))
+
+        pd.testing.assert_frame_equal(main['data']['bill_quantity_data'], single['bill_quantity_data'])
+        assert main['data']['title_data'] == single['title_data']
+        assert second['data']['title_data'] != single['title_data']
+        assert len(second['data']['bill_quantity_data']) < len(single['bill_quantity_data'])
+        pd.testing.assert_frame_equal(second['data']['work_order_data'], single['work_order_data'])
+
+    def test_feeds_batch_runner(self, multi_bill_workbook, tmp_path):
+        config = BatchConfig(max_workers=2, output_dir=tmp_path / 'batch',
+                             retry_policy=RetryPolicy(max_retries=0))
+        runner = BatchJobRunner(config=config, job_id='multi_bill')
+
+        result = runner.run_batch(
+            ExcelProcessor().iter_bills(str(multi_bill_workbook)),
+            lambda record: {'items': len(record['data']['bill_quantity_data'])}
+        )
+        assert result.status == JobStatus.SUCCESS
+        assert result.total_records == 3
+        assert sorted(r.record_id for r in result.record_results) == \
+            ['three_bills#2', 'three_bills#RA-3', 'three_bills#main']
+        # Record files are written even though inputs hold DataFrames
+        assert (tmp_path / 'batch' / 'success' / 'three_bills#main.json').exists()
@@ -0,0 +1,105 @@
+"""
+Unit tests for the Arrow/Parquet bill folder format
+"""
+import sys
+from datetime import date
+from pathlib import Path
+
+import pandas as pd
+import pytest
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from core.generators.document_generator import DocumentGenerator
+from core.processors.bill_store import (
+    frame_to_table, is_bill_store, load_bill, save_bill, table_to_frame
+)
+from core.processors.excel_processor import ExcelProcessor
+
+SAMPLE = Path(__file__).parent.parent / 'TEST_INPUT_FILES' / '3rdFinalVidExtra.xlsx'
+
+
+def _assert_same_bill(left, right):
+    assert left.keys() == right.keys()
+    for key, value in left.items():
+        if isinstance(value, pd.DataFrame):
+            pd.testing.assert_frame_equal(value, right[key])
+        else:
+            assert value == right[key], key
+
+
+class TestTables:
+    """Frame <-> Arrow table conversion"""
+
+    def test_mixed_object_column_keeps_cell_types(self):
+        index = range(10, 16)
+        df = pd.DataFrame({
+            'Item': pd.Series([1, '1.1', 2.5, None, True, pd.Timestamp('2024-03-15')], index=index, dtype=object),
+            'Rate': [1.0, 2.0, None, 4.0, 5.0, 6.0],
+            3: ['a', 'b', 'c', 'd', 'e', 'f'],
+        }, index=index)
+        restored = table_to_frame(frame_to_table(df))
+        pd.testing.assert_frame_equal(restored, df)
+        assert [type(v) for v in restored['Item']][:5] == [int, str, float, type(None), bool]
+
+    def test_empty_frame(self):
+        pd.testing.assert_frame_equal(table_to_frame(frame_to_table(pd.DataFrame())), pd.DataFrame())
+
+
+class TestBillFolder:
+    """save_bill / load_bill round trips"""
+
+    @pytest.mark.parametrize('table_format', ['arrow', 'parquet'])
+    @pytest.mark.parametrize('columnar', [False, True])
+    def test_round_trip(self, tmp_path, table_format, columnar):
+        data = ExcelProcessor(columnar=columnar).process_excel(str(SAMPLE))
+        folder = save_bill(data, tmp_path / 'bill', table_format=table_format)
+
+        assert is_bill_store(folder)
+        assert (folder / f"bill_quantity_data.{table_format}").exists()
+        _assert_same_bill(data, load_bill(folder))
+
+    def test_mapped_tables_release_their_files(self, tmp_path, monkeypatch):
+        import pyarrow as pa
+        memory_map, sources = pa.memory_map, []
+
+        def recording_memory_map(path, mode='r'):
+            sources.append(memory_map(path, mode))
+            return sources[-1]
+        monkeypatch.setattr(pa, 'memory_map', recording_memory_map)
+
+        folder = save_bill({'bill_quantity_data': pd.DataFrame({'Rate': [1.5, 2.5]})}, tmp_path / 'bill')
+        loaded = load_bill(folder)
+        assert sources and all(source.closed for source in sources)
+        assert loaded['bill_quantity_data']['Rate'].tolist() == [1.5, 2.5]
+
+    def test_title_dates_survive(self, tmp_path):
+        data = {'title_data': {'Name': 'x'}, 'title_dates': {'Date of measurement': date(2024, 3, 15)}}
+        loaded = load_bill(save_bill(data, tmp_path / 'bill'))
+        assert loaded['title_dates'] == {'Date of measurement': date(2024, 3, 15)}
+
+    def test_not_a_bill_folder(self, tmp_path):
+        assert not is_bill_store(tmp_path)
+        (tmp_path / 'bill.json').write_text('{"format": "other"}')
+        with pytest.raises(ValueError):
+            load_bill(tmp_path)
+
+    def test_document_generator_accepts_folder(self, tmp_path):
+        data = ExcelProcessor(columnar=True).process_excel(str(SAMPLE))
+        folder = save_bill(data, tmp_path / 'bill')
+
+        expected = DocumentGenerator(data).generate_all_documents()
+        assert DocumentGenerator(folder).generate_all_documents() == expected
+        assert DocumentGenerator(str(folder)).generate_all_documents() == expected
+
+    def test_batch_runner_saves_bill_folders(self, tmp_path):
+        from core.batch.job_runner_enterprise import BatchConfig, BatchJobRunner
+
+        config = BatchConfig(max_workers=1, save_bills=True, output_dir=tmp_path / 'batch')
+        runner = BatchJobRunner(config=config, job_id='bill_store')
+        records = ExcelProcessor(columnar=True).iter_bills(str(SAMPLE))
+        runner.run_batch(records, lambda record: {'items': len(record['data']['bill_quantity_data'])})
+
+        folder = tmp_path / 'batch' / 'success' / f"{SAMPLE.stem}#main.bill"
+        assert is_bill_store(folder)
+        assert len(load_bill(folder)['bill_quantity_data']) > 0
@@ -0,0 +1,95 @@
+"""
+Unit tests for the single-pass content scanner
+"""
+import io
+import sys
+from pathlib import Path
+
+import openpyxl
+import pytest
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from core.utils.content_scanner import (
+    BLOCKED, HTML, SUSPICIOUS, ContentScanner, ScanRule, default_rules
+)
+from core.utils.security_manager import SecurityConfig, SecurityManager
+
+BLOCKED_PATTERNS = SecurityConfig().blocked_patterns
+PAGE = (b'<html><head><META charset="utf-8"></head><body onload=init()>'
+        b'<SCRIPT src="https://cdn.example/x.js"></script><script>eval (1)</script>'
+        b'<a href="https://example.org">x</a><iframe></iframe></body></html>')
+
+
+def _xlsx(*cells) -> bytes:
+    workbook = openpyxl.Workbook()
+    for row, value in enumerate(cells, 1):
+        workbook.active.cell(row=row, column=1, value=value)
+    buffer = io.BytesIO()
+    workbook.save(buffer)
+    return buffer.getvalue()
+
+
+class TestContentScanner:
+    """Scores, counting rules and chunk boundaries"""
+
+    def test_scores_by_group(self):
+        scan = ContentScanner(default_rules(BLOCKED_PATTERNS, html=True)).scan(PAGE)
+        # two script blocks, onload=, eval\s*\(
+        assert scan.score(BLOCKED) == 40
+        # <script x2, <iframe, <meta (5 each); onload= (10); http link, src=http, href=http (3 each)
+        assert scan.score(HTML) == 39
+        # presence only: <script ('eval (' is not 'eval(')
+        assert scan.score(SUSPICIOUS) == 5
+
+    def test_overlapping_rules_all_count(self):
+        scan = ContentScanner(default_rules([])).scan(b'x = shell_exec($cmd)')
+        names = {rule.name for rule, _ in scan.matches(SUSPICIOUS)}
+        assert names == {'shell_exec', 'exec('}
+
+    @pytest.mark.parametrize('chunk_size', [1, 3, 7, 64])
+    def test_matches_across_chunk_boundaries(self, chunk_size):
+        whole = ContentScanner(default_rules(BLOCKED_PATTERNS, html=True)).scan(PAGE * 3)
+        chunked = ContentScanner(default_rules(BLOCKED_PATTERNS, html=True), chunk_size=chunk_size).scan(PAGE * 3)
+        assert dict(chunked.counts) == dict(whole.counts)
+
+    def test_rule_without_literal_prefix(self):
+        rules = [ScanRule('digits', BLOCKED, r'[0-9]{3}', 1, count=True)]
+        # Non-overlapping like findall: '345', '789'
+        assert ContentScanner(rules, chunk_size=2).scan(b'12 3456 7890').score(BLOCKED) == 2
+
+
+class TestOfficeContainers:
+    """.xlsx files are scanned through their XML text"""
+
+    def test_cell_text_is_scanned(self):
+        scan = ContentScanner(default_rules(BLOCKED_PATTERNS)).scan(_xlsx('<script>alert(1)</script>'), '.xlsx')
+        assert scan.score(BLOCKED) == 10
+        assert scan.score(SUSPICIOUS) == 5
+
+    def test_markup_is_not_content(self):
+        # openpyxl writes fullCalcOnLoad="1", which must not count as 'onload='
+        scan = ContentScanner(default_rules(BLOCKED_PATTERNS)).scan(_xlsx('Item', 12.5), '.xlsx')
+        assert dict((rule.name, count) for rule, count in scan.counts.items() if count) == {}
+
+    def test_sample_workbook_is_clean(self):
+        sample = Path(__file__).parent.parent / 'TEST_INPUT_FILES' / '3rdRunningNoExtra.xlsx'
+        result = SecurityManager().validate_file(sample)
+        assert result.is_valid
+        assert result.risk_score == 0.0
+
+
+class TestSecurityManagerContent:
+    """_validate_content decisions"""
+
+    def test_risky_html_rejected(self):
+        ok, message, _ = SecurityManager()._validate_content(PAGE, '.html')
+        assert not ok
+        assert message == "HTML content too risky: 39.0"
+
+    def test_plain_text_accepted(self):
+        assert SecurityManager()._validate_content(b'Bill for work done', '.txt') == (True, "", 0.0)
+
+    def test_html_content_helper(self):
+        ok, score, _ = SecurityManager()._validate_html_content('<p><a href="http://x">x</a></p>')
+        assert ok and score == 6.0
@@ -0,0 +1,88 @@
+"""
+Unit tests for the template-data DOCX builder
+"""
+import io
+import sys
+from pathlib import Path
+
+import pytest
+from docx import Document
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from core.generators.docx_builder import DocxBuilder
+from core.generators.html_generator import HTMLGenerator
+from core.generators.doc_generator import DOCGenerator
+from core.generators.word_generator import WordGenerator
+
+
+def _open(docx_bytes: bytes):
+    return Document(io.BytesIO(docx_bytes))
+
+
+class TestDocxBuilder:
+    """Tests for DocxBuilder"""
+
+    @pytest.fixture(autouse=True)
+    def _setup(self, bill_data_factory):
+        self.bill_data = bill_data_factory
+        self.builder = DocxBuilder(margin_mm=10)
+        self.template_data = HTMLGenerator(self.bill_data()).template_data
+
+    def test_first_page_rows_written_from_records(self):
+        """Items table has header + one row per item + six totals rows"""
+        doc = _open(self.builder.render('First Page Summary', self.template_data))
+        items_table = doc.tables[-1]
+        assert len(items_table.rows) == 1 + 5 + 6
+        assert items_table.rows[1].cells[4].text == 'Item <0> & description'
+        assert items_table.rows[1].cells[6].text == '100.00'
+
+    def test_header_row_repeats(self):
+        """Header rows are flagged to repeat on every page"""
+        doc = _open(self.builder.render('Deviation Statement', self.template_data))
+        first_row = doc.tables[0].rows[0]._tr
+        assert first_row.trPr is not None
+        assert first_row.trPr.xpath('./w:tblHeader')
+
+    def test_deviation_is_landscape(self):
+        """Deviation Statement section is landscape"""
+        doc = _open(self.builder.render('Deviation Statement', self.template_data))
+        section = doc.sections[0]
+        assert section.page_width > section.page_height
+
+    def test_unsupported_document_raises(self):
+        """Unknown documents are rejected"""
+        with pytest.raises(ValueError):
+            self.builder.render('Unknown Document', self.template_data)
+
+    def test_skeleton_built_once_per_document_type(self):
+        """Skeleton bytes are cached and reused across builders and bills"""
+        self.builder.render('Certificate III', self.template_data)
+        skeleton = DocxBuilder._skeletons[('Certificate III', 10)]
+        DocxBuilder(margin_mm=10).render('Certificate III', HTMLGenerator(self.bill_data(3)).template_data)
+        assert DocxBuilder._skeletons[('Certificate III', 10)] is skeleton
+
+    def test_skeleton_keeps_only_used_styles(self):
+        """Stock template styles are trimmed; title style is shared"""
+        doc = _open(self.builder.render('Deviation Statement', self.template_data))
+        style_names = {style.name for style in doc.styles}
+        assert 'Bill Title' in style_names
+        assert 'Heading 1' not in style_names
+        assert doc.paragraphs[0].style.name == 'Bill Title'
+
+
+class TestWordAndDocGenerators:
+    """Both Word entry points go through the builder"""
+
+    def test_word_generator_uses_template_data(self, bill_data_factory):
+        """HTML is not parsed when template data is supplied"""
+        template_data = HTMLGenerator(bill_data_factory()).template_data
+        word_gen = WordGenerator()
+        docs = word_gen.generate_all_docx({'Certificate III': '<html></html>'}, template_data=template_data)
+        assert len(_open(docs['Certificate III']).tables) == 1
+
+    def test_doc_generator_skips_extra_items_without_data(self, bill_data_factory):
+        """Extra Items document only generated when extra items exist"""
+        docs = DOCGenerator(bill_data_factory()).generate_doc_documents()
+        assert 'Extra Items Statement.docx' not in docs
+        assert 'First Page Summary.docx' in docs
@@ -0,0 +1,48 @@
+"""
+Unit tests for the bounded download manager
+"""
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from core.utils.download_manager import EnhancedDownloadManager, DownloadCategory, FileType
+
+
+class TestEnhancedDownloadManager:
+    """Tests for EnhancedDownloadManager"""
+
+    def test_contents_spill_above_threshold(self):
+        """Oldest contents move to disk; all items stay readable"""
+        manager = EnhancedDownloadManager(memory_threshold_mb=0.1)
+        payloads = [bytes([i]) * 40_000 for i in range(6)]
+        for idx, payload in enumerate(payloads):
+            manager.add_pdf_document(f"bill_{idx}.pdf", payload)
+
+        stats = manager.get_statistics()
+        assert stats['memory_bytes'] <= 0.1 * 1024 * 1024
+        assert stats['spilled_bytes'] == 40_000 * 4
+        assert not manager.get_all_items()[0].in_memory
+        assert manager.get_all_items()[-1].in_memory
+        assert [item.content for item in manager.get_all_items()] == payloads
+
+    def test_indexes_match_items(self):
+        """Category/type views and statistics come from the incremental indexes"""
+        manager = EnhancedDownloadManager()
+        manager.add_html_document('a.html', '<p>a</p>')
+        manager.add_pdf_document('a.pdf', b'%PDF')
+        manager.add_excel_file('a.xlsm', b'PK')
+        manager.add_item('all.zip', b'PK', FileType.ZIP)
+
+        stats = manager.get_statistics()
+        assert stats['total_items'] == 4
+        assert stats['total_size_bytes'] == 8 + 4 + 2 + 2
+        assert stats['categories'][DownloadCategory.GENERAL.value] == 1
+        assert [i.name for i in manager.get_items_by_filter(category=DownloadCategory.EXCEL_FILES)] == ['a.xlsm']
+        assert [i.name for i in manager.get_items_by_filter(file_type=FileType.PDF)] == ['a.pdf']
+        assert manager.get_items_by_filter(DownloadCategory.PDF_DOCUMENTS, FileType.HTML) == []
+        assert set(manager.get_items_by_type()) == {FileType.HTML, FileType.PDF, FileType.XLSM, FileType.ZIP}
+
+        manager.clear_items()
+        assert manager.get_statistics()['total_items'] == 0
+        assert manager.get_items_by_category() == {}
@@ -0,0 +1,73 @@
+"""
+Unit tests for Excel engine selection and calamine/openpyxl parity
+"""
+import io
+import sys
+from pathlib import Path
+
+import pandas as pd
+import pytest
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from core.processors import excel_engines
+from core.processors.excel_engines import engine_candidates, open_workbook, workbook_kind
+from core.processors.excel_processor import ExcelProcessor
+
+INPUT_DIR = Path(__file__).parent.parent / 'TEST_INPUT_FILES'
+WORKBOOKS = sorted(INPUT_DIR.glob('*.xlsx')) + sorted(INPUT_DIR.glob('*.xlsm'))
+SAMPLE = INPUT_DIR / '3rdRunningNoExtra.xlsx'
+
+
+def _assert_same(left, right):
+    assert left.keys() == right.keys()
+    for key, value in left.items():
+        if isinstance(value, pd.DataFrame):
+            pd.testing.assert_frame_equal(value, right[key])
+        else:
+            assert value == right[key], key
+
+
+class TestEngineSelection:
+    """Candidate ordering and fallback"""
+
+    def test_workbook_kind(self):
+        assert workbook_kind('bill.xlsm') == 'xlsx'
+        assert workbook_kind('bill.XLS') == 'xls'
+        assert workbook_kind(None, head=b'PK\x03\x04') == 'xlsx'
+        assert workbook_kind(None, head=b'\xd0\xcf\x11\xe0') == 'xls'
+
+    def test_candidates_prefer_calamine(self, monkeypatch):
+        monkeypatch.setattr(excel_engines, 'available_engines', lambda: ['calamine', 'openpyxl'])
+        assert engine_candidates('xlsx') == ['calamine', 'openpyxl']
+        assert engine_candidates('xlsx', 'openpyxl') == ['openpyxl']
+        monkeypatch.setattr(excel_engines, 'available_engines', lambda: ['openpyxl'])
+        assert engine_candidates('xlsx') == ['openpyxl']
+        assert engine_candidates('xls') == ['xlrd']
+
+    @pytest.mark.skipif(not SAMPLE.exists(), reason="sample workbook not available")
+    def test_falls_back_when_fast_engine_fails(self, monkeypatch):
+        real_excel_file = pd.ExcelFile
+
+        def picky_excel_file(source, engine=None):
+            if engine == 'calamine':
+                raise ValueError("unsupported workbook")
+            return real_excel_file(source, engine=engine)
+
+        monkeypatch.setattr(excel_engines, 'available_engines', lambda: ['calamine', 'openpyxl'])
+        monkeypatch.setattr(excel_engines.pd, 'ExcelFile', picky_excel_file)
+        upload = io.BytesIO(SAMPLE.read_bytes())
+        workbook, engine = open_workbook(upload)
+        assert engine == 'openpyxl'
+        assert 'Title' in workbook.sheet_names
+
+
+@pytest.mark.skipif(not excel_engines.is_available('python_calamine'), reason="python-calamine not installed")
+@pytest.mark.parametrize('workbook', WORKBOOKS, ids=lambda p: p.name)
+def test_calamine_matches_openpyxl(workbook):
+    fast = ExcelProcessor(engine='calamine')
+    slow = ExcelProcessor(engine='openpyxl')
+    fast_data = fast.process_excel(str(workbook))
+    slow_data = slow.process_excel(str(workbook))
+    assert (fast.last_engine, slow.last_engine) == ('calamine', 'openpyxl')
+    _assert_same(fast_data, slow_data)
@@ -60,7 +60,26 @@ class TestExcelValidator(unittest.TestCase):
         """Test sanitization of NaN values."""
         result = ExcelValidator.sanitize_string(pd.NA)
         self.assertEqual(result, "")
-    
+
+    def test_sanitize_series_matches_sanitize_string(self):
+        """Test vectorised sanitization agrees with the per-cell version."""
+        values = [1, '2', 3.0, None, '=5', -1, '@a', '+', '|p', '%d', '', ' =x', 'abc', pd.NA]
+        # Duplicate labels must not misalign the result
+        series = pd.Series(values * 2, index=[0, 1] * len(values), dtype=object)
+
+        result = ExcelValidator.sanitize_series(series)
+
+        self.assertEqual(result.tolist(), [ExcelValidator.sanitize_string(v) for v in series])
+        self.assertTrue(result.index.equals(series.index))
+
+    def test_sanitize_series_string_dtype(self):
+        """Test sanitization of pandas string-dtype columns."""
+        series = pd.Series(['=cmd', 'safe', None], dtype='string')
+
+        result = ExcelValidator.sanitize_series(series)
+
+        self.assertEqual(result.tolist(), ["'=cmd", 'safe', ''])
+
     def test_validate_sheet_schema_empty_dataframe(self):
         """Test schema validation with empty DataFrame."""
         df = pd.DataFrame()
@@ -336,6 +355,123 @@ class TestEdgeCases(unittest.TestCase):
         self.assertEqual(len(df_clean), 5)
 
 
+SAMPLE_WORKBOOK = Path(__file__).parent.parent / 'TEST_INPUT_FILES' / '3rdRunningNoExtra.xlsx'
+
+
+@unittest.skipUnless(SAMPLE_WORKBOOK.exists(), "sample workbook not available")
+class TestSingleWorkbookOpen(unittest.TestCase):
+    """Test that process_file reads every sheet from one workbook handle."""
+
+    def test_workbook_opened_once(self):
+        """Test the file is opened once and no sheet re-reads the path."""
+        from core.processors import excel_processor_enterprise as enterprise
+
+        with patch.object(enterprise, 'open_workbook', wraps=enterprise.open_workbook) as opener, \
+                patch('pandas.read_excel', side_effect=AssertionError("re-opened workbook")):
+            result = ExcelProcessor().process_file(SAMPLE_WORKBOOK)
+
+        self.assertTrue(result.success, result.errors)
+        opener.assert_called_once()
+        self.assertEqual(list(result.data), pd.ExcelFile(SAMPLE_WORKBOOK).sheet_names)
+        self.assertIn('engine', result.metadata)
+
+    def test_parallel_matches_sequential(self):
+        """Test parallel sheet processing gives the same result in sheet order."""
+        sequential = ExcelProcessor().process_file(SAMPLE_WORKBOOK, sheet_names=['Title', 'Missing', 'Work Order', 'Bill Quantity'])
+        parallel = ExcelProcessor(max_workers=3).process_file(SAMPLE_WORKBOOK, sheet_names=['Title', 'Missing', 'Work Order', 'Bill Quantity'])
+
+        self.assertEqual(list(parallel.data), ['Title', 'Work Order', 'Bill Quantity'])
+        self.assertEqual(parallel.warnings, sequential.warnings)
+        for sheet_name, df in sequential.data.items():
+            pd.testing.assert_frame_equal(parallel.data[sheet_name], df)
+
+    def test_single_chunk_stream_matches_whole_sheet(self):
+        """Test a stream that fits one chunk equals process_file."""
+        whole = ExcelProcessor().process_file(SAMPLE_WORKBOOK).data
+        chunks = list(ExcelProcessor(chunk_size=1000).stream_file(SAMPLE_WORKBOOK))
+
+        self.assertEqual([c.sheet_name for c in chunks], ['Work Order', 'Bill Quantity'])
+        for chunk in chunks:
+            pd.testing.assert_frame_equal(chunk.data, whole[chunk.sheet_name])
+
+
+class TestStreaming(unittest.TestCase):
+    """Test chunked streaming of large sheets."""
+
+    def setUp(self):
+        import tempfile
+        import openpyxl
+
+        self.tmp = tempfile.TemporaryDirectory()
+        self.path = Path(self.tmp.name) / 'measurements.xlsx'
+        workbook = openpyxl.Workbook()
+        sheet = workbook.active
+        sheet.title = 'Bill Quantity'
+        sheet.append(['Item No.', 'Description', None, 'Quantity'])
+        for i in range(25):
+            sheet.append([f'1.{i}', '@SUM(A1)' if i == 3 else f'Entry {i}', None, float(i)])
+        sheet.append([])
+        sheet.append(['2.0', 'Last entry', None, 99.0])
+        workbook.save(self.path)
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def test_chunks_are_bounded_and_cleaned(self):
+        """Test chunk sizes, row numbers, sanitization and blank rows."""
+        processor = ExcelProcessor(chunk_size=10)
+
+        chunks = list(processor.stream_file(self.path, sheet_names=['Bill Quantity', 'Missing']))
+
+        self.assertEqual([len(c.data) for c in chunks], [10, 10, 6])
+        self.assertEqual([c.start_row for c in chunks], [2, 12, 22])
+        self.assertEqual([c.index for c in chunks], [0, 1, 2])
+        combined = pd.concat([c.data for c in chunks])
+        # Empty columns are kept so every chunk has the same header
+        self.assertEqual(list(combined.columns), ['Item No.', 'Description', 'Unnamed: 2', 'Quantity'])
+        self.assertEqual(combined['Description'].iloc[3], "'@SUM(A1)")
+        self.assertEqual(combined['Item No.'].iloc[-1], '2.0')
+        self.assertTrue(combined.index.is_unique)
+
+    def test_schema_checked_per_chunk_and_in_total(self):
+        """Test required columns, row limits and warnings."""
+        processor = ExcelProcessor(chunk_size=10)
+        schema = SheetSchema(name='Bill Quantity', required_columns=['Item No.'], max_rows=15)
+
+        chunks = list(processor.stream_sheet(self.path, 'Bill Quantity', schema))
+        self.assertEqual([len(c.warnings) for c in chunks], [0, 1, 0])
+
+        missing = SheetSchema(name='Bill Quantity', required_columns=['Rate'])
+        with self.assertRaises(ValidationError):
+            next(processor.stream_sheet(self.path, 'Bill Quantity', missing))
+
+        too_few = SheetSchema(name='Bill Quantity', required_columns=[], min_rows=100)
+        with self.assertRaises(ValidationError):
+            list(processor.stream_sheet(self.path, 'Bill Quantity', too_few))
+
+    def test_legacy_xls_missing_sheet_is_skipped(self):
+        """Test .xls sheets open through open_workbook and missing ones are skipped."""
+        legacy = Path(self.tmp.name) / 'legacy.xls'
+        legacy.write_bytes(self.path.read_bytes())
+        opened = []
+
+        def fake_open_workbook(path):
+            opened.append(path)
+            return pd.ExcelFile(self.path, engine='openpyxl'), 'openpyxl'
+
+        processor = ExcelProcessor(chunk_size=10)
+        with patch('core.processors.excel_processor_enterprise.open_workbook', fake_open_workbook):
+            self.assertEqual(list(processor._iter_row_chunks(legacy, 'Missing')), [])
+            chunks = list(processor._iter_row_chunks(legacy, 'Bill Quantity'))
+        self.assertEqual(opened, [str(legacy)] * 2)
+        self.assertEqual([start for start, _ in chunks], [2, 12, 22])
+
+    def test_invalid_file_raises(self):
+        """Test streaming a missing file fails validation."""
+        with self.assertRaises(ValidationError):
+            list(ExcelProcessor().stream_file(Path(self.tmp.name) / 'missing.xlsx'))
+
+
 # Pytest fixtures
 @pytest.fixture
 def sample_dataframe():
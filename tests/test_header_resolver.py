@@ -0,0 +1,80 @@
+"""
+Unit tests for the cached header resolver
+"""
+import io
+import sys
+from pathlib import Path
+
+import pandas as pd
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from core.processors import header_resolver
+from core.processors.excel_processor import ExcelProcessor
+from core.processors.header_resolver import normalize_header, resolve_headers
+
+REQUIRED = ['Item No.', 'Description', 'Unit', 'Quantity', 'Rate', 'Amount', 'BSR']
+MAPPING = ExcelProcessor().column_mappings['Bill Quantity']
+
+
+class TestResolveHeaders:
+    """Scoring, renames and reporting"""
+
+    def setup_method(self):
+        header_resolver.clear_cache()
+
+    def test_normalize(self):
+        assert normalize_header('Item No.') == 'item no'
+        assert normalize_header(' QTY. ') == 'qty'
+        assert normalize_header(42) == '42'
+
+    def test_standard_layout_keeps_names(self):
+        resolution = resolve_headers(['Item', 'Description', 'Unit', 'Quantity', 'Rate', 'Amount', 'BSR'], REQUIRED, MAPPING)
+        assert resolution.columns['Item No.'] == 'Item'
+        assert resolution.renames == {}
+        assert resolution.missing == ()
+        assert resolution.ambiguous == {}
+
+    def test_variants_renamed_to_standard_names(self):
+        headers = ['S. No.', 'Particulars', 'unit', 'Qty.', 'Rate (Rs.)', 'Unnamed: 5']
+        resolution = resolve_headers(headers, REQUIRED, MAPPING)
+        assert resolution.renames == {
+            'S. No.': 'Item', 'Particulars': 'Description', 'unit': 'Unit', 'Qty.': 'Quantity', 'Rate (Rs.)': 'Rate',
+        }
+        assert resolution.missing == ('Amount', 'BSR')
+
+    def test_ties_are_reported(self):
+        resolution = resolve_headers(['Item', 'Quantity Since', 'Quantity Upto'], ['Item No.', 'Quantity'], MAPPING)
+        assert resolution.ambiguous == {'Quantity': ('Quantity Since', 'Quantity Upto')}
+        assert resolution.columns['Quantity'] == 'Quantity Since'
+
+    def test_exact_match_beats_partial(self):
+        resolution = resolve_headers(['Unit Rate', 'Unit', 'Rate'], ['Unit', 'Rate'], MAPPING)
+        assert resolution.columns == {'Unit': 'Unit', 'Rate': 'Rate'}
+        assert resolution.ambiguous == {}
+
+    def test_repeat_layout_hits_cache(self):
+        headers = ['Item', 'Description', 'Quantity']
+        first = resolve_headers(headers, REQUIRED, MAPPING)
+        second = resolve_headers(list(headers), REQUIRED, MAPPING)
+        assert second is first
+        assert header_resolver.cache_info().hits == 1
+
+
+def test_processor_reads_variant_layout_once(capsys):
+    buffer = io.BytesIO()
+    with pd.ExcelWriter(buffer, engine='openpyxl') as writer:
+        pd.DataFrame({'Name of Work ;-': ['Repair']}).to_excel(writer, sheet_name='Title', index=False)
+        pd.DataFrame({
+            'Item No.': ['1', '2'], 'Particulars': ['Cable', 'Switch'], 'Unit': ['Mtr', 'Each'],
+            'Qty.': [10.0, 2.0], 'Rate': [50.0, 400.0], 'Remarks': ['x', 'y'],
+        }).to_excel(writer, sheet_name='Bill Quantity', index=False)
+    buffer.seek(0)
+
+    data = ExcelProcessor().process_excel(buffer)
+
+    bill = data['bill_quantity_data']
+    assert list(bill.columns) == ['Item No.', 'Description', 'Unit', 'Quantity', 'Rate']
+    assert bill['Quantity'].tolist() == [10.0, 2.0]
+    assert data['header_resolution']['Bill Quantity']['missing'] == ['Amount', 'BSR']
+    assert "no column for: Amount, BSR" in capsys.readouterr().out
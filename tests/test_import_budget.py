@@ -0,0 +1,90 @@
+"""
+Import-time budget for the core package and the CLI
+Runs `python -X importtime` in a subprocess so every run starts cold. The
+budget is which modules load, not milliseconds: wall-clock limits fail on
+slow or busy CI machines without any code change.
+"""
+import subprocess
+import sys
+from pathlib import Path
+
+import pytest
+
+PROJECT_ROOT = Path(__file__).parent.parent
+
+sys.path.insert(0, str(PROJECT_ROOT))
+
+from core.utils.lazy_imports import is_available, lazy_import
+
+HEAVY_MODULES = {'pandas', 'numpy', 'openpyxl', 'docx', 'bs4', 'reportlab', 'weasyprint', 'magic', 'psutil'}
+
+
+def _importtime(*args: str, cwd: Path = PROJECT_ROOT) -> dict:
+    """
+    Cumulative import time (µs) per module for a cold interpreter
+
+    Nested imports are keyed with a leading '.' per level, so top-level
+    entries (whose times already include their children) can be summed.
+    """
+    completed = subprocess.run(
+        [sys.executable, '-X', 'importtime', *args],
+        cwd=cwd, capture_output=True, text=True, timeout=120
+    )
+    assert completed.returncode == 0, completed.stderr[-2000:]
+    timings = {}
+    for line in completed.stderr.splitlines():
+        if not line.startswith('import time:') or 'cumulative' in line:
+            continue
+        _self_us, cumulative_us, module = line[len('import time:'):].split('|')
+        # Nesting is shown by two extra spaces per level after the separator
+        depth = (len(module) - len(module.lstrip()) - 1) // 2
+        timings['.' * depth + module.strip()] = int(cumulative_us)
+    return timings
+
+
+def _loaded(timings: dict) -> set:
+    """Top-level package names of every imported module"""
+    return {name.lstrip('.').split('.')[0] for name in timings}
+
+
+class TestImportBudget:
+    """Cold import costs stay within budget"""
+
+    def test_import_core(self):
+        timings = _importtime('-c', 'import core')
+        assert not (_loaded(timings) & HEAVY_MODULES)
+
+    def test_import_generators_is_lazy(self):
+        timings = _importtime('-c', 'import core.generators')
+        assert not (_loaded(timings) & HEAVY_MODULES)
+
+    def test_html_generation_skips_docx_and_pdf_stacks(self):
+        timings = _importtime('-c', 'from core.generators import DocumentGenerator')
+        assert not (_loaded(timings) & {'docx', 'bs4', 'reportlab', 'weasyprint'})
+
+    def test_optional_dependencies_not_loaded_at_import(self):
+        timings = _importtime('-c', 'import core.utils.security_manager, core.utils.optimized_zip_processor')
+        assert not (_loaded(timings) & {'magic', 'psutil'})
+
+    def test_cli_help(self, tmp_path):
+        pytest.importorskip('click')
+        # Run from a scratch directory: the CLI logger creates logs/ in the cwd
+        timings = _importtime(str(PROJECT_ROOT / 'cli.py'), '--help', cwd=tmp_path)
+        assert not (_loaded(timings) & HEAVY_MODULES)
+
+
+class TestLazyImport:
+    """LazyModule proxies"""
+
+    def test_loads_on_first_attribute(self):
+        module = lazy_import('json')
+        assert 'not loaded' in repr(module)
+        assert module.dumps([1]) == '[1]'
+        assert 'not loaded' not in repr(module)
+
+    def test_missing_module_fails_at_use(self):
+        module = lazy_import('no_such_module_for_tests', 'pip install it')
+        with pytest.raises(ImportError, match='pip install it'):
+            module.anything
+        assert not is_available('no_such_module_for_tests')
+        assert is_available('json')
@@ -0,0 +1,154 @@
+"""
+Unit tests for the SQLite-backed background job queue
+"""
+import sys
+import zipfile
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from core.batch.job_queue import (
+    PARSED_BILL_DIR, JobQueue, _load_job_input, _update_job, build_package, run_generation_job
+)
+from core.batch.job_runner_enterprise import JobStatus
+
+WORKBOOK = Path(__file__).parent.parent / 'TEST_INPUT_FILES' / '3rdRunningNoExtra.xlsx'
+
+
+class TestJobQueueStore:
+    """Queue bookkeeping without starting workers"""
+
+    def setup_method(self):
+        self.queue = None
+
+    def teardown_method(self):
+        if self.queue:
+            self.queue.shutdown()
+
+    def _queue(self, tmp_path, monkeypatch):
+        # Keep the dispatcher from claiming jobs so the rows can be inspected
+        monkeypatch.setattr(JobQueue, 'start', lambda self: None)
+        self.queue = JobQueue(tmp_path / 'queue', max_workers=1)
+        return self.queue
+
+    def test_submit_persists_pending_job(self, tmp_path, monkeypatch):
+        queue = self._queue(tmp_path, monkeypatch)
+        first = queue.submit_workbook(b'PK', 'bill_a.xlsx', {'pdf': False})
+        second = queue.submit_data({'title_data': {}}, 'bill_b')
+
+        job = queue.get(first)
+        assert job.status == JobStatus.PENDING
+        assert job.label == 'bill_a'
+        assert job.options == {'pdf': False}
+        assert Path(job.input_path).read_bytes() == b'PK'
+        assert queue.queue_position(second) == 1
+
+        # A second queue on the same database sees the same jobs
+        assert JobQueue(tmp_path / 'queue').get(second).kind == 'data'
+
+    def test_claim_is_fifo_and_exclusive(self, tmp_path, monkeypatch):
+        queue = self._queue(tmp_path, monkeypatch)
+        ids = [queue.submit_data({}, f'bill_{idx}') for idx in range(3)]
+        assert queue._claim_next() == ids[0]
+        assert queue._claim_next() == ids[1]
+        assert queue.get(ids[0]).status == JobStatus.RUNNING
+        assert queue.counts() == {'running': 2, 'pending': 1}
+
+    def test_cancel_only_pending(self, tmp_path, monkeypatch):
+        queue = self._queue(tmp_path, monkeypatch)
+        running, pending = queue.submit_data({}, 'a'), queue.submit_data({}, 'b')
+        queue._claim_next()
+        assert not queue.cancel(running)
+        assert queue.cancel(pending)
+        assert queue.get(pending).status == JobStatus.CANCELLED
+
+    def test_interrupted_jobs_are_requeued(self, tmp_path, monkeypatch):
+        queue = self._queue(tmp_path, monkeypatch)
+        job_id = queue.submit_data({}, 'a')
+        queue._claim_next()
+
+        # Another server process must not take a job whose lease is live
+        other = JobQueue(tmp_path / 'queue')
+        assert other._recover_interrupted() == 0
+        assert queue.get(job_id).status == JobStatus.RUNNING
+
+        _update_job(queue.db_path, job_id, lease_until=0)
+        assert other._recover_interrupted() == 1
+        assert queue.get(job_id).status == JobStatus.PENDING
+
+    def test_purge_finished(self, tmp_path, monkeypatch):
+        queue = self._queue(tmp_path, monkeypatch)
+        job_id = queue.submit_data({}, 'a')
+        queue.cancel(job_id)
+        job_dir = Path(queue.get(job_id).job_dir)
+        assert queue.purge_finished(max_age_hours=0) == 1
+        assert queue.get(job_id) is None
+        assert not job_dir.exists()
+
+
+@pytest.mark.skipif(not WORKBOOK.exists(), reason="sample workbook not available")
+class TestJobExecution:
+    """Jobs produce artefacts and a result ZIP"""
+
+    def test_run_generation_job_in_process(self, tmp_path, monkeypatch):
+        monkeypatch.setattr(JobQueue, 'start', lambda self: None)
+        queue = JobQueue(tmp_path / 'queue')
+        job_id = queue.submit_workbook(WORKBOOK.read_bytes(), WORKBOOK.name, {'pdf': False})
+        queue._claim_next()
+
+        assert run_generation_job(str(queue.db_path), job_id) == 'success'
+        job = queue.get(job_id)
+        assert job.progress == 1.0
+        with zipfile.ZipFile(job.result_path) as zf:
+            names = zf.namelist()
+        assert any(name.startswith('html/') for name in names)
+        assert any(name.startswith('word/') for name in names)
+        assert not any(name.startswith('pdf/') for name in names)
+
+    def test_rerun_renders_from_saved_bill(self, tmp_path, monkeypatch):
+        monkeypatch.setattr(JobQueue, 'start', lambda self: None)
+        queue = JobQueue(tmp_path / 'queue')
+        job_id = queue.submit_workbook(WORKBOOK.read_bytes(), WORKBOOK.name, {'pdf': False, 'docx': False})
+        queue._claim_next()
+        assert run_generation_job(str(queue.db_path), job_id) == 'success'
+
+        job = queue.get(job_id)
+        assert (Path(job.job_dir) / PARSED_BILL_DIR / 'bill.json').exists()
+
+        def no_excel(*args, **kwargs):
+            raise AssertionError("workbook parsed again")
+
+        monkeypatch.setattr('core.processors.excel_processor.ExcelProcessor.process_excel', no_excel)
+        data = _load_job_input('workbook', Path(job.input_path))
+        assert not data['bill_quantity_data'].empty
+        assert data['schema'] is not None
+
+    def test_one_shot_package_keeps_no_bill(self, tmp_path):
+        input_path = tmp_path / 'input.xlsx'
+        input_path.write_bytes(WORKBOOK.read_bytes())
+        build_package('workbook', input_path, tmp_path, 'bill', {'pdf': False, 'docx': False})
+        assert not (tmp_path / PARSED_BILL_DIR).exists()
+
+    def test_bad_input_marks_job_failed(self, tmp_path, monkeypatch):
+        monkeypatch.setattr(JobQueue, 'start', lambda self: None)
+        queue = JobQueue(tmp_path / 'queue')
+        job_id = queue.submit_workbook(b'not a workbook', 'broken.xlsx')
+        queue._claim_next()
+
+        assert run_generation_job(str(queue.db_path), job_id) == 'failed'
+        assert queue.get(job_id).error
+
+    def test_worker_process_runs_job(self, tmp_path):
+        """End to end through the dispatcher and a spawned worker process"""
+        queue = JobQueue(tmp_path / 'queue', max_workers=1)
+        try:
+            job_id = queue.submit_workbook(
+                WORKBOOK.read_bytes(), WORKBOOK.name, {'pdf': False, 'docx': False}
+            )
+            job = queue.wait(job_id, timeout=120)
+        finally:
+            queue.shutdown()
+        assert job.status == JobStatus.SUCCESS
+        assert job.artefacts()
@@ -0,0 +1,64 @@
+"""
+Unit tests for OutputManager deduplicated storage
+"""
+import os
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from core.utils.output_manager import OutputManager
+
+
+class TestOutputDedup:
+    """Identical outputs are stored once under OUTPUT/.blobs"""
+
+    def test_identical_files_share_storage(self, tmp_path):
+        manager = OutputManager(base_output_dir=str(tmp_path / 'OUTPUT'))
+        certificate = b'%PDF-1.4 certificate' * 1000
+
+        first = manager.set_source_file('bill_1')
+        manager.save_file(certificate, 'Certificate II', 'pdf')
+        manager.save_text_file('<p>1</p>', 'Note', 'html')
+        second = first.parent / 'bill_2_x'
+        second.mkdir()
+        manager.save_file(certificate, 'Certificate II', 'pdf', folder=second)
+
+        a = (first / 'Certificate II.pdf').stat()
+        b = (second / 'Certificate II.pdf').stat()
+        assert (a.st_ino, a.st_dev) == (b.st_ino, b.st_dev)
+        assert manager.get_folder_size() == len(certificate) + len(b'<p>1</p>')
+        assert manager.get_dedup_stats()['saved_bytes'] == len(certificate)
+
+    def test_clean_old_files_keeps_shared_blobs(self, tmp_path):
+        manager = OutputManager(base_output_dir=str(tmp_path / 'OUTPUT'))
+        certificate = b'%PDF-1.4 certificate' * 1000
+        base = tmp_path / 'OUTPUT'
+
+        bill = base / 'bill_old'
+        bill.mkdir()
+        manager.save_file(certificate, 'Certificate II', 'pdf', folder=bill)
+        old_copy = manager.save_file(certificate, 'Certificate II old', 'pdf')
+        old_note = manager.save_file(b'old only', 'Note', 'pdf')
+        for path in (bill, old_copy, old_note):
+            os.utime(path, (0, 0))
+        latest = manager.save_file(b'latest', 'Latest', 'pdf')
+
+        files_deleted, space_freed = manager.clean_old_files(keep_latest=1)
+        assert files_deleted == 2
+        assert space_freed == len(b'old only')
+        # Bill folders are not cleaned; the shared blob survives through them
+        assert (bill / 'Certificate II.pdf').read_bytes() == certificate
+        assert sorted(p.name for p in manager.get_all_files()) == sorted(['bill_old', latest.name])
+
+    def test_usage_summary_is_reused_until_a_write(self, tmp_path):
+        manager = OutputManager(base_output_dir=str(tmp_path / 'OUTPUT'))
+        manager.save_file(b'first', 'a', 'pdf')
+        assert manager.get_usage_summary()['size_bytes'] == len(b'first')
+
+        (tmp_path / 'OUTPUT' / 'external.pdf').write_bytes(b'written elsewhere')
+        assert manager.get_usage_summary()['entries'] == 1
+        assert manager.get_usage_summary(max_age=0)['entries'] == 2
+
+        manager.save_file(b'second', 'b', 'pdf')
+        assert manager.get_usage_summary()['entries'] == 3
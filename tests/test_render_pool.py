@@ -0,0 +1,71 @@
+"""
+Unit tests for the shared render pool
+"""
+import sys
+from pathlib import Path
+
+import pandas as pd
+import pytest
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+pytest.importorskip("reportlab")
+
+from core.generators.html_generator import HTMLGenerator
+from core.generators.render_pool import RenderPool, get_render_pool
+
+
+def _template_data() -> dict:
+    bill_df = pd.DataFrame({
+        'Item No.': ['1.0', '2.0'],
+        'Description': ['Cable laying', 'Switch board'],
+        'Unit': ['Mtr', 'Each'],
+        'Quantity': [10.0, 2.0],
+        'Rate': [50.0, 400.0],
+    })
+    return HTMLGenerator({
+        'title_data': {'Name of Work ;-': 'Electric Repair Work'},
+        'work_order_data': bill_df.copy(),
+        'bill_quantity_data': bill_df,
+        'extra_items_data': pd.DataFrame(),
+    }).template_data
+
+
+class TestRenderPool:
+    """Tests for RenderPool"""
+
+    def setup_method(self):
+        self.pool = RenderPool(max_workers=4)
+
+    def teardown_method(self):
+        self.pool.shutdown()
+
+    def test_bill_outputs_collected_with_timing(self):
+        """Every DOCX and PDF job for every bill comes back with its timing"""
+        template_data = _template_data()
+        docs = {'First Page Summary': '', 'Certificate III': ''}
+        futures = []
+        for bill in ('bill_a', 'bill_b'):
+            futures += self.pool.submit_bill(bill, docs, template_data, native_pdf=True)
+
+        results = list(self.pool.iter_completed(futures))
+        assert len(results) == 8
+        assert all(r.success and r.seconds > 0 for r in results)
+        assert {(r.bill, r.fmt) for r in results} == {
+            ('bill_a', 'pdf'), ('bill_a', 'docx'), ('bill_b', 'pdf'), ('bill_b', 'docx')
+        }
+        assert all(r.content.startswith(b'%PDF') for r in results if r.fmt == 'pdf')
+
+    def test_errors_are_captured(self, monkeypatch):
+        """A failing job returns an error result instead of raising"""
+        def broken(*args):
+            raise RuntimeError("engine unavailable")
+        monkeypatch.setattr(self.pool, '_render_docx', broken)
+        future = self.pool.submit_docx('bill', 'Certificate III', '', {})
+        result = future.result()
+        assert not result.success
+        assert result.error == 'engine unavailable'
+
+    def test_global_pool_is_shared(self):
+        """get_render_pool returns a single instance"""
+        assert get_render_pool() is get_render_pool()
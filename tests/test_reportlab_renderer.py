@@ -0,0 +1,86 @@
+"""
+Unit tests for the native ReportLab bill renderer
+"""
+import re
+import sys
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+pytest.importorskip("reportlab")
+
+from core.generators.html_generator import HTMLGenerator
+from core.generators.reportlab_renderer import ReportLabRenderer
+
+
+def _page_count(pdf_bytes: bytes) -> int:
+    return len(re.findall(rb"/Type /Page[^s]", pdf_bytes))
+
+
+class TestReportLabRenderer:
+    """Tests for ReportLabRenderer"""
+
+    @pytest.fixture(autouse=True)
+    def _setup(self, bill_data_factory):
+        self.bill_data = bill_data_factory
+        self.renderer = ReportLabRenderer(margin_mm=10)
+        self.template_data = HTMLGenerator(self.bill_data()).template_data
+
+    def test_supported_documents(self):
+        """Native layouts exist for first page, deviation and certificates"""
+        for name in ('First Page Summary', 'Deviation Statement', 'Certificate II', 'Certificate III'):
+            assert self.renderer.supports(name)
+        assert not self.renderer.supports('BILL SCRUTINY SHEET')
+
+    def test_render_returns_pdf(self):
+        """Each native layout renders a PDF"""
+        for name in ('First Page Summary', 'Certificate II', 'Certificate III'):
+            pdf_bytes = self.renderer.render(name, self.template_data)
+            assert pdf_bytes.startswith(b'%PDF')
+
+    def test_deviation_is_landscape(self):
+        """Deviation Statement uses A4 landscape"""
+        pdf_bytes = self.renderer.render('Deviation Statement', self.template_data)
+        match = re.search(rb"/MediaBox \[\s*0 0 ([\d.]+) ([\d.]+)", pdf_bytes)
+        assert match is not None
+        assert float(match.group(1)) > float(match.group(2))
+
+    def test_long_tables_split_across_pages(self):
+        """Large bills flow onto multiple pages instead of shrinking"""
+        template_data = HTMLGenerator(self.bill_data(rows=150)).template_data
+        pdf_bytes = self.renderer.render('First Page Summary', template_data)
+        assert _page_count(pdf_bytes) > 1
+
+    def test_unsupported_document_raises(self):
+        """Documents without a native layout are rejected"""
+        with pytest.raises(ValueError):
+            self.renderer.render('BILL SCRUTINY SHEET', self.template_data)
+
+    def test_render_all_skips_unsupported(self):
+        """render_all only returns native layouts"""
+        pdfs = self.renderer.render_all(self.template_data, ['First Page Summary', 'Extra Items Statement'])
+        assert list(pdfs) == ['First Page Summary']
+
+    def test_html_fallback_keeps_orientation(self, monkeypatch):
+        """Documents rendered through HTML get the native layout's orientation"""
+        from core.generators.document_generator import DocumentGenerator
+
+        def broken_render(renderer, doc_name, template_data):
+            raise RuntimeError("layout error")
+
+        orientation = {}
+
+        def fake_convert(html_content, landscape=False, doc_name=""):
+            orientation[doc_name] = landscape
+            return b'%PDF'
+
+        monkeypatch.setattr(ReportLabRenderer, 'render', broken_render)
+        generator = DocumentGenerator(self.bill_data())
+        monkeypatch.setattr(generator.pdf_generator, 'auto_convert', fake_convert)
+
+        generator.create_native_pdf_documents(
+            {name: '<p></p>' for name in ('Deviation Statement', 'Certificate II', 'Extra Items Statement')}
+        )
+        assert orientation == {'Deviation Statement': True, 'Certificate II': False, 'Extra Items Statement': False}
@@ -0,0 +1,238 @@
+"""
+Unit tests for streaming ZIP creation
+"""
+import io
+import os
+import sys
+import zipfile
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from core.utils.streaming_zip import StreamingZipWriter, archive_bytes, deflate_entry, verify_zip_stream
+from core.utils.output_manager import OutputManager
+
+
+class TestStreamingZipWriter:
+    """Tests for StreamingZipWriter"""
+
+    def test_round_trip_from_bytes_and_files(self, tmp_path):
+        """Entries from memory and from disk come back unchanged"""
+        source = tmp_path / 'bill.pdf'
+        source.write_bytes(os.urandom(300_000))
+
+        writer = StreamingZipWriter(chunk_size=4096)
+        writer.add_bytes('html/First Page.html', '<html>ü</html>')
+        writer.add_file(source, 'pdf/bill.pdf')
+        assert writer.verify()
+
+        with zipfile.ZipFile(writer.close()) as zf:
+            assert zf.read('html/First Page.html') == '<html>ü</html>'.encode('utf-8')
+            assert zf.read('pdf/bill.pdf') == source.read_bytes()
+        assert writer.bytes_in == len('<html>ü</html>'.encode('utf-8')) + 300_000
+
+    def test_large_archive_spools_to_disk(self):
+        """Archives above the spool limit leave memory"""
+        writer = StreamingZipWriter(compresslevel=0, spool_max_mb=1)
+        for idx in range(3):
+            writer.add_bytes(f'doc_{idx}.bin', os.urandom(512 * 1024))
+        archive = writer.close()
+        assert archive._rolled
+
+    def test_unseekable_target(self):
+        """Archives can be written straight to a forward-only stream"""
+        class ForwardOnly(io.RawIOBase):
+            def __init__(self):
+                self.data = bytearray()
+
+            def writable(self):
+                return True
+
+            def write(self, b):
+                self.data += b
+                return len(b)
+
+        target = ForwardOnly()
+        with StreamingZipWriter(target) as writer:
+            writer.add_bytes('a.txt', 'hello')
+        with zipfile.ZipFile(io.BytesIO(bytes(target.data))) as zf:
+            assert zf.read('a.txt') == b'hello'
+
+    def test_precompressed_entries(self):
+        """deflate_entry output can be appended without recompressing"""
+        payload, crc, size = deflate_entry('<html>' * 1000, level=9)
+        writer = StreamingZipWriter()
+        writer.add_compressed('a.html', payload, crc, size)
+        writer.add_bytes('b.txt', 'plain')
+        assert writer.verify()
+        with zipfile.ZipFile(writer.close()) as zf:
+            assert zf.read('a.html') == b'<html>' * 1000
+            assert zf.getinfo('a.html').compress_size == len(payload)
+
+    def test_archive_bytes_for_download_button(self):
+        """Streamlit rejects the spooled file; archive_bytes hands it bytes and closes the spool"""
+        from streamlit.runtime.download_data_util import convert_data_to_bytes_and_infer_mime
+
+        writer = StreamingZipWriter()
+        writer.add_bytes('a.txt', 'bill')
+        spooled = writer.close()
+        with pytest.raises(RuntimeError):
+            convert_data_to_bytes_and_infer_mime(spooled, RuntimeError("Invalid binary data format"))
+
+        data, _ = convert_data_to_bytes_and_infer_mime(archive_bytes(spooled), RuntimeError())
+        assert spooled.closed
+        with zipfile.ZipFile(io.BytesIO(data)) as zf:
+            assert zf.read('a.txt') == b'bill'
+
+    def test_corruption_detected(self):
+        """verify_zip_stream reports CRC failures"""
+        writer = StreamingZipWriter(compresslevel=0)
+        writer.add_bytes('a.txt', b'A' * 1000)
+        data = bytearray(writer.close().read())
+        data[data.index(b'AAAA')] = ord('B')
+        with pytest.raises(ValueError):
+            verify_zip_stream(io.BytesIO(bytes(data)))
+
+
+class TestOutputManagerZip:
+    """OutputManager ZIPs are streamed from disk"""
+
+    def test_save_zip_streams_folder(self, tmp_path):
+        manager = OutputManager(base_output_dir=str(tmp_path / 'OUTPUT'))
+        manager.save_text_file('<html></html>', 'First Page', 'html')
+        manager.save_file(b'%PDF-1.4', 'First Page', 'pdf')
+
+        zip_path = manager.save_zip('bill')
+        with zipfile.ZipFile(zip_path) as zf:
+            assert sorted(zf.namelist()) == ['First Page.html', 'First Page.pdf']
+
+        zip_bytes, zip_name = manager.create_zip('bill_again')
+        assert zip_name == 'bill_again.zip'
+        with zipfile.ZipFile(io.BytesIO(zip_bytes)) as zf:
+            assert 'bill.zip' in zf.namelist()
+
+
+class TestOptimizedZipProcessorStreaming:
+    """OptimizedZipProcessor returns a verified stream"""
+
+    def test_create_zip_returns_stream(self, tmp_path, monkeypatch):
+        pytest.importorskip("psutil")
+        from core.utils.optimized_zip_processor import OptimizedZipProcessor, OptimizedZipConfig
+
+        monkeypatch.chdir(tmp_path)
+        config = OptimizedZipConfig(enable_caching=False, memory_limit_mb=100000)
+        with OptimizedZipProcessor(config) as processor:
+            processor.add_file_from_memory('<html></html>', 'html/a.html')
+            processor.add_file_from_memory(b'%PDF-1.4', 'pdf/a.pdf')
+            zip_stream, metrics = processor.create_zip()
+
+        assert metrics.total_files == 2
+        assert metrics.compressed_size_bytes == len(zip_stream.read())
+        zip_stream.seek(0)
+        with zipfile.ZipFile(zip_stream) as zf:
+            assert zf.read('pdf/a.pdf') == b'%PDF-1.4'
+
+    def test_parallel_compression_keeps_order(self, tmp_path, monkeypatch):
+        """Entries deflated on worker threads are assembled in add order"""
+        pytest.importorskip("psutil")
+        from core.utils.optimized_zip_processor import OptimizedZipProcessor, OptimizedZipConfig
+
+        monkeypatch.chdir(tmp_path)
+        large = tmp_path / 'large.bin'
+        large.write_bytes(os.urandom(2 * 1024 * 1024))
+        config = OptimizedZipConfig(
+            enable_caching=False, memory_limit_mb=100000, parallel_compression=True,
+            parallel_min_files=2, max_workers=3, streaming_threshold_mb=1
+        )
+        names = []
+        with OptimizedZipProcessor(config) as processor:
+            for idx in range(12):
+                names.append(f"bill_{idx}/note.html")
+                processor.add_file_from_memory(f"<p>{idx}</p>" * 500, names[-1])
+                if idx == 5:
+                    processor.add_file_from_path(large, 'large.bin')
+                    names.append('large.bin')
+            zip_stream, metrics = processor.create_zip()
+
+        with zipfile.ZipFile(zip_stream) as zf:
+            assert zf.namelist() == names
+            assert zf.testzip() is None
+            assert zf.read('bill_7/note.html') == b"<p>7</p>" * 500
+            assert zf.getinfo('bill_7/note.html').compress_type == zipfile.ZIP_DEFLATED
+        assert metrics.streaming_files_count == 1
+
+    def test_compression_policy_per_entry(self, tmp_path, monkeypatch):
+        """PDFs and random data are stored, text is deflated, savings reported"""
+        pytest.importorskip("psutil")
+        from core.utils.optimized_zip_processor import OptimizedZipProcessor, OptimizedZipConfig
+
+        monkeypatch.chdir(tmp_path)
+        config = OptimizedZipConfig(enable_caching=False, memory_limit_mb=100000)
+        with OptimizedZipProcessor(config) as processor:
+            processor.add_file_from_memory(b'%PDF-1.7\n' + b'0' * 50000, 'pdf/bill.pdf')
+            processor.add_file_from_memory('<td>100.00</td>' * 5000, 'html/bill.html')
+            processor.add_file_from_memory(os.urandom(50000), 'data/blob.bin')
+            processor.add_file_from_memory(b'A' * 50000, 'data/text.bin')
+            zip_stream, metrics = processor.create_zip()
+
+        with zipfile.ZipFile(zip_stream) as zf:
+            assert zf.getinfo('pdf/bill.pdf').compress_type == zipfile.ZIP_STORED
+            assert zf.getinfo('html/bill.html').compress_type == zipfile.ZIP_DEFLATED
+            assert zf.getinfo('data/blob.bin').compress_type == zipfile.ZIP_STORED
+            assert zf.getinfo('data/text.bin').compress_type == zipfile.ZIP_DEFLATED
+            assert zf.testzip() is None
+        assert metrics.stored_files_count == 2
+        assert metrics.bytes_saved > 0
+        assert metrics.time_saved_seconds > 0
+
+
+class TestOptimizedZipCache:
+    """Digest-keyed archive cache"""
+
+    def _processor(self, **overrides):
+        from core.utils.optimized_zip_processor import OptimizedZipProcessor, OptimizedZipConfig
+        config = OptimizedZipConfig(memory_limit_mb=100000, **overrides)
+        return OptimizedZipProcessor(config)
+
+    def test_key_tracks_content_and_names(self, tmp_path, monkeypatch):
+        """Same-size content or renamed entries give a different key"""
+        pytest.importorskip("psutil")
+        monkeypatch.chdir(tmp_path)
+        keys = []
+        for name, content in (('a.html', 'AAAA'), ('a.html', 'BBBB'), ('b.html', 'AAAA'), ('a.html', 'AAAA')):
+            processor = self._processor()
+            processor.add_file_from_memory(content, name)
+            keys.append(processor._generate_cache_key(processor.processed_files))
+        assert len(set(keys)) == 3
+        assert keys[0] == keys[3]
+
+    def test_cache_hit_uses_json_metadata(self, tmp_path, monkeypatch):
+        """Second build of the same entries is served from cache"""
+        pytest.importorskip("psutil")
+        monkeypatch.chdir(tmp_path)
+        for attempt in range(2):
+            with self._processor() as processor:
+                processor.add_file_from_memory('<p>bill</p>', 'bill.html')
+                zip_stream, metrics = processor.create_zip()
+                zip_bytes = archive_bytes(zip_stream)
+        assert metrics.cached_files_count == 1
+        assert zip_stream.closed
+        with zipfile.ZipFile(io.BytesIO(zip_bytes)) as zf:
+            assert zf.read('bill.html') == b'<p>bill</p>'
+        assert list((tmp_path / '.zip_cache_optimized').glob('*.json'))
+        assert not list((tmp_path / '.zip_cache_optimized').glob('*.meta'))
+
+    def test_sweep_removes_old_entries(self, tmp_path):
+        """Old archives and their metadata are removed by the sweeper"""
+        pytest.importorskip("psutil")
+        from core.utils.optimized_zip_processor import sweep_zip_cache
+        old_zip = tmp_path / 'old.zip'
+        old_zip.write_bytes(b'PK')
+        (tmp_path / 'old.json').write_text('{}')
+        os.utime(old_zip, (0, 0))
+        (tmp_path / 'new.zip').write_bytes(b'PK')
+
+        assert sweep_zip_cache(tmp_path, max_age_hours=1) == 1
+        assert sorted(p.name for p in tmp_path.iterdir()) == ['new.zip']
@@ -0,0 +1,101 @@
+"""
+Unit tests for Title-sheet date parsing and its use in delay/LD calculations
+"""
+import sys
+from datetime import date, datetime
+from pathlib import Path
+
+import pandas as pd
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from core.generators.base_generator import BaseGenerator
+from core.processors.excel_processor import ExcelProcessor
+from core.processors.title_dates import lookup_title_date, parse_title_date
+
+SCHEDULED = 'St. date of completion :'
+ACTUAL = 'Date of actual completion of work :'
+START = 'Date of written order to commence work :'
+
+
+class TestParseTitleDate:
+    """Accepted cell values"""
+
+    def test_values(self):
+        assert parse_title_date(pd.Timestamp('2025-04-17 00:00:00')) == date(2025, 4, 17)
+        assert parse_title_date(datetime(2025, 1, 9, 10, 30)) == date(2025, 1, 9)
+        assert parse_title_date(date(2025, 1, 9)) == date(2025, 1, 9)
+        assert parse_title_date(' 17/04/2025 ') == date(2025, 4, 17)
+        assert parse_title_date('2025-04-17 00:00:00') == date(2025, 4, 17)
+        assert parse_title_date('17-04-2025') == date(2025, 4, 17)
+        assert parse_title_date(pd.NaT) is None
+        assert parse_title_date('Not Applicable') is None
+        assert parse_title_date(45000) is None
+        assert parse_title_date(None) is None
+
+    def test_lookup_prefers_parsed_dates(self):
+        title_data = {SCHEDULED: 'garbage', ACTUAL: '01/03/2025'}
+        parsed = {SCHEDULED: date(2025, 1, 1)}
+        assert lookup_title_date(parsed, title_data, SCHEDULED) == date(2025, 1, 1)
+        assert lookup_title_date(parsed, title_data, ACTUAL) == date(2025, 3, 1)
+        assert lookup_title_date(None, title_data, 'Missing', ACTUAL) == date(2025, 3, 1)
+
+
+class TestTitleSheet:
+    """ExcelProcessor._parse_title_sheet"""
+
+    def test_dates_parsed_once_with_display_strings(self):
+        df = pd.DataFrame([
+            ['Name of Work ;-', 'Electric Repair Work'],
+            [START, pd.Timestamp('2025-01-09')],
+            [SCHEDULED, '17/04/2025'],
+            [ACTUAL, '2025-06-28 00:00:00'],
+            ['Date of measurement :', 'Not Applicable'],
+            [None, 'orphan value'],
+            ['Name of Work ;-', 'Duplicate key'],
+        ])
+
+        title_data, title_dates = ExcelProcessor()._parse_title_sheet(df)
+
+        assert title_data[START] == '09/01/2025'
+        assert title_data[SCHEDULED] == '17/04/2025'
+        assert title_data[ACTUAL] == '28/06/2025'
+        assert title_data['Date of measurement :'] == 'Not Applicable'
+        assert title_data['Name of Work ;-'] == 'Duplicate key'
+        assert title_data['_first_20_rows_count'] == 5
+        assert title_dates == {
+            START: date(2025, 1, 9),
+            SCHEDULED: date(2025, 4, 17),
+            ACTUAL: date(2025, 6, 28),
+        }
+        assert ExcelProcessor()._process_title_sheet(df) == title_data
+
+    def test_single_column_sheet(self):
+        title_data, title_dates = ExcelProcessor()._parse_title_sheet(pd.DataFrame({0: ['only keys']}))
+        assert title_dates == {}
+        assert title_data['_first_20_rows_count'] == 0
+
+
+class TestGeneratorDates:
+    """Delay and liquidated damages consume the parsed dates"""
+
+    def test_uses_parsed_dates(self):
+        generator = BaseGenerator({
+            'title_data': {SCHEDULED: 'unparseable', ACTUAL: 'unparseable', START: 'unparseable'},
+            'title_dates': {START: date(2025, 1, 9), SCHEDULED: date(2025, 4, 17), ACTUAL: date(2025, 6, 28)},
+        })
+        assert generator._calculate_delay_days() == 72
+        assert generator._calculate_liquidated_damages(1_000_000, 500_000, 72) > 0
+
+    def test_mixed_text_formats(self):
+        # Each date may use its own layout
+        generator = BaseGenerator({'title_data': {
+            START: '01-06-2023', SCHEDULED: '01/01/2024', ACTUAL: '2024-03-01',
+        }})
+        assert generator._calculate_delay_days() == 60
+        assert generator._calculate_liquidated_damages(1_000_000, 500_000, 60) > 0
+
+    def test_missing_dates(self):
+        generator = BaseGenerator({'title_data': {SCHEDULED: '01/01/2024'}})
+        assert generator._calculate_delay_days() == 0
+        assert generator._calculate_liquidated_damages(1_000_000, 500_000, 0) == 0
@@ -0,0 +1,120 @@
+"""
+Unit tests for memory-mapped upload ingest
+"""
+import gc
+import hashlib
+import io
+import sys
+import tempfile
+from pathlib import Path
+
+import pandas as pd
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from core.processors import excel_engines
+from core.processors.excel_processor import ExcelProcessor
+from core.utils.security_manager import SecurityManager
+from core.utils.upload_ingest import MappedReader, ingest_upload
+
+SAMPLE = Path(__file__).parent.parent / 'TEST_INPUT_FILES' / '3rdRunningNoExtra.xlsx'
+
+
+class FakeUpload(io.BytesIO):
+    """Stand-in for Streamlit's UploadedFile (a BytesIO with name/size)"""
+
+    def __init__(self, content: bytes, name: str):
+        super().__init__(content)
+        self.name = name
+        self.size = len(content)
+
+
+class TestIngest:
+    """Spooling, mapping and cleanup"""
+
+    def test_in_memory_upload_is_spooled_and_removed(self, tmp_path):
+        content = SAMPLE.read_bytes()
+        upload = ingest_upload(FakeUpload(content, 'bill.xlsx'), temp_dir=str(tmp_path))
+        assert upload.spooled
+        assert upload.path.parent == tmp_path and upload.path.suffix == '.xlsx'
+        assert upload.size == len(content)
+        assert upload.checksum == hashlib.sha256(content).hexdigest()
+        assert upload.head(2) == b'PK'
+
+        upload.close()
+        assert upload.closed
+        assert not upload.path.exists()
+
+    def test_files_on_disk_are_mapped_in_place(self):
+        with open(SAMPLE, 'rb') as f, ingest_upload(f) as upload:
+            assert not upload.spooled
+            assert upload.path == SAMPLE
+            assert f.tell() == 0
+        assert SAMPLE.exists()
+
+    def test_empty_upload(self, tmp_path):
+        with ingest_upload(b'', name='empty.txt', temp_dir=str(tmp_path)) as upload:
+            assert upload.size == 0
+            assert upload.reader().read() == b''
+
+    def test_mapped_reader(self):
+        reader = MappedReader(b'0123456789')
+        assert reader.read(3) == b'012'
+        reader.seek(-2, io.SEEK_END)
+        assert reader.read() == b'89'
+        reader.seek(4)
+        chunk = bytearray(4)
+        assert reader.readinto(chunk) == 4 and bytes(chunk) == b'4567'
+
+
+class TestSharedBuffer:
+    """Validation and parsing from the same mapping"""
+
+    def test_validation_and_parsing_share_the_upload(self, tmp_path):
+        manager = SecurityManager()
+        with ingest_upload(FakeUpload(SAMPLE.read_bytes(), SAMPLE.name), temp_dir=str(tmp_path)) as upload:
+            result = manager.validate_upload(upload)
+            data = ExcelProcessor().process_excel(upload)
+
+        assert result.is_valid
+        assert result.checksum == manager.validate_file(SAMPLE).checksum
+        assert data['source_filename'] == SAMPLE.name
+        expected = ExcelProcessor().process_excel(str(SAMPLE))
+        pd.testing.assert_frame_equal(data['bill_quantity_data'], expected['bill_quantity_data'])
+
+    def test_validate_uploaded_file(self, tmp_path):
+        manager = SecurityManager()
+        manager.config.temp_dir = str(tmp_path)
+        upload = FakeUpload(b'<p>hello</p>', 'note.html')
+
+        result = manager.validate_uploaded_file(upload)
+        assert result.is_valid, result.error_message
+        assert result.file_size == upload.size
+        assert list(tmp_path.iterdir()) == []
+
+    def test_cached_result_is_not_shared(self, tmp_path):
+        manager = SecurityManager()
+        manager.config.temp_dir = str(tmp_path)
+        first = manager.validate_uploaded_file(FakeUpload(b'<p>hello</p>', 'note.html'))
+        first.file_size = -1
+        assert manager.validate_uploaded_file(FakeUpload(b'<p>hello</p>', 'note.html')).file_size == 12
+
+    def test_workbook_keeps_its_upload_mapped(self, monkeypatch):
+        uploads = []
+
+        def recording_ingest(source):
+            uploads.append(ingest_upload(source))
+            return uploads[-1]
+        monkeypatch.setattr(excel_engines, 'ingest_upload', recording_ingest)
+
+        with tempfile.SpooledTemporaryFile() as source:
+            source.write(SAMPLE.read_bytes())
+            workbook, _ = excel_engines.open_workbook(source)
+        gc.collect()
+        # Still mapped (and the spool still on disk) while the workbook is alive
+        assert not uploads[0].closed and uploads[0].path.exists()
+        assert 'Title' in workbook.sheet_names
+
+        del workbook
+        gc.collect()
+        assert uploads[0].closed and not uploads[0].path.exists()
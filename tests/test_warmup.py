@@ -0,0 +1,71 @@
+"""
+Unit tests for warm startup and bytecode-preserving cache cleaning
+"""
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from core.utils.cache_cleaner import CacheCleaner
+from core.utils import warmup
+
+
+class TestCacheCleaner:
+    """Bytecode survives routine cleaning"""
+
+    def _tree(self, tmp_path):
+        (tmp_path / 'pkg' / '__pycache__').mkdir(parents=True)
+        (tmp_path / 'pkg' / '__pycache__' / 'mod.cpython-311.pyc').write_bytes(b'')
+        (tmp_path / '.pytest_cache').mkdir()
+        return tmp_path
+
+    def test_bytecode_kept_by_default(self, tmp_path):
+        root = self._tree(tmp_path)
+        assert CacheCleaner.clean_cache(str(root)) == (1, 0)
+        assert (root / 'pkg' / '__pycache__' / 'mod.cpython-311.pyc').exists()
+        assert not (root / '.pytest_cache').exists()
+
+    def test_bytecode_removed_on_request(self, tmp_path):
+        root = self._tree(tmp_path)
+        CacheCleaner.clean_cache(str(root), include_bytecode=True)
+        assert not (root / 'pkg' / '__pycache__').exists()
+
+
+class TestWarmup:
+    """Background warm-up of the document stack"""
+
+    def test_steps_follow_pdf_engine(self):
+        names = [name for name, _ in warmup.warmup_steps('reportlab')]
+        assert 'weasyprint' not in names
+        assert names[0] == 'modules' and names[-1] == 'bytecode'
+        assert 'weasyprint' in [name for name, _ in warmup.warmup_steps('weasyprint')]
+
+    def test_run_warmup_records_every_step(self, monkeypatch):
+        monkeypatch.setattr(warmup, '_compile_bytecode', lambda: 0)
+        steps = warmup.run_warmup('reportlab')
+        assert {'modules', 'templates', 'openpyxl', 'docx', 'reportlab', 'bytecode'} <= set(steps)
+        assert all('error' not in steps[name] for name in ('modules', 'templates', 'docx'))
+        assert steps['templates']['items'] >= 5
+        assert warmup.wait_for_warmup(0)
+        assert warmup.warmup_status()['done']
+
+    def test_failing_step_is_recorded(self, monkeypatch):
+        def broken():
+            raise OSError("cannot load library 'libpango-1.0-0'")
+        monkeypatch.setattr(warmup, 'warmup_steps', lambda engine: [('weasyprint', broken)])
+        steps = warmup.run_warmup('weasyprint')
+        assert 'libpango' in steps['weasyprint']['error']
+
+    def test_worker_warms_configured_engine(self, monkeypatch):
+        warmed = []
+        monkeypatch.setattr(warmup, 'warmup_steps', lambda engine: [
+            (engine, lambda: warmed.append(engine)), ('bytecode', lambda: warmed.append('bytecode'))
+        ])
+        warmup.warm_worker('weasyprint')
+        assert warmed == ['weasyprint']
+
+    def test_templates_are_shared_between_generators(self):
+        from core.generators.base_generator import BaseGenerator, get_template_environment
+        first, second = BaseGenerator({}), BaseGenerator({})
+        assert first.jinja_env is second.jinja_env is get_template_environment()
+        assert first.get_template('first_page.html') is second.get_template('first_page.html')